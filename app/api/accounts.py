@@ -1,13 +1,19 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from pydantic import BaseModel, EmailStr
+from typing import Optional
 import uuid
 import datetime
 import pytz
 
-from app.data.database import get_connection
+from app.api.deps import get_db, parse_cursor
+from app.data.pagination import fetch_keyset_page
+from app.repositories.transaction_repo import ACCOUNT_TRANSACTIONS_CURSOR_SCOPE, fetch_account_transactions
+from app.services.account_snapshot import get_account_snapshot
 
 router = APIRouter(prefix="/accounts", tags=["Accounts"])
 
+LAST_TRANSACTION_FIELDS = ("txn_id", "amount", "device_id", "txn_timestamp", "status")
+
 
 class CreateAccountRequest(BaseModel):
     name: str
@@ -16,11 +22,10 @@ class CreateAccountRequest(BaseModel):
 
 
 @router.post("/create")
-def create_account(req: CreateAccountRequest):
+def create_account(req: CreateAccountRequest, conn=Depends(get_db)):
     """
     Create user + create account, returning identifiers.
     """
-    conn = get_connection()
     try:
         cursor = conn.cursor()
 
@@ -51,176 +56,93 @@ def create_account(req: CreateAccountRequest):
     except Exception:
         conn.rollback()
         raise
-    finally:
-        conn.close()
 
 
 @router.get("")
-def list_accounts(limit: int = 200):
-    conn = get_connection()
-    try:
-        cursor = conn.cursor()
-        cursor.execute(
-            """
+def list_accounts(
+    response: Response,
+    limit: int = Query(200, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    conn=Depends(get_db),
+):
+    """
+    Newest accounts first. The body stays a plain list; the continuation
+    token for the next page is returned in the X-Next-Cursor header.
+    """
+    rows, next_cursor = fetch_keyset_page(
+        conn.cursor(),
+        scope="accounts",
+        select_sql="""
             SELECT account_id, user_id, status, balance, created_at
             FROM accounts
-            ORDER BY created_at DESC
-            LIMIT %s
-            """,
-            (limit,),
-        )
-        rows = cursor.fetchall()
-        return [dict(r) for r in rows]
-    finally:
-        conn.close()
+        """,
+        conditions=[],
+        params=[],
+        created_column="created_at",
+        id_column="account_id",
+        descending=True,
+        after=parse_cursor("accounts", cursor),
+        limit=limit,
+    )
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return [dict(r) for r in rows]
 
 
 @router.get("/{account_id}")
-def account_details(account_id: str):
+def account_details(account_id: str, conn=Depends(get_db)):
     """
     Account details = profile + last decision + open case + last 10 signals.
-    """
-    conn = get_connection()
-    try:
-        cursor = conn.cursor()
-
-        cursor.execute(
-            """
-            SELECT account_id, user_id, account_type, balance, status, created_at
-            FROM accounts
-            WHERE account_id = %s
-            LIMIT 1
-            """,
-            (account_id,),
-        )
-        acct = cursor.fetchone()
-        if not acct:
-            raise HTTPException(status_code=404, detail="Account not found")
-
-        user_id = acct["user_id"]
-
-        cursor.execute(
-            """
-            SELECT decision, risk_score, reasons, created_at
-            FROM risk_decisions
-            WHERE account_id = %s
-            ORDER BY created_at DESC
-            LIMIT 1
-            """,
-            (account_id,),
-        )
-        latest_decision = cursor.fetchone()
-
-        cursor.execute(
-            """
-            SELECT case_id, decision, risk_score, status, created_at
-            FROM review_cases
-            WHERE account_id = %s
-              AND status = 'OPEN'
-            ORDER BY created_at DESC
-            LIMIT 1
-            """,
-            (account_id,),
-        )
-        open_case = cursor.fetchone()
 
-        cursor.execute(
-            """
-            SELECT signal_type, signal_value, signal_weight, signal_contribution, description, created_at
-            FROM signals
-            WHERE user_id = %s
-            ORDER BY created_at DESC
-            LIMIT 10
-            """,
-            (user_id,),
-        )
-        signals = cursor.fetchall()
-
-        # Aggregate transaction stats for this account
-        cursor.execute(
-            """
-            SELECT
-              COUNT(*) AS total_txns
-            FROM transactions
-            WHERE account_id = %s
-            """,
-            (account_id,),
-        )
-        tx_agg = cursor.fetchone() or {"total_txns": 0}
+    Served from the cached account snapshot (one query on a miss).
+    """
+    snapshot = get_account_snapshot(conn.cursor(), account_id)
+    if not snapshot or not snapshot["account"]:
+        raise HTTPException(status_code=404, detail="Account not found")
 
-        cursor.execute(
-            """
-            SELECT txn_id, amount, device_id, txn_timestamp, status
-            FROM transactions
-            WHERE account_id = %s
-            ORDER BY txn_timestamp DESC
-            LIMIT 1
-            """,
-            (account_id,),
-        )
-        last_txn = cursor.fetchone()
+    txns = snapshot["recent_transactions"]
+    last_txn = txns[0] if txns else None
 
-        return {
-            "profile": dict(acct),
-            "latest_decision": dict(latest_decision) if latest_decision else None,
-            "open_case": dict(open_case) if open_case else None,
-            "recent_signals": [dict(s) for s in signals],
-            "total_transactions": tx_agg["total_txns"],
-            "last_transaction": dict(last_txn) if last_txn else None,
-        }
-    finally:
-        conn.close()
+    return {
+        "profile": snapshot["account"],
+        "latest_decision": snapshot["latest_decision"],
+        "open_case": snapshot["open_case"],
+        "recent_signals": snapshot["recent_signals"],
+        "total_transactions": snapshot["total_transactions"],
+        "last_transaction": (
+            {field: last_txn.get(field) for field in LAST_TRANSACTION_FIELDS} if last_txn else None
+        ),
+    }
 
 
 @router.get("/{account_id}/transactions")
-def account_transactions(account_id: str, limit: int = 50):
+def account_transactions(
+    account_id: str,
+    response: Response,
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = None,
+    conn=Depends(get_db),
+):
     """
     Return last N transactions with decision + risk_score.
+    The next page's token is returned in the X-Next-Cursor header.
     """
-    conn = get_connection()
-    try:
-        cursor = conn.cursor()
-
-        cursor.execute(
-            """
-            SELECT 1
-            FROM accounts
-            WHERE account_id = %s
-            LIMIT 1
-            """,
-            (account_id,),
-        )
-        if not cursor.fetchone():
-            raise HTTPException(status_code=404, detail="Account not found")
-
-        cursor.execute(
-            """
-            SELECT
-              t.txn_id,
-              t.account_id,
-              t.amount,
-              t.txn_timestamp AS timestamp,
-              t.device_id,
-              t.channel,
-              d.decision,
-              d.risk_score
-            FROM transactions t
-            LEFT JOIN LATERAL (
-              SELECT decision, risk_score
-              FROM risk_decisions
-              WHERE account_id = t.account_id
-                AND created_at >= t.txn_timestamp
-              ORDER BY created_at ASC
-              LIMIT 1
-            ) d ON TRUE
-            WHERE t.account_id = %s
-            ORDER BY t.txn_timestamp DESC
-            LIMIT %s
-            """,
-            (account_id, limit),
-        )
-        rows = cursor.fetchall()
-        return [dict(r) for r in rows]
-    finally:
-        conn.close()
-
+    after = parse_cursor(ACCOUNT_TRANSACTIONS_CURSOR_SCOPE, cursor)
+    db = conn.cursor()
+
+    db.execute(
+        """
+        SELECT 1
+        FROM accounts
+        WHERE account_id = %s
+        LIMIT 1
+        """,
+        (account_id,),
+    )
+    if not db.fetchone():
+        raise HTTPException(status_code=404, detail="Account not found")
+
+    rows, next_cursor = fetch_account_transactions(db, account_id, limit=limit, after=after)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return [dict(r) for r in rows]
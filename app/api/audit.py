@@ -1,7 +1,9 @@
-from fastapi import APIRouter, HTTPException, Query
+from typing import Optional
 
-from app.data.database import get_connection
-from app.audit.queries import fetch_account_audit
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from app.api.deps import get_db, parse_cursor
+from app.audit.queries import AUDIT_CURSOR_SCOPE, fetch_account_audit
 
 router = APIRouter(prefix="/accounts", tags=["Audit Traceability"])
 
@@ -10,7 +12,13 @@ router = APIRouter(prefix="/accounts", tags=["Audit Traceability"])
 def get_account_audit(
     account_id: str,
     limit: int = Query(50, ge=1, le=200),
-    offset: int = Query(0, ge=0),
+    offset: int = Query(0, ge=0, description="Deprecated; use cursor"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    event_type: Optional[str] = Query(None, description="e.g. DECISION_MADE"),
+    transaction_id: Optional[str] = Query(None),
+    decision: Optional[str] = Query(None, pattern="^(ALLOW|REVIEW|BLOCK)$", description="ALLOW | REVIEW | BLOCK"),
+    case_id: Optional[str] = Query(None),
+    conn=Depends(get_db),
 ):
     """
     Full audit trace endpoint.
@@ -19,16 +27,31 @@ def get_account_audit(
     - All SIGNAL_GENERATED events
     - All DECISION_MADE events
     For compliance + analyst investigation.
+
+    transaction_id / decision / case_id filter on event metadata in the
+    database. Pass `next_cursor` back as `cursor` for the following page.
     """
 
-    conn = get_connection()
-    cursor = conn.cursor()
+    after = parse_cursor(AUDIT_CURSOR_SCOPE, cursor)
+
+    metadata_filter = {
+        key: value
+        for key, value in (
+            ("transaction_id", transaction_id),
+            ("decision", decision),
+            ("case_id", case_id),
+        )
+        if value is not None
+    }
 
-    audit_events = fetch_account_audit(
-        cursor,
+    audit_events, next_cursor = fetch_account_audit(
+        conn.cursor(),
         account_id,
         limit=limit,
         offset=offset,
+        after=after,
+        event_type=event_type,
+        metadata_filter=metadata_filter,
     )
 
     if not audit_events:
@@ -43,4 +66,5 @@ def get_account_audit(
         "offset": offset,
         "returned_events": len(audit_events),
         "audit_history": audit_events,
+        "next_cursor": next_cursor,
     }
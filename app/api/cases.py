@@ -1,9 +1,12 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel
+from typing import Optional
 import datetime
 
-from app.data.database import get_connection
+from app.api.deps import get_db, parse_cursor
+from app.data.pagination import fetch_keyset_page
 from app.repositories.audit_repo import log_case_resolved
+from app.services.account_snapshot import invalidate_account_snapshots
 
 router = APIRouter(prefix="/cases", tags=["Cases"])
 
@@ -22,54 +25,60 @@ class ResolveCaseRequest(BaseModel):
 # ----------------------------
 
 @router.get("/open")
-def get_open_cases(limit: int = 50):
+def get_open_cases(
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = None,
+    conn=Depends(get_db),
+):
     """
     Fraud Analyst Queue:
-    Returns all OPEN review/block cases.
+    Returns all OPEN review/block cases, newest first.
+    Pass `next_cursor` back as `cursor` for the following page.
     """
 
-    conn = get_connection()
-    cursor = conn.cursor()
-
-    cursor.execute("""
-        SELECT case_id, user_id, account_id,
-               decision, risk_score,
-               status, created_at
-        FROM review_cases
-        WHERE status = 'OPEN'
-        ORDER BY created_at DESC
-        LIMIT %s
-    """, (limit,))
+    after = parse_cursor("open_cases", cursor)
 
-    rows = cursor.fetchall()
-    conn.close()
+    rows, next_cursor = fetch_keyset_page(
+        conn.cursor(),
+        scope="open_cases",
+        select_sql="""
+            SELECT case_id, user_id, account_id,
+                   decision, risk_score,
+                   status, created_at
+            FROM review_cases
+        """,
+        conditions=["status = 'OPEN'"],
+        params=[],
+        created_column="created_at",
+        id_column="case_id",
+        descending=True,
+        after=after,
+        limit=limit,
+    )
 
     return {
         "returned": len(rows),
-        "cases": [dict(r) for r in rows]
+        "cases": [dict(r) for r in rows],
+        "next_cursor": next_cursor,
     }
 
 
 @router.get("/{case_id}")
-def get_case(case_id: str):
-    conn = get_connection()
-    try:
-        cursor = conn.cursor()
-        cursor.execute(
-            """
-            SELECT *
-            FROM review_cases
-            WHERE case_id = %s
-            LIMIT 1
-            """,
-            (case_id,),
-        )
-        row = cursor.fetchone()
-        if not row:
-            raise HTTPException(status_code=404, detail="Case not found")
-        return dict(row)
-    finally:
-        conn.close()
+def get_case(case_id: str, conn=Depends(get_db)):
+    cursor = conn.cursor()
+    cursor.execute(
+        """
+        SELECT *
+        FROM review_cases
+        WHERE case_id = %s
+        LIMIT 1
+        """,
+        (case_id,),
+    )
+    row = cursor.fetchone()
+    if not row:
+        raise HTTPException(status_code=404, detail="Case not found")
+    return dict(row)
 
 
 # ----------------------------
@@ -77,13 +86,12 @@ def get_case(case_id: str):
 # ----------------------------
 
 @router.post("/{case_id}/resolve")
-def resolve_case(case_id: str, req: ResolveCaseRequest):
+def resolve_case(case_id: str, req: ResolveCaseRequest, conn=Depends(get_db)):
     """
     Analyst resolves a fraud review case.
     Marks case as RESOLVED + writes audit log.
     """
 
-    conn = get_connection()
     cursor = conn.cursor()
 
     # Fetch case first
@@ -96,11 +104,9 @@ def resolve_case(case_id: str, req: ResolveCaseRequest):
     row = cursor.fetchone()
 
     if not row:
-        conn.close()
         raise HTTPException(status_code=404, detail="Case not found")
 
     if row["status"] == "RESOLVED":
-        conn.close()
         raise HTTPException(status_code=400, detail="Case already resolved")
 
     account_id = row["account_id"]
@@ -133,7 +139,7 @@ def resolve_case(case_id: str, req: ResolveCaseRequest):
     )
 
     conn.commit()
-    conn.close()
+    invalidate_account_snapshots(account_id)
 
     return {
         "message": "Case resolved successfully",
@@ -0,0 +1,58 @@
+from fastapi import HTTPException
+
+from app.data.database import DB_POOL_TIMEOUT_SECONDS, get_pool
+from app.data.async_database import get_async_pool
+from app.data.pagination import InvalidCursor, decode_cursor
+from app.core.logging import get_logger
+
+
+logger = get_logger(__name__)
+
+
+def get_db():
+    """
+    FastAPI dependency: borrow a pooled connection for the request.
+
+    The connection is returned to the pool once the response is sent;
+    any transaction left open by the handler is rolled back on return.
+    """
+    # get_pool() opens min_size connections on first use, so it can fail too
+    try:
+        pool = get_pool()
+        conn = pool.getconn()
+    except Exception as exc:
+        logger.error("Database unreachable: %s", exc)
+        raise HTTPException(status_code=503, detail="Database unreachable") from exc
+
+    try:
+        yield conn
+    finally:
+        pool.putconn(conn)
+
+
+async def get_async_db():
+    """
+    FastAPI dependency: borrow an asyncpg connection for the request.
+
+    Handlers are expected to wrap their writes in `conn.transaction()`;
+    asyncpg resets the connection when it is released.
+    """
+    pool = get_async_pool()
+    try:
+        conn = await pool.acquire(timeout=DB_POOL_TIMEOUT_SECONDS)
+    except Exception as exc:
+        logger.error("Database unreachable: %s", exc)
+        raise HTTPException(status_code=503, detail="Database unreachable") from exc
+
+    try:
+        yield conn
+    finally:
+        await pool.release(conn)
+
+
+def parse_cursor(scope: str, token):
+    """Decode a listing's continuation token; a bad token is a 400."""
+    try:
+        return decode_cursor(scope, token)
+    except InvalidCursor as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
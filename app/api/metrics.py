@@ -1,57 +1,136 @@
-from fastapi import APIRouter
-from app.data.database import get_connection
+import datetime
+import os
+import threading
+import time
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import PlainTextResponse
+from app.api.deps import get_db
+from app.core.instrumentation import registry
+from app.data.database import get_pool
+from app.repositories.dashboard_repo import DECISIONS, fetch_dashboard_counters
+from app.risk.shadow import shadow_writer
+from app.audit.writer import audit_writer
+from app.services.metrics_rollup import fetch_rollup_watermark, fetch_timeseries
 
 router = APIRouter(prefix="/metrics", tags=["Metrics"])
 
+METRICS_OVERVIEW_TTL_SECONDS = float(os.getenv("METRICS_OVERVIEW_TTL_SECONDS", 2))
 
-@router.get("/overview")
-def get_overview_metrics():
-    conn = get_connection()
-    cursor = conn.cursor()
+MAX_TIMESERIES_POINTS = 5000
 
-    cursor.execute("SELECT COUNT(*) AS cnt FROM transactions")
-    total_txns = cursor.fetchone()["cnt"]
+_STEP_SECONDS = {"minute": 60, "hour": 3600, "day": 86400}
 
-    cursor.execute("SELECT COUNT(*) AS cnt FROM accounts")
-    total_accounts = cursor.fetchone()["cnt"]
+_overview_lock = threading.Lock()
+_overview_cache = {"value": None, "expires_at": 0.0}
 
-    cursor.execute("""
-        SELECT COUNT(*) AS cnt
-        FROM review_cases
-        WHERE status = 'OPEN'
-    """)
-    open_cases = cursor.fetchone()["cnt"]
 
-    cursor.execute("""
-        SELECT decision, COUNT(*) AS cnt
-        FROM risk_decisions
-        GROUP BY decision
-    """)
-    decision_rows = cursor.fetchall()
+def _runtime_gauges():
+    samples = []
+    for key, value in get_pool().stats().items():
+        if isinstance(value, (int, float)):
+            samples.append(("aegis_db_pool", "Connection pool state", {"stat": key}, value))
+    for key, value in shadow_writer.stats().items():
+        samples.append(("aegis_shadow_writer", "Shadow score writer state", {"stat": key}, int(value)))
+    for key, value in audit_writer.stats().items():
+        samples.append(("aegis_audit_writer", "Write-behind audit writer state", {"stat": key}, int(value)))
+    return samples
 
-    # Ensure stable contract with zeroed defaults
-    decisions = {
-        "ALLOW": 0,
-        "REVIEW": 0,
-        "BLOCK": 0,
-    }
-    for row in decision_rows:
-        decision = row["decision"]
-        count = row["cnt"]
-        if decision in decisions:
-            decisions[decision] = count
 
-    cursor.execute("SELECT COALESCE(AVG(risk_score), 0) AS avg_score FROM risk_decisions;")
-    avg_risk_score = float(cursor.fetchone()["avg_score"] or 0)
+registry.register_collector(_runtime_gauges)
 
-    conn.close()
 
-    return {
-        "total_transactions": total_txns,
-        "total_accounts": total_accounts,
-        "open_cases": open_cases,
+@router.get("", response_class=PlainTextResponse)
+def get_prometheus_metrics():
+    """
+    Prometheus text exposition of the in-process pipeline histograms,
+    SQL round-trip counters and pool gauges.
+    """
+    return PlainTextResponse(
+        registry.render(),
+        media_type="text/plain; version=0.0.4",
+    )
+
+
+@router.get("/overview")
+def get_overview_metrics():
+    """
+    Dashboard totals from the trigger-maintained dashboard_counters table.
+
+    Responses are cached in-process for METRICS_OVERVIEW_TTL_SECONDS, so a
+    poll costs at most one small aggregate per TTL per worker.
+    """
+    now = time.monotonic()
+    with _overview_lock:
+        if _overview_cache["value"] is not None and now < _overview_cache["expires_at"]:
+            return _overview_cache["value"]
+
+    with get_pool().connection() as conn:
+        counters = fetch_dashboard_counters(conn.cursor())
+        conn.rollback()
+
+    # Ensure stable contract with zeroed defaults
+    decisions = {decision: int(counters.get(f"decision:{decision}", 0)) for decision in DECISIONS}
+
+    scored = counters.get("decisions", 0)
+    avg_risk_score = counters.get("risk_score_sum", 0.0) / scored if scored else 0.0
+
+    overview = {
+        "total_transactions": int(counters.get("transactions", 0)),
+        "total_accounts": int(counters.get("accounts", 0)),
+        "open_cases": int(counters.get("open_cases", 0)),
         "decisions": decisions,
         # new contract fields for upgraded console
         "decision_distribution": decisions,
         "avg_risk_score": round(avg_risk_score, 2),
     }
+
+    with _overview_lock:
+        _overview_cache["value"] = overview
+        _overview_cache["expires_at"] = time.monotonic() + METRICS_OVERVIEW_TTL_SECONDS
+    return overview
+
+
+@router.get("/timeseries")
+def get_metrics_timeseries(
+    start: Optional[datetime.datetime] = None,
+    end: Optional[datetime.datetime] = None,
+    granularity: str = "hour",
+    conn=Depends(get_db),
+):
+    """
+    Decision counts, risk-score percentiles and case-open rates per time
+    bucket, read from metrics_rollups only (defaults to the last 24 hours).
+
+    Buckets newer than `watermark` have not been rolled up yet.
+    """
+    if granularity not in _STEP_SECONDS:
+        raise HTTPException(status_code=400, detail="granularity must be minute, hour or day")
+
+    # Stored timestamps are naive UTC
+    if end and end.tzinfo:
+        end = end.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+    if start and start.tzinfo:
+        start = start.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+
+    end = end or datetime.datetime.utcnow()
+    start = start or end - datetime.timedelta(hours=24)
+    if start >= end:
+        raise HTTPException(status_code=400, detail="start must be before end")
+
+    if (end - start).total_seconds() / _STEP_SECONDS[granularity] > MAX_TIMESERIES_POINTS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Range too large for {granularity} buckets (max {MAX_TIMESERIES_POINTS} points)",
+        )
+
+    cursor = conn.cursor()
+    points = fetch_timeseries(cursor, start=start, end=end, granularity=granularity)
+    return {
+        "granularity": granularity,
+        "start": start,
+        "end": end,
+        "watermark": fetch_rollup_watermark(cursor),
+        "points": points,
+    }
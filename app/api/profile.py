@@ -1,14 +1,17 @@
-from fastapi import APIRouter, HTTPException
-from app.data.database import get_connection
+from fastapi import APIRouter, Depends, HTTPException
+from app.api.deps import get_db
 from app.repositories.decision_repo import fetch_risk_trend
+from app.services.account_snapshot import get_account_snapshot
 
 router = APIRouter(prefix="/accounts", tags=["Account Profile"])
 
+PROFILE_SIGNAL_FIELDS = ("signal_type", "signal_value", "description", "created_at")
+PROFILE_TRANSACTION_FIELDS = ("txn_id", "amount", "merchant_category", "location", "txn_timestamp", "status")
+
 
 @router.get("/{account_id}/signals")
-def get_account_signals(account_id: str, limit: int = 50):
+def get_account_signals(account_id: str, limit: int = 50, conn=Depends(get_db)):
     """Return signals used in decisions for explainable risk analysis."""
-    conn = get_connection()
     cursor = conn.cursor()
 
     cursor.execute(
@@ -18,7 +21,6 @@ def get_account_signals(account_id: str, limit: int = 50):
         (account_id,),
     )
     if not cursor.fetchone():
-        conn.close()
         raise HTTPException(status_code=404, detail="Account not found")
 
     cursor.execute(
@@ -33,7 +35,6 @@ def get_account_signals(account_id: str, limit: int = 50):
         (account_id, limit),
     )
     rows = cursor.fetchall()
-    conn.close()
 
     return [
         {
@@ -47,14 +48,11 @@ def get_account_signals(account_id: str, limit: int = 50):
 
 
 @router.get("/{account_id}/risk-trend")
-def get_risk_trend(account_id: str, limit: int = 20):
-    conn = get_connection()
+def get_risk_trend(account_id: str, limit: int = 20, conn=Depends(get_db)):
     cursor = conn.cursor()
 
     trend = fetch_risk_trend(cursor, account_id, limit=limit)
 
-    conn.close()
-
     return [
         {
             "timestamp": row["created_at"],
@@ -66,98 +64,35 @@ def get_risk_trend(account_id: str, limit: int = 20):
 
 
 @router.get("/{account_id}/profile")
-def get_account_profile(account_id: str):
-    conn = get_connection()
-    cursor = conn.cursor()
-
-    # 1) Latest decision ALWAYS (even if account row missing)
-    cursor.execute(
-        """
-        SELECT decision, risk_score, reasons, created_at
-        FROM risk_decisions
-        WHERE account_id = %s
-        ORDER BY created_at DESC
-        LIMIT 1
-        """,
-        (account_id,),
-    )
-    latest_decision = cursor.fetchone()
-
-    # 2) Account row (may be missing)
-    cursor.execute(
-        """
-        SELECT account_id, user_id, account_type, balance, status, created_at
-        FROM accounts
-        WHERE account_id = %s
-        LIMIT 1
-        """,
-        (account_id,),
-    )
-    acct = cursor.fetchone()
-
-    # ✅ If account missing but decision exists → still return decision
-    if not acct:
-        conn.close()
-        if latest_decision:
-            return {
-                "account": None,
-                "latest_decision": dict(latest_decision),
-                "recent_signals": [],
-                "recent_transactions": [],
-                "open_case": None,
-                "warning": "Orphan account_id: decision exists but account row missing",
-            }
-        from fastapi import HTTPException  # local import to avoid circulars
+def get_account_profile(account_id: str, conn=Depends(get_db)):
+    """
+    Account profile from the cached account snapshot (one query on a miss).
+    """
+    snapshot = get_account_snapshot(conn.cursor(), account_id)
+    if not snapshot:
         raise HTTPException(status_code=404, detail="Account not found")
 
-    user_id = acct["user_id"]
-
-    # 3) Signals (user-level)
-    cursor.execute(
-        """
-        SELECT signal_type, signal_value, description, created_at
-        FROM signals
-        WHERE user_id = %s
-        ORDER BY created_at DESC
-        LIMIT 10
-        """,
-        (user_id,),
-    )
-    signals = cursor.fetchall()
-
-    # 4) Transactions (account-level)
-    cursor.execute(
-        """
-        SELECT txn_id, amount, merchant_category, location, txn_timestamp, status
-        FROM transactions
-        WHERE account_id = %s
-        ORDER BY txn_timestamp DESC
-        LIMIT 10
-        """,
-        (account_id,),
-    )
-    txns = cursor.fetchall()
-
-    # 5) Open case
-    cursor.execute(
-        """
-        SELECT case_id, decision, risk_score, status, created_at
-        FROM review_cases
-        WHERE account_id = %s
-          AND status = 'OPEN'
-        ORDER BY created_at DESC
-        LIMIT 1
-        """,
-        (account_id,),
-    )
-    open_case = cursor.fetchone()
-
-    conn.close()
+    # ✅ If account missing but decision exists → still return decision
+    if not snapshot["account"]:
+        return {
+            "account": None,
+            "latest_decision": snapshot["latest_decision"],
+            "recent_signals": [],
+            "recent_transactions": [],
+            "open_case": None,
+            "warning": "Orphan account_id: decision exists but account row missing",
+        }
 
     return {
-        "account": dict(acct),
-        "latest_decision": dict(latest_decision) if latest_decision else None,
-        "recent_signals": [dict(s) for s in signals],
-        "recent_transactions": [dict(t) for t in txns],
-        "open_case": dict(open_case) if open_case else None,
+        "account": snapshot["account"],
+        "latest_decision": snapshot["latest_decision"],
+        "recent_signals": [
+            {field: s.get(field) for field in PROFILE_SIGNAL_FIELDS}
+            for s in snapshot["recent_signals"]
+        ],
+        "recent_transactions": [
+            {field: t.get(field) for field in PROFILE_TRANSACTION_FIELDS}
+            for t in snapshot["recent_transactions"]
+        ],
+        "open_case": snapshot["open_case"],
     }
@@ -1,5 +1,8 @@
-from fastapi import APIRouter
-from app.data.database import get_connection
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query
+from app.api.deps import get_db, parse_cursor
+from app.data.pagination import fetch_keyset_page
 
 router = APIRouter()
 
@@ -16,19 +19,28 @@ def health():
 # Recent Signals
 # -----------------------------
 @router.get("/signals/recent")
-def recent_signals(limit: int = 20):
-    conn = get_connection()
-    cursor = conn.cursor()
-
-    cursor.execute("""
-        SELECT signal_id, user_id, signal_type, signal_value, description, created_at
-        FROM signals
-        ORDER BY created_at DESC
-        LIMIT %s
-    """, (limit,))
-
-    rows = cursor.fetchall()
-    conn.close()
+def recent_signals(
+    limit: int = Query(20, ge=1, le=500),
+    cursor: Optional[str] = None,
+    conn=Depends(get_db),
+):
+    after = parse_cursor("recent_signals", cursor)
+
+    rows, next_cursor = fetch_keyset_page(
+        conn.cursor(),
+        scope="recent_signals",
+        select_sql="""
+            SELECT signal_id, user_id, signal_type, signal_value, description, created_at
+            FROM signals
+        """,
+        conditions=[],
+        params=[],
+        created_column="created_at",
+        id_column="signal_id",
+        descending=True,
+        after=after,
+        limit=limit,
+    )
 
     return {
         "count": len(rows),
@@ -42,7 +54,8 @@ def recent_signals(limit: int = 20):
                 "created_at": r["created_at"],
             }
             for r in rows
-        ]
+        ],
+        "next_cursor": next_cursor,
     }
 
 
@@ -50,19 +63,28 @@ def recent_signals(limit: int = 20):
 # Latest Decisions
 # -----------------------------
 @router.get("/decisions/latest")
-def latest_decisions(limit: int = 10):
-    conn = get_connection()
-    cursor = conn.cursor()
-
-    cursor.execute("""
-        SELECT decision_id, user_id, account_id, risk_score, decision, reasons, created_at
-        FROM risk_decisions
-        ORDER BY created_at DESC
-        LIMIT %s
-    """, (limit,))
-
-    rows = cursor.fetchall()
-    conn.close()
+def latest_decisions(
+    limit: int = Query(10, ge=1, le=500),
+    cursor: Optional[str] = None,
+    conn=Depends(get_db),
+):
+    after = parse_cursor("latest_decisions", cursor)
+
+    rows, next_cursor = fetch_keyset_page(
+        conn.cursor(),
+        scope="latest_decisions",
+        select_sql="""
+            SELECT decision_id, user_id, account_id, risk_score, decision, reasons, created_at
+            FROM risk_decisions
+        """,
+        conditions=[],
+        params=[],
+        created_column="created_at",
+        id_column="decision_id",
+        descending=True,
+        after=after,
+        limit=limit,
+    )
 
     return {
         "count": len(rows),
@@ -77,7 +99,8 @@ def latest_decisions(limit: int = 10):
                 "created_at": r["created_at"],
             }
             for r in rows
-        ]
+        ],
+        "next_cursor": next_cursor,
     }
 
 
@@ -85,8 +108,7 @@ def latest_decisions(limit: int = 10):
 # Account Risk Lookup
 # -----------------------------
 @router.get("/accounts/{account_id}/decision")
-def account_decision(account_id: str):
-    conn = get_connection()
+def account_decision(account_id: str, conn=Depends(get_db)):
     cursor = conn.cursor()
 
     cursor.execute("""
@@ -98,7 +120,6 @@ def account_decision(account_id: str):
     """, (account_id,))
 
     row = cursor.fetchone()
-    conn.close()
 
     if not row:
         return {"error": "No decision found for this account"}
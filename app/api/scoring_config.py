@@ -0,0 +1,215 @@
+from fastapi import APIRouter, Depends, HTTPException
+from pydantic import BaseModel
+from typing import Dict, Optional
+
+from app.api.deps import get_db
+from app.audit.logger import log_event
+from app.repositories.scoring_config_repo import (
+    activate_scoring_config,
+    fetch_active_scoring_config,
+    insert_scoring_config,
+    list_scoring_configs,
+    set_scoring_config_shadow,
+)
+from app.risk.shadow import shadow_writer
+from app.risk.scoring_config import (
+    ScoringConfig,
+    invalidate_scoring_config,
+    scoring_config_cache_info,
+)
+
+
+router = APIRouter(prefix="/scoring-config", tags=["Scoring Config"])
+
+
+class ScoringConfigRequest(BaseModel):
+    weights: Dict[str, float]
+    review_threshold: float
+    block_threshold: float
+    note: Optional[str] = None
+    activate: bool = False
+    shadow: bool = False
+
+
+def _activate(cursor, version: int):
+    config = activate_scoring_config(cursor, version)
+    if not config:
+        raise HTTPException(status_code=404, detail="Scoring config version not found")
+
+    log_event(
+        cursor,
+        event_type="SCORING_CONFIG_ACTIVATED",
+        entity_type="SCORING_CONFIG",
+        entity_id="active",
+        metadata=ScoringConfig.from_row(config).to_dict(),
+    )
+    return config
+
+
+@router.get("")
+def get_active_scoring_config(conn=Depends(get_db)):
+    """
+    Active weight set in the database plus what this worker has cached.
+    """
+    cursor = conn.cursor()
+    return {
+        "active": fetch_active_scoring_config(cursor),
+        "cache": scoring_config_cache_info(),
+    }
+
+
+@router.get("/versions")
+def get_scoring_config_versions(limit: int = 50, conn=Depends(get_db)):
+    cursor = conn.cursor()
+    versions = list_scoring_configs(cursor, limit=limit)
+    return {"returned": len(versions), "versions": versions}
+
+
+@router.post("")
+def create_scoring_config(req: ScoringConfigRequest, conn=Depends(get_db)):
+    """
+    Store a new weight set version, optionally activating it.
+    """
+    if req.review_threshold > req.block_threshold:
+        raise HTTPException(status_code=400, detail="review_threshold must not exceed block_threshold")
+
+    if any(weight < 0 for weight in req.weights.values()):
+        raise HTTPException(status_code=400, detail="weights must be non-negative")
+
+    cursor = conn.cursor()
+    config = insert_scoring_config(
+        cursor,
+        weights=req.weights,
+        review_threshold=req.review_threshold,
+        block_threshold=req.block_threshold,
+        note=req.note,
+    )
+    if req.activate:
+        config = _activate(cursor, config["version"])
+    elif req.shadow:
+        config = set_scoring_config_shadow(cursor, config["version"], True)
+    conn.commit()
+
+    if req.activate or req.shadow:
+        invalidate_scoring_config()
+    return config
+
+
+@router.post("/{version}/activate")
+def activate_scoring_config_version(version: int, conn=Depends(get_db)):
+    """
+    Activate a stored version (also used to roll back).
+
+    Other workers pick it up via LISTEN/NOTIFY, or within
+    SCORING_CONFIG_TTL_SECONDS when not listening.
+    """
+    cursor = conn.cursor()
+    config = _activate(cursor, version)
+    conn.commit()
+
+    invalidate_scoring_config()
+    return config
+
+
+@router.post("/{version}/shadow")
+def enable_shadow_scoring(version: int, conn=Depends(get_db)):
+    """
+    Score live traffic with this version alongside the active one.
+    """
+    cursor = conn.cursor()
+    config = set_scoring_config_shadow(cursor, version, True)
+    if not config:
+        raise HTTPException(status_code=404, detail="Scoring config version not found")
+    conn.commit()
+
+    invalidate_scoring_config()
+    return config
+
+
+@router.delete("/{version}/shadow")
+def disable_shadow_scoring(version: int, conn=Depends(get_db)):
+    cursor = conn.cursor()
+    config = set_scoring_config_shadow(cursor, version, False)
+    if not config:
+        raise HTTPException(status_code=404, detail="Scoring config version not found")
+    conn.commit()
+
+    invalidate_scoring_config()
+    return config
+
+
+@router.get("/shadow/compare")
+def compare_shadow_scoring(hours: int = 24, conn=Depends(get_db)):
+    """
+    Decision-flip rates of each shadow candidate against the active config.
+
+    A flip is a transaction where the candidate's decision differs from the
+    one actually made; `transitions` breaks flips down by direction.
+    """
+    if hours <= 0:
+        raise HTTPException(status_code=400, detail="hours must be positive")
+
+    cursor = conn.cursor()
+    cursor.execute(
+        """
+        SELECT candidate_version,
+               active_decision,
+               candidate_decision,
+               COUNT(*) AS n,
+               AVG(candidate_score - active_score) AS avg_score_delta
+        FROM shadow_scores
+        WHERE created_at >= NOW() - (%s * INTERVAL '1 hour')
+        GROUP BY candidate_version, active_decision, candidate_decision
+        ORDER BY candidate_version
+        """,
+        (hours,),
+    )
+
+    candidates = {}
+    for row in cursor.fetchall():
+        version = row["candidate_version"]
+        entry = candidates.setdefault(
+            version,
+            {
+                "candidate_version": version,
+                "active_versions": [],
+                "scored": 0,
+                "flips": 0,
+                "transitions": {},
+                "_delta_sum": 0.0,
+            },
+        )
+        n = int(row["n"])
+        entry["scored"] += n
+        entry["_delta_sum"] += float(row["avg_score_delta"] or 0.0) * n
+        if row["active_decision"] != row["candidate_decision"]:
+            entry["flips"] += n
+            key = f"{row['active_decision']}->{row['candidate_decision']}"
+            entry["transitions"][key] = entry["transitions"].get(key, 0) + n
+
+    cursor.execute(
+        """
+        SELECT candidate_version, ARRAY_AGG(DISTINCT active_version) AS active_versions
+        FROM shadow_scores
+        WHERE created_at >= NOW() - (%s * INTERVAL '1 hour')
+        GROUP BY candidate_version
+        """,
+        (hours,),
+    )
+    for row in cursor.fetchall():
+        if row["candidate_version"] in candidates:
+            candidates[row["candidate_version"]]["active_versions"] = sorted(row["active_versions"] or [])
+
+    results = []
+    for entry in candidates.values():
+        scored = entry["scored"]
+        delta_sum = entry.pop("_delta_sum")
+        entry["flip_rate"] = round(entry["flips"] / scored, 4) if scored else 0.0
+        entry["avg_score_delta"] = round(delta_sum / scored, 2) if scored else 0.0
+        results.append(entry)
+
+    return {
+        "window_hours": hours,
+        "candidates": results,
+        "writer": shadow_writer.stats(),
+    }
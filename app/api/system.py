@@ -1,10 +1,15 @@
-from fastapi import APIRouter
-import json
+from fastapi import APIRouter, Depends
 
-from app.data.database import get_connection
+from app.api.deps import get_db
+from app.data.database import get_pool
+from app.data.async_database import async_pool_stats
+from app.core.config import AUDIT_WRITE_BEHIND
 from app.core.logging import get_logger
-from app.audit.hash_utils import compute_event_hash
+from app.audit.integrity import fetch_audit_totals, verify_audit_chain
 from app.services.pipeline import RiskPipeline
+from app.services.account_snapshot import invalidate_account_snapshots
+from app.services.outbox import OUTBOX_MAX_ATTEMPTS
+from app.repositories.outbox_repo import fetch_outbox_backlog
 
 
 router = APIRouter(prefix="/system", tags=["System"])
@@ -25,11 +30,16 @@ def deep_health():
         "tables_status": {},
         "audit_chain_valid": True,
         "total_audit_events": 0,
+        "verified_audit_events": 0,
         "last_audit_timestamp": None,
+        "db_pool": None,
+        "async_db_pool": async_pool_stats(),
+        "outbox": None,
     }
 
     try:
-        conn = get_connection()
+        pool = get_pool()
+        conn = pool.getconn()
     except Exception as exc:
         logger.error("Deep health: database unreachable: %s", exc)
         health["ok"] = False
@@ -50,7 +60,17 @@ def deep_health():
             "signals",
             "risk_decisions",
             "audit_logs",
+            "audit_chain_heads",
+            "audit_verification_checkpoints",
+            "scoring_configs",
+            "shadow_scores",
             "review_cases",
+            "dashboard_counters",
+            "account_txn_counts",
+            "metrics_rollups",
+            "metrics_rollup_state",
+            "outbox",
+            "idempotency_keys",
         ]
         cursor.execute(
             """
@@ -64,66 +84,37 @@ def deep_health():
             health["tables"][t] = t in existing
             health["tables_status"][t] = t in existing
 
-        # Audit chain verification
-        cursor.execute(
-            """
-            SELECT audit_id,
-                   event_type,
-                   entity_type,
-                   entity_id,
-                   metadata,
-                   prev_hash,
-                   event_hash,
-                   created_at
-            FROM audit_logs
-            ORDER BY created_at ASC
-            """
-        )
-        rows = cursor.fetchall()
-        health["total_audit_events"] = len(rows)
-        if rows:
-            health["last_audit_timestamp"] = rows[-1]["created_at"]
-
-        audit_chain_valid = True
-        for row in rows:
-            prev_hash = row["prev_hash"] or "GENESIS"
-            raw_metadata = row["metadata"]
-            metadata = json.loads(raw_metadata) if raw_metadata else {}
-            recomputed = compute_event_hash(
-                prev_hash=prev_hash,
-                event_type=row["event_type"],
-                entity_type=row["entity_type"],
-                entity_id=row["entity_id"],
-                metadata=metadata,
+        # Audit chain verification (read-only, from the last checkpoint)
+        result = verify_audit_chain(conn, persist=False)
+        totals = fetch_audit_totals(cursor)
+        health["total_audit_events"] = totals["total_events"]
+        health["verified_audit_events"] = result["verified_events"]
+        health["last_audit_timestamp"] = totals["last_event_time"]
+
+        audit_chain_valid = result["audit_chain_valid"]
+        if not audit_chain_valid:
+            logger.error(
+                "Audit chain mismatch for audit_id=%s", result["first_invalid_audit_id"]
             )
-            if recomputed != row["event_hash"]:
-                audit_chain_valid = False
-                logger.error(
-                    "Audit chain mismatch for audit_id=%s", row["audit_id"]
-                )
-                break
 
         health["audit_chain_valid"] = audit_chain_valid
         if not audit_chain_valid:
             health["ok"] = False
 
+        if health["tables"]["outbox"]:
+            health["outbox"] = fetch_outbox_backlog(cursor, max_attempts=OUTBOX_MAX_ATTEMPTS)
+
+        health["db_pool"] = pool.stats()
         return health
     finally:
-        conn.close()
+        pool.putconn(conn)
 
 
 @router.post("/test-transaction")
-def test_transaction():
+def test_transaction(conn=Depends(get_db)):
     """
     Generate and evaluate a synthetic transaction for a random active account.
     """
-    try:
-        conn = get_connection()
-    except Exception as exc:
-        logger.error("Test transaction: database unreachable: %s", exc)
-        from fastapi import HTTPException
-        raise HTTPException(status_code=503, detail="Database unreachable") from exc
-
     try:
         cursor = conn.cursor()
         cursor.execute(
@@ -146,25 +137,26 @@ def test_transaction():
         amount = 100.0
         device_id = "test_device_system"
 
-        pipeline = RiskPipeline(conn)
+        pipeline = RiskPipeline(conn, audit_write_behind=AUDIT_WRITE_BEHIND)
         result = pipeline.process_transaction(
             account_id=account_id,
             amount=amount,
             device_id=device_id,
         )
         conn.commit()
-
-        logger.info(
-            "Test transaction processed for account_id=%s decision=%s score=%.2f",
-            account_id,
-            result.get("decision"),
-            result.get("risk_score", 0.0),
-        )
-
-        return result
     except Exception:
         conn.rollback()
         raise
-    finally:
-        conn.close()
+
+    pipeline.after_commit()
+    invalidate_account_snapshots(account_id)
+
+    logger.info(
+        "Test transaction processed for account_id=%s decision=%s score=%.2f",
+        account_id,
+        result.get("decision"),
+        result.get("risk_score", 0.0),
+    )
+
+    return result
 
@@ -1,10 +1,24 @@
-from fastapi import APIRouter, HTTPException
-import json
+from fastapi import APIRouter, Depends, Header, HTTPException, Response
+import time
 import traceback
+from typing import List, Optional
 from pydantic import BaseModel
 
-from app.data.database import get_connection
+from app.api.deps import get_async_db, get_db
+from app.core.config import AUDIT_WRITE_BEHIND, INGESTION_DRIVER, PIPELINE_OUTBOX
 from app.services.pipeline import RiskPipeline
+from app.services.async_pipeline import AsyncRiskPipeline
+from app.repositories.aio.transaction_repo import update_transaction_status
+from app.repositories.account_repo import reserve_balance
+from app.repositories.aio import account_repo as aio_account_repo
+from app.repositories.decision_repo import fetch_decision_for_transaction
+from app.services.account_snapshot import invalidate_account_snapshots
+from app.services.idempotency import (
+    IdempotencyKeyInProgress,
+    IdempotencyKeyInvalid,
+    IdempotencyKeyMismatch,
+    IdempotentRequest,
+)
 from app.core.logging import get_logger
 
 
@@ -12,6 +26,8 @@ router = APIRouter(prefix="/transactions", tags=["Transactions"])
 
 logger = get_logger(__name__)
 
+MAX_BATCH_SIZE = 5000
+
 
 class TransactionRequest(BaseModel):
     account_id: str
@@ -19,13 +35,45 @@ class TransactionRequest(BaseModel):
     device_id: str
 
 
-@router.post("")
-def ingest_transaction(payload: TransactionRequest):
+class BatchTransactionRequest(BaseModel):
+    transactions: List[TransactionRequest]
+
+
+IDEMPOTENCY_ERRORS = (IdempotencyKeyInvalid, IdempotencyKeyMismatch, IdempotencyKeyInProgress)
+
+# Set on responses replayed from a stored Idempotency-Key result
+REPLAYED_HEADER = "Idempotent-Replayed"
+
+
+def _idempotency_http_error(exc: Exception) -> HTTPException:
+    if isinstance(exc, IdempotencyKeyMismatch):
+        return HTTPException(
+            status_code=422,
+            detail="Idempotency-Key was already used with a different request body",
+        )
+    if isinstance(exc, IdempotencyKeyInProgress):
+        return HTTPException(
+            status_code=409,
+            detail="A request with this Idempotency-Key is still in progress; retry later",
+        )
+    return HTTPException(status_code=400, detail=str(exc))
+
+
+def ingest_transaction(
+    payload: TransactionRequest,
+    response: Response,
+    timings: bool = False,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
+    conn=Depends(get_db),
+):
     """
     Real-time transaction ingestion endpoint.
-    """
-    conn = get_connection()
 
+    `?timings=true` adds the per-stage pipeline breakdown to the response.
+    With an Idempotency-Key header, a retry of a completed request returns
+    the stored result (marked Idempotent-Replayed) without re-running the
+    pipeline; a retry racing the original waits for it to finish.
+    """
     try:
         cursor = conn.cursor()
 
@@ -44,6 +92,20 @@ def ingest_transaction(payload: TransactionRequest):
                 detail="device_id cannot be empty",
             )
 
+        # Replays are answered before the balance check: the original
+        # request may have spent the balance being checked
+        idempotent = None
+        if idempotency_key is not None:
+            try:
+                idempotent = IdempotentRequest(idempotency_key, payload.model_dump())
+                replay = idempotent.begin(cursor)
+            except IDEMPOTENCY_ERRORS as exc:
+                raise _idempotency_http_error(exc) from exc
+            if replay is not None:
+                conn.rollback()
+                response.headers[REPLAYED_HEADER] = "true"
+                return replay
+
         # Validate account exists first
         cursor.execute(
             """
@@ -63,7 +125,8 @@ def ingest_transaction(payload: TransactionRequest):
                 detail=f"Account not found for account_id={payload.account_id}",
             )
 
-        # Guardrail: prevent overdraft before entering pipeline
+        # Fast rejection before the pipeline; the conditional debit below is
+        # what actually prevents an overdraft
         current_balance = float(account.get("balance") or 0.0)
         if payload.amount > current_balance:
             raise HTTPException(
@@ -71,29 +134,19 @@ def ingest_transaction(payload: TransactionRequest):
                 detail="Insufficient balance",
             )
 
-        pipeline = RiskPipeline(conn)
+        pipeline = RiskPipeline(conn, audit_write_behind=AUDIT_WRITE_BEHIND, outbox=PIPELINE_OUTBOX)
 
         result = pipeline.process_transaction(
             account_id=payload.account_id,
             amount=payload.amount,
             device_id=payload.device_id,
+            timings=timings,
         )
 
         # Balance management based on decision outcome
         decision = result.get("decision")
         txn_id = result.get("transaction_id")
 
-        if decision == "ALLOW":
-            # Deduct balance only for allowed transactions
-            cursor.execute(
-                """
-                UPDATE accounts
-                SET balance = balance - %s
-                WHERE account_id = %s
-                """,
-                (payload.amount, payload.account_id),
-            )
-
         # Persist transaction status aligned with decision
         if txn_id and decision:
             status_value = "success" if decision == "ALLOW" else decision.lower()
@@ -106,17 +159,20 @@ def ingest_transaction(payload: TransactionRequest):
                 (status_value, txn_id),
             )
 
-        conn.commit()
-
-        logger.info(
-            "Transaction ingested account_id=%s amount=%.2f decision=%s score=%.2f",
-            payload.account_id,
-            payload.amount,
-            result.get("decision"),
-            result.get("risk_score", 0.0),
-        )
+        if decision == "ALLOW":
+            # Deduct balance only for allowed transactions. Last write before
+            # commit, so the account row is locked only briefly; a concurrent
+            # spend that got there first fails the request and rolls it back.
+            if reserve_balance(cursor, account_id=payload.account_id, amount=payload.amount) is None:
+                raise HTTPException(
+                    status_code=400,
+                    detail="Insufficient balance",
+                )
+
+        if idempotent is not None:
+            idempotent.complete(cursor, result)
 
-        return result
+        conn.commit()
 
     except HTTPException:
         conn.rollback()
@@ -133,92 +189,264 @@ def ingest_transaction(payload: TransactionRequest):
             detail=str(e),
         )
 
-    finally:
-        conn.close()
-
-
-@router.get("/{txn_id}/explain")
-def explain_transaction(txn_id: str):
+    # Committed: post-commit hooks must not turn the response into an error
+    if idempotent is not None:
+        idempotent.remember(result)
+    pipeline.after_commit()
+    invalidate_account_snapshots(payload.account_id)
+
+    logger.info(
+        "Transaction ingested account_id=%s amount=%.2f decision=%s score=%.2f",
+        payload.account_id,
+        payload.amount,
+        result.get("decision"),
+        result.get("risk_score", 0.0),
+    )
+
+    return result
+
+
+async def ingest_transaction_async(
+    payload: TransactionRequest,
+    response: Response,
+    timings: bool = False,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
+    conn=Depends(get_async_db),
+):
     """
-    Explainable risk view for a transaction.
+    Real-time transaction ingestion endpoint (asyncpg driver).
+
+    Same validation, idempotency, pipeline and settlement as
+    ingest_transaction, without occupying a threadpool worker while waiting
+    on the database.
     """
-    conn = get_connection()
+    if payload.amount <= 0:
+        raise HTTPException(
+            status_code=400,
+            detail="Amount must be positive",
+        )
+
+    if not payload.device_id or not payload.device_id.strip():
+        raise HTTPException(
+            status_code=400,
+            detail="device_id cannot be empty",
+        )
+
+    idempotent = None
+    if idempotency_key is not None:
+        try:
+            idempotent = IdempotentRequest(idempotency_key, payload.model_dump())
+        except IDEMPOTENCY_ERRORS as exc:
+            raise _idempotency_http_error(exc) from exc
 
     try:
-        cursor = conn.cursor()
+        async with conn.transaction():
+            if idempotent is not None:
+                try:
+                    replay = await idempotent.begin_async(conn)
+                except IDEMPOTENCY_ERRORS as exc:
+                    raise _idempotency_http_error(exc) from exc
+                if replay is not None:
+                    response.headers[REPLAYED_HEADER] = "true"
+                    return replay
+
+            account = await conn.fetchrow(
+                """
+                SELECT account_id, balance
+                FROM accounts
+                WHERE account_id = $1
+                LIMIT 1
+                """,
+                payload.account_id,
+            )
 
-        cursor.execute(
-            """
-            SELECT txn_id, account_id
-            FROM transactions
-            WHERE txn_id = %s
-            LIMIT 1
-            """,
-            (txn_id,),
-        )
+            if not account:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Account not found for account_id={payload.account_id}",
+                )
+
+            current_balance = float(account["balance"] or 0.0)
+            if payload.amount > current_balance:
+                raise HTTPException(
+                    status_code=400,
+                    detail="Insufficient balance",
+                )
+
+            pipeline = AsyncRiskPipeline(
+                conn, audit_write_behind=AUDIT_WRITE_BEHIND, outbox=PIPELINE_OUTBOX
+            )
 
-        txn = cursor.fetchone()
+            result = await pipeline.process_transaction(
+                account_id=payload.account_id,
+                amount=payload.amount,
+                device_id=payload.device_id,
+                timings=timings,
+            )
 
-        if not txn:
-            raise HTTPException(status_code=404, detail="Transaction not found")
+            decision = result.get("decision")
+            txn_id = result.get("transaction_id")
 
-        cursor.execute(
-            """
-            SELECT metadata
-            FROM audit_logs
-            WHERE event_type = 'DECISION_MADE'
-            AND (metadata::jsonb ->> 'transaction_id') = %s
-            ORDER BY created_at DESC
-            LIMIT 1
-            """,
-            (txn_id,),
+            if txn_id and decision:
+                status_value = "success" if decision == "ALLOW" else decision.lower()
+                await update_transaction_status(conn, txn_id=txn_id, status=status_value)
+
+            if decision == "ALLOW":
+                reserved = await aio_account_repo.reserve_balance(
+                    conn, account_id=payload.account_id, amount=payload.amount
+                )
+                if reserved is None:
+                    raise HTTPException(
+                        status_code=400,
+                        detail="Insufficient balance",
+                    )
+
+            if idempotent is not None:
+                await idempotent.complete_async(conn, result)
+
+    except HTTPException:
+        raise
+
+    except Exception as e:
+        logger.error("Transaction processing failed")
+        traceback.print_exc()
+
+        raise HTTPException(
+            status_code=500,
+            detail=str(e),
         )
 
-        row = cursor.fetchone()
+    if idempotent is not None:
+        idempotent.remember(result)
+    await pipeline.after_commit()
+    invalidate_account_snapshots(payload.account_id)
 
-        if not row:
-            raise HTTPException(
-                status_code=404,
-                detail="No explanation found for transaction",
-            )
+    logger.info(
+        "Transaction ingested account_id=%s amount=%.2f decision=%s score=%.2f",
+        payload.account_id,
+        payload.amount,
+        result.get("decision"),
+        result.get("risk_score", 0.0),
+    )
+
+    return result
 
-        metadata = json.loads(row["metadata"]) if row["metadata"] else {}
 
-        decision = metadata.get("decision")
-        risk_score = metadata.get("risk_score")
+# POST /transactions is served by the driver selected with INGESTION_DRIVER
+router.post("")(
+    ingest_transaction_async if INGESTION_DRIVER == "asyncpg" else ingest_transaction
+)
+
+
+@router.post("/batch")
+def ingest_transaction_batch(payload: BatchTransactionRequest, conn=Depends(get_db)):
+    """
+    Bulk transaction ingestion.
 
-        raw_signals = metadata.get("signals") or []
-        breakdown = metadata.get("signal_breakdown") or []
+    Runs RiskPipeline.process_batch: decisions are identical to posting the
+    items one by one to POST /transactions, in order. Invalid items are
+    reported per index and do not fail the batch.
+    """
+    items = payload.transactions
 
-        desc_by_type = {}
-        for s in raw_signals:
-            if isinstance(s, dict) and "type" in s:
-                desc_by_type[s["type"]] = s.get("description")
+    if not items:
+        raise HTTPException(status_code=400, detail="transactions cannot be empty")
 
-        signals_out = []
+    if len(items) > MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Batch size exceeds limit of {MAX_BATCH_SIZE}",
+        )
 
-        for s in breakdown:
-            if not isinstance(s, dict):
-                continue
+    started_at = time.monotonic()
 
-            t = s.get("type")
+    results = [None] * len(items)
+    accepted = []
+    accepted_index = []
 
-            signals_out.append(
+    for index, item in enumerate(items):
+        if item.amount <= 0:
+            results[index] = {"index": index, "error": "Amount must be positive"}
+        elif not item.device_id or not item.device_id.strip():
+            results[index] = {"index": index, "error": "device_id cannot be empty"}
+        else:
+            accepted.append(
                 {
-                    "type": t,
-                    "value": s.get("value"),
-                    "weight": s.get("weight"),
-                    "contribution": s.get("contribution"),
-                    "description": desc_by_type.get(t),
+                    "account_id": item.account_id,
+                    "amount": item.amount,
+                    "device_id": item.device_id,
                 }
             )
+            accepted_index.append(index)
+
+    try:
+        pipeline = RiskPipeline(conn, audit_write_behind=AUDIT_WRITE_BEHIND)
+        batch_results = pipeline.process_batch(accepted, enforce_balance=True)
+        conn.commit()
+    except Exception as e:
+        conn.rollback()
+
+        logger.error("Batch transaction processing failed")
+        traceback.print_exc()
+
+        raise HTTPException(
+            status_code=500,
+            detail=str(e),
+        )
+
+    pipeline.after_commit()
+    invalidate_account_snapshots(*{item["account_id"] for item in accepted})
+
+    for index, result in zip(accepted_index, batch_results):
+        result["index"] = index
+        results[index] = result
+
+    elapsed_s = time.monotonic() - started_at
+    processed = sum(1 for r in results if "error" not in r)
+
+    logger.info(
+        "Batch ingested size=%d processed=%d elapsed_ms=%.2f",
+        len(items),
+        processed,
+        elapsed_s * 1000.0,
+    )
 
-        return {
-            "txn_id": txn_id,
-            "risk_score": risk_score,
-            "decision": decision,
-            "signals": signals_out,
-        }
+    return {
+        "batch_size": len(items),
+        "processed": processed,
+        "rejected": len(items) - processed,
+        "elapsed_ms": round(elapsed_s * 1000.0, 2),
+        "throughput_tps": round(processed / elapsed_s, 2) if elapsed_s > 0 else None,
+        "results": results,
+    }
+
+
+@router.get("/{txn_id}/explain")
+def explain_transaction(txn_id: str, conn=Depends(get_db)):
+    """
+    Explainable risk view for a transaction.
+
+    Reads the decision linked to the transaction (risk_decisions.txn_id);
+    decisions made before the link existed are filled in by
+    scripts/backfill_decision_txn_links.py.
+    """
+    cursor = conn.cursor()
+
+    row = fetch_decision_for_transaction(cursor, txn_id)
+
+    if not row:
+        raise HTTPException(status_code=404, detail="Transaction not found")
+
+    if not row["decision_id"]:
+        raise HTTPException(
+            status_code=404,
+            detail="No explanation found for transaction",
+        )
 
-    finally:
-        conn.close()
\ No newline at end of file
+    return {
+        "txn_id": txn_id,
+        "risk_score": row["risk_score"],
+        "decision": row["decision"],
+        "scoring_config_version": row["scoring_config_version"],
+        "signals": row["explanation"] or [],
+    }
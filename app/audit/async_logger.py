@@ -0,0 +1,112 @@
+import uuid
+
+from app.audit.hash_utils import compute_event_hash, encode_metadata
+from app.audit.logger import _head_cache
+
+
+# asyncpg counterparts of logger._LOCK_HEAD_SQL / logger._APPEND_SQL
+# ($n placeholders instead of pyformat; statements are otherwise identical).
+_LOCK_HEAD_SQL = """
+    INSERT INTO audit_chain_heads (entity_type, entity_id, event_hash, updated_at)
+    SELECT $1,
+           $2,
+           COALESCE(last.event_hash, 'GENESIS'),
+           last.created_at
+    FROM (SELECT 1) AS seed
+    LEFT JOIN LATERAL (
+        SELECT event_hash, created_at
+        FROM audit_logs
+        WHERE entity_type = $1
+          AND entity_id = $2
+          AND event_hash IS NOT NULL
+        ORDER BY created_at DESC
+        LIMIT 1
+    ) AS last ON TRUE
+    ON CONFLICT (entity_type, entity_id)
+    DO UPDATE SET updated_at = audit_chain_heads.updated_at
+    RETURNING event_hash
+"""
+
+_APPEND_SQL = """
+    WITH head AS (
+        UPDATE audit_chain_heads
+        SET event_hash = $8,
+            updated_at = GREATEST(
+                clock_timestamp() AT TIME ZONE 'UTC',
+                updated_at + INTERVAL '1 microsecond'
+            )
+        WHERE entity_type = $3
+          AND entity_id = $4
+          AND event_hash = $7
+        RETURNING updated_at
+    )
+    INSERT INTO audit_logs (
+        audit_id,
+        event_type,
+        entity_type,
+        entity_id,
+        metadata,
+        metadata_raw,
+        prev_hash,
+        event_hash,
+        created_at
+    )
+    SELECT $1, $2, $3, $4, $5::jsonb, $6, $7, $8, head.updated_at
+    FROM head
+"""
+
+
+async def _append(conn, params: dict, prev_hash: str) -> bool:
+    params["prev_hash"] = prev_hash
+    params["event_hash"] = compute_event_hash(
+        prev_hash=prev_hash,
+        event_type=params["event_type"],
+        entity_type=params["entity_type"],
+        entity_id=params["entity_id"],
+        metadata=params["metadata_obj"],
+    )
+    status = await conn.execute(
+        _APPEND_SQL,
+        params["audit_id"],
+        params["event_type"],
+        params["entity_type"],
+        params["entity_id"],
+        params["metadata"],
+        params["metadata_raw"],
+        params["prev_hash"],
+        params["event_hash"],
+    )
+    # Command tag is "INSERT 0 <rows>"
+    return status.endswith(" 1")
+
+
+async def log_event(conn, event_type: str, entity_type: str, entity_id, metadata: dict):
+    """
+    asyncpg version of app.audit.logger.log_event.
+
+    Same hash inputs, same chain-head compare-and-swap and the same head
+    cache, so events appended through either driver form one chain.
+    """
+    entity_id = str(entity_id)
+    key = (entity_type, entity_id)
+
+    metadata_text, metadata_raw = encode_metadata(metadata)
+    params = {
+        "audit_id": str(uuid.uuid4()),
+        "event_type": event_type,
+        "entity_type": entity_type,
+        "entity_id": entity_id,
+        "metadata": metadata_text,
+        "metadata_raw": metadata_raw,
+        "metadata_obj": metadata,
+    }
+
+    cached = _head_cache.get(key)
+    if cached is None or not await _append(conn, params, cached):
+        prev_hash = await conn.fetchval(_LOCK_HEAD_SQL, entity_type, entity_id)
+        if not await _append(conn, params, prev_hash):
+            raise RuntimeError(
+                f"Audit chain head moved while locked for {entity_type}:{entity_id}"
+            )
+
+    _head_cache.set(key, params["event_hash"])
@@ -0,0 +1,311 @@
+import datetime
+import multiprocessing
+import os
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.audit.integrity import AUDIT_VERIFY_CHUNK_SIZE, verify_row
+from app.core.logging import get_logger
+from app.data.database import get_connection
+
+
+logger = get_logger(__name__)
+
+# Broken links reported per run; the total count is always exact
+MAX_REPORTED_BREAKS = 1000
+
+# Sampled rows per key range when choosing split points
+SAMPLE_ROWS_PER_PARTITION = 200
+
+EntityKey = Tuple[str, str]
+
+
+# Rows of one entity held back waiting for their predecessor; past this the
+# chain is reported broken rather than buffered further
+MAX_PENDING_ROWS = 10000
+
+
+class _EntityChecker:
+    """
+    Rebuilds one entity's chain by following prev_hash -> event_hash links
+    from GENESIS, and records its first break.
+
+    Rows arrive in (created_at, audit_id) order, which is chain order for
+    events appended since created_at is stamped under the head lock. Older
+    rows can be out of timestamp order, so a row whose predecessor has not
+    been seen yet waits in `pending` instead of counting as a break; what is
+    still waiting when the entity ends links to nothing in the chain.
+    """
+
+    def __init__(self, entity_type: str, entity_id: str):
+        self.entity_type = entity_type
+        self.entity_id = entity_id
+        self.head: Optional[str] = None
+        self.events = 0
+        self.broken: Optional[Dict[str, Any]] = None
+        self._pending: Dict[str, List[Dict[str, Any]]] = {}
+        self._pending_rows = 0
+
+    def add(self, row: Dict[str, Any]) -> None:
+        self.events += 1
+        if self.broken:
+            return
+        self._pending.setdefault(row["prev_hash"] or "GENESIS", []).append(row)
+        self._pending_rows += 1
+        self._advance()
+        if self._pending_rows > MAX_PENDING_ROWS:
+            self._break_at_leftover()
+
+    def finish(self) -> None:
+        if not self.broken and self._pending_rows:
+            self._break_at_leftover()
+        self._pending = {}
+        self._pending_rows = 0
+
+    def _advance(self) -> None:
+        while not self.broken:
+            expected_prev = self.head or "GENESIS"
+            waiting = self._pending.get(expected_prev)
+            if not waiting:
+                return
+            # Several rows claiming one predecessor: the earliest continues
+            row = waiting.pop(0)
+            if not waiting:
+                del self._pending[expected_prev]
+            self._pending_rows -= 1
+            if not verify_row(row):
+                self._break(row, "hash_mismatch")
+                return
+            self.head = row["event_hash"]
+
+    def _break_at_leftover(self) -> None:
+        # Nothing in the chain links to these rows; report the earliest
+        leftover = min(
+            (row for rows in self._pending.values() for row in rows),
+            key=lambda row: (row["created_at"] is None, row["created_at"] or datetime.datetime.min, row["audit_id"]),
+        )
+        self._break(leftover, "broken_link")
+
+    def _break(self, row: Dict[str, Any], reason: str) -> None:
+        self.broken = {
+            "entity_type": self.entity_type,
+            "entity_id": self.entity_id,
+            "audit_id": row["audit_id"],
+            "created_at": row["created_at"],
+            "reason": reason,
+            "expected_prev_hash": self.head or "GENESIS",
+            "prev_hash": row["prev_hash"] or "GENESIS",
+        }
+
+
+def _split_points(cursor: Any, partitions: int) -> List[EntityKey]:
+    """
+    Choose up to partitions - 1 (entity_type, entity_id) keys that cut the
+    chains into ranges of roughly equal row counts.
+
+    Keys come from a block sample of audit_logs, so the cost is a few pages
+    rather than a scan; a skewed sample only unbalances the ranges.
+    """
+    if partitions <= 1:
+        return []
+
+    cursor.execute("SELECT reltuples::BIGINT AS estimate FROM pg_class WHERE oid = 'audit_logs'::regclass")
+    row = cursor.fetchone()
+    estimate = row["estimate"] if row else 0
+    # Never analyzed (-1/0): read everything once rather than guess
+    percent = 100.0
+    if estimate and estimate > 0:
+        percent = min(100.0, 100.0 * partitions * SAMPLE_ROWS_PER_PARTITION / estimate)
+
+    cursor.execute(
+        """
+        SELECT entity_type, entity_id
+        FROM audit_logs TABLESAMPLE SYSTEM (%s)
+        WHERE entity_type IS NOT NULL
+          AND entity_id IS NOT NULL
+        ORDER BY entity_type, entity_id
+        """,
+        (percent,),
+    )
+    keys = [(r["entity_type"], r["entity_id"]) for r in cursor.fetchall()]
+
+    points: List[EntityKey] = []
+    for i in range(1, partitions):
+        if not keys:
+            break
+        key = keys[i * len(keys) // partitions]
+        # keys are in the database's collation order; only drop repeats
+        if not points or key != points[-1]:
+            points.append(key)
+    return points
+
+
+def _key_ranges(partitions: int) -> List[Tuple[Optional[EntityKey], Optional[EntityKey]]]:
+    """[lower, upper) bounds of the (entity_type, entity_id) ranges; None is open."""
+    conn = get_connection()
+    try:
+        points = _split_points(conn.cursor(), partitions)
+    finally:
+        conn.rollback()
+        conn.close()
+    bounds: List[Optional[EntityKey]] = [None, *points, None]
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def verify_partition(
+    partition: int,
+    lower: Optional[EntityKey],
+    upper: Optional[EntityKey],
+    chunk_size: int = AUDIT_VERIFY_CHUNK_SIZE,
+    *,
+    null_keys: bool = False,
+) -> Dict[str, Any]:
+    """
+    Verify every entity chain whose key is in [lower, upper).
+
+    Runs in a worker process with its own connection; rows are streamed in
+    (entity, created_at, audit_id) order through a server-side cursor as a
+    range scan of idx_audit_logs_entity_created_id, so each worker reads
+    only its slice. Whole entities fall in one range. With null_keys the
+    worker instead takes the rows whose entity_type or entity_id is NULL.
+    """
+    started_at = time.monotonic()
+    conn = get_connection()
+    conn.set_session(readonly=True)
+
+    entities = 0
+    events = 0
+    broken: List[Dict[str, Any]] = []
+    broken_total = 0
+
+    checker: Optional[_EntityChecker] = None
+
+    def finish_entity():
+        nonlocal entities, events, broken_total
+        if checker is None:
+            return
+        checker.finish()
+        entities += 1
+        events += checker.events
+        if checker.broken:
+            broken_total += 1
+            if len(broken) < MAX_REPORTED_BREAKS:
+                broken.append(checker.broken)
+
+    if null_keys:
+        where = "(entity_type IS NULL OR entity_id IS NULL)"
+        params: List[Any] = []
+    else:
+        where = "entity_type IS NOT NULL AND entity_id IS NOT NULL"
+        params = []
+        if lower is not None:
+            where += " AND (entity_type, entity_id) >= (%s, %s)"
+            params.extend(lower)
+        if upper is not None:
+            where += " AND (entity_type, entity_id) < (%s, %s)"
+            params.extend(upper)
+
+    try:
+        cursor = conn.cursor(name=f"audit_partition_{partition}_{uuid.uuid4().hex}")
+        cursor.itersize = chunk_size
+        cursor.execute(
+            f"""
+            SELECT audit_id,
+                   event_type,
+                   entity_type,
+                   entity_id,
+                   metadata,
+                   metadata_raw,
+                   prev_hash,
+                   event_hash,
+                   created_at
+            FROM audit_logs
+            WHERE {where}
+            ORDER BY entity_type, entity_id, created_at, audit_id
+            """,
+            params,
+        )
+
+        for row in cursor:
+            key = (row["entity_type"], row["entity_id"])
+            if checker is None or key != (checker.entity_type, checker.entity_id):
+                finish_entity()
+                checker = _EntityChecker(*key)
+            checker.add(row)
+
+        finish_entity()
+        cursor.close()
+    finally:
+        conn.rollback()
+        conn.close()
+
+    return {
+        "partition": partition,
+        "entities": entities,
+        "events": events,
+        "broken_entities": broken_total,
+        "broken_links": broken,
+        "elapsed_s": time.monotonic() - started_at,
+    }
+
+
+def verify_entity_chains(
+    *,
+    workers: Optional[int] = None,
+    partitions: Optional[int] = None,
+    chunk_size: int = AUDIT_VERIFY_CHUNK_SIZE,
+) -> Dict[str, Any]:
+    """
+    Verify every per-entity audit chain in parallel across processes.
+
+    Entity keys are split into `partitions` contiguous ranges at sampled
+    split points (several per worker so a few very long chains do not
+    serialize the run), plus one for rows without an entity key. Each row
+    must recompute to its stored event_hash, and following prev_hash links
+    from GENESIS must reach every row of the entity. Returns throughput and
+    the first broken link of every broken entity.
+    """
+    workers = workers or os.cpu_count() or 1
+    partitions = partitions or workers * 4
+
+    started_at = time.monotonic()
+    results = []
+    ranges = _key_ranges(partitions)
+
+    # spawn, not fork: this also runs inside the API process (entity-mode
+    # reverify), whose pool connections and daemon threads must not be
+    # copied into the workers
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        futures = [
+            pool.submit(verify_partition, partition, lower, upper, chunk_size)
+            for partition, (lower, upper) in enumerate(ranges)
+        ]
+        futures.append(pool.submit(verify_partition, len(ranges), None, None, chunk_size, null_keys=True))
+        for future in as_completed(futures):
+            results.append(future.result())
+
+    elapsed_s = time.monotonic() - started_at
+    events = sum(r["events"] for r in results)
+    broken_total = sum(r["broken_entities"] for r in results)
+    broken = sorted(
+        (link for r in results for link in r["broken_links"]),
+        key=lambda link: (link["entity_type"] or "", link["entity_id"] or ""),
+    )[:MAX_REPORTED_BREAKS]
+
+    if broken_total:
+        logger.error("Audit chain verification found %d broken entities", broken_total)
+
+    return {
+        "audit_chain_valid": broken_total == 0,
+        "entities": sum(r["entities"] for r in results),
+        "events": events,
+        "broken_entities": broken_total,
+        "broken_links": broken,
+        "workers": workers,
+        "partitions": len(ranges),
+        "elapsed_s": round(elapsed_s, 3),
+        "events_per_sec": round(events / elapsed_s, 1) if elapsed_s > 0 else None,
+        "slowest_partition_s": round(max((r["elapsed_s"] for r in results), default=0.0), 3),
+    }
@@ -1,5 +1,7 @@
 import hashlib
 import json
+import math
+from typing import Optional, Tuple
 
 
 def compute_event_hash(
@@ -29,3 +31,58 @@ def compute_event_hash(
     encoded = json.dumps(payload, sort_keys=True).encode("utf-8")
 
     return hashlib.sha256(encoded).hexdigest()
+
+
+def _jsonb_stable(value) -> bool:
+    if isinstance(value, float):
+        if not math.isfinite(value) or (value == 0.0 and math.copysign(1.0, value) < 0):
+            return False
+        # jsonb prints numerics positionally: 1e+16 comes back as an integer
+        return abs(value) < 1e16
+    if isinstance(value, dict):
+        return all(_jsonb_stable(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return all(_jsonb_stable(v) for v in value)
+    return True
+
+
+def _jsonb_safe(value):
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    if isinstance(value, dict):
+        return {k: _jsonb_safe(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_jsonb_safe(v) for v in value]
+    return value
+
+
+def encode_metadata(metadata: dict) -> Tuple[str, Optional[str]]:
+    """
+    Audit metadata as (jsonb_text, raw_text) for the metadata and
+    metadata_raw columns.
+
+    JSONB re-serializes numbers, so a few float values (non-finite, -0.0,
+    |x| >= 1e16) would not hash the same after a round trip. Only those rows
+    keep their original JSON text in metadata_raw; for every other row
+    raw_text is None and the hash is recomputed from the JSONB value.
+    """
+    text = json.dumps(metadata)
+    if _jsonb_stable(metadata):
+        return text, None
+    return json.dumps(_jsonb_safe(metadata)), text
+
+
+def load_metadata(value, raw: Optional[str] = None) -> dict:
+    """
+    Audit metadata exactly as it was hashed.
+
+    `value` is the metadata column: a dict once it is JSONB, or JSON text on
+    databases not yet migrated. `raw` is metadata_raw, when present.
+    """
+    if raw is not None:
+        return json.loads(raw)
+    if value is None:
+        return {}
+    if isinstance(value, str):
+        return json.loads(value) if value else {}
+    return value
@@ -0,0 +1,413 @@
+import datetime
+import os
+import threading
+import uuid
+from contextlib import closing
+from typing import Any, Dict, Iterator, Optional
+
+from app.audit.hash_utils import compute_event_hash, load_metadata
+from app.core.logging import get_logger
+from app.data.database import get_pool
+
+
+logger = get_logger(__name__)
+
+AUDIT_VERIFY_CHUNK_SIZE = int(os.getenv("AUDIT_VERIFY_CHUNK_SIZE", 5000))
+
+# Rows younger than this are left for the next run: a writer may still commit
+# an event stamped slightly before the newest visible row.
+AUDIT_VERIFY_LAG_SECONDS = float(os.getenv("AUDIT_VERIFY_LAG_SECONDS", 60))
+
+# How often the in-app worker advances the checkpoint (0 disables it)
+AUDIT_VERIFY_INTERVAL_SECONDS = float(os.getenv("AUDIT_VERIFY_INTERVAL_SECONDS", 60))
+
+GLOBAL_CHECKPOINT = "global"
+
+
+def verify_row(row: Dict[str, Any]) -> bool:
+    """
+    Recompute an audit row's hash and compare it to the stored event_hash.
+    """
+    prev_hash = row["prev_hash"] or "GENESIS"
+    metadata = load_metadata(row["metadata"], row.get("metadata_raw"))
+
+    recomputed = compute_event_hash(
+        prev_hash=prev_hash,
+        event_type=row["event_type"],
+        entity_type=row["entity_type"],
+        entity_id=row["entity_id"],
+        metadata=metadata,
+    )
+    return recomputed == row["event_hash"]
+
+
+def stream_audit_rows(
+    conn,
+    *,
+    after: Optional[Dict[str, Any]] = None,
+    until: Optional[datetime.datetime] = None,
+    chunk_size: int = AUDIT_VERIFY_CHUNK_SIZE,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Yield audit rows in (created_at, audit_id) order through a server-side
+    cursor, fetching `chunk_size` rows per round trip.
+
+    `after` is a checkpoint dict (last_created_at, last_audit_id); only rows
+    strictly after it are returned. `until` bounds created_at (exclusive).
+    """
+    conditions = ["created_at IS NOT NULL"]
+    params = []
+
+    if after and after.get("last_created_at") is not None:
+        conditions.append("(created_at, audit_id) > (%s, %s)")
+        params.extend([after["last_created_at"], after["last_audit_id"]])
+
+    if until is not None:
+        conditions.append("created_at < %s")
+        params.append(until)
+
+    cursor = conn.cursor(name=f"audit_stream_{uuid.uuid4().hex}")
+    cursor.itersize = chunk_size
+    try:
+        cursor.execute(
+            f"""
+            SELECT audit_id,
+                   event_type,
+                   entity_type,
+                   entity_id,
+                   metadata,
+                   metadata_raw,
+                   prev_hash,
+                   event_hash,
+                   created_at
+            FROM audit_logs
+            WHERE {" AND ".join(conditions)}
+            ORDER BY created_at ASC, audit_id ASC
+            """,
+            params,
+        )
+        for row in cursor:
+            yield row
+    finally:
+        cursor.close()
+
+
+def _load_checkpoint(cursor, checkpoint_id: str) -> Optional[Dict[str, Any]]:
+    cursor.execute(
+        """
+        SELECT checkpoint_id,
+               last_audit_id,
+               last_created_at,
+               last_event_hash,
+               verified_events,
+               chain_valid,
+               first_invalid_audit_id,
+               updated_at
+        FROM audit_verification_checkpoints
+        WHERE checkpoint_id = %s
+        """,
+        (checkpoint_id,),
+    )
+    row = cursor.fetchone()
+    return dict(row) if row else None
+
+
+def _save_checkpoint(cursor, checkpoint: Dict[str, Any]) -> None:
+    cursor.execute(
+        """
+        INSERT INTO audit_verification_checkpoints (
+            checkpoint_id,
+            last_audit_id,
+            last_created_at,
+            last_event_hash,
+            verified_events,
+            chain_valid,
+            first_invalid_audit_id,
+            updated_at
+        )
+        VALUES (%(checkpoint_id)s, %(last_audit_id)s, %(last_created_at)s, %(last_event_hash)s,
+                %(verified_events)s, %(chain_valid)s, %(first_invalid_audit_id)s, %(updated_at)s)
+        ON CONFLICT (checkpoint_id) DO UPDATE SET
+            last_audit_id = EXCLUDED.last_audit_id,
+            last_created_at = EXCLUDED.last_created_at,
+            last_event_hash = EXCLUDED.last_event_hash,
+            verified_events = EXCLUDED.verified_events,
+            chain_valid = EXCLUDED.chain_valid,
+            first_invalid_audit_id = EXCLUDED.first_invalid_audit_id,
+            updated_at = EXCLUDED.updated_at
+        """,
+        checkpoint,
+    )
+
+
+def _checkpoint_anchor_intact(cursor, checkpoint: Dict[str, Any]) -> bool:
+    """The last verified row must still exist with the hash we recorded."""
+    if not checkpoint.get("last_audit_id"):
+        return True
+    cursor.execute(
+        "SELECT event_hash FROM audit_logs WHERE audit_id = %s",
+        (checkpoint["last_audit_id"],),
+    )
+    row = cursor.fetchone()
+    return bool(row) and row["event_hash"] == checkpoint["last_event_hash"]
+
+
+def _new_checkpoint() -> Dict[str, Any]:
+    return {
+        "checkpoint_id": GLOBAL_CHECKPOINT,
+        "last_audit_id": None,
+        "last_created_at": None,
+        "last_event_hash": None,
+        "verified_events": 0,
+        "chain_valid": True,
+        "first_invalid_audit_id": None,
+    }
+
+
+def _verify_from_checkpoint(conn, checkpoint: Dict[str, Any], *, until: Optional[datetime.datetime]) -> int:
+    """
+    Verify rows after the checkpoint, moving it past each one; returns how
+    many rows were new.
+
+    The AUDIT_VERIFY_LAG_SECONDS window before the checkpoint is re-hashed
+    too, which catches rows that committed after the previous run had passed
+    their created_at. Rows that commit even later than that are only covered
+    by a full (or entity) run.
+    """
+    rescan_from = None
+    anchor = None
+    if checkpoint["last_created_at"] is not None:
+        anchor = (checkpoint["last_created_at"], checkpoint["last_audit_id"])
+        rescan_from = {
+            "last_created_at": checkpoint["last_created_at"] - datetime.timedelta(seconds=AUDIT_VERIFY_LAG_SECONDS),
+            "last_audit_id": "",
+        }
+
+    newly_verified = 0
+    with closing(stream_audit_rows(conn, after=rescan_from, until=until)) as rows:
+        for row in rows:
+            if not verify_row(row):
+                checkpoint["chain_valid"] = False
+                checkpoint["first_invalid_audit_id"] = row["audit_id"]
+                logger.error("Audit integrity failed for audit_id=%s", row["audit_id"])
+                break
+
+            if anchor is not None and (row["created_at"], row["audit_id"]) <= anchor:
+                # Overlap: counted by an earlier run (or a late row before the checkpoint)
+                continue
+
+            checkpoint["last_audit_id"] = row["audit_id"]
+            checkpoint["last_created_at"] = row["created_at"]
+            checkpoint["last_event_hash"] = row["event_hash"]
+            newly_verified += 1
+
+    return newly_verified
+
+
+def _result(checkpoint: Dict[str, Any], newly_verified: int, *, full: bool, in_progress: bool = False) -> Dict[str, Any]:
+    return {
+        "audit_chain_valid": checkpoint.get("chain_valid", True),
+        "verified_events": checkpoint.get("verified_events", 0),
+        "newly_verified_events": newly_verified,
+        "last_verified_audit_id": checkpoint.get("last_audit_id"),
+        "last_verified_at": checkpoint.get("last_created_at"),
+        "first_invalid_audit_id": checkpoint.get("first_invalid_audit_id"),
+        "full_run": full,
+        "verification_in_progress": in_progress,
+    }
+
+
+def verify_audit_chain(conn, *, full: bool = False, persist: bool = True) -> Dict[str, Any]:
+    """
+    Verify audit_logs hashes, resuming from the persisted checkpoint.
+
+    Incremental runs only stream rows newer than the checkpoint, so cost is
+    proportional to new events. full=True discards the checkpoint and
+    re-verifies everything. Once a mismatch is found the result stays
+    invalid until a full run succeeds.
+
+    With persist (AuditVerificationWorker, scripts/run_audit_verification.py
+    and the POST /audit/integrity/reverify jobs) the checkpoint
+    advances up to AUDIT_VERIFY_LAG_SECONDS ago and is committed on `conn`.
+    Without it (GET /audit/integrity, deep health) every row after the
+    checkpoint is verified but nothing is written; `conn` is rolled back.
+
+    Rows with a NULL created_at have no place in the global order and are
+    not verified here; entity mode covers them.
+    """
+    cursor = conn.cursor()
+
+    if not persist:
+        checkpoint = _load_checkpoint(cursor, GLOBAL_CHECKPOINT) or _new_checkpoint()
+        if full:
+            checkpoint = _new_checkpoint()
+        elif checkpoint["chain_valid"] and not _checkpoint_anchor_intact(cursor, checkpoint):
+            checkpoint["chain_valid"] = False
+            checkpoint["first_invalid_audit_id"] = checkpoint["last_audit_id"]
+        newly_verified = 0
+        if checkpoint["chain_valid"]:
+            newly_verified = _verify_from_checkpoint(conn, checkpoint, until=None)
+        checkpoint["verified_events"] += newly_verified
+        conn.rollback()
+        return _result(checkpoint, newly_verified, full=full)
+
+    # One verifier at a time; others report the last persisted result
+    cursor.execute(
+        "SELECT pg_try_advisory_xact_lock(hashtext(%s)) AS locked",
+        (f"audit_verification:{GLOBAL_CHECKPOINT}",),
+    )
+    if not cursor.fetchone()["locked"]:
+        checkpoint = _load_checkpoint(cursor, GLOBAL_CHECKPOINT) or {}
+        conn.commit()
+        return _result(checkpoint, 0, full=False, in_progress=True)
+
+    checkpoint = _load_checkpoint(cursor, GLOBAL_CHECKPOINT)
+
+    if full or checkpoint is None:
+        checkpoint = _new_checkpoint()
+    elif checkpoint["chain_valid"] and not _checkpoint_anchor_intact(cursor, checkpoint):
+        logger.error(
+            "Audit integrity checkpoint anchor changed for audit_id=%s",
+            checkpoint["last_audit_id"],
+        )
+        checkpoint["chain_valid"] = False
+        checkpoint["first_invalid_audit_id"] = checkpoint["last_audit_id"]
+
+    newly_verified = 0
+
+    if checkpoint["chain_valid"]:
+        horizon = datetime.datetime.utcnow() - datetime.timedelta(seconds=AUDIT_VERIFY_LAG_SECONDS)
+        newly_verified = _verify_from_checkpoint(conn, checkpoint, until=horizon)
+
+    checkpoint["verified_events"] += newly_verified
+    checkpoint["updated_at"] = datetime.datetime.utcnow()
+    _save_checkpoint(cursor, checkpoint)
+    conn.commit()
+
+    return _result(checkpoint, newly_verified, full=full)
+
+
+def fetch_audit_totals(cursor) -> Dict[str, Any]:
+    """Every audit row (verified or not) and the newest created_at."""
+    cursor.execute("SELECT COUNT(*) AS total_events, MAX(created_at) AS last_event_time FROM audit_logs")
+    row = cursor.fetchone()
+    return {"total_events": row["total_events"], "last_event_time": row["last_event_time"]}
+
+
+# ---------------------------------------------------------
+# Background full re-verification jobs (in-process registry)
+# ---------------------------------------------------------
+
+_jobs: Dict[str, Dict[str, Any]] = {}
+_jobs_lock = threading.Lock()
+
+
+VERIFICATION_MODES = ("incremental", "global", "entity")
+
+
+def start_full_verification_job(mode: str = "global") -> Dict[str, Any]:
+    """
+    Register a verification job.
+
+    mode="incremental" advances the checkpoint over the rows added since
+    the last run (AuditVerificationWorker does this on a schedule);
+    mode="global" re-hashes every row in created_at order and resets the
+    incremental checkpoint; mode="entity" runs the parallel per-entity
+    chain verifier (app/audit/chain_verifier.py), which also checks links.
+    """
+    if mode not in VERIFICATION_MODES:
+        raise ValueError(f"Unknown verification mode: {mode}")
+
+    job = {
+        "job_id": str(uuid.uuid4()),
+        "mode": mode,
+        "status": "PENDING",
+        "started_at": None,
+        "finished_at": None,
+        "result": None,
+        "error": None,
+    }
+    with _jobs_lock:
+        _jobs[job["job_id"]] = job
+    return dict(job)
+
+
+def run_full_verification_job(job_id: str) -> None:
+    """Run a verification job on a pooled connection and record the outcome."""
+    with _jobs_lock:
+        job = _jobs[job_id]
+        job["status"] = "RUNNING"
+        job["started_at"] = datetime.datetime.utcnow()
+
+    try:
+        if job["mode"] == "entity":
+            # local import to avoid circulars (chain_verifier reuses verify_row)
+            from app.audit.chain_verifier import verify_entity_chains
+
+            result = verify_entity_chains()
+        else:
+            with get_pool().connection() as conn:
+                result = verify_audit_chain(conn, full=job["mode"] == "global")
+        with _jobs_lock:
+            job["status"] = "COMPLETED"
+            job["result"] = result
+    except Exception as exc:
+        logger.exception("Audit verification job %s failed", job_id)
+        with _jobs_lock:
+            job["status"] = "FAILED"
+            job["error"] = str(exc)
+    finally:
+        with _jobs_lock:
+            job["finished_at"] = datetime.datetime.utcnow()
+
+
+def get_verification_job(job_id: str) -> Optional[Dict[str, Any]]:
+    with _jobs_lock:
+        job = _jobs.get(job_id)
+        return dict(job) if job else None
+
+
+# ---------------------------------------------------------
+# Background incremental verification
+# ---------------------------------------------------------
+
+class AuditVerificationWorker:
+    """
+    Daemon thread running an incremental verify_audit_chain() every
+    `interval` seconds, so the checkpoint keeps up with new events.
+
+    Safe to run in every API worker; the advisory lock lets exactly one
+    of them advance the checkpoint at a time.
+    """
+
+    def __init__(self, *, interval: float = AUDIT_VERIFY_INTERVAL_SECONDS):
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.last_result: Optional[Dict[str, Any]] = None
+
+    def start(self) -> None:
+        if self.interval <= 0:
+            return
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="audit-verifier", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                with get_pool().connection() as conn:
+                    self.last_result = verify_audit_chain(conn)
+            except Exception:
+                logger.exception("Incremental audit verification failed")
+
+
+audit_verification_worker = AuditVerificationWorker()
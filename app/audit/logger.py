@@ -1,5 +1,135 @@
-import json
-from app.audit.hash_utils import compute_event_hash
+import datetime
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+from psycopg2.extras import execute_values
+
+from app.audit.hash_utils import compute_event_hash, encode_metadata
+
+
+AUDIT_HEAD_CACHE_SIZE = int(os.getenv("AUDIT_HEAD_CACHE_SIZE", 100000))
+
+
+class _HeadCache:
+    """
+    Bounded LRU of the last known event_hash per (entity_type, entity_id).
+
+    Only a hint: every append compare-and-swaps against audit_chain_heads,
+    so a stale entry (another process appended, or our transaction rolled
+    back) costs one extra round trip and is then corrected.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    def get(self, key) -> Optional[str]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value: str) -> None:
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_head_cache = _HeadCache(AUDIT_HEAD_CACHE_SIZE)
+
+
+def clear_head_cache() -> None:
+    _head_cache.clear()
+
+
+# Lock (creating if needed) the chain head row and return its hash. New heads
+# are seeded from the newest existing audit row so pre-existing chains continue.
+# audit_chain_heads.updated_at is the created_at of the head event; locking
+# leaves it unchanged.
+_LOCK_HEAD_SQL = """
+    INSERT INTO audit_chain_heads (entity_type, entity_id, event_hash, updated_at)
+    SELECT %(entity_type)s,
+           %(entity_id)s,
+           COALESCE(last.event_hash, 'GENESIS'),
+           last.created_at
+    FROM (SELECT 1) AS seed
+    LEFT JOIN LATERAL (
+        SELECT event_hash, created_at
+        FROM audit_logs
+        WHERE entity_type = %(entity_type)s
+          AND entity_id = %(entity_id)s
+          AND event_hash IS NOT NULL
+        ORDER BY created_at DESC
+        LIMIT 1
+    ) AS last ON TRUE
+    ON CONFLICT (entity_type, entity_id)
+    DO UPDATE SET updated_at = audit_chain_heads.updated_at
+    RETURNING event_hash
+"""
+
+# Advance the head only if it still equals prev_hash, and insert the audit row
+# in the same statement. Inserts nothing if another writer moved the head.
+# created_at is stamped here, while the head row is held, and is never earlier
+# than the predecessor's, so created_at order is chain order for every entity.
+_APPEND_SQL = """
+    WITH head AS (
+        UPDATE audit_chain_heads
+        SET event_hash = %(event_hash)s,
+            updated_at = GREATEST(
+                clock_timestamp() AT TIME ZONE 'UTC',
+                updated_at + INTERVAL '1 microsecond'
+            )
+        WHERE entity_type = %(entity_type)s
+          AND entity_id = %(entity_id)s
+          AND event_hash = %(prev_hash)s
+        RETURNING updated_at
+    )
+    INSERT INTO audit_logs (
+        audit_id,
+        event_type,
+        entity_type,
+        entity_id,
+        metadata,
+        metadata_raw,
+        prev_hash,
+        event_hash,
+        created_at
+    )
+    SELECT %(audit_id)s,
+           %(event_type)s,
+           %(entity_type)s,
+           %(entity_id)s,
+           %(metadata)s::jsonb,
+           %(metadata_raw)s,
+           %(prev_hash)s,
+           %(event_hash)s,
+           head.updated_at
+    FROM head
+"""
+
+
+def _append(cursor, params: Dict, prev_hash: str) -> bool:
+    params["prev_hash"] = prev_hash
+    params["event_hash"] = compute_event_hash(
+        prev_hash=prev_hash,
+        event_type=params["event_type"],
+        entity_type=params["entity_type"],
+        entity_id=params["entity_id"],
+        metadata=params["metadata_obj"],
+    )
+    cursor.execute(_APPEND_SQL, params)
+    return cursor.rowcount == 1
 
 
 def log_event(cursor, event_type: str, entity_type: str, entity_id, metadata: dict):
@@ -7,56 +137,163 @@ def log_event(cursor, event_type: str, entity_type: str, entity_id, metadata: di
     Day 11: Tamper-Evident Audit Logger (FIXED)
 
     Ensures proper hash chaining by treating entity_id consistently as TEXT.
+
+    The previous hash is taken from the entity's audit_chain_heads row, not
+    from a scan of audit_logs. With a cached head the append is a single
+    statement; on a cache miss or a lost race the head row is locked
+    (serializing concurrent writers for that entity) and the append retried.
     """
 
     entity_id = str(entity_id)  # 🔑 THE ACTUAL FIX
+    key = (entity_type, entity_id)
+
+    metadata_text, metadata_raw = encode_metadata(metadata)
+    params = {
+        "audit_id": str(uuid.uuid4()),
+        "event_type": event_type,
+        "entity_type": entity_type,
+        "entity_id": entity_id,
+        "metadata": metadata_text,
+        "metadata_raw": metadata_raw,
+        "metadata_obj": metadata,
+    }
+
+    # 1. Fast path: compare-and-swap against the cached head
+    cached = _head_cache.get(key)
+    if cached is None or not _append(cursor, params, cached):
+        # 2. Slow path: lock the head row, read it, append
+        cursor.execute(_LOCK_HEAD_SQL, params)
+        prev_hash = cursor.fetchone()["event_hash"]
+        if not _append(cursor, params, prev_hash):
+            raise RuntimeError(
+                f"Audit chain head moved while locked for {entity_type}:{entity_id}"
+            )
+
+    _head_cache.set(key, params["event_hash"])
 
-    # 1. Fetch previous hash
-    cursor.execute(
+
+def log_events(cursor, events: List[Dict]):
+    """
+    Append many audit events with one chain-head lock and one multi-row INSERT.
+
+    Events are chained in list order per (entity_type, entity_id), exactly as
+    if log_event had been called for each of them in turn. created_at is
+    stamped once every head is locked, with strictly increasing values that
+    start after each head event's, so the chain order survives ORDER BY
+    created_at. An event may carry its own "audit_id" (the write-behind
+    writer assigns them up front to detect replays).
+    """
+    if not events:
+        return
+
+    keys = sorted({(event["entity_type"], str(event["entity_id"])) for event in events})
+
+    # Lock every head in a stable order so concurrent batches cannot deadlock
+    locked = execute_values(
+        cursor,
         """
-        SELECT event_hash
-        FROM audit_logs
-        WHERE entity_type = %s
-          AND entity_id = %s
-          AND event_hash IS NOT NULL
-        ORDER BY created_at DESC
-        LIMIT 1
+        INSERT INTO audit_chain_heads (entity_type, entity_id, event_hash, updated_at)
+        SELECT v.entity_type,
+               v.entity_id,
+               COALESCE(last.event_hash, 'GENESIS'),
+               last.created_at
+        FROM (VALUES %s) AS v(entity_type, entity_id)
+        LEFT JOIN LATERAL (
+            SELECT l.event_hash, l.created_at
+            FROM audit_logs l
+            WHERE l.entity_type = v.entity_type
+              AND l.entity_id = v.entity_id
+              AND l.event_hash IS NOT NULL
+            ORDER BY l.created_at DESC
+            LIMIT 1
+        ) AS last ON TRUE
+        ORDER BY v.entity_type, v.entity_id
+        ON CONFLICT (entity_type, entity_id)
+        DO UPDATE SET updated_at = audit_chain_heads.updated_at
+        RETURNING entity_type,
+                  entity_id,
+                  event_hash,
+                  updated_at,
+                  clock_timestamp() AT TIME ZONE 'UTC' AS locked_at
         """,
-        (entity_type, entity_id),
+        keys,
+        page_size=len(keys),
+        fetch=True,
     )
+    heads = {(row["entity_type"], row["entity_id"]): row["event_hash"] for row in locked}
 
+    # Database clock, read while the heads are held, and never at or before
+    # the newest head event
+    now = max(row["locked_at"] for row in locked)
+    for row in locked:
+        if row["updated_at"] is not None and row["updated_at"] >= now:
+            now = row["updated_at"] + datetime.timedelta(microseconds=1)
 
-    row = cursor.fetchone()
-    prev_hash = row["event_hash"] if row and row["event_hash"] else "GENESIS"
+    last_created_at = {}
+    rows = []
+    for offset, event in enumerate(events):
+        entity_type = event["entity_type"]
+        entity_id = str(event["entity_id"])
+        key = (entity_type, entity_id)
 
-    # 2. Compute hash
-    event_hash = compute_event_hash(
-        prev_hash=prev_hash,
-        event_type=event_type,
-        entity_type=entity_type,
-        entity_id=entity_id,
-        metadata=metadata,
-    )
+        prev_hash = heads[key]
+        event_hash = compute_event_hash(
+            prev_hash=prev_hash,
+            event_type=event["event_type"],
+            entity_type=entity_type,
+            entity_id=entity_id,
+            metadata=event["metadata"],
+        )
+        heads[key] = event_hash
+
+        rows.append(
+            (
+                event.get("audit_id") or str(uuid.uuid4()),
+                event["event_type"],
+                entity_type,
+                entity_id,
+                *encode_metadata(event["metadata"]),
+                prev_hash,
+                event_hash,
+                now + datetime.timedelta(microseconds=offset),
+            )
+        )
+        last_created_at[key] = rows[-1][-1]
 
-    # 3. Insert chained audit row
-    cursor.execute(
+    execute_values(
+        cursor,
         """
         INSERT INTO audit_logs (
+            audit_id,
             event_type,
             entity_type,
             entity_id,
             metadata,
+            metadata_raw,
             prev_hash,
-            event_hash
+            event_hash,
+            created_at
         )
-        VALUES (%s, %s, %s, %s, %s, %s)
+        VALUES %s
         """,
-        (
-            event_type,
-            entity_type,
-            entity_id,
-            json.dumps(metadata),
-            prev_hash,
-            event_hash,
-        ),
+        rows,
+        template="(%s, %s, %s, %s, %s::jsonb, %s, %s, %s, %s)",
+        page_size=1000,
     )
+
+    execute_values(
+        cursor,
+        """
+        UPDATE audit_chain_heads AS h
+        SET event_hash = v.event_hash,
+            updated_at = v.updated_at
+        FROM (VALUES %s) AS v(entity_type, entity_id, event_hash, updated_at)
+        WHERE h.entity_type = v.entity_type
+          AND h.entity_id = v.entity_id
+        """,
+        [(*key, heads[key], last_created_at[key]) for key in keys],
+        page_size=1000,
+    )
+
+    for key in keys:
+        _head_cache.set(key, heads[key])
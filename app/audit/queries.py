@@ -1,33 +1,87 @@
 import json
+from typing import Dict, Optional
 
+from app.audit.hash_utils import load_metadata
+from app.data.pagination import Keyset, fetch_keyset_page
 
-def fetch_account_audit(cursor, account_id: int, *, limit: int, offset: int):
+AUDIT_CURSOR_SCOPE = "account_audit"
+
+_AUDIT_SELECT = """
+    SELECT
+        audit_id,
+        event_type,
+        entity_type,
+        entity_id,
+        metadata,
+        metadata_raw,
+        created_at
+    FROM audit_logs
+"""
+
+
+def fetch_account_audit(
+    cursor,
+    account_id: int,
+    *,
+    limit: int,
+    offset: int = 0,
+    after: Optional[Keyset] = None,
+    event_type: Optional[str] = None,
+    metadata_filter: Optional[Dict] = None,
+):
     """
     Fetch paginated audit history for a given account_id.
 
     Filters only ACCOUNT-level events for regulator-grade traceability:
     - SIGNAL_GENERATED events
     - DECISION_MADE events
+
+    `metadata_filter` is matched with JSONB containment (metadata @> filter),
+    served by the GIN index on audit_logs.metadata.
+
+    Pages are keyset-paginated on (created_at, audit_id) from `after`;
+    returns (events, next_cursor). A non-zero `offset` without `after` keeps
+    the legacy OFFSET paging and never returns a cursor.
     """
 
-    cursor.execute(
-        """
-        SELECT
-            audit_id,
-            event_type,
-            entity_type,
-            entity_id,
-            metadata,
-            created_at
-        FROM audit_logs
-        WHERE entity_type = 'ACCOUNT' AND entity_id = %s
-        ORDER BY created_at ASC
-        LIMIT %s OFFSET %s
-        """,
-        (str(account_id), limit, offset),
-    )
-
-    rows = cursor.fetchall()
+    conditions = ["entity_type = 'ACCOUNT'", "entity_id = %s"]
+    params = [str(account_id)]
+
+    if event_type:
+        conditions.append("event_type = %s")
+        params.append(event_type)
+
+    if metadata_filter:
+        # The cast is a no-op once metadata is JSONB (and keeps the GIN index
+        # usable); before migrate_audit_metadata_jsonb it parses the text.
+        conditions.append("metadata::jsonb @> %s::jsonb")
+        params.append(json.dumps(metadata_filter))
+
+    next_cursor = None
+    if offset and after is None:
+        cursor.execute(
+            f"""
+            {_AUDIT_SELECT}
+            WHERE {" AND ".join(conditions)}
+            ORDER BY created_at ASC, audit_id ASC
+            LIMIT %s OFFSET %s
+            """,
+            (*params, limit, offset),
+        )
+        rows = cursor.fetchall()
+    else:
+        rows, next_cursor = fetch_keyset_page(
+            cursor,
+            scope=AUDIT_CURSOR_SCOPE,
+            select_sql=_AUDIT_SELECT,
+            conditions=conditions,
+            params=params,
+            created_column="created_at",
+            id_column="audit_id",
+            descending=False,
+            after=after,
+            limit=limit,
+        )
 
     audit_events = []
     for row in rows:
@@ -37,9 +91,9 @@ def fetch_account_audit(cursor, account_id: int, *, limit: int, offset: int):
                 "event_type": row["event_type"],
                 "entity_type": row["entity_type"],
                 "entity_id": row["entity_id"],
-                "metadata": json.loads(row["metadata"]) if row["metadata"] else {},
+                "metadata": load_metadata(row["metadata"], row["metadata_raw"]),
                 "created_at": row["created_at"],
             }
         )
 
-    return audit_events
+    return audit_events, next_cursor
@@ -0,0 +1,293 @@
+import asyncio
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+import psycopg2
+
+from app.audit.logger import log_events
+from app.core.logging import get_logger
+from app.data.database import PoolTimeout, get_pool
+
+
+logger = get_logger(__name__)
+
+AUDIT_WRITER_QUEUE_SIZE = int(os.getenv("AUDIT_WRITER_QUEUE_SIZE", 50000))
+AUDIT_WRITER_BATCH_SIZE = int(os.getenv("AUDIT_WRITER_BATCH_SIZE", 1000))
+AUDIT_WRITER_FLUSH_INTERVAL_SECONDS = float(os.getenv("AUDIT_WRITER_FLUSH_INTERVAL_SECONDS", 0.05))
+# A batch failing this many times (for reasons other than connectivity) is
+# split to isolate the event that fails, which is then dropped and logged
+AUDIT_WRITER_MAX_ATTEMPTS = int(os.getenv("AUDIT_WRITER_MAX_ATTEMPTS", 5))
+
+_MAX_RETRY_DELAY_SECONDS = 5.0
+# Blocked producers re-check that the writer is still alive this often
+_BLOCKED_RECHECK_SECONDS = 1.0
+# Nothing can be written while these persist, so they never split a batch
+_TRANSIENT_ERRORS = (psycopg2.OperationalError, psycopg2.InterfaceError, PoolTimeout)
+
+
+class AuditWriter:
+    """
+    Write-behind, group-committing writer for audit events.
+
+    Requests hand over their events after their own transaction commits; a
+    single daemon thread drains the queue and appends up to `batch_size`
+    events per log_events call (one head lock + one multi-row INSERT + one
+    head UPDATE, one commit).
+
+    Ordering: the queue is FIFO and has one consumer, and log_events chains
+    a batch in list order per entity, so each submit's events stay in order
+    and contiguous within their entity's chain. Other processes (or sync
+    mode) appending to the same entity are serialized by the head lock.
+
+    Durability:
+    - bounded: at most `max_queue` events wait in memory; submit() blocks
+      while the queue is full (backpressure: producers slow to the rate the
+      writer commits at; nothing is dropped and nothing jumps the queue)
+    - a failed batch stays at the head of the queue and is retried with
+      backoff; audit_ids are assigned at submit, so a batch whose commit
+      succeeded but whose acknowledgement was lost is detected and skipped
+    - connection errors are retried until the database is back; any other
+      error that survives `max_attempts` splits the batch in halves until
+      the failing event is alone, and that event is dropped (logged in
+      full, counted as "parked") so it cannot stall the events behind it
+    - stop() flushes the queue before returning
+    Events still queued when the process is killed are lost; the business
+    rows they describe are already committed.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_queue: int = AUDIT_WRITER_QUEUE_SIZE,
+        batch_size: int = AUDIT_WRITER_BATCH_SIZE,
+        flush_interval: float = AUDIT_WRITER_FLUSH_INTERVAL_SECONDS,
+        max_attempts: int = AUDIT_WRITER_MAX_ATTEMPTS,
+    ):
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_attempts = max_attempts
+        self._cond = threading.Condition()
+        self._queue: deque = deque()
+        self._in_flight = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.submitted = 0
+        self.written = 0
+        self.batches = 0
+        self.direct_writes = 0
+        self.retries = 0
+        self.splits = 0
+        self.parked = 0
+        self.blocked = 0
+        self.blocked_seconds = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 30.0) -> None:
+        """Stop the thread after flushing whatever is queued."""
+        self._stop.set()
+        with self._cond:
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            if self._thread.is_alive():
+                logger.error("Audit writer did not drain within %.1fs; %d events queued", timeout, len(self._queue))
+            self._thread = None
+
+    # -----------------------------------------------------
+    # Producers
+    # -----------------------------------------------------
+
+    def _prepare(self, events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        for event in events:
+            event.setdefault("audit_id", str(uuid.uuid4()))
+        return events
+
+    def _offer(self, events: List[Dict[str, Any]], block: bool) -> bool:
+        """Append to the queue, waiting for room if `block`; False if not queued."""
+        with self._cond:
+            # An oversized group is admitted into an empty queue rather than never
+            while self._queue and len(self._queue) + len(events) > self.max_queue:
+                if not block or not self.running:
+                    return False
+                self.blocked += 1
+                started_at = time.monotonic()
+                self._cond.wait(_BLOCKED_RECHECK_SECONDS)
+                self.blocked_seconds += time.monotonic() - started_at
+            self._queue.extend(events)
+            self.submitted += len(events)
+            self._cond.notify_all()
+            return True
+
+    def submit(self, events: List[Dict[str, Any]]) -> None:
+        """
+        Queue `events` (account_event dicts, in chain order) for writing.
+
+        Call only after the transaction that produced them has committed.
+        Blocks while the queue is full. Without a running writer the events
+        are appended synchronously instead.
+        """
+        if not events:
+            return
+        events = self._prepare(events)
+        if self.running and self._offer(events, block=True):
+            return
+        self._write_direct(events)
+
+    async def submit_async(self, events: List[Dict[str, Any]]) -> None:
+        """submit() for the event loop: waiting for room happens on the default executor."""
+        if not events:
+            return
+        events = self._prepare(events)
+        if self.running and self._offer(events, block=False):
+            return
+        await asyncio.get_running_loop().run_in_executor(None, self.submit, events)
+
+    def _write_direct(self, events: List[Dict[str, Any]]) -> None:
+        with self._cond:
+            self.submitted += len(events)
+            self.direct_writes += 1
+        with get_pool().connection() as conn:
+            try:
+                log_events(conn.cursor(), events)
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+        with self._cond:
+            self.written += len(events)
+
+    def flush(self, timeout: float = 10.0) -> bool:
+        """Wait until everything submitted so far is written; False on timeout."""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while self._queue or self._in_flight:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    # -----------------------------------------------------
+    # Consumer
+    # -----------------------------------------------------
+
+    def _take(self) -> List[Dict[str, Any]]:
+        with self._cond:
+            if not self._queue and not self._stop.is_set():
+                self._cond.wait(self.flush_interval)
+            batch = []
+            while self._queue and len(batch) < self.batch_size:
+                batch.append(self._queue.popleft())
+            self._in_flight = len(batch)
+            return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._take()
+            if not batch:
+                if self._stop.is_set():
+                    return
+                continue
+            self._write_batch(batch)
+            with self._cond:
+                self._in_flight = 0
+                self.written += len(batch)
+                self.batches += 1
+                # Room for blocked producers, and wake flush() waiters
+                self._cond.notify_all()
+
+    def _write_batch(self, batch: List[Dict[str, Any]], max_attempts: Optional[int] = None) -> None:
+        max_attempts = max_attempts or self.max_attempts
+        attempt = 0
+        failures = 0
+        while True:
+            try:
+                with get_pool().connection() as conn:
+                    cursor = conn.cursor()
+                    if attempt and self._already_written(cursor, batch[0]["audit_id"]):
+                        conn.rollback()
+                        return
+                    log_events(cursor, batch)
+                    conn.commit()
+                return
+            except Exception as exc:
+                attempt += 1
+                if not isinstance(exc, _TRANSIENT_ERRORS):
+                    failures += 1
+                    if failures >= max_attempts:
+                        break
+                with self._cond:
+                    self.retries += 1
+                delay = min(0.1 * 2 ** attempt, _MAX_RETRY_DELAY_SECONDS)
+                logger.exception(
+                    "Audit batch of %d events failed (attempt %d); retrying in %.1fs",
+                    len(batch),
+                    attempt,
+                    delay,
+                )
+                time.sleep(delay)
+
+        if len(batch) == 1:
+            self._park(batch[0])
+            return
+
+        # The error has already proven persistent: halves get one try each
+        with self._cond:
+            self.splits += 1
+        middle = len(batch) // 2
+        logger.error("Audit batch of %d events keeps failing; splitting it", len(batch))
+        self._write_batch(batch[:middle], max_attempts=1)
+        self._write_batch(batch[middle:], max_attempts=1)
+
+    def _park(self, event: Dict[str, Any]) -> None:
+        with self._cond:
+            self.parked += 1
+        logger.error(
+            "Dropping audit event that cannot be written: audit_id=%s event_type=%s entity=%s:%s metadata=%r",
+            event.get("audit_id"),
+            event.get("event_type"),
+            event.get("entity_type"),
+            event.get("entity_id"),
+            event.get("metadata"),
+        )
+
+    @staticmethod
+    def _already_written(cursor: Any, audit_id: str) -> bool:
+        # A batch commits atomically: its first event present means all are
+        cursor.execute("SELECT 1 FROM audit_logs WHERE audit_id = %s", (audit_id,))
+        return cursor.fetchone() is not None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                "running": self.running,
+                "queued": len(self._queue),
+                "in_flight": self._in_flight,
+                "submitted": self.submitted,
+                "written": self.written,
+                "batches": self.batches,
+                "direct_writes": self.direct_writes,
+                "retries": self.retries,
+                "splits": self.splits,
+                "parked": self.parked,
+                "blocked": self.blocked,
+                "blocked_seconds": round(self.blocked_seconds, 3),
+            }
+
+
+audit_writer = AuditWriter()
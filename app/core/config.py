@@ -3,4 +3,29 @@ import os
 DATABASE_URL = os.getenv("DATABASE_URL")
 
 BLOCK_THRESHOLD = float(os.getenv("BLOCK_THRESHOLD", 70))
-REVIEW_THRESHOLD = float(os.getenv("REVIEW_THRESHOLD", 40))
\ No newline at end of file
+REVIEW_THRESHOLD = float(os.getenv("REVIEW_THRESHOLD", 40))
+
+# In-process sliding-window features for signal generation (see app/signals/feature_store.py)
+FEATURE_STORE_ENABLED = os.getenv("FEATURE_STORE_ENABLED", "true").lower() in ("1", "true", "yes")
+
+# Driver behind POST /transactions: "psycopg2" (sync, threadpool) or "asyncpg" (async, own pool)
+INGESTION_DRIVER = os.getenv("INGESTION_DRIVER", "psycopg2").lower()
+
+# Active scoring config (app/risk/scoring_config.py) is re-read at most this often;
+# with SCORING_CONFIG_LISTEN, activations are also pushed via LISTEN/NOTIFY
+SCORING_CONFIG_TTL_SECONDS = float(os.getenv("SCORING_CONFIG_TTL_SECONDS", 30))
+SCORING_CONFIG_LISTEN = os.getenv("SCORING_CONFIG_LISTEN", "true").lower() in ("1", "true", "yes")
+
+# Build missing indexes from app/data/indexes.py (CREATE INDEX CONCURRENTLY) at startup
+MANAGED_INDEXES_ON_STARTUP = os.getenv("MANAGED_INDEXES_ON_STARTUP", "true").lower() in ("1", "true", "yes")
+
+# Audit events from the transaction pipeline: "sync" (appended inside the request
+# transaction) or "write_behind" (queued after commit, group-committed by app/audit/writer.py)
+AUDIT_WRITE_MODE = os.getenv("AUDIT_WRITE_MODE", "sync").lower()
+AUDIT_WRITE_BEHIND = AUDIT_WRITE_MODE == "write_behind"
+
+# Signals, review cases and audit events of POST /transactions: "inline" (written in
+# the request) or "outbox" (queued in the decision's transaction and materialized by
+# scripts/run_outbox_worker.py; see app/services/outbox.py)
+PIPELINE_SIDE_EFFECTS = os.getenv("PIPELINE_SIDE_EFFECTS", "inline").lower()
+PIPELINE_OUTBOX = PIPELINE_SIDE_EFFECTS == "outbox"
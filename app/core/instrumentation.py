@@ -0,0 +1,250 @@
+import bisect
+import threading
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from psycopg2.extras import RealDictCursor
+
+
+# Seconds; covers a sub-millisecond statement up to a multi-second batch
+DEFAULT_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+    0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+
+def _label_text(labels: Tuple[Tuple[str, str], ...], extra: str = "") -> str:
+    parts = [f'{k}="{v}"' for k, v in labels]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class Histogram:
+    """Fixed-bucket histogram; observe() is one bisect and one locked add."""
+
+    __slots__ = ("buckets", "counts", "sum", "count", "_lock")
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+            self.count += 1
+
+    def render(self, name: str, labels) -> List[str]:
+        with self._lock:
+            counts = list(self.counts)
+            total, count = self.sum, self.count
+        lines = []
+        cumulative = 0
+        for upper, n in zip(self.buckets, counts):
+            cumulative += n
+            le = _label_text(labels, 'le="%s"' % upper)
+            lines.append(f"{name}_bucket{le} {cumulative}")
+        le = _label_text(labels, 'le="+Inf"')
+        lines.append(f"{name}_bucket{le} {count}")
+        lines.append(f"{name}_sum{_label_text(labels)} {total}")
+        lines.append(f"{name}_count{_label_text(labels)} {count}")
+        return lines
+
+
+class Counter:
+    __slots__ = ("value", "_lock")
+
+    def __init__(self):
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: int = 1) -> None:
+        with self._lock:
+            self.value += amount
+
+    def render(self, name: str, labels) -> List[str]:
+        return [f"{name}{_label_text(labels)} {self.value}"]
+
+
+class MetricsRegistry:
+    """
+    In-process metric families rendered in Prometheus text format.
+
+    Metrics are created on first use per (name, labels); gauges come from
+    collector callbacks evaluated at scrape time.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._families: Dict[str, Dict[str, Any]] = {}
+        self._collectors: List[Callable[[], List[Tuple[str, str, Dict[str, str], float]]]] = []
+
+    def _get(self, kind: str, name: str, help_text: str, labels: Dict[str, str], factory):
+        key = tuple(sorted(labels.items()))
+        family = self._families.get(name)
+        if family is not None:
+            metric = family["metrics"].get(key)
+            if metric is not None:
+                return metric
+        with self._lock:
+            family = self._families.setdefault(name, {"type": kind, "help": help_text, "metrics": {}})
+            return family["metrics"].setdefault(key, factory())
+
+    def histogram(self, name: str, help_text: str, **labels) -> Histogram:
+        return self._get("histogram", name, help_text, labels, Histogram)
+
+    def counter(self, name: str, help_text: str, **labels) -> Counter:
+        return self._get("counter", name, help_text, labels, Counter)
+
+    def register_collector(self, collector) -> None:
+        """collector() returns [(name, help, labels, value)] gauge samples."""
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        lines: List[str] = []
+        with self._lock:
+            families = [(name, dict(f, metrics=dict(f["metrics"]))) for name, f in sorted(self._families.items())]
+        for name, family in families:
+            lines.append(f"# HELP {name} {family['help']}")
+            lines.append(f"# TYPE {name} {family['type']}")
+            for labels, metric in sorted(family["metrics"].items()):
+                lines.extend(metric.render(name, labels))
+
+        seen = set()
+        for collector in self._collectors:
+            try:
+                samples = collector()
+            except Exception:
+                continue
+            for name, help_text, labels, value in samples:
+                if name not in seen:
+                    lines.append(f"# HELP {name} {help_text}")
+                    lines.append(f"# TYPE {name} gauge")
+                    seen.add(name)
+                lines.append(f"{name}{_label_text(tuple(sorted(labels.items())))} {value}")
+
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+
+# ---------------------------------------------------------
+# SQL round-trip counting
+# ---------------------------------------------------------
+
+class InstrumentedCursor(RealDictCursor):
+    """RealDictCursor that counts the statements it sends (execute_values pages included)."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.statements = 0
+
+    def execute(self, query, vars=None):
+        self.statements += 1
+        return super().execute(query, vars)
+
+
+class InstrumentedAsyncConnection:
+    """Pass-through asyncpg connection wrapper that counts round trips."""
+
+    __slots__ = ("_conn", "statements")
+
+    def __init__(self, conn):
+        self._conn = conn
+        self.statements = 0
+
+    async def execute(self, *args, **kwargs):
+        self.statements += 1
+        return await self._conn.execute(*args, **kwargs)
+
+    async def executemany(self, *args, **kwargs):
+        self.statements += 1
+        return await self._conn.executemany(*args, **kwargs)
+
+    async def fetch(self, *args, **kwargs):
+        self.statements += 1
+        return await self._conn.fetch(*args, **kwargs)
+
+    async def fetchrow(self, *args, **kwargs):
+        self.statements += 1
+        return await self._conn.fetchrow(*args, **kwargs)
+
+    async def fetchval(self, *args, **kwargs):
+        self.statements += 1
+        return await self._conn.fetchval(*args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+
+# ---------------------------------------------------------
+# Stage timer
+# ---------------------------------------------------------
+
+class StageTimer:
+    """
+    Lap timer for one pipeline run.
+
+    lap(stage) attributes the time and SQL statements since the previous
+    lap to `stage` (a perf_counter call and a tuple append, well under a
+    microsecond). finish() feeds the stage histograms once per run.
+    """
+
+    __slots__ = ("pipeline", "counter", "started_at", "_last", "_last_sql", "stages")
+
+    def __init__(self, pipeline: str, counter: Optional[Any] = None):
+        self.pipeline = pipeline
+        self.counter = counter  # anything with a `statements` attribute
+        self.started_at = self._last = perf_counter()
+        self._last_sql = getattr(counter, "statements", 0)
+        self.stages: List[Tuple[str, float, int]] = []
+
+    def lap(self, stage: str) -> None:
+        now = perf_counter()
+        sql = getattr(self.counter, "statements", 0)
+        self.stages.append((stage, now - self._last, sql - self._last_sql))
+        self._last = now
+        self._last_sql = sql
+
+    def finish(self) -> float:
+        total = perf_counter() - self.started_at
+        for stage, seconds, sql in self.stages:
+            registry.histogram(
+                "aegis_pipeline_stage_seconds",
+                "RiskPipeline time per stage",
+                pipeline=self.pipeline,
+                stage=stage,
+            ).observe(seconds)
+            if sql:
+                registry.counter(
+                    "aegis_pipeline_sql_statements_total",
+                    "SQL round trips issued by RiskPipeline, per stage",
+                    pipeline=self.pipeline,
+                    stage=stage,
+                ).inc(sql)
+        registry.histogram(
+            "aegis_pipeline_seconds",
+            "RiskPipeline end-to-end time",
+            pipeline=self.pipeline,
+        ).observe(total)
+        return total
+
+    def as_dict(self) -> Dict[str, Any]:
+        stages: Dict[str, Dict[str, float]] = {}
+        for stage, seconds, sql in self.stages:
+            entry = stages.setdefault(stage, {"ms": 0.0, "sql_statements": 0})
+            entry["ms"] += seconds * 1000.0
+            entry["sql_statements"] += sql
+        for entry in stages.values():
+            entry["ms"] = round(entry["ms"], 3)
+        return {
+            "total_ms": round((self._last - self.started_at) * 1000.0, 3),
+            "sql_statements": sum(sql for _, _, sql in self.stages),
+            "stages": stages,
+        }
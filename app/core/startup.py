@@ -1,4 +1,5 @@
 import uuid
+import json
 import datetime
 from app.data.database import get_connection
 from app.data.schema import (
@@ -8,8 +9,23 @@ from app.data.schema import (
     SIGNALS_TABLE,
     RISK_DECISIONS_TABLE,
     AUDIT_LOG_TABLE,
+    AUDIT_CHAIN_HEADS_TABLE,
+    AUDIT_VERIFICATION_CHECKPOINTS_TABLE,
+    SCORING_CONFIGS_TABLE,
+    SHADOW_SCORES_TABLE,
     REVIEW_CASES_TABLE,
+    DASHBOARD_COUNTERS_TABLE,
+    ACCOUNT_TXN_COUNTS_TABLE,
+    DASHBOARD_COUNTER_TRIGGERS,
+    METRICS_ROLLUPS_TABLE,
+    METRICS_ROLLUP_STATE_TABLE,
+    OUTBOX_TABLE,
+    IDEMPOTENCY_KEYS_TABLE,
 )
+from app.repositories.dashboard_repo import seed_dashboard_counters
+from app.data.indexes import ensure_managed_indexes
+from app.core.config import BLOCK_THRESHOLD, MANAGED_INDEXES_ON_STARTUP, REVIEW_THRESHOLD
+from app.risk.engine import SIGNAL_WEIGHTS
 from app.core.logging import get_logger
 
 
@@ -36,7 +52,17 @@ def initialize_database():
         cursor.execute(SIGNALS_TABLE)
         cursor.execute(RISK_DECISIONS_TABLE)
         cursor.execute(AUDIT_LOG_TABLE)
+        cursor.execute(AUDIT_CHAIN_HEADS_TABLE)
+        cursor.execute(AUDIT_VERIFICATION_CHECKPOINTS_TABLE)
+        cursor.execute(SCORING_CONFIGS_TABLE)
+        cursor.execute(SHADOW_SCORES_TABLE)
         cursor.execute(REVIEW_CASES_TABLE)
+        cursor.execute(DASHBOARD_COUNTERS_TABLE)
+        cursor.execute(ACCOUNT_TXN_COUNTS_TABLE)
+        cursor.execute(METRICS_ROLLUPS_TABLE)
+        cursor.execute(METRICS_ROLLUP_STATE_TABLE)
+        cursor.execute(OUTBOX_TABLE)
+        cursor.execute(IDEMPOTENCY_KEYS_TABLE)
 
         # Schema drift hardening (idempotent Postgres-only)
         cursor.execute("ALTER TABLE signals ADD COLUMN IF NOT EXISTS signal_weight REAL;")
@@ -45,23 +71,14 @@ def initialize_database():
         cursor.execute("ALTER TABLE audit_logs ADD COLUMN IF NOT EXISTS prev_hash TEXT;")
         cursor.execute("ALTER TABLE audit_logs ADD COLUMN IF NOT EXISTS event_hash TEXT;")
         cursor.execute("ALTER TABLE audit_logs ADD COLUMN IF NOT EXISTS created_at TIMESTAMP;")
+        cursor.execute("ALTER TABLE audit_logs ADD COLUMN IF NOT EXISTS metadata_raw TEXT;")
         cursor.execute("ALTER TABLE review_cases ADD COLUMN IF NOT EXISTS resolution_type TEXT;")
         cursor.execute("ALTER TABLE review_cases ADD COLUMN IF NOT EXISTS analyst_note TEXT;")
         cursor.execute("ALTER TABLE review_cases ADD COLUMN IF NOT EXISTS resolved_at TIMESTAMP;")
-
-        # Performance indexes (idempotent)
-        cursor.execute(
-            "CREATE INDEX IF NOT EXISTS idx_transactions_account_id ON transactions(account_id);"
-        )
-        cursor.execute(
-            "CREATE INDEX IF NOT EXISTS idx_transactions_timestamp ON transactions(txn_timestamp);"
-        )
-        cursor.execute(
-            "CREATE INDEX IF NOT EXISTS idx_risk_decisions_account_id ON risk_decisions(account_id);"
-        )
-        cursor.execute(
-            "CREATE INDEX IF NOT EXISTS idx_audit_logs_created_at ON audit_logs(created_at);"
-        )
+        cursor.execute("ALTER TABLE scoring_configs ADD COLUMN IF NOT EXISTS is_shadow BOOLEAN DEFAULT FALSE;")
+        cursor.execute("ALTER TABLE risk_decisions ADD COLUMN IF NOT EXISTS txn_id TEXT;")
+        cursor.execute("ALTER TABLE risk_decisions ADD COLUMN IF NOT EXISTS scoring_config_version INTEGER;")
+        cursor.execute("ALTER TABLE risk_decisions ADD COLUMN IF NOT EXISTS explanation JSONB;")
 
         # Seed minimal users + accounts if empty
         cursor.execute("SELECT COUNT(*) as count FROM users;")
@@ -69,6 +86,12 @@ def initialize_database():
         if result and result["count"] == 0:
             seed_minimal_data(cursor)
 
+        seed_scoring_config(cursor)
+
+        # Dashboard counters: install triggers, then count existing rows once
+        cursor.execute(DASHBOARD_COUNTER_TRIGGERS)
+        seed_dashboard_counters(cursor)
+
         conn.commit()
         logger.info("Database schema initialized and minimal data ensured.")
     except Exception as exc:
@@ -78,6 +101,14 @@ def initialize_database():
     finally:
         conn.close()
 
+    # Performance indexes are built concurrently, outside the schema transaction
+    if MANAGED_INDEXES_ON_STARTUP:
+        report = ensure_managed_indexes()
+        if report["created"] or report["rebuilt"] or report["dropped"]:
+            logger.info("Managed indexes updated: %s", report)
+        if report["failed"]:
+            logger.error("Managed index build failures: %s", report["failed"])
+
 
 def seed_minimal_data(cursor):
     now = datetime.datetime.utcnow()
@@ -99,4 +130,22 @@ def seed_minimal_data(cursor):
         VALUES (%s, %s, %s, %s, %s, %s)
         """,
         (account_id, user_id, "savings", 10000.0, "active", now),
-    )
\ No newline at end of file
+    )
+
+
+def seed_scoring_config(cursor):
+    """
+    Store the built-in weights as active version 1 if no version exists yet.
+    """
+    now = datetime.datetime.utcnow()
+    cursor.execute(
+        """
+        INSERT INTO scoring_configs (
+            version, weights, review_threshold, block_threshold,
+            is_active, note, created_at, activated_at
+        )
+        SELECT 1, %s, %s, %s, TRUE, 'built-in defaults', %s, %s
+        WHERE NOT EXISTS (SELECT 1 FROM scoring_configs)
+        """,
+        (json.dumps(SIGNAL_WEIGHTS, sort_keys=True), REVIEW_THRESHOLD, BLOCK_THRESHOLD, now, now),
+    )
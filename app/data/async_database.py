@@ -0,0 +1,65 @@
+import os
+from typing import Optional
+
+from app.data.database import (
+    DATABASE_URL,
+    DB_POOL_MAX_SIZE,
+    DB_POOL_MIN_SIZE,
+    DB_POOL_TIMEOUT_SECONDS,
+)
+
+
+# asyncpg closes connections idle this long; it has no maximum lifetime, so
+# DB_POOL_MAX_LIFETIME_SECONDS does not apply to this pool
+ASYNC_DB_POOL_MAX_IDLE_SECONDS = float(os.getenv("ASYNC_DB_POOL_MAX_IDLE_SECONDS", 300))
+
+_async_pool = None
+
+
+async def init_async_pool():
+    """
+    Create the process-wide asyncpg pool (INGESTION_DRIVER=asyncpg).
+
+    Sized by the same DB_POOL_* settings as the psycopg2 pool, but busy
+    connections are never recycled by age. asyncpg is imported here so
+    deployments on the sync driver do not need it.
+    """
+    global _async_pool
+    if _async_pool is None:
+        import asyncpg
+
+        _async_pool = await asyncpg.create_pool(
+            DATABASE_URL,
+            min_size=DB_POOL_MIN_SIZE,
+            max_size=DB_POOL_MAX_SIZE,
+            timeout=DB_POOL_TIMEOUT_SECONDS,
+            max_inactive_connection_lifetime=ASYNC_DB_POOL_MAX_IDLE_SECONDS,
+        )
+    return _async_pool
+
+
+def get_async_pool():
+    if _async_pool is None:
+        raise RuntimeError("Async connection pool is not initialized (INGESTION_DRIVER=asyncpg)")
+    return _async_pool
+
+
+async def close_async_pool() -> None:
+    global _async_pool
+    if _async_pool is not None:
+        await _async_pool.close()
+        _async_pool = None
+
+
+def async_pool_stats() -> Optional[dict]:
+    if _async_pool is None:
+        return None
+    size = _async_pool.get_size()
+    idle = _async_pool.get_idle_size()
+    return {
+        "size": size,
+        "idle": idle,
+        "in_use": size - idle,
+        "min_size": _async_pool.get_min_size(),
+        "max_size": _async_pool.get_max_size(),
+    }
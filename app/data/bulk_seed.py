@@ -0,0 +1,299 @@
+import datetime
+import math
+import random
+import time
+import uuid
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from app.ingestion.generator import CHANNELS, LOCATIONS, MERCHANT_CATEGORIES
+
+
+USER_COLUMNS = ("user_id", "name", "email", "phone", "kyc_level", "created_at")
+ACCOUNT_COLUMNS = ("account_id", "user_id", "account_type", "balance", "status", "created_at")
+TRANSACTION_COLUMNS = (
+    "txn_id", "user_id", "account_id", "amount", "txn_type", "channel",
+    "merchant_category", "location", "device_id", "txn_timestamp", "status",
+)
+
+ACCOUNT_TYPES = ("wallet", "savings")
+TXN_STATUSES = ("success", "failed")
+
+
+# ---------------------------------------------------------
+# COPY streaming
+# ---------------------------------------------------------
+
+_COPY_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+
+def _copy_value(value: Any) -> str:
+    if value is None:
+        return "\\N"
+    if isinstance(value, datetime.datetime):
+        return value.isoformat(sep=" ")
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, float):
+        return repr(value)
+    return str(value).translate(_COPY_ESCAPES)
+
+
+class CopyStream:
+    """
+    File-like reader rendering row tuples to COPY text format on demand, so
+    copy_expert() streams straight from a generator without buffering the
+    table in memory.
+    """
+
+    def __init__(self, rows: Iterable[Sequence[Any]]):
+        self._rows = iter(rows)
+        self._pending = ""
+        self.rows = 0
+
+    def read(self, size: int = -1) -> str:
+        parts = [self._pending]
+        length = len(self._pending)
+        while size < 0 or length < size:
+            row = next(self._rows, None)
+            if row is None:
+                break
+            line = "\t".join(_copy_value(v) for v in row) + "\n"
+            parts.append(line)
+            length += len(line)
+            self.rows += 1
+
+        data = "".join(parts)
+        if size < 0 or len(data) <= size:
+            self._pending = ""
+            return data
+        self._pending = data[size:]
+        return data[:size]
+
+
+def copy_rows(cursor, table: str, columns: Sequence[str], rows: Iterable[Sequence[Any]]) -> int:
+    """COPY `rows` into `table`; returns the number of rows sent."""
+    stream = CopyStream(rows)
+    cursor.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN", stream)
+    return stream.rows
+
+
+# ---------------------------------------------------------
+# Synthetic history
+# ---------------------------------------------------------
+
+def parse_weights(spec: Optional[str], choices: Sequence[str]) -> List[float]:
+    """
+    "upi=0.6,card=0.3" -> weights aligned with `choices`; unnamed choices get
+    0. None or "" means uniform.
+    """
+    if not spec:
+        return [1.0] * len(choices)
+    weights = dict.fromkeys(choices, 0.0)
+    for part in spec.split(","):
+        name, _, value = part.partition("=")
+        name = name.strip()
+        if name not in weights:
+            raise ValueError(f"unknown choice {name!r}; expected one of {', '.join(choices)}")
+        weights[name] = float(value)
+    if not any(weights.values()):
+        raise ValueError("at least one weight must be positive")
+    return [weights[c] for c in choices]
+
+
+class SeedProfile:
+    """
+    Shape of the generated population and its transaction history.
+
+    amount: lognormal(amount_mu, amount_sigma) clamped to [amount_min, amount_max]
+    device reuse: each transaction uses one of the user's known devices with
+        probability device_reuse, otherwise a new device (capped per user)
+    location: the user's home city with probability home_location_prob,
+        otherwise a LOCATIONS draw by location_weights
+    txns per account: exponential with mean txns_per_account (heavy users exist)
+    """
+
+    __slots__ = (
+        "seed", "users", "accounts_per_user", "txns_per_account", "history_days", "end",
+        "amount_mu", "amount_sigma", "amount_min", "amount_max",
+        "device_reuse", "max_devices_per_user", "home_location_prob",
+        "channel_weights", "location_weights", "merchant_weights", "failure_rate", "balance",
+    )
+
+    def __init__(
+        self,
+        *,
+        seed: int = 42,
+        users: int = 100_000,
+        accounts_per_user: float = 1.5,
+        txns_per_account: float = 20.0,
+        history_days: int = 90,
+        end: Optional[datetime.datetime] = None,
+        amount_mu: float = 6.2,
+        amount_sigma: float = 1.1,
+        amount_min: float = 10.0,
+        amount_max: float = 5000.0,
+        device_reuse: float = 0.9,
+        max_devices_per_user: int = 5,
+        home_location_prob: float = 0.85,
+        channel_weights: Optional[List[float]] = None,
+        location_weights: Optional[List[float]] = None,
+        merchant_weights: Optional[List[float]] = None,
+        failure_rate: float = 0.05,
+        balance: float = 10000.0,
+    ):
+        self.seed = seed
+        self.users = users
+        self.accounts_per_user = accounts_per_user
+        self.txns_per_account = txns_per_account
+        self.history_days = history_days
+        # Back-dated from a fixed instant so output depends only on the profile
+        self.end = end or datetime.datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+        self.amount_mu = amount_mu
+        self.amount_sigma = amount_sigma
+        self.amount_min = amount_min
+        self.amount_max = amount_max
+        self.device_reuse = device_reuse
+        self.max_devices_per_user = max_devices_per_user
+        self.home_location_prob = home_location_prob
+        self.channel_weights = channel_weights or [1.0] * len(CHANNELS)
+        self.location_weights = location_weights or [1.0] * len(LOCATIONS)
+        self.merchant_weights = merchant_weights or [1.0] * len(MERCHANT_CATEGORIES)
+        self.failure_rate = failure_rate
+        self.balance = balance
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+def _uuid(rng: random.Random) -> str:
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+class _UserHistory:
+    """
+    Everything generated for one user index. Each user draws from its own
+    RNG seeded by (seed, index), so a user's rows are identical whichever
+    table is being streamed and however the run is chunked.
+    """
+
+    __slots__ = ("profile", "index", "rng", "user", "accounts")
+
+    def __init__(self, profile: SeedProfile, index: int):
+        self.profile = profile
+        self.index = index
+        self.rng = rng = random.Random(f"{profile.seed}:{index}")
+
+        span = datetime.timedelta(days=profile.history_days)
+        created_at = profile.end - span - datetime.timedelta(seconds=rng.randrange(30 * 86400))
+        user_id = _uuid(rng)
+        self.user = (
+            user_id,
+            f"User_{index}",
+            f"user{index}@example.com",
+            f"+91{9000000000 + index}",
+            rng.choice((1, 2, 2, 3)),
+            created_at,
+        )
+
+        # At least one account; the fractional part of the mean is a coin flip
+        whole = int(profile.accounts_per_user)
+        n_accounts = max(1, whole + (rng.random() < profile.accounts_per_user - whole))
+        self.accounts = [
+            (
+                _uuid(rng),
+                user_id,
+                ACCOUNT_TYPES[i % len(ACCOUNT_TYPES)],
+                profile.balance,
+                "active",
+                created_at,
+            )
+            for i in range(n_accounts)
+        ]
+
+    def transactions(self) -> Iterator[Tuple]:
+        profile = self.profile
+        rng = self.rng
+        user_id = self.user[0]
+        home = rng.choices(LOCATIONS, weights=profile.location_weights)[0]
+        devices = [f"device_{self.index}_0"]
+        window = profile.history_days * 86400.0
+        start = profile.end - datetime.timedelta(days=profile.history_days)
+
+        for account in self.accounts:
+            account_id = account[0]
+            count = int(round(rng.expovariate(1.0 / profile.txns_per_account))) if profile.txns_per_account > 0 else 0
+            offsets = sorted(rng.random() * window for _ in range(count))
+            for offset in offsets:
+                if rng.random() >= profile.device_reuse and len(devices) < profile.max_devices_per_user:
+                    devices.append(f"device_{self.index}_{len(devices)}")
+                    device_id = devices[-1]
+                else:
+                    device_id = rng.choice(devices)
+
+                if rng.random() < profile.home_location_prob:
+                    location = home
+                else:
+                    location = rng.choices(LOCATIONS, weights=profile.location_weights)[0]
+
+                amount = math.exp(rng.gauss(profile.amount_mu, profile.amount_sigma))
+                amount = round(min(max(amount, profile.amount_min), profile.amount_max), 2)
+
+                yield (
+                    _uuid(rng),
+                    user_id,
+                    account_id,
+                    amount,
+                    "debit",
+                    rng.choices(CHANNELS, weights=profile.channel_weights)[0],
+                    rng.choices(MERCHANT_CATEGORIES, weights=profile.merchant_weights)[0],
+                    location,
+                    device_id,
+                    start + datetime.timedelta(seconds=offset),
+                    TXN_STATUSES[rng.random() < profile.failure_rate],
+                )
+
+
+def bulk_seed(conn, profile: SeedProfile, *, chunk_users: int = 10_000, progress=None) -> Dict[str, Any]:
+    """
+    Stream profile.users users, their accounts and back-dated transactions
+    into Postgres with COPY, committing every `chunk_users` users.
+
+    Output is deterministic for a given profile (seed, sizes, distributions
+    and end). Returns per-table row counts, COPY time and rows/sec.
+    """
+    cursor = conn.cursor()
+    tables = {
+        name: {"rows": 0, "seconds": 0.0}
+        for name in ("users", "accounts", "transactions")
+    }
+    started = time.perf_counter()
+
+    def timed_copy(table, columns, rows):
+        t0 = time.perf_counter()
+        tables[table]["rows"] += copy_rows(cursor, table, columns, rows)
+        tables[table]["seconds"] += time.perf_counter() - t0
+
+    for first in range(0, profile.users, chunk_users):
+        indexes = range(first, min(first + chunk_users, profile.users))
+        histories = [_UserHistory(profile, i) for i in indexes]
+
+        timed_copy("users", USER_COLUMNS, (h.user for h in histories))
+        timed_copy("accounts", ACCOUNT_COLUMNS, (a for h in histories for a in h.accounts))
+        timed_copy("transactions", TRANSACTION_COLUMNS, (t for h in histories for t in h.transactions()))
+        conn.commit()
+
+        if progress:
+            progress(indexes.stop, tables)
+
+    elapsed = time.perf_counter() - started
+    total = sum(t["rows"] for t in tables.values())
+    for stats in tables.values():
+        stats["rows_per_sec"] = round(stats["rows"] / stats["seconds"], 1) if stats["seconds"] else None
+        stats["seconds"] = round(stats["seconds"], 3)
+
+    return {
+        "tables": tables,
+        "total_rows": total,
+        "elapsed_s": round(elapsed, 3),
+        "rows_per_sec": round(total / elapsed, 1) if elapsed else None,
+    }
@@ -1,15 +1,257 @@
 import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
 import psycopg2
+from psycopg2 import extensions
 from psycopg2.extras import RealDictCursor
 from dotenv import load_dotenv
 
+from app.core.instrumentation import InstrumentedCursor
+
 load_dotenv()
 
 DATABASE_URL = os.getenv("DATABASE_URL")
 
+DB_POOL_MIN_SIZE = int(os.getenv("DB_POOL_MIN_SIZE", 1))
+DB_POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX_SIZE", 10))
+DB_POOL_TIMEOUT_SECONDS = float(os.getenv("DB_POOL_TIMEOUT_SECONDS", 10))
+DB_POOL_MAX_LIFETIME_SECONDS = float(os.getenv("DB_POOL_MAX_LIFETIME_SECONDS", 1800))
+DB_POOL_HEALTH_CHECK_SECONDS = float(os.getenv("DB_POOL_HEALTH_CHECK_SECONDS", 30))
+
 
 def get_connection():
     return psycopg2.connect(
         DATABASE_URL,
         cursor_factory=RealDictCursor
     )
+
+
+class PoolTimeout(Exception):
+    """Raised when no pooled connection becomes available in time."""
+
+
+class ConnectionPool:
+    """
+    Thread-safe, bounded pool of psycopg2 connections.
+
+    - Blocks up to `timeout` seconds when all connections are checked out
+    - Pings connections that sat idle longer than `health_check_interval`
+    - Recycles connections older than `max_lifetime`
+    - Tracks checkout wait times for observability
+    """
+
+    def __init__(
+        self,
+        dsn,
+        *,
+        min_size: int = DB_POOL_MIN_SIZE,
+        max_size: int = DB_POOL_MAX_SIZE,
+        timeout: float = DB_POOL_TIMEOUT_SECONDS,
+        max_lifetime: float = DB_POOL_MAX_LIFETIME_SECONDS,
+        health_check_interval: float = DB_POOL_HEALTH_CHECK_SECONDS,
+    ):
+        if max_size < 1 or min_size < 0 or min_size > max_size:
+            raise ValueError("Invalid pool sizing: require 0 <= min_size <= max_size, max_size >= 1")
+
+        self.dsn = dsn
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_lifetime = max_lifetime
+        self.health_check_interval = health_check_interval
+
+        self._cond = threading.Condition()
+        self._idle = deque()  # (conn, created_at, last_used_at)
+        self._created_at = {}  # id(conn) -> created_at
+        self._size = 0
+        self._closed = False
+
+        self._checkouts = 0
+        self._waits = 0
+        self._total_wait_s = 0.0
+        self._max_wait_s = 0.0
+        self._timeouts = 0
+        self._recycled = 0
+        self._health_check_failures = 0
+
+        for _ in range(min_size):
+            conn = self._connect()
+            self._size += 1
+            now = time.monotonic()
+            self._idle.append((conn, now, now))
+
+    def _connect(self):
+        conn = psycopg2.connect(self.dsn, cursor_factory=InstrumentedCursor)
+        self._created_at[id(conn)] = time.monotonic()
+        return conn
+
+    def _discard(self, conn) -> None:
+        self._created_at.pop(id(conn), None)
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def _is_expired(self, conn, now: float) -> bool:
+        created_at = self._created_at.get(id(conn), now)
+        return self.max_lifetime > 0 and now - created_at >= self.max_lifetime
+
+    def _is_healthy(self, conn) -> bool:
+        if conn.closed:
+            return False
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT 1")
+            cursor.fetchone()
+            conn.rollback()
+            return True
+        except Exception:
+            return False
+
+    def getconn(self):
+        started_at = time.monotonic()
+        deadline = started_at + self.timeout
+        waited = False
+
+        while True:
+            conn = None
+            with self._cond:
+                while True:
+                    if self._closed:
+                        raise PoolTimeout("Connection pool is closed")
+                    if self._idle:
+                        conn, _, last_used_at = self._idle.pop()
+                        break
+                    if self._size < self.max_size:
+                        self._size += 1
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._timeouts += 1
+                        raise PoolTimeout(
+                            f"No database connection available within {self.timeout}s"
+                        )
+                    waited = True
+                    self._cond.wait(remaining)
+
+            now = time.monotonic()
+
+            if conn is None:
+                try:
+                    conn = self._connect()
+                except Exception:
+                    with self._cond:
+                        self._size -= 1
+                        self._cond.notify()
+                    raise
+            elif self._is_expired(conn, now):
+                self._discard(conn)
+                with self._cond:
+                    self._size -= 1
+                    self._recycled += 1
+                continue
+            elif now - last_used_at >= self.health_check_interval and not self._is_healthy(conn):
+                self._discard(conn)
+                with self._cond:
+                    self._size -= 1
+                    self._health_check_failures += 1
+                continue
+
+            wait_s = time.monotonic() - started_at
+            with self._cond:
+                self._checkouts += 1
+                if waited:
+                    self._waits += 1
+                self._total_wait_s += wait_s
+                self._max_wait_s = max(self._max_wait_s, wait_s)
+            return conn
+
+    def putconn(self, conn) -> None:
+        reusable = not conn.closed and not self._closed
+
+        if reusable and conn.get_transaction_status() != extensions.TRANSACTION_STATUS_IDLE:
+            try:
+                conn.rollback()
+            except Exception:
+                reusable = False
+
+        now = time.monotonic()
+        expired = reusable and self._is_expired(conn, now)
+        if expired:
+            reusable = False
+
+        with self._cond:
+            if expired:
+                self._recycled += 1
+            if reusable:
+                self._idle.append((conn, self._created_at.get(id(conn), now), now))
+            else:
+                self._size -= 1
+            self._cond.notify()
+
+        if not reusable:
+            self._discard(conn)
+
+    @contextmanager
+    def connection(self):
+        """Borrow a connection for the duration of a `with` block."""
+        conn = self.getconn()
+        try:
+            yield conn
+        finally:
+            self.putconn(conn)
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._size -= len(idle)
+            self._cond.notify_all()
+        for conn, _, _ in idle:
+            self._discard(conn)
+
+    def stats(self) -> dict:
+        with self._cond:
+            idle = len(self._idle)
+            return {
+                "size": self._size,
+                "idle": idle,
+                "in_use": self._size - idle,
+                "min_size": self.min_size,
+                "max_size": self.max_size,
+                "checkouts": self._checkouts,
+                "waits": self._waits,
+                "avg_wait_ms": round(self._total_wait_s * 1000.0 / self._checkouts, 3)
+                if self._checkouts
+                else 0.0,
+                "max_wait_ms": round(self._max_wait_s * 1000.0, 3),
+                "timeouts": self._timeouts,
+                "recycled": self._recycled,
+                "health_check_failures": self._health_check_failures,
+            }
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> ConnectionPool:
+    """Return the process-wide connection pool, creating it on first use."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(DATABASE_URL)
+    return _pool
+
+
+def close_pool() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
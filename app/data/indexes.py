@@ -0,0 +1,456 @@
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.logging import get_logger
+from app.data.database import get_connection
+
+
+logger = get_logger(__name__)
+
+
+class ManagedIndex:
+    """One index in the managed set, with the query shapes it serves."""
+
+    __slots__ = ("name", "table", "columns", "where", "using", "unique", "requires", "serves")
+
+    def __init__(
+        self,
+        name: str,
+        table: str,
+        columns: str,
+        *,
+        where: Optional[str] = None,
+        using: Optional[str] = None,
+        unique: bool = False,
+        requires: Optional[str] = None,
+        serves: str = "",
+    ):
+        self.name = name
+        self.table = table
+        self.columns = columns
+        self.where = where
+        self.using = using
+        self.unique = unique
+        # SQL returning one boolean; the build is deferred while it is false
+        self.requires = requires
+        self.serves = serves
+
+    def ddl(self) -> str:
+        kind = "UNIQUE INDEX" if self.unique else "INDEX"
+        method = f" USING {self.using}" if self.using else ""
+        sql = f"CREATE {kind} CONCURRENTLY IF NOT EXISTS {self.name} ON {self.table}{method} ({self.columns})"
+        if self.where:
+            sql += f" WHERE {self.where}"
+        return sql
+
+
+# Metadata indexes wait for scripts/migrate_audit_metadata_jsonb.py
+_AUDIT_METADATA_IS_JSONB = """
+    SELECT EXISTS (
+        SELECT 1
+        FROM information_schema.columns
+        WHERE table_schema = current_schema()
+          AND table_name = 'audit_logs'
+          AND column_name = 'metadata'
+          AND data_type = 'jsonb'
+    )
+"""
+
+
+# Equality column first, sort/range column second, matching the repository
+# queries so "WHERE a = ? ORDER BY b DESC LIMIT n" is an index range scan.
+MANAGED_INDEXES: List[ManagedIndex] = [
+    ManagedIndex(
+        "idx_transactions_account_ts_id", "transactions", "account_id, txn_timestamp, txn_id",
+        serves="24h spend sum, profile/account recent transactions, account transaction pages",
+    ),
+    ManagedIndex(
+        "idx_transactions_timestamp", "transactions", "txn_timestamp",
+        serves="metrics rollup windows",
+    ),
+    ManagedIndex(
+        "idx_risk_decisions_account_created", "risk_decisions", "account_id, created_at",
+        serves="fetch_latest_decision(s), risk trend, profile latest decision",
+    ),
+    ManagedIndex(
+        "idx_risk_decisions_txn_id_key", "risk_decisions", "txn_id",
+        where="txn_id IS NOT NULL",
+        unique=True,
+        serves="transaction explain lookup, account transaction -> decision join (one decision per txn)",
+    ),
+    ManagedIndex(
+        "idx_risk_decisions_created_id", "risk_decisions", "created_at, decision_id",
+        serves="metrics rollup windows, latest decision pages",
+    ),
+    ManagedIndex(
+        "idx_signals_user_created", "signals", "user_id, created_at",
+        serves="profile/account recent signals",
+    ),
+    ManagedIndex(
+        "idx_signals_created_id", "signals", "created_at, signal_id",
+        serves="recent signal pages",
+    ),
+    ManagedIndex(
+        "idx_review_cases_status_created_id", "review_cases", "status, created_at, case_id",
+        serves="open case queue pages",
+    ),
+    ManagedIndex(
+        "idx_review_cases_account_open", "review_cases", "account_id, created_at",
+        where="status = 'OPEN'",
+        serves="profile/account open case",
+    ),
+    ManagedIndex(
+        "idx_review_cases_created_at", "review_cases", "created_at",
+        serves="metrics rollup windows",
+    ),
+    ManagedIndex(
+        "idx_review_cases_resolved_at", "review_cases", "resolved_at",
+        serves="metrics rollup windows",
+    ),
+    ManagedIndex(
+        "idx_accounts_created_id", "accounts", "created_at, account_id",
+        serves="account list pages",
+    ),
+    ManagedIndex(
+        "idx_audit_logs_entity_created_id", "audit_logs", "entity_type, entity_id, created_at, audit_id",
+        serves="log_event chain head seed, fetch_account_audit pages",
+    ),
+    ManagedIndex(
+        "idx_audit_logs_created_audit_id", "audit_logs", "created_at, audit_id",
+        serves="integrity verification checkpoints",
+    ),
+    ManagedIndex(
+        "idx_audit_logs_metadata", "audit_logs", "metadata jsonb_path_ops",
+        using="gin",
+        requires=_AUDIT_METADATA_IS_JSONB,
+        serves="audit metadata containment filters",
+    ),
+    ManagedIndex(
+        "idx_audit_logs_metadata_txn", "audit_logs", "(metadata ->> 'transaction_id')",
+        where="event_type = 'DECISION_MADE'",
+        requires=_AUDIT_METADATA_IS_JSONB,
+        serves="DECISION_MADE lookup by transaction_id",
+    ),
+    ManagedIndex(
+        "idx_shadow_scores_candidate_created", "shadow_scores", "candidate_version, created_at",
+        serves="shadow comparison window",
+    ),
+    ManagedIndex(
+        "idx_idempotency_keys_expires_at", "idempotency_keys", "expires_at",
+        serves="expired idempotency key purge",
+    ),
+]
+
+# Superseded by a composite index with the same leading columns (the
+# *_created_id indexes add the keyset pagination tie-breaker), or by a typed
+# column (explain no longer parses audit metadata)
+RETIRED_INDEXES = (
+    "idx_transactions_account_id",
+    "idx_transactions_account_ts",
+    "idx_risk_decisions_account_id",
+    "idx_risk_decisions_created_at",
+    "idx_risk_decisions_txn_id",
+    "idx_review_cases_status_created",
+    "idx_accounts_created_at",
+    "idx_audit_logs_created_at",
+    "idx_audit_logs_entity_created",
+    "idx_audit_logs_decision_txn",
+)
+
+# Serializes index builds across API workers / scripts
+_INDEX_LOCK_KEY = "aegis_managed_indexes"
+
+
+def _index_state(cursor, names: List[str]) -> Dict[str, bool]:
+    cursor.execute(
+        """
+        SELECT c.relname AS name, i.indisvalid AS valid
+        FROM pg_index i
+        JOIN pg_class c ON c.oid = i.indexrelid
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE n.nspname = current_schema()
+          AND c.relname = ANY(%s)
+        """,
+        (names,),
+    )
+    return {row["name"]: row["valid"] for row in cursor.fetchall()}
+
+
+def ensure_managed_indexes(*, drop_retired: bool = True) -> Dict[str, Any]:
+    """
+    Create every missing managed index with CREATE INDEX CONCURRENTLY.
+
+    Runs in autocommit on its own connection (concurrent builds cannot run
+    inside a transaction) and does not block writers. An index left INVALID
+    by an interrupted build is dropped and rebuilt. Indexes whose `requires`
+    check is false are reported as deferred. Retired indexes are only
+    dropped once every managed index is valid. Returns what was done; if
+    another process holds the build lock nothing is attempted.
+    """
+    conn = get_connection()
+    conn.autocommit = True
+    report: Dict[str, Any] = {"skipped": False, "created": [], "rebuilt": [], "deferred": [], "dropped": [], "failed": {}}
+    try:
+        cursor = conn.cursor()
+        cursor.execute("SELECT pg_try_advisory_lock(hashtext(%s)) AS locked", (_INDEX_LOCK_KEY,))
+        if not cursor.fetchone()["locked"]:
+            report["skipped"] = True
+            return report
+
+        try:
+            state = _index_state(cursor, [index.name for index in MANAGED_INDEXES])
+            for index in MANAGED_INDEXES:
+                try:
+                    if index.requires:
+                        cursor.execute(index.requires)
+                        if not list(cursor.fetchone().values())[0]:
+                            report["deferred"].append(index.name)
+                            continue
+                    if state.get(index.name) is False:
+                        cursor.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {index.name}")
+                        cursor.execute(index.ddl())
+                        report["rebuilt"].append(index.name)
+                    elif index.name not in state:
+                        cursor.execute(index.ddl())
+                        report["created"].append(index.name)
+                except Exception as exc:
+                    report["failed"][index.name] = str(exc)
+                    logger.error("Managed index %s failed: %s", index.name, exc)
+
+            if drop_retired and not report["failed"]:
+                for name in _index_state(cursor, list(RETIRED_INDEXES)):
+                    cursor.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+                    report["dropped"].append(name)
+        finally:
+            cursor.execute("SELECT pg_advisory_unlock(hashtext(%s))", (_INDEX_LOCK_KEY,))
+    finally:
+        conn.close()
+
+    return report
+
+
+# ---------------------------------------------------------
+# EXPLAIN advisor
+# ---------------------------------------------------------
+
+class AdvisorQuery:
+    """
+    A repository query shape plus a statement that picks realistic
+    parameters for it (its first row is used as the parameter tuple).
+    """
+
+    __slots__ = ("name", "sql", "sample_sql", "fallback")
+
+    def __init__(self, name: str, sql: str, sample_sql: Optional[str], fallback: Tuple):
+        self.name = name
+        self.sql = sql
+        self.sample_sql = sample_sql
+        self.fallback = fallback
+
+
+_SAMPLE_ACCOUNT = "SELECT account_id FROM accounts ORDER BY created_at DESC NULLS LAST LIMIT 1"
+_SAMPLE_USER = "SELECT user_id FROM accounts ORDER BY created_at DESC NULLS LAST LIMIT 1"
+
+ADVISOR_QUERIES: List[AdvisorQuery] = [
+    AdvisorQuery(
+        "decision_repo.fetch_latest_decision",
+        "SELECT risk_score, decision FROM risk_decisions WHERE account_id = %s ORDER BY created_at DESC LIMIT 1",
+        _SAMPLE_ACCOUNT,
+        ("",),
+    ),
+    AdvisorQuery(
+        "decision_repo.fetch_risk_trend",
+        "SELECT created_at, risk_score, decision FROM risk_decisions WHERE account_id = %s "
+        "ORDER BY created_at DESC LIMIT 20",
+        _SAMPLE_ACCOUNT,
+        ("",),
+    ),
+    AdvisorQuery(
+        "pipeline._generate_signals.total_spend",
+        "SELECT COALESCE(SUM(amount),0) AS total_spend FROM transactions WHERE account_id = %s "
+        "AND txn_timestamp >= NOW() - INTERVAL '1 day'",
+        _SAMPLE_ACCOUNT,
+        ("",),
+    ),
+    AdvisorQuery(
+        "profile.recent_transactions",
+        "SELECT txn_id, amount, txn_timestamp, status FROM transactions WHERE account_id = %s "
+        "ORDER BY txn_timestamp DESC LIMIT 10",
+        _SAMPLE_ACCOUNT,
+        ("",),
+    ),
+    AdvisorQuery(
+        "profile.recent_signals",
+        "SELECT signal_type, signal_value, description, created_at FROM signals WHERE user_id = %s "
+        "ORDER BY created_at DESC LIMIT 10",
+        _SAMPLE_USER,
+        ("",),
+    ),
+    AdvisorQuery(
+        "profile.open_case",
+        "SELECT case_id, decision, risk_score, status, created_at FROM review_cases "
+        "WHERE account_id = %s AND status = 'OPEN' ORDER BY created_at DESC LIMIT 1",
+        _SAMPLE_ACCOUNT,
+        ("",),
+    ),
+    AdvisorQuery(
+        "cases.open_queue.page",
+        "SELECT case_id, user_id, account_id, decision, risk_score, status, created_at FROM review_cases "
+        "WHERE status = 'OPEN' AND (created_at, case_id) < (%s, %s) "
+        "ORDER BY created_at DESC, case_id DESC LIMIT 51",
+        "SELECT created_at, case_id FROM review_cases WHERE status = 'OPEN' AND created_at IS NOT NULL "
+        "ORDER BY created_at DESC, case_id DESC OFFSET 50 LIMIT 1",
+        ("infinity", ""),
+    ),
+    AdvisorQuery(
+        "accounts.list.page",
+        "SELECT account_id, user_id, status, balance, created_at FROM accounts "
+        "WHERE (created_at, account_id) < (%s, %s) ORDER BY created_at DESC, account_id DESC LIMIT 201",
+        "SELECT created_at, account_id FROM accounts WHERE created_at IS NOT NULL "
+        "ORDER BY created_at DESC, account_id DESC OFFSET 200 LIMIT 1",
+        ("infinity", ""),
+    ),
+    AdvisorQuery(
+        "routes.recent_signals.page",
+        "SELECT signal_id, user_id, signal_type, signal_value, description, created_at FROM signals "
+        "WHERE (created_at, signal_id) < (%s, %s) ORDER BY created_at DESC, signal_id DESC LIMIT 21",
+        "SELECT created_at, signal_id FROM signals WHERE created_at IS NOT NULL "
+        "ORDER BY created_at DESC, signal_id DESC OFFSET 20 LIMIT 1",
+        ("infinity", ""),
+    ),
+    AdvisorQuery(
+        "routes.latest_decisions.page",
+        "SELECT decision_id, user_id, account_id, risk_score, decision, reasons, created_at FROM risk_decisions "
+        "WHERE (created_at, decision_id) < (%s, %s) ORDER BY created_at DESC, decision_id DESC LIMIT 11",
+        "SELECT created_at, decision_id FROM risk_decisions WHERE created_at IS NOT NULL "
+        "ORDER BY created_at DESC, decision_id DESC OFFSET 10 LIMIT 1",
+        ("infinity", ""),
+    ),
+    AdvisorQuery(
+        "audit.logger.chain_head_seed",
+        "SELECT event_hash FROM audit_logs WHERE entity_type = 'ACCOUNT' AND entity_id = %s "
+        "AND event_hash IS NOT NULL ORDER BY created_at DESC LIMIT 1",
+        _SAMPLE_ACCOUNT,
+        ("",),
+    ),
+    AdvisorQuery(
+        "audit.queries.fetch_account_audit.page",
+        "SELECT audit_id, event_type, metadata, created_at FROM audit_logs "
+        "WHERE entity_type = 'ACCOUNT' AND entity_id = %s AND (created_at, audit_id) > (%s, %s) "
+        "ORDER BY created_at ASC, audit_id ASC LIMIT 51",
+        "SELECT entity_id, created_at, audit_id FROM audit_logs WHERE entity_type = 'ACCOUNT' "
+        "AND created_at IS NOT NULL ORDER BY created_at DESC LIMIT 1",
+        ("", "-infinity", ""),
+    ),
+    AdvisorQuery(
+        "audit.queries.fetch_account_audit.metadata_filter",
+        "SELECT audit_id, event_type, metadata, created_at FROM audit_logs "
+        "WHERE metadata::jsonb @> jsonb_build_object('transaction_id', %s::text) ORDER BY created_at ASC LIMIT 50",
+        "SELECT txn_id FROM transactions ORDER BY txn_timestamp DESC LIMIT 1",
+        ("",),
+    ),
+    AdvisorQuery(
+        "transaction_repo.fetch_account_transactions.page",
+        "SELECT t.txn_id, t.amount, t.txn_timestamp, d.decision, d.risk_score FROM transactions t "
+        "LEFT JOIN risk_decisions d ON d.txn_id = t.txn_id "
+        "WHERE t.account_id = %s AND (t.txn_timestamp, t.txn_id) < ('infinity', '') "
+        "ORDER BY t.txn_timestamp DESC, t.txn_id DESC LIMIT 51",
+        _SAMPLE_ACCOUNT,
+        ("",),
+    ),
+    AdvisorQuery(
+        "decision_repo.fetch_decision_for_transaction",
+        "SELECT t.txn_id, d.decision, d.explanation FROM transactions t "
+        "LEFT JOIN risk_decisions d ON d.txn_id = t.txn_id WHERE t.txn_id = %s "
+        "ORDER BY d.created_at DESC NULLS LAST LIMIT 1",
+        "SELECT txn_id FROM transactions ORDER BY txn_timestamp DESC LIMIT 1",
+        ("",),
+    ),
+]
+
+
+def _walk_plan(node: Dict[str, Any], found: List[Dict[str, Any]]) -> None:
+    found.append(node)
+    for child in node.get("Plans", []):
+        _walk_plan(child, found)
+
+
+def _table_rows(cursor, tables: List[str]) -> Dict[str, float]:
+    if not tables:
+        return {}
+    cursor.execute(
+        """
+        SELECT relname, reltuples
+        FROM pg_class
+        WHERE relkind = 'r' AND relname = ANY(%s)
+        """,
+        (tables,),
+    )
+    return {row["relname"]: float(row["reltuples"]) for row in cursor.fetchall()}
+
+
+def explain_query(cursor, query: AdvisorQuery, *, min_rows: float) -> Dict[str, Any]:
+    """
+    EXPLAIN one registered query and flag sequential scans on tables
+    estimated above `min_rows` (small tables are seq-scanned by design).
+    """
+    params = query.fallback
+    if query.sample_sql:
+        cursor.execute(query.sample_sql)
+        row = cursor.fetchone()
+        if row:
+            params = tuple(row.values())
+
+    cursor.execute("EXPLAIN (FORMAT JSON) " + query.sql, params)
+    raw = cursor.fetchone()["QUERY PLAN"]
+    plan = (json.loads(raw) if isinstance(raw, str) else raw)[0]["Plan"]
+
+    nodes: List[Dict[str, Any]] = []
+    _walk_plan(plan, nodes)
+
+    scans = [node for node in nodes if node.get("Relation Name")]
+    rows = _table_rows(cursor, sorted({node["Relation Name"] for node in scans}))
+
+    seq_scans = [
+        node["Relation Name"]
+        for node in scans
+        if node["Node Type"] == "Seq Scan" and rows.get(node["Relation Name"], 0) >= min_rows
+    ]
+
+    return {
+        "query": query.name,
+        "total_cost": plan.get("Total Cost"),
+        "scans": [
+            {
+                "node": node["Node Type"],
+                "table": node["Relation Name"],
+                "index": node.get("Index Name"),
+                "estimated_table_rows": int(rows.get(node["Relation Name"], 0)),
+            }
+            for node in scans
+        ],
+        "seq_scans": seq_scans,
+        "ok": not seq_scans,
+    }
+
+
+def run_index_advisor(conn, *, min_rows: float = 1000) -> Dict[str, Any]:
+    """EXPLAIN every ADVISOR_QUERIES entry; nothing is executed for real."""
+    cursor = conn.cursor()
+    results = []
+    try:
+        for query in ADVISOR_QUERIES:
+            try:
+                results.append(explain_query(cursor, query, min_rows=min_rows))
+            except Exception as exc:
+                conn.rollback()
+                results.append({"query": query.name, "error": str(exc), "ok": False})
+    finally:
+        conn.rollback()
+
+    flagged = [r["query"] for r in results if not r["ok"]]
+    return {
+        "queries": len(results),
+        "flagged": flagged,
+        "results": results,
+    }
@@ -0,0 +1,115 @@
+import base64
+import binascii
+import datetime
+import json
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+
+# Position of the last row on a page: (created_at, id). created_at may be
+# None for legacy rows without a timestamp.
+Keyset = Tuple[Optional[datetime.datetime], str]
+
+
+class InvalidCursor(ValueError):
+    """Raised when a continuation token is malformed or was issued for another listing."""
+
+
+def encode_cursor(scope: str, created_at: Optional[datetime.datetime], row_id: Any) -> str:
+    payload = {
+        "s": scope,
+        "t": created_at.isoformat() if created_at is not None else None,
+        "k": str(row_id),
+    }
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(scope: str, token: Optional[str]) -> Optional[Keyset]:
+    """Decode a continuation token for `scope`; None/empty means the first page."""
+    if not token:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        payload = json.loads(raw)
+        if payload["s"] != scope:
+            raise InvalidCursor(f"cursor was issued for {payload['s']}, not {scope}")
+        created_at = datetime.datetime.fromisoformat(payload["t"]) if payload["t"] is not None else None
+        return created_at, str(payload["k"])
+    except InvalidCursor:
+        raise
+    except (binascii.Error, ValueError, KeyError, TypeError) as exc:
+        raise InvalidCursor("malformed cursor") from exc
+
+
+def fetch_keyset_page(
+    cursor,
+    *,
+    scope: str,
+    select_sql: str,
+    conditions: Sequence[str],
+    params: Sequence[Any],
+    created_column: str,
+    id_column: str,
+    descending: bool,
+    after: Optional[Keyset],
+    limit: int,
+    row_keys: Optional[Tuple[str, str]] = None,
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    One page of `select_sql` ordered by (created_column, id_column), starting
+    strictly after `after`. Returns (rows, next_cursor); next_cursor is None
+    on the last page.
+
+    Non-NULL timestamps are paged with a row comparison, an index range scan
+    on a (..., created_at, id) index regardless of depth. Rows with a NULL
+    timestamp keep Postgres' default placement (first when descending, last
+    when ascending) and are paged by id as a separate segment, so a page
+    costs one query except where it crosses into that segment.
+
+    `row_keys` names the (created_at, id) keys in the result rows when the
+    select list aliases them.
+    """
+    direction = "DESC" if descending else "ASC"
+    op = "<" if descending else ">"
+    created_key, id_key = row_keys or (created_column.split(".")[-1], id_column.split(".")[-1])
+
+    segments = ["null", "value"] if descending else ["value", "null"]
+    if after is not None:
+        segments = segments[segments.index("value" if after[0] is not None else "null"):]
+
+    rows: List[Dict[str, Any]] = []
+    for segment in segments:
+        want = limit + 1 - len(rows)
+        if want <= 0:
+            break
+
+        where = list(conditions)
+        args = list(params)
+        if segment == "null":
+            where.append(f"{created_column} IS NULL")
+            if after is not None:
+                where.append(f"{id_column} {op} %s")
+                args.append(after[1])
+            order = f"{id_column} {direction}"
+        else:
+            if after is not None:
+                where.append(f"({created_column}, {id_column}) {op} (%s, %s)")
+                args.extend(after)
+            else:
+                where.append(f"{created_column} IS NOT NULL")
+            order = f"{created_column} {direction}, {id_column} {direction}"
+
+        cursor.execute(
+            f"{select_sql} WHERE {' AND '.join(where)} ORDER BY {order} LIMIT %s",
+            (*args, want),
+        )
+        rows.extend(cursor.fetchall())
+        # Only the first segment resumes mid-way
+        after = None
+
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(scope, last[created_key], last[id_key])
@@ -60,6 +60,9 @@ CREATE TABLE IF NOT EXISTS risk_decisions (
     decision TEXT,
     reasons TEXT,
     created_at TIMESTAMP,
+    txn_id TEXT,
+    scoring_config_version INTEGER,
+    explanation JSONB,
     FOREIGN KEY(user_id) REFERENCES users(user_id),
     FOREIGN KEY(account_id) REFERENCES accounts(account_id)
 );
@@ -70,12 +73,61 @@ CREATE TABLE IF NOT EXISTS audit_logs (
     event_type TEXT,
     entity_type TEXT,
     entity_id TEXT,
-    metadata TEXT,
+    metadata JSONB,
+    metadata_raw TEXT,
     prev_hash TEXT,
     event_hash TEXT,
     created_at TIMESTAMP
 );
 """
+AUDIT_CHAIN_HEADS_TABLE = """
+CREATE TABLE IF NOT EXISTS audit_chain_heads (
+    entity_type TEXT NOT NULL,
+    entity_id TEXT NOT NULL,
+    event_hash TEXT NOT NULL,
+    updated_at TIMESTAMP,
+    PRIMARY KEY (entity_type, entity_id)
+);
+"""
+AUDIT_VERIFICATION_CHECKPOINTS_TABLE = """
+CREATE TABLE IF NOT EXISTS audit_verification_checkpoints (
+    checkpoint_id TEXT PRIMARY KEY,
+    last_audit_id TEXT,
+    last_created_at TIMESTAMP,
+    last_event_hash TEXT,
+    verified_events BIGINT DEFAULT 0,
+    chain_valid BOOLEAN DEFAULT TRUE,
+    first_invalid_audit_id TEXT,
+    updated_at TIMESTAMP
+);
+"""
+SCORING_CONFIGS_TABLE = """
+CREATE TABLE IF NOT EXISTS scoring_configs (
+    version INTEGER PRIMARY KEY,
+    weights TEXT NOT NULL,
+    review_threshold REAL NOT NULL,
+    block_threshold REAL NOT NULL,
+    is_active BOOLEAN DEFAULT FALSE,
+    is_shadow BOOLEAN DEFAULT FALSE,
+    note TEXT,
+    created_at TIMESTAMP,
+    activated_at TIMESTAMP
+);
+"""
+SHADOW_SCORES_TABLE = """
+CREATE TABLE IF NOT EXISTS shadow_scores (
+    shadow_id TEXT PRIMARY KEY,
+    txn_id TEXT,
+    account_id TEXT,
+    active_version INTEGER,
+    active_score REAL,
+    active_decision TEXT,
+    candidate_version INTEGER,
+    candidate_score REAL,
+    candidate_decision TEXT,
+    created_at TIMESTAMP
+);
+"""
 
 REVIEW_CASES_TABLE = """
 CREATE TABLE IF NOT EXISTS review_cases (
@@ -96,4 +148,205 @@ CREATE TABLE IF NOT EXISTS review_cases (
     FOREIGN KEY(user_id) REFERENCES users(user_id),
     FOREIGN KEY(account_id) REFERENCES accounts(account_id)
 );
-"""
\ No newline at end of file
+"""
+
+DASHBOARD_COUNTERS_TABLE = """
+CREATE TABLE IF NOT EXISTS dashboard_counters (
+    counter TEXT NOT NULL,
+    shard SMALLINT NOT NULL,
+    value NUMERIC NOT NULL DEFAULT 0,
+    PRIMARY KEY (counter, shard)
+);
+"""
+
+# Per-account transaction count, kept by the same statement-level triggers;
+# replaces COUNT(*) over an account's transactions in the account snapshot.
+ACCOUNT_TXN_COUNTS_TABLE = """
+CREATE TABLE IF NOT EXISTS account_txn_counts (
+    account_id TEXT PRIMARY KEY,
+    txn_count BIGINT NOT NULL DEFAULT 0
+);
+"""
+
+METRICS_ROLLUPS_TABLE = """
+CREATE TABLE IF NOT EXISTS metrics_rollups (
+    granularity TEXT NOT NULL,
+    bucket_start TIMESTAMP NOT NULL,
+    transactions INTEGER NOT NULL DEFAULT 0,
+    transaction_amount NUMERIC NOT NULL DEFAULT 0,
+    decisions INTEGER NOT NULL DEFAULT 0,
+    allow_count INTEGER NOT NULL DEFAULT 0,
+    review_count INTEGER NOT NULL DEFAULT 0,
+    block_count INTEGER NOT NULL DEFAULT 0,
+    risk_score_sum NUMERIC NOT NULL DEFAULT 0,
+    risk_score_hist INTEGER[] NOT NULL,
+    cases_opened INTEGER NOT NULL DEFAULT 0,
+    cases_resolved INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (granularity, bucket_start)
+);
+"""
+
+METRICS_ROLLUP_STATE_TABLE = """
+CREATE TABLE IF NOT EXISTS metrics_rollup_state (
+    name TEXT PRIMARY KEY,
+    watermark TIMESTAMP,
+    updated_at TIMESTAMP
+);
+"""
+
+# Side effects of a scored transaction (signals, review case, audit events),
+# written in the decision's transaction and materialized by the outbox worker
+# (app/services/outbox.py). payload is TEXT, not JSONB, so audit metadata
+# round-trips to exactly the value that gets hashed. Rows are deleted once
+# materialized; attempts/last_error track rows that keep failing.
+OUTBOX_TABLE = """
+CREATE TABLE IF NOT EXISTS outbox (
+    outbox_id BIGSERIAL PRIMARY KEY,
+    account_id TEXT NOT NULL,
+    txn_id TEXT,
+    payload TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+"""
+
+# Results of POST /transactions requests sent with an Idempotency-Key. A row
+# is inserted in the request's own transaction and committed together with
+# the response, so a committed row always carries its result; a concurrent
+# duplicate waits on the uncommitted key (app/services/idempotency.py).
+IDEMPOTENCY_KEYS_TABLE = """
+CREATE TABLE IF NOT EXISTS idempotency_keys (
+    idempotency_key TEXT PRIMARY KEY,
+    request_hash TEXT NOT NULL,
+    response JSONB,
+    created_at TIMESTAMP NOT NULL,
+    expires_at TIMESTAMP NOT NULL
+);
+"""
+
+# Statement-level triggers keep dashboard_counters in step with the base
+# tables inside the writing transaction. Deltas land on one of 16 shard rows
+# per counter (by backend pid) so concurrent writers rarely share a row lock.
+DASHBOARD_COUNTER_TRIGGERS = """
+CREATE OR REPLACE FUNCTION dashboard_counters_bump(p_counters TEXT[], p_deltas NUMERIC[])
+RETURNS VOID AS $$
+    INSERT INTO dashboard_counters (counter, shard, value)
+    SELECT c, pg_backend_pid() % 16, d
+    FROM unnest(p_counters, p_deltas) AS t(c, d)
+    WHERE d <> 0
+    ORDER BY c
+    ON CONFLICT (counter, shard)
+    DO UPDATE SET value = dashboard_counters.value + EXCLUDED.value;
+$$ LANGUAGE sql;
+
+CREATE OR REPLACE FUNCTION dashboard_counters_rows() RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        PERFORM dashboard_counters_bump(ARRAY[TG_TABLE_NAME::TEXT], ARRAY[(SELECT COUNT(*) FROM new_rows)::NUMERIC]);
+    ELSE
+        PERFORM dashboard_counters_bump(ARRAY[TG_TABLE_NAME::TEXT], ARRAY[-(SELECT COUNT(*) FROM old_rows)::NUMERIC]);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION dashboard_counters_review_cases() RETURNS TRIGGER AS $$
+DECLARE
+    delta NUMERIC := 0;
+BEGIN
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        delta := delta + (SELECT COUNT(*) FROM new_rows WHERE status = 'OPEN');
+    END IF;
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        delta := delta - (SELECT COUNT(*) FROM old_rows WHERE status = 'OPEN');
+    END IF;
+    PERFORM dashboard_counters_bump(ARRAY['open_cases'], ARRAY[delta]);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION dashboard_counters_risk_decisions() RETURNS TRIGGER AS $$
+DECLARE
+    counters TEXT[];
+    deltas NUMERIC[];
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        SELECT ARRAY_AGG(counter), ARRAY_AGG(delta) INTO counters, deltas FROM (
+            SELECT 'decision:' || decision AS counter, COUNT(*)::NUMERIC AS delta FROM new_rows GROUP BY decision
+            UNION ALL SELECT 'decisions', COUNT(*) FROM new_rows
+            UNION ALL SELECT 'risk_score_sum', COALESCE(SUM(risk_score::NUMERIC), 0) FROM new_rows
+        ) d;
+    ELSE
+        SELECT ARRAY_AGG(counter), ARRAY_AGG(-delta) INTO counters, deltas FROM (
+            SELECT 'decision:' || decision AS counter, COUNT(*)::NUMERIC AS delta FROM old_rows GROUP BY decision
+            UNION ALL SELECT 'decisions', COUNT(*) FROM old_rows
+            UNION ALL SELECT 'risk_score_sum', COALESCE(SUM(risk_score::NUMERIC), 0) FROM old_rows
+        ) d;
+    END IF;
+    PERFORM dashboard_counters_bump(counters, deltas);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Rows are upserted in account_id order so concurrent batches lock them consistently
+CREATE OR REPLACE FUNCTION account_txn_counts_bump() RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO account_txn_counts (account_id, txn_count)
+        SELECT account_id, COUNT(*)
+        FROM new_rows
+        WHERE account_id IS NOT NULL
+        GROUP BY account_id
+        ORDER BY account_id
+        ON CONFLICT (account_id)
+        DO UPDATE SET txn_count = account_txn_counts.txn_count + EXCLUDED.txn_count;
+    ELSE
+        UPDATE account_txn_counts c
+        SET txn_count = c.txn_count - d.n
+        FROM (SELECT account_id, COUNT(*) AS n FROM old_rows GROUP BY account_id) d
+        WHERE c.account_id = d.account_id;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS account_txn_counts_ins ON transactions;
+CREATE TRIGGER account_txn_counts_ins AFTER INSERT ON transactions
+    REFERENCING NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION account_txn_counts_bump();
+DROP TRIGGER IF EXISTS account_txn_counts_del ON transactions;
+CREATE TRIGGER account_txn_counts_del AFTER DELETE ON transactions
+    REFERENCING OLD TABLE AS old_rows FOR EACH STATEMENT EXECUTE FUNCTION account_txn_counts_bump();
+
+DROP TRIGGER IF EXISTS dashboard_counters_transactions_ins ON transactions;
+CREATE TRIGGER dashboard_counters_transactions_ins AFTER INSERT ON transactions
+    REFERENCING NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION dashboard_counters_rows();
+DROP TRIGGER IF EXISTS dashboard_counters_transactions_del ON transactions;
+CREATE TRIGGER dashboard_counters_transactions_del AFTER DELETE ON transactions
+    REFERENCING OLD TABLE AS old_rows FOR EACH STATEMENT EXECUTE FUNCTION dashboard_counters_rows();
+
+DROP TRIGGER IF EXISTS dashboard_counters_accounts_ins ON accounts;
+CREATE TRIGGER dashboard_counters_accounts_ins AFTER INSERT ON accounts
+    REFERENCING NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION dashboard_counters_rows();
+DROP TRIGGER IF EXISTS dashboard_counters_accounts_del ON accounts;
+CREATE TRIGGER dashboard_counters_accounts_del AFTER DELETE ON accounts
+    REFERENCING OLD TABLE AS old_rows FOR EACH STATEMENT EXECUTE FUNCTION dashboard_counters_rows();
+
+DROP TRIGGER IF EXISTS dashboard_counters_review_cases_ins ON review_cases;
+CREATE TRIGGER dashboard_counters_review_cases_ins AFTER INSERT ON review_cases
+    REFERENCING NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION dashboard_counters_review_cases();
+DROP TRIGGER IF EXISTS dashboard_counters_review_cases_upd ON review_cases;
+CREATE TRIGGER dashboard_counters_review_cases_upd AFTER UPDATE ON review_cases
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION dashboard_counters_review_cases();
+DROP TRIGGER IF EXISTS dashboard_counters_review_cases_del ON review_cases;
+CREATE TRIGGER dashboard_counters_review_cases_del AFTER DELETE ON review_cases
+    REFERENCING OLD TABLE AS old_rows FOR EACH STATEMENT EXECUTE FUNCTION dashboard_counters_review_cases();
+
+DROP TRIGGER IF EXISTS dashboard_counters_risk_decisions_ins ON risk_decisions;
+CREATE TRIGGER dashboard_counters_risk_decisions_ins AFTER INSERT ON risk_decisions
+    REFERENCING NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION dashboard_counters_risk_decisions();
+DROP TRIGGER IF EXISTS dashboard_counters_risk_decisions_del ON risk_decisions;
+CREATE TRIGGER dashboard_counters_risk_decisions_del AFTER DELETE ON risk_decisions
+    REFERENCING OLD TABLE AS old_rows FOR EACH STATEMENT EXECUTE FUNCTION dashboard_counters_risk_decisions();
+"""
@@ -1,38 +1,22 @@
 import uuid
 import datetime
+from app.data.bulk_seed import ACCOUNT_COLUMNS, USER_COLUMNS, copy_rows
 from app.data.database import get_connection
 
 def seed_users_and_accounts(n_users=10):
     conn = get_connection()
     cursor = conn.cursor()
 
+    now = datetime.datetime.utcnow()
+    users = []
+    accounts = []
     for i in range(n_users):
         user_id = str(uuid.uuid4())
-        account_id = str(uuid.uuid4())
+        users.append((user_id, f"User_{i}", f"user{i}@example.com", f"+91XXXXXXXX{i}", 2, now))
+        accounts.append((str(uuid.uuid4()), user_id, "wallet", 10000.0, "active", now))
 
-        cursor.execute(
-            "INSERT INTO users VALUES (%s, %s, %s, %s, %s, %s)",
-            (
-                user_id,
-                f"User_{i}",
-                f"user{i}@example.com",
-                f"+91XXXXXXXX{i}",
-                2,
-                datetime.datetime.utcnow()
-            )
-        )
-
-        cursor.execute(
-            "INSERT INTO accounts VALUES (%s, %s, %s, %s, %s, %s)",
-            (
-                account_id,
-                user_id,
-                "wallet",
-                10000.0,
-                "active",
-                datetime.datetime.utcnow()
-            )
-        )
+    copy_rows(cursor, "users", USER_COLUMNS, users)
+    copy_rows(cursor, "accounts", ACCOUNT_COLUMNS, accounts)
 
     conn.commit()
     conn.close()
@@ -28,8 +28,14 @@ def fetch_users_and_accounts():
     return rows
 
 
-def generate_transaction():
-    users = fetch_users_and_accounts()
+def generate_transaction(users=None):
+    """
+    Build a random transaction for one of `users` (rows from
+    fetch_users_and_accounts). Callers generating many transactions should
+    fetch the rows once and pass them in.
+    """
+    if users is None:
+        users = fetch_users_and_accounts()
     choice = random.choice(users)
     user_id = choice["user_id"]
     account_id = choice["account_id"]
@@ -0,0 +1,125 @@
+import random
+import uuid
+import datetime
+from typing import Dict, Iterator, List, Optional
+
+from psycopg2.extras import execute_values
+
+
+# Share of generated items per kind; bursts emit BURST_LENGTH items each
+DEFAULT_MIX = {
+    "normal": 0.80,
+    "burst": 0.08,
+    "new_device": 0.07,
+    "high_amount": 0.05,
+}
+
+BURST_LENGTH = 5
+DEVICES_PER_ACCOUNT = 2
+BENCH_USER_PREFIX = "bench-user-"
+BENCH_ACCOUNT_PREFIX = "bench-acct-"
+
+
+def parse_mix(spec: str) -> Dict[str, float]:
+    """Parse "normal=0.8,burst=0.1,..." into a normalized mix."""
+    mix = {}
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in DEFAULT_MIX:
+            raise ValueError(f"Unknown traffic kind: {name}")
+        mix[name] = float(weight)
+    total = sum(mix.values())
+    if total <= 0:
+        raise ValueError("Traffic mix weights must sum to a positive value")
+    return {name: weight / total for name, weight in mix.items()}
+
+
+def seed_bench_accounts(cursor, n_accounts: int, *, balance: float = 1_000_000.0) -> List[str]:
+    """
+    Bulk-insert n bench users/accounts (one account per user) with
+    deterministic ids, skipping any that already exist. Returns account ids.
+    """
+    now = datetime.datetime.utcnow()
+    ids = [(f"{BENCH_USER_PREFIX}{i:08d}", f"{BENCH_ACCOUNT_PREFIX}{i:08d}") for i in range(n_accounts)]
+
+    execute_values(
+        cursor,
+        """
+        INSERT INTO users (user_id, name, email, phone, kyc_level, created_at)
+        VALUES %s
+        ON CONFLICT (user_id) DO NOTHING
+        """,
+        [(user_id, f"Bench User {i}", f"bench{i}@aegis.local", None, 1, now) for i, (user_id, _) in enumerate(ids)],
+        page_size=1000,
+    )
+    execute_values(
+        cursor,
+        """
+        INSERT INTO accounts (account_id, user_id, account_type, balance, status, created_at)
+        VALUES %s
+        ON CONFLICT (account_id) DO UPDATE SET balance = EXCLUDED.balance
+        """,
+        [(account_id, user_id, "wallet", balance, "active", now) for user_id, account_id in ids],
+        page_size=1000,
+    )
+    return [account_id for _, account_id in ids]
+
+
+class TrafficGenerator:
+    """
+    Deterministic stream of POST /transactions payloads with a traffic mix.
+
+    - normal: known device, everyday amount
+    - burst: BURST_LENGTH back-to-back transactions on one account
+    - new_device: never-seen device id
+    - high_amount: amount above the 5000 HIGH_AMOUNT threshold
+    """
+
+    def __init__(self, account_ids: List[str], *, mix: Optional[Dict[str, float]] = None, seed: int = 7):
+        if not account_ids:
+            raise ValueError("TrafficGenerator needs at least one account")
+        self.account_ids = account_ids
+        self.mix = mix or DEFAULT_MIX
+        self.rng = random.Random(seed)
+        self._kinds = list(self.mix)
+        self._weights = [self.mix[k] for k in self._kinds]
+
+    def _device(self, account_id: str) -> str:
+        return f"{account_id}-dev-{self.rng.randrange(DEVICES_PER_ACCOUNT)}"
+
+    def _item(self, kind: str, account_id: str) -> Dict:
+        if kind == "high_amount":
+            amount = round(self.rng.uniform(5001, 20000), 2)
+        elif kind == "burst":
+            amount = round(self.rng.uniform(50, 1500), 2)
+        else:
+            amount = round(self.rng.lognormvariate(5.5, 1.0), 2)
+
+        if kind == "new_device":
+            device_id = f"{account_id}-new-{uuid.UUID(int=self.rng.getrandbits(128)).hex[:12]}"
+        else:
+            device_id = self._device(account_id)
+
+        return {
+            "kind": kind,
+            "account_id": account_id,
+            "amount": max(amount, 1.0),
+            "device_id": device_id,
+        }
+
+    def __iter__(self) -> Iterator[Dict]:
+        while True:
+            kind = self.rng.choices(self._kinds, weights=self._weights)[0]
+            account_id = self.rng.choice(self.account_ids)
+            repeat = BURST_LENGTH if kind == "burst" else 1
+            for _ in range(repeat):
+                yield self._item(kind, account_id)
+
+    def take(self, n: int) -> List[Dict]:
+        items = []
+        for item in self:
+            items.append(item)
+            if len(items) >= n:
+                break
+        return items
@@ -10,8 +10,18 @@ from app.api import profile
 from app.api import metrics
 from app.api import transactions
 from app.api import system
+from app.api import scoring_config
 
 from app.core.startup import initialize_database
+from app.core.config import AUDIT_WRITE_BEHIND, FEATURE_STORE_ENABLED, INGESTION_DRIVER
+from app.data.database import close_pool, get_pool
+from app.data.async_database import close_async_pool, init_async_pool
+from app.signals.feature_store import feature_store
+from app.risk.scoring_config import start_scoring_config_listener, stop_scoring_config_listener
+from app.risk.shadow import shadow_writer
+from app.audit.writer import audit_writer
+from app.audit.integrity import audit_verification_worker
+from app.services.metrics_rollup import metrics_rollup_worker
 from app.core.logging import get_logger
 
 
@@ -29,6 +39,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "Idempotent-Replayed"],
 )
 
 # -----------------------------
@@ -43,6 +54,7 @@ app.include_router(metrics.router)
 app.include_router(transactions.router)
 app.include_router(system.router)
 app.include_router(audit_integrity.router)
+app.include_router(scoring_config.router)
 
 
 
@@ -56,4 +68,35 @@ def health():
 def startup_event():
     logger = get_logger("aegis.startup")
     initialize_database()
-    logger.info("Aegis backend startup completed successfully.")
\ No newline at end of file
+    if FEATURE_STORE_ENABLED:
+        with get_pool().connection() as conn:
+            feature_store.warm(conn.cursor())
+    start_scoring_config_listener()
+    shadow_writer.start()
+    if AUDIT_WRITE_BEHIND:
+        audit_writer.start()
+    metrics_rollup_worker.start()
+    audit_verification_worker.start()
+    logger.info("Aegis backend startup completed successfully.")
+
+
+@app.on_event("startup")
+async def startup_async_pool():
+    if INGESTION_DRIVER == "asyncpg":
+        await init_async_pool()
+
+
+@app.on_event("shutdown")
+def shutdown_event():
+    stop_scoring_config_listener()
+    shadow_writer.stop()
+    # Flush queued audit events while the pool is still open
+    audit_writer.stop()
+    metrics_rollup_worker.stop()
+    audit_verification_worker.stop()
+    close_pool()
+
+
+@app.on_event("shutdown")
+async def shutdown_async_pool():
+    await close_async_pool()
@@ -0,0 +1,74 @@
+from typing import Any, Dict, List, Optional
+
+from psycopg2.extras import execute_values
+
+
+def fetch_accounts(
+    cursor: Any,
+    account_ids: List[str],
+    *,
+    for_update: bool = False,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Resolve many accounts in one round trip, keyed by account_id.
+
+    for_update locks the rows (in account_id order, so concurrent callers
+    cannot deadlock) until the transaction ends.
+    """
+    if not account_ids:
+        return {}
+
+    cursor.execute(
+        """
+        SELECT account_id, user_id, balance
+        FROM accounts
+        WHERE account_id = ANY(%s)
+        ORDER BY account_id
+        """
+        + ("FOR UPDATE" if for_update else ""),
+        (list(set(account_ids)),),
+    )
+    return {row["account_id"]: dict(row) for row in cursor.fetchall()}
+
+
+def debit_accounts(cursor: Any, debits: Dict[str, float]) -> None:
+    """
+    Apply per-account balance debits with a single UPDATE ... FROM (VALUES).
+    """
+    if not debits:
+        return
+
+    execute_values(
+        cursor,
+        """
+        UPDATE accounts AS a
+        SET balance = a.balance - v.amount
+        FROM (VALUES %s) AS v(account_id, amount)
+        WHERE a.account_id = v.account_id
+        """,
+        list(debits.items()),
+    )
+
+
+def reserve_balance(cursor: Any, *, account_id: str, amount: float) -> Optional[float]:
+    """
+    Debit `amount` only if the balance covers it, as one atomic statement.
+
+    Returns the new balance, or None if the balance is short (or the account
+    is missing); nothing is changed then. The row stays locked until the
+    transaction ends, so call this as close to commit as possible.
+    """
+    cursor.execute(
+        """
+        UPDATE accounts
+        SET balance = balance - %(amount)s
+        WHERE account_id = %(account_id)s
+          -- balance is REAL: compare at that precision, or spending exactly
+          -- the balance fails for amounts float4 cannot represent (100.1)
+          AND balance >= %(amount)s::real
+        RETURNING balance
+        """,
+        {"account_id": account_id, "amount": amount},
+    )
+    row = cursor.fetchone()
+    return float(row["balance"]) if row else None
@@ -0,0 +1,17 @@
+from typing import Any, Optional
+
+
+async def reserve_balance(conn: Any, *, account_id: str, amount: float) -> Optional[float]:
+    """asyncpg version of account_repo.reserve_balance."""
+    balance = await conn.fetchval(
+        """
+        UPDATE accounts
+        SET balance = balance - $1
+        WHERE account_id = $2
+          AND balance >= $1::real
+        RETURNING balance
+        """,
+        amount,
+        account_id,
+    )
+    return float(balance) if balance is not None else None
@@ -0,0 +1,47 @@
+from typing import Any, Dict
+
+from app.audit.async_logger import log_event
+
+
+async def log_transaction_created(conn: Any, *, account_id: str, metadata: Dict) -> None:
+    """Append a TRANSACTION_CREATED audit event."""
+    await log_event(
+        conn,
+        event_type="TRANSACTION_CREATED",
+        entity_type="ACCOUNT",
+        entity_id=account_id,
+        metadata=metadata,
+    )
+
+
+async def log_signals_generated(conn: Any, *, account_id: str, metadata: Dict) -> None:
+    """Append a SIGNALS_GENERATED audit event."""
+    await log_event(
+        conn,
+        event_type="SIGNALS_GENERATED",
+        entity_type="ACCOUNT",
+        entity_id=account_id,
+        metadata=metadata,
+    )
+
+
+async def log_decision_made(conn: Any, *, account_id: str, metadata: Dict) -> None:
+    """Append a DECISION_MADE audit event."""
+    await log_event(
+        conn,
+        event_type="DECISION_MADE",
+        entity_type="ACCOUNT",
+        entity_id=account_id,
+        metadata=metadata,
+    )
+
+
+async def log_case_opened(conn: Any, *, account_id: str, metadata: Dict) -> None:
+    """Append a CASE_OPENED audit event."""
+    await log_event(
+        conn,
+        event_type="CASE_OPENED",
+        entity_type="ACCOUNT",
+        entity_id=account_id,
+        metadata=metadata,
+    )
@@ -0,0 +1,49 @@
+import uuid
+import datetime
+from typing import Any, Dict
+
+
+async def create_review_case(
+    conn: Any,
+    *,
+    user_id: str,
+    account_id: str,
+    decision: str,
+    risk_score: float,
+) -> Dict[str, Any]:
+    """
+    Create a fraud analyst review case for a given account.
+    """
+    case_id = str(uuid.uuid4())
+    now = datetime.datetime.utcnow()
+
+    await conn.execute(
+        """
+        INSERT INTO review_cases (
+            case_id,
+            user_id,
+            account_id,
+            decision,
+            risk_score,
+            status,
+            created_at
+        )
+        VALUES ($1, $2, $3, $4, $5, 'OPEN', $6)
+        """,
+        case_id,
+        user_id,
+        account_id,
+        decision,
+        risk_score,
+        now,
+    )
+
+    return {
+        "case_id": case_id,
+        "user_id": user_id,
+        "account_id": account_id,
+        "decision": decision,
+        "risk_score": risk_score,
+        "status": "OPEN",
+        "created_at": now,
+    }
@@ -0,0 +1,72 @@
+import json
+import uuid
+import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+
+async def fetch_latest_decision(conn: Any, *, account_id: str) -> Optional[Tuple[float, str]]:
+    """
+    Fetch the most recent decision for an account, if any.
+    """
+    row = await conn.fetchrow(
+        """
+        SELECT risk_score, decision
+        FROM risk_decisions
+        WHERE account_id = $1
+        ORDER BY created_at DESC
+        LIMIT 1
+        """,
+        account_id,
+    )
+    if not row:
+        return None
+    return row["risk_score"], row["decision"]
+
+
+async def insert_decision(
+    conn: Any,
+    *,
+    user_id: str,
+    account_id: str,
+    risk_score: float,
+    decision: str,
+    reasons: str,
+    txn_id: Optional[str] = None,
+    scoring_config_version: Optional[int] = None,
+    explanation: Optional[List[Dict[str, Any]]] = None,
+) -> Dict[str, Any]:
+    """
+    Persist a risk decision for an (account, user) pair.
+    """
+    decision_id = str(uuid.uuid4())
+    now = datetime.datetime.utcnow()
+
+    await conn.execute(
+        """
+        INSERT INTO risk_decisions (
+            decision_id, user_id, account_id, risk_score, decision, reasons, created_at,
+            txn_id, scoring_config_version, explanation
+        )
+        VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10::jsonb)
+        """,
+        decision_id,
+        user_id,
+        account_id,
+        risk_score,
+        decision,
+        reasons,
+        now,
+        txn_id,
+        scoring_config_version,
+        json.dumps(explanation) if explanation is not None else None,
+    )
+
+    return {
+        "decision_id": decision_id,
+        "user_id": user_id,
+        "account_id": account_id,
+        "risk_score": risk_score,
+        "decision": decision,
+        "reasons": reasons,
+        "created_at": now,
+    }
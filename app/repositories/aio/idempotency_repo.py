@@ -0,0 +1,64 @@
+import datetime
+import json
+from typing import Any, Dict, Optional
+
+
+# asyncpg counterpart of idempotency_repo.CLAIM_IDEMPOTENCY_KEY_SQL
+_CLAIM_IDEMPOTENCY_KEY_SQL = """
+    INSERT INTO idempotency_keys (idempotency_key, request_hash, response, created_at, expires_at)
+    VALUES ($1, $2, NULL, $3, $4)
+    ON CONFLICT (idempotency_key) DO UPDATE
+    SET request_hash = EXCLUDED.request_hash,
+        response = NULL,
+        created_at = EXCLUDED.created_at,
+        expires_at = EXCLUDED.expires_at
+    WHERE idempotency_keys.expires_at <= EXCLUDED.created_at
+    RETURNING idempotency_key
+"""
+
+
+async def claim_idempotency_key(
+    conn: Any,
+    *,
+    key: str,
+    request_hash: str,
+    now: datetime.datetime,
+    expires_at: datetime.datetime,
+    wait_ms: int,
+) -> bool:
+    """asyncpg version of idempotency_repo.claim_idempotency_key."""
+    await conn.execute("SELECT set_config('lock_timeout', $1, true)", f"{wait_ms}ms")
+    claimed = await conn.fetchval(_CLAIM_IDEMPOTENCY_KEY_SQL, key, request_hash, now, expires_at)
+    await conn.execute("SELECT set_config('lock_timeout', '0', true)")
+    return claimed is not None
+
+
+async def fetch_idempotency_result(conn: Any, key: str) -> Optional[Dict[str, Any]]:
+    row = await conn.fetchrow(
+        """
+        SELECT request_hash, response, expires_at
+        FROM idempotency_keys
+        WHERE idempotency_key = $1
+        """,
+        key,
+    )
+    if row is None:
+        return None
+    # asyncpg hands jsonb back as text
+    return {
+        "request_hash": row["request_hash"],
+        "response": json.loads(row["response"]) if row["response"] is not None else None,
+        "expires_at": row["expires_at"],
+    }
+
+
+async def store_idempotency_result(conn: Any, *, key: str, response: Dict[str, Any]) -> None:
+    await conn.execute(
+        """
+        UPDATE idempotency_keys
+        SET response = $1::jsonb
+        WHERE idempotency_key = $2
+        """,
+        json.dumps(response),
+        key,
+    )
@@ -0,0 +1,16 @@
+from typing import Any, Optional
+
+
+async def enqueue_side_effects(conn: Any, *, account_id: str, txn_id: Optional[str], payload: str) -> None:
+    """
+    Queue an encoded side-effects payload; commits with the caller's transaction.
+    """
+    await conn.execute(
+        """
+        INSERT INTO outbox (account_id, txn_id, payload)
+        VALUES ($1, $2, $3)
+        """,
+        account_id,
+        txn_id,
+        payload,
+    )
@@ -0,0 +1,42 @@
+import uuid
+import datetime
+from typing import Any, Dict, List
+
+
+async def insert_signals(conn: Any, user_id: str, signals: List[Dict]) -> None:
+    """
+    Persist a transaction's computed signals in one pipelined round trip.
+    """
+    if not signals:
+        return
+
+    now = datetime.datetime.utcnow()
+
+    await conn.executemany(
+        """
+        INSERT INTO signals (
+            signal_id,
+            user_id,
+            signal_type,
+            signal_value,
+            signal_weight,
+            signal_contribution,
+            description,
+            created_at
+        )
+        VALUES ($1, $2, $3, $4, $5, $6, $7, $8)
+        """,
+        [
+            (
+                str(uuid.uuid4()),
+                user_id,
+                signal["type"],
+                float(signal["value"]),
+                float(signal.get("weight", 0.0)),
+                float(signal.get("contribution", 0.0)),
+                signal.get("description", ""),
+                now,
+            )
+            for signal in signals
+        ],
+    )
@@ -0,0 +1,62 @@
+from typing import Any, Dict
+
+from app.repositories.transaction_repo import build_transaction
+
+
+async def insert_transaction(
+    conn: Any,
+    *,
+    account_id: str,
+    amount: float,
+    device_id: str,
+) -> Dict[str, Any]:
+
+    row = await conn.fetchrow(
+        """
+        SELECT user_id
+        FROM accounts
+        WHERE account_id = $1
+        """,
+        account_id,
+    )
+    if not row:
+        raise ValueError(f"Account not found for account_id={account_id}")
+
+    txn = build_transaction(
+        user_id=row["user_id"],
+        account_id=account_id,
+        amount=amount,
+        device_id=device_id,
+    )
+
+    await conn.execute(
+        """
+        INSERT INTO transactions
+        VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11)
+        """,
+        txn["txn_id"],
+        txn["user_id"],
+        txn["account_id"],
+        txn["amount"],
+        txn["txn_type"],
+        txn["channel"],
+        txn["merchant_category"],
+        txn["location"],
+        txn["device_id"],
+        txn["txn_timestamp"],
+        txn["status"],
+    )
+
+    return txn
+
+
+async def update_transaction_status(conn: Any, *, txn_id: str, status: str) -> None:
+    await conn.execute(
+        """
+        UPDATE transactions
+        SET status = $1
+        WHERE txn_id = $2
+        """,
+        status,
+        txn_id,
+    )
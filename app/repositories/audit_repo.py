@@ -1,6 +1,6 @@
-from typing import Any, Dict
+from typing import Any, Dict, List
 
-from app.audit.logger import log_event
+from app.audit.logger import log_event, log_events
 
 
 def log_transaction_created(
@@ -88,3 +88,21 @@ def log_case_resolved(
         metadata=metadata,
     )
 
+
+def account_event(event_type: str, *, account_id: str, metadata: Dict) -> Dict:
+    """
+    Build an ACCOUNT-level audit event for log_account_events.
+    """
+    return {
+        "event_type": event_type,
+        "entity_type": "ACCOUNT",
+        "entity_id": account_id,
+        "metadata": metadata,
+    }
+
+
+def log_account_events(cursor: Any, events: List[Dict]) -> None:
+    """
+    Append many ACCOUNT audit events in order with a single INSERT.
+    """
+    log_events(cursor, events)
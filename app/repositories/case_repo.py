@@ -1,6 +1,8 @@
 import uuid
 import datetime
-from typing import Any, Dict
+from typing import Any, Dict, List
+
+from psycopg2.extras import execute_values
 
 
 def create_review_case(
@@ -50,3 +52,85 @@ def create_review_case(
         "created_at": now,
     }
 
+
+def build_review_case(
+    *,
+    user_id: str,
+    account_id: str,
+    decision: str,
+    risk_score: float,
+) -> Dict[str, Any]:
+    """
+    The row create_review_case would insert, without inserting it.
+    """
+    return {
+        "case_id": str(uuid.uuid4()),
+        "user_id": user_id,
+        "account_id": account_id,
+        "decision": decision,
+        "risk_score": risk_score,
+        "status": "OPEN",
+        "created_at": datetime.datetime.utcnow(),
+    }
+
+
+def create_review_cases_batch(
+    cursor: Any,
+    cases: List[Dict[str, Any]],
+    *,
+    skip_existing: bool = False,
+) -> List[Dict[str, Any]]:
+    """
+    Create many review cases with a single multi-row INSERT.
+
+    case_id and created_at may be supplied per row (e.g. when the caller has
+    already referenced the case in an audit event). With skip_existing,
+    cases whose case_id is already present are left untouched.
+    """
+    if not cases:
+        return []
+
+    now = datetime.datetime.utcnow()
+    rows = [
+        {
+            "case_id": c.get("case_id") or str(uuid.uuid4()),
+            "user_id": c["user_id"],
+            "account_id": c["account_id"],
+            "decision": c["decision"],
+            "risk_score": c["risk_score"],
+            "status": "OPEN",
+            "created_at": c.get("created_at") or now,
+        }
+        for c in cases
+    ]
+
+    execute_values(
+        cursor,
+        """
+        INSERT INTO review_cases (
+            case_id,
+            user_id,
+            account_id,
+            decision,
+            risk_score,
+            status,
+            created_at
+        )
+        VALUES %s
+        """ + ("ON CONFLICT (case_id) DO NOTHING" if skip_existing else ""),
+        [
+            (
+                r["case_id"],
+                r["user_id"],
+                r["account_id"],
+                r["decision"],
+                r["risk_score"],
+                r["status"],
+                r["created_at"],
+            )
+            for r in rows
+        ],
+        page_size=1000,
+    )
+
+    return rows
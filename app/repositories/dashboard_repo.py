@@ -0,0 +1,91 @@
+from typing import Any, Dict
+
+
+DECISIONS = ("ALLOW", "REVIEW", "BLOCK")
+
+
+def fetch_dashboard_counters(cursor: Any) -> Dict[str, float]:
+    """
+    Current value of every dashboard counter (sum over its shard rows).
+
+    Reads at most 16 rows per counter, independent of base table size.
+    """
+    cursor.execute(
+        """
+        SELECT counter, SUM(value) AS value
+        FROM dashboard_counters
+        GROUP BY counter
+        """
+    )
+    return {row["counter"]: float(row["value"]) for row in cursor.fetchall()}
+
+
+def _lock_for_rebuild(cursor: Any) -> None:
+    # Writers lock a base table, then its trigger updates the counters; take
+    # the locks in the same order or a rebuild deadlocks with ingestion
+    cursor.execute(
+        "LOCK TABLE transactions, accounts, review_cases, risk_decisions IN SHARE MODE"
+    )
+    cursor.execute("LOCK TABLE dashboard_counters, account_txn_counts IN EXCLUSIVE MODE")
+
+
+def rebuild_dashboard_counters(cursor: Any) -> Dict[str, float]:
+    """
+    Recompute all counters, including account_txn_counts, from the base tables.
+
+    Needed once for pre-existing data and after anything the triggers do
+    not see (TRUNCATE, restores). Blocks writers on the counted tables
+    until the caller commits.
+    """
+    _lock_for_rebuild(cursor)
+    cursor.execute("DELETE FROM dashboard_counters")
+    cursor.execute(
+        """
+        INSERT INTO dashboard_counters (counter, shard, value)
+        SELECT 'transactions', 0, COUNT(*) FROM transactions
+        UNION ALL SELECT 'accounts', 0, COUNT(*) FROM accounts
+        UNION ALL SELECT 'open_cases', 0, COUNT(*) FROM review_cases WHERE status = 'OPEN'
+        UNION ALL SELECT 'decisions', 0, COUNT(*) FROM risk_decisions
+        UNION ALL SELECT 'risk_score_sum', 0, COALESCE(SUM(risk_score::NUMERIC), 0) FROM risk_decisions
+        UNION ALL
+        SELECT 'decision:' || decision, 0, COUNT(*)
+        FROM risk_decisions
+        GROUP BY decision
+        """
+    )
+    cursor.execute("DELETE FROM account_txn_counts")
+    cursor.execute(
+        """
+        INSERT INTO account_txn_counts (account_id, txn_count)
+        SELECT account_id, COUNT(*)
+        FROM transactions
+        WHERE account_id IS NOT NULL
+        GROUP BY account_id
+        """
+    )
+    return fetch_dashboard_counters(cursor)
+
+
+def _counters_seeded(cursor: Any) -> bool:
+    cursor.execute(
+        """
+        SELECT EXISTS (SELECT 1 FROM dashboard_counters)
+           AND (EXISTS (SELECT 1 FROM account_txn_counts) OR NOT EXISTS (SELECT 1 FROM transactions))
+           AS seeded
+        """
+    )
+    return cursor.fetchone()["seeded"]
+
+
+def seed_dashboard_counters(cursor: Any) -> bool:
+    """Rebuild once when the counters tables are still empty."""
+    if _counters_seeded(cursor):
+        return False
+
+    # Another worker may be seeding concurrently; re-check under its lock
+    _lock_for_rebuild(cursor)
+    if _counters_seeded(cursor):
+        return False
+
+    rebuild_dashboard_counters(cursor)
+    return True
@@ -1,6 +1,25 @@
 import uuid
 import datetime
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
+
+from psycopg2.extras import Json, execute_values
+
+
+def build_explanation(signals: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Per-signal explanation stored with a decision (signals as scored by
+    RiskPipeline._compute_risk_score, i.e. carrying weight/contribution).
+    """
+    return [
+        {
+            "type": s["type"],
+            "value": float(s["value"]),
+            "weight": s.get("weight"),
+            "contribution": s.get("contribution"),
+            "description": s.get("description"),
+        }
+        for s in signals
+    ]
 
 
 def fetch_latest_decision(cursor: Any, *, account_id: str) -> Optional[Tuple[float, str]]:
@@ -23,6 +42,28 @@ def fetch_latest_decision(cursor: Any, *, account_id: str) -> Optional[Tuple[flo
     return row["risk_score"], row["decision"]
 
 
+def fetch_latest_decisions(cursor: Any, account_ids: List[str]) -> Dict[str, Tuple[float, str]]:
+    """
+    Fetch the most recent decision for many accounts in one round trip.
+    """
+    if not account_ids:
+        return {}
+
+    cursor.execute(
+        """
+        SELECT DISTINCT ON (account_id) account_id, risk_score, decision
+        FROM risk_decisions
+        WHERE account_id = ANY(%s)
+        ORDER BY account_id, created_at DESC
+        """,
+        (list(set(account_ids)),),
+    )
+    return {
+        row["account_id"]: (row["risk_score"], row["decision"])
+        for row in cursor.fetchall()
+    }
+
+
 def insert_decision(
     cursor: Any,
     *,
@@ -31,17 +72,26 @@ def insert_decision(
     risk_score: float,
     decision: str,
     reasons: str,
+    txn_id: Optional[str] = None,
+    scoring_config_version: Optional[int] = None,
+    explanation: Optional[List[Dict[str, Any]]] = None,
 ) -> Dict[str, Any]:
     """
     Persist a risk decision for an (account, user) pair.
+
+    Transaction-driven decisions also record the txn_id, config version and
+    signal explanation so /transactions/{txn_id}/explain is an index lookup.
     """
     decision_id = str(uuid.uuid4())
     now = datetime.datetime.utcnow()
 
     cursor.execute(
         """
-        INSERT INTO risk_decisions
-        VALUES (%s, %s, %s, %s, %s, %s, %s)
+        INSERT INTO risk_decisions (
+            decision_id, user_id, account_id, risk_score, decision, reasons, created_at,
+            txn_id, scoring_config_version, explanation
+        )
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
         """,
         (
             decision_id,
@@ -51,6 +101,9 @@ def insert_decision(
             decision,
             reasons,
             now,
+            txn_id,
+            scoring_config_version,
+            Json(explanation) if explanation is not None else None,
         ),
     )
 
@@ -64,6 +117,63 @@ def insert_decision(
         "created_at": now,
     }
 
+
+def insert_decisions_batch(cursor: Any, decisions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Persist many risk decisions with a single multi-row INSERT.
+
+    decision_id and created_at may be supplied per row to preserve ordering.
+    """
+    if not decisions:
+        return []
+
+    now = datetime.datetime.utcnow()
+    rows = [
+        {
+            "decision_id": d.get("decision_id") or str(uuid.uuid4()),
+            "user_id": d["user_id"],
+            "account_id": d["account_id"],
+            "risk_score": d["risk_score"],
+            "decision": d["decision"],
+            "reasons": d["reasons"],
+            "created_at": d.get("created_at") or now,
+            "txn_id": d.get("txn_id"),
+            "scoring_config_version": d.get("scoring_config_version"),
+            "explanation": d.get("explanation"),
+        }
+        for d in decisions
+    ]
+
+    execute_values(
+        cursor,
+        """
+        INSERT INTO risk_decisions (
+            decision_id, user_id, account_id, risk_score, decision, reasons, created_at,
+            txn_id, scoring_config_version, explanation
+        )
+        VALUES %s
+        """,
+        [
+            (
+                r["decision_id"],
+                r["user_id"],
+                r["account_id"],
+                r["risk_score"],
+                r["decision"],
+                r["reasons"],
+                r["created_at"],
+                r["txn_id"],
+                r["scoring_config_version"],
+                Json(r["explanation"]) if r["explanation"] is not None else None,
+            )
+            for r in rows
+        ],
+        page_size=1000,
+    )
+
+    return rows
+
+
 def fetch_risk_trend(cursor, account_id: str, limit: int = 20):
     cursor.execute(
         """
@@ -77,3 +187,29 @@ def fetch_risk_trend(cursor, account_id: str, limit: int = 20):
     )
     rows = cursor.fetchall()
     return list(reversed(rows))
+
+
+def fetch_decision_for_transaction(cursor: Any, txn_id: str) -> Optional[Dict[str, Any]]:
+    """
+    The transaction and the decision made for it, in one round trip
+    (two primary/secondary index probes). decision_id is NULL when the
+    transaction exists but has no linked decision.
+    """
+    cursor.execute(
+        """
+        SELECT t.txn_id,
+               t.account_id,
+               d.decision_id,
+               d.risk_score,
+               d.decision,
+               d.scoring_config_version,
+               d.explanation
+        FROM transactions t
+        LEFT JOIN risk_decisions d ON d.txn_id = t.txn_id
+        WHERE t.txn_id = %s
+        ORDER BY d.created_at DESC NULLS LAST
+        LIMIT 1
+        """,
+        (txn_id,),
+    )
+    return cursor.fetchone()
@@ -0,0 +1,86 @@
+import datetime
+from typing import Any, Dict, Optional
+
+from psycopg2.extras import Json
+
+
+# Insert the key, or take over an expired one. Returns no row while a live
+# key exists; if that key's transaction is still open, this waits for it.
+CLAIM_IDEMPOTENCY_KEY_SQL = """
+    INSERT INTO idempotency_keys (idempotency_key, request_hash, response, created_at, expires_at)
+    VALUES (%(key)s, %(request_hash)s, NULL, %(now)s, %(expires_at)s)
+    ON CONFLICT (idempotency_key) DO UPDATE
+    SET request_hash = EXCLUDED.request_hash,
+        response = NULL,
+        created_at = EXCLUDED.created_at,
+        expires_at = EXCLUDED.expires_at
+    WHERE idempotency_keys.expires_at <= EXCLUDED.created_at
+    RETURNING idempotency_key
+"""
+
+
+def claim_idempotency_key(
+    cursor: Any,
+    *,
+    key: str,
+    request_hash: str,
+    now: datetime.datetime,
+    expires_at: datetime.datetime,
+    wait_ms: int,
+) -> bool:
+    """
+    True if this transaction now owns `key`; False if a committed, unexpired
+    result exists. Raises the driver's LockNotAvailable error (55P03) when
+    another transaction holds the key for longer than `wait_ms`.
+    """
+    cursor.execute("SELECT set_config('lock_timeout', %s, true)", (f"{wait_ms}ms",))
+    cursor.execute(
+        CLAIM_IDEMPOTENCY_KEY_SQL,
+        {"key": key, "request_hash": request_hash, "now": now, "expires_at": expires_at},
+    )
+    claimed = cursor.fetchone() is not None
+    # Only the key wait is bounded; the rest of the request keeps the default
+    cursor.execute("SELECT set_config('lock_timeout', '0', true)")
+    return claimed
+
+
+def fetch_idempotency_result(cursor: Any, key: str) -> Optional[Dict[str, Any]]:
+    cursor.execute(
+        """
+        SELECT request_hash, response, expires_at
+        FROM idempotency_keys
+        WHERE idempotency_key = %s
+        """,
+        (key,),
+    )
+    return cursor.fetchone()
+
+
+def store_idempotency_result(cursor: Any, *, key: str, response: Dict[str, Any]) -> None:
+    cursor.execute(
+        """
+        UPDATE idempotency_keys
+        SET response = %s
+        WHERE idempotency_key = %s
+        """,
+        (Json(response), key),
+    )
+
+
+def purge_expired_idempotency_keys(cursor: Any, *, now: datetime.datetime, limit: int) -> int:
+    """Delete up to `limit` expired keys; returns the number deleted."""
+    cursor.execute(
+        """
+        DELETE FROM idempotency_keys
+        WHERE idempotency_key IN (
+            SELECT idempotency_key
+            FROM idempotency_keys
+            WHERE expires_at <= %s
+            ORDER BY expires_at
+            LIMIT %s
+            FOR UPDATE SKIP LOCKED
+        )
+        """,
+        (now, limit),
+    )
+    return cursor.rowcount
@@ -0,0 +1,88 @@
+from typing import Any, Dict, List, Optional
+
+
+def enqueue_side_effects(cursor: Any, *, account_id: str, txn_id: Optional[str], payload: str) -> None:
+    """
+    Queue an encoded side-effects payload; commits with the caller's transaction.
+    """
+    cursor.execute(
+        """
+        INSERT INTO outbox (account_id, txn_id, payload)
+        VALUES (%s, %s, %s)
+        """,
+        (account_id, txn_id, payload),
+    )
+
+
+def claim_outbox_batch(
+    cursor: Any,
+    *,
+    limit: int,
+    max_attempts: int,
+    shard: int = 0,
+    shards: int = 1,
+) -> List[Dict[str, Any]]:
+    """
+    Lock the oldest pending rows of a shard, skipping rows another worker holds.
+
+    Accounts map to exactly one shard, so a single worker per shard sees an
+    account's rows in outbox_id order.
+    """
+    cursor.execute(
+        """
+        SELECT outbox_id, account_id, txn_id, payload, attempts
+        FROM outbox
+        WHERE attempts < %(max_attempts)s
+          AND (%(shards)s = 1 OR abs(hashtext(account_id)) %% %(shards)s = %(shard)s)
+        ORDER BY outbox_id
+        LIMIT %(limit)s
+        FOR UPDATE SKIP LOCKED
+        """,
+        {"limit": limit, "max_attempts": max_attempts, "shard": shard, "shards": shards},
+    )
+    return cursor.fetchall()
+
+
+def claim_outbox_row(cursor: Any, outbox_id: int) -> Optional[Dict[str, Any]]:
+    cursor.execute(
+        """
+        SELECT outbox_id, account_id, txn_id, payload, attempts
+        FROM outbox
+        WHERE outbox_id = %s
+        FOR UPDATE SKIP LOCKED
+        """,
+        (outbox_id,),
+    )
+    return cursor.fetchone()
+
+
+def delete_outbox_rows(cursor: Any, outbox_ids: List[int]) -> None:
+    cursor.execute("DELETE FROM outbox WHERE outbox_id = ANY(%s)", (outbox_ids,))
+
+
+def record_outbox_failure(cursor: Any, outbox_id: int, error: str) -> None:
+    cursor.execute(
+        """
+        UPDATE outbox
+        SET attempts = attempts + 1,
+            last_error = %s
+        WHERE outbox_id = %s
+        """,
+        (error[:2000], outbox_id),
+    )
+
+
+def fetch_outbox_backlog(cursor: Any, *, max_attempts: int) -> Dict[str, Any]:
+    """Pending rows, rows that have failed at least once, rows given up on, oldest pending age."""
+    cursor.execute(
+        """
+        SELECT
+            COUNT(*) FILTER (WHERE attempts < %(max_attempts)s) AS pending,
+            COUNT(*) FILTER (WHERE attempts > 0 AND attempts < %(max_attempts)s) AS retrying,
+            COUNT(*) FILTER (WHERE attempts >= %(max_attempts)s) AS dead,
+            MIN(created_at) FILTER (WHERE attempts < %(max_attempts)s) AS oldest_pending_at
+        FROM outbox
+        """,
+        {"max_attempts": max_attempts},
+    )
+    return cursor.fetchone()
@@ -0,0 +1,151 @@
+import json
+import datetime
+from typing import Any, Dict, List, Optional
+
+
+def _to_dict(row) -> Dict[str, Any]:
+    return {
+        "version": row["version"],
+        "weights": json.loads(row["weights"]),
+        "review_threshold": float(row["review_threshold"]),
+        "block_threshold": float(row["block_threshold"]),
+        "is_active": bool(row["is_active"]),
+        "is_shadow": bool(row.get("is_shadow")),
+        "note": row["note"],
+        "created_at": row["created_at"],
+        "activated_at": row["activated_at"],
+    }
+
+
+def fetch_active_scoring_config(cursor: Any) -> Optional[Dict[str, Any]]:
+    cursor.execute(
+        """
+        SELECT *
+        FROM scoring_configs
+        WHERE is_active
+        ORDER BY activated_at DESC NULLS LAST, version DESC
+        LIMIT 1
+        """
+    )
+    row = cursor.fetchone()
+    return _to_dict(row) if row else None
+
+
+def fetch_shadow_scoring_configs(cursor: Any) -> List[Dict[str, Any]]:
+    """Candidate versions scored alongside the active one."""
+    cursor.execute(
+        """
+        SELECT *
+        FROM scoring_configs
+        WHERE is_shadow AND NOT is_active
+        ORDER BY version
+        """
+    )
+    return [_to_dict(row) for row in cursor.fetchall()]
+
+
+def fetch_scoring_config(cursor: Any, version: int) -> Optional[Dict[str, Any]]:
+    cursor.execute("SELECT * FROM scoring_configs WHERE version = %s", (version,))
+    row = cursor.fetchone()
+    return _to_dict(row) if row else None
+
+
+def list_scoring_configs(cursor: Any, limit: int = 50) -> List[Dict[str, Any]]:
+    cursor.execute(
+        """
+        SELECT *
+        FROM scoring_configs
+        ORDER BY version DESC
+        LIMIT %s
+        """,
+        (limit,),
+    )
+    return [_to_dict(row) for row in cursor.fetchall()]
+
+
+def insert_scoring_config(
+    cursor: Any,
+    *,
+    weights: Dict[str, float],
+    review_threshold: float,
+    block_threshold: float,
+    note: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Store a new, inactive weight set under the next version number.
+    """
+    # Serialize version allocation between concurrent writers
+    cursor.execute("LOCK TABLE scoring_configs IN SHARE ROW EXCLUSIVE MODE")
+    cursor.execute(
+        """
+        INSERT INTO scoring_configs (
+            version,
+            weights,
+            review_threshold,
+            block_threshold,
+            is_active,
+            note,
+            created_at
+        )
+        SELECT COALESCE(MAX(version), 0) + 1, %s, %s, %s, FALSE, %s, %s
+        FROM scoring_configs
+        RETURNING *
+        """,
+        (
+            json.dumps(weights, sort_keys=True),
+            review_threshold,
+            block_threshold,
+            note,
+            datetime.datetime.utcnow(),
+        ),
+    )
+    return _to_dict(cursor.fetchone())
+
+
+def activate_scoring_config(cursor: Any, version: int) -> Optional[Dict[str, Any]]:
+    """
+    Make `version` the only active weight set and notify listeners.
+    """
+    # Serialize activations: locking only the target row would let two
+    # concurrent activations each deactivate the other's old row and both
+    # commit an active one. Readers are not blocked.
+    cursor.execute("LOCK TABLE scoring_configs IN SHARE ROW EXCLUSIVE MODE")
+    cursor.execute("SELECT version FROM scoring_configs WHERE version = %s", (version,))
+    if not cursor.fetchone():
+        return None
+
+    cursor.execute("UPDATE scoring_configs SET is_active = FALSE WHERE is_active AND version <> %s", (version,))
+    cursor.execute(
+        """
+        UPDATE scoring_configs
+        SET is_active = TRUE,
+            activated_at = %s
+        WHERE version = %s
+        RETURNING *
+        """,
+        (datetime.datetime.utcnow(), version),
+    )
+    row = cursor.fetchone()
+    # Delivered on commit to any LISTEN scoring_config session
+    cursor.execute("SELECT pg_notify('scoring_config', %s)", (str(version),))
+    return _to_dict(row)
+
+
+def set_scoring_config_shadow(cursor: Any, version: int, enabled: bool) -> Optional[Dict[str, Any]]:
+    """
+    Add a version to (or remove it from) the shadow candidate set.
+    """
+    cursor.execute(
+        """
+        UPDATE scoring_configs
+        SET is_shadow = %s
+        WHERE version = %s
+        RETURNING *
+        """,
+        (enabled, version),
+    )
+    row = cursor.fetchone()
+    if not row:
+        return None
+    cursor.execute("SELECT pg_notify('scoring_config', %s)", (str(version),))
+    return _to_dict(row)
@@ -1,6 +1,8 @@
 import uuid
 import datetime
-from typing import Dict
+from typing import Any, Dict, List, Tuple
+
+from psycopg2.extras import execute_values
 
 
 def insert_signal(cursor, user_id: str, signal: Dict):
@@ -34,4 +36,102 @@ def insert_signal(cursor, user_id: str, signal: Dict):
             signal.get("description", ""),
             now,
         ),
-    )
\ No newline at end of file
+    )
+
+
+def insert_signals_batch(cursor: Any, rows: List[Tuple[str, Dict, Any]]) -> None:
+    """
+    Persist many (user_id, signal, created_at) rows with a single multi-row INSERT.
+
+    created_at may be None to use the current time.
+    """
+    if not rows:
+        return
+
+    now = datetime.datetime.utcnow()
+
+    execute_values(
+        cursor,
+        """
+        INSERT INTO signals (
+            signal_id,
+            user_id,
+            signal_type,
+            signal_value,
+            signal_weight,
+            signal_contribution,
+            description,
+            created_at
+        )
+        VALUES %s
+        """,
+        [
+            (
+                str(uuid.uuid4()),
+                user_id,
+                signal["type"],
+                signal["value"],
+                signal.get("weight", 0.0),
+                signal.get("contribution", 0.0),
+                signal.get("description", ""),
+                created_at or now,
+            )
+            for user_id, signal, created_at in rows
+        ],
+        page_size=1000,
+    )
+
+
+def build_signal_rows(user_id: str, signals: List[Dict], created_at: Any) -> List[Dict[str, Any]]:
+    """
+    Signals rows with their ids assigned up front, for insert_signal_rows.
+    """
+    return [
+        {
+            "signal_id": str(uuid.uuid4()),
+            "user_id": user_id,
+            "signal": signal,
+            "created_at": created_at,
+        }
+        for signal in signals
+    ]
+
+
+def insert_signal_rows(cursor: Any, rows: List[Dict[str, Any]]) -> None:
+    """
+    Persist prebuilt signal rows; rows whose signal_id already exists are skipped.
+    """
+    if not rows:
+        return
+
+    execute_values(
+        cursor,
+        """
+        INSERT INTO signals (
+            signal_id,
+            user_id,
+            signal_type,
+            signal_value,
+            signal_weight,
+            signal_contribution,
+            description,
+            created_at
+        )
+        VALUES %s
+        ON CONFLICT (signal_id) DO NOTHING
+        """,
+        [
+            (
+                r["signal_id"],
+                r["user_id"],
+                r["signal"]["type"],
+                r["signal"]["value"],
+                r["signal"].get("weight", 0.0),
+                r["signal"].get("contribution", 0.0),
+                r["signal"].get("description", ""),
+                r["created_at"],
+            )
+            for r in rows
+        ],
+        page_size=1000,
+    )
@@ -1,6 +1,36 @@
 import uuid
 import datetime
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional, Tuple
+
+from psycopg2.extras import execute_values
+
+from app.data.pagination import Keyset, fetch_keyset_page
+
+
+def build_transaction(
+    *,
+    user_id: str,
+    account_id: str,
+    amount: float,
+    device_id: str,
+    txn_timestamp: Optional[datetime.datetime] = None,
+) -> Dict[str, Any]:
+    """
+    Build the row dict for an API-originated debit transaction.
+    """
+    return {
+        "txn_id": str(uuid.uuid4()),
+        "user_id": user_id,
+        "account_id": account_id,
+        "amount": float(amount),
+        "txn_type": "debit",
+        "channel": "upi",
+        "merchant_category": "generic",
+        "location": "Unknown",
+        "device_id": device_id,
+        "txn_timestamp": txn_timestamp or datetime.datetime.utcnow(),
+        "status": "success",
+    }
 
 
 def insert_transaction(
@@ -24,24 +54,12 @@ def insert_transaction(
     if not row:
         raise ValueError(f"Account not found for account_id={account_id}")
 
-    user_id = row["user_id"]
-
-    txn_id = str(uuid.uuid4())
-    now = datetime.datetime.utcnow()
-
-    txn = {
-        "txn_id": txn_id,
-        "user_id": user_id,
-        "account_id": account_id,
-        "amount": float(amount),
-        "txn_type": "debit",
-        "channel": "upi",
-        "merchant_category": "generic",
-        "location": "Unknown",
-        "device_id": device_id,
-        "txn_timestamp": now,
-        "status": "success",
-    }
+    txn = build_transaction(
+        user_id=row["user_id"],
+        account_id=account_id,
+        amount=amount,
+        device_id=device_id,
+    )
 
     cursor.execute(
         """
@@ -63,4 +81,85 @@ def insert_transaction(
         ),
     )
 
-    return txn
\ No newline at end of file
+    return txn
+
+
+def insert_transactions_batch(cursor: Any, txns: List[Dict[str, Any]]) -> None:
+    """
+    Persist pre-built transaction dicts with a single multi-row INSERT.
+
+    Callers resolve user_id up front (see account_repo.fetch_accounts) and
+    are responsible for feeding the feature store, in transaction order,
+    once the transaction has committed (see RiskPipeline.after_commit).
+    """
+    if not txns:
+        return
+
+    execute_values(
+        cursor,
+        """
+        INSERT INTO transactions
+        VALUES %s
+        """,
+        [
+            (
+                txn["txn_id"],
+                txn["user_id"],
+                txn["account_id"],
+                txn["amount"],
+                txn["txn_type"],
+                txn["channel"],
+                txn["merchant_category"],
+                txn["location"],
+                txn["device_id"],
+                txn["txn_timestamp"],
+                txn["status"],
+            )
+            for txn in txns
+        ],
+        page_size=1000,
+    )
+
+
+ACCOUNT_TRANSACTIONS_CURSOR_SCOPE = "account_transactions"
+
+
+def fetch_account_transactions(
+    cursor: Any,
+    account_id: str,
+    *,
+    limit: int,
+    after: Optional[Keyset] = None,
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    Newest-first page of an account's transactions with the decision each
+    one produced, joined through risk_decisions.txn_id (a unique index
+    probe per row). Transactions without a linked decision, e.g. rows not yet
+    covered by scripts/backfill_decision_txn_links.py, have a NULL decision.
+    Returns (rows, next_cursor).
+    """
+    return fetch_keyset_page(
+        cursor,
+        scope=ACCOUNT_TRANSACTIONS_CURSOR_SCOPE,
+        select_sql="""
+            SELECT
+              t.txn_id,
+              t.account_id,
+              t.amount,
+              t.txn_timestamp AS timestamp,
+              t.device_id,
+              t.channel,
+              d.decision,
+              d.risk_score
+            FROM transactions t
+            LEFT JOIN risk_decisions d ON d.txn_id = t.txn_id
+        """,
+        conditions=["t.account_id = %s"],
+        params=[account_id],
+        created_column="t.txn_timestamp",
+        id_column="t.txn_id",
+        descending=True,
+        after=after,
+        limit=limit,
+        row_keys=("timestamp", "txn_id"),
+    )
@@ -100,21 +100,23 @@ def store_risk_decisions():
 
 def fetch_signals_with_accounts():
     """
-    Fetch signals joined with accounts through transactions.
+    Fetch signals attributed to the owning user's accounts.
+
+    Joins through accounts (one row per account) rather than transactions,
+    which repeated every signal once per transaction of the user.
     """
     conn = get_connection()
     cursor = conn.cursor()
 
     cursor.execute("""
         SELECT s.user_id,
-               t.account_id,
+               a.account_id,
                s.signal_type,
                s.signal_value,
                s.description
         FROM signals s
-        JOIN transactions t
-          ON s.user_id = t.user_id
-        GROUP BY s.signal_id
+        JOIN accounts a
+          ON a.user_id = s.user_id
     """)
 
     rows = cursor.fetchall()
@@ -126,11 +128,18 @@ def compute_account_risk_scores():
     """
     Compute risk scores per (user_id, account_id).
     Store structured reasons with contribution breakdown.
+
+    For full re-scoring use app.risk.vectorized.rescore_all_accounts.
     """
     rows = fetch_signals_with_accounts()
     risk_map = {}
 
-    for user_id, account_id, signal_type, value, description in rows:
+    for row in rows:
+        user_id = row["user_id"]
+        account_id = row["account_id"]
+        signal_type = row["signal_type"]
+        value = row["signal_value"] or 0
+        description = row["description"]
         key = (user_id, account_id)
 
         if key not in risk_map:
@@ -0,0 +1,244 @@
+import asyncio
+import select
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.config import (
+    BLOCK_THRESHOLD,
+    REVIEW_THRESHOLD,
+    SCORING_CONFIG_LISTEN,
+    SCORING_CONFIG_TTL_SECONDS,
+)
+from app.core.logging import get_logger
+from app.data.database import get_connection, get_pool
+from app.repositories.scoring_config_repo import (
+    fetch_active_scoring_config,
+    fetch_shadow_scoring_configs,
+)
+from app.risk.engine import SIGNAL_WEIGHTS
+
+
+logger = get_logger(__name__)
+
+NOTIFY_CHANNEL = "scoring_config"
+
+
+class ScoringConfig:
+    """An immutable weight set + thresholds, identified by version."""
+
+    __slots__ = ("version", "weights", "review_threshold", "block_threshold")
+
+    def __init__(self, version: int, weights: Dict[str, float], review_threshold: float, block_threshold: float):
+        self.version = version
+        self.weights = dict(weights)
+        self.review_threshold = float(review_threshold)
+        self.block_threshold = float(block_threshold)
+
+    @classmethod
+    def from_row(cls, row: Dict[str, Any]) -> "ScoringConfig":
+        return cls(row["version"], row["weights"], row["review_threshold"], row["block_threshold"])
+
+    def weight(self, signal_type: str) -> float:
+        return self.weights.get(signal_type, 0)
+
+    def score(self, signals: List[Dict[str, Any]]) -> float:
+        """Risk score for already-generated signals, without annotating them."""
+        raw_score = sum(self.weight(s["type"]) * float(s["value"]) for s in signals)
+        return round(min(max(raw_score, 0), 100), 2)
+
+    def decide(self, risk_score: float) -> str:
+        if risk_score >= self.block_threshold:
+            return "BLOCK"
+        if risk_score >= self.review_threshold:
+            return "REVIEW"
+        return "ALLOW"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "version": self.version,
+            "weights": dict(self.weights),
+            "review_threshold": self.review_threshold,
+            "block_threshold": self.block_threshold,
+        }
+
+
+def default_scoring_config() -> ScoringConfig:
+    """
+    Built-in weights (engine.SIGNAL_WEIGHTS) and env thresholds.
+
+    Seeded as version 1 at startup; version 0 is only served when the
+    scoring_configs table cannot be read.
+    """
+    return ScoringConfig(0, SIGNAL_WEIGHTS, REVIEW_THRESHOLD, BLOCK_THRESHOLD)
+
+
+class _ScoringConfigCache:
+    """
+    Process-wide cache of the active scoring config and shadow candidates.
+
+    Reads are lock-free while the entry is fresh; after `ttl` seconds (or an
+    invalidate()) the next reader reloads it on a pooled connection while the
+    others keep using the previous version. A failed reload keeps the last
+    good config and retries after another TTL.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._config: Optional[ScoringConfig] = None
+        self._shadows: Tuple[ScoringConfig, ...] = ()
+        self._expires_at = 0.0
+        self._loaded_at: Optional[float] = None
+        self.reloads = 0
+        self.reload_failures = 0
+
+    def fresh(self) -> Optional[ScoringConfig]:
+        """The cached config if it needs no reload, else None."""
+        config = self._config
+        if config is not None and time.monotonic() < self._expires_at:
+            return config
+        return None
+
+    def get(self) -> ScoringConfig:
+        config = self._config
+        if config is not None and time.monotonic() < self._expires_at:
+            return config
+
+        if not self._lock.acquire(blocking=config is None):
+            # Someone else is reloading; serve the previous version meanwhile
+            return config
+        try:
+            if self._config is not None and time.monotonic() < self._expires_at:
+                return self._config
+            self._reload()
+            return self._config
+        finally:
+            self._lock.release()
+
+    def _reload(self) -> None:
+        try:
+            with get_pool().connection() as conn:
+                cursor = conn.cursor()
+                row = fetch_active_scoring_config(cursor)
+                shadow_rows = fetch_shadow_scoring_configs(cursor)
+            config = ScoringConfig.from_row(row) if row else default_scoring_config()
+            if self._config is None or config.version != self._config.version:
+                logger.info("Scoring config version %s loaded", config.version)
+            self._shadows = tuple(ScoringConfig.from_row(r) for r in shadow_rows)
+            self._config = config
+            self._loaded_at = time.monotonic()
+            self.reloads += 1
+        except Exception:
+            self.reload_failures += 1
+            logger.exception("Scoring config reload failed; keeping version %s",
+                             self._config.version if self._config else None)
+            if self._config is None:
+                self._config = default_scoring_config()
+        self._expires_at = time.monotonic() + self.ttl
+
+    @property
+    def shadows(self) -> Tuple[ScoringConfig, ...]:
+        return self._shadows
+
+    def invalidate(self) -> None:
+        self._expires_at = 0.0
+
+    def info(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        return {
+            "version": self._config.version if self._config else None,
+            "shadow_versions": [c.version for c in self._shadows],
+            "ttl_seconds": self.ttl,
+            "age_seconds": round(now - self._loaded_at, 3) if self._loaded_at else None,
+            "reloads": self.reloads,
+            "reload_failures": self.reload_failures,
+            "listening": _listener is not None and _listener.is_alive(),
+        }
+
+
+_cache = _ScoringConfigCache(SCORING_CONFIG_TTL_SECONDS)
+
+
+def get_scoring_config() -> ScoringConfig:
+    """Active scoring config; refreshed at most once per TTL per process."""
+    return _cache.get()
+
+
+async def get_scoring_configs_async() -> Tuple[ScoringConfig, Tuple[ScoringConfig, ...]]:
+    """
+    Active config and shadow candidates for the event loop, from one cache read.
+
+    A reload is a psycopg2 query on a pooled connection, so it runs on the
+    default executor instead of blocking the loop. Pass the candidates on to
+    shadow_score() so it does not go back to the cache (and maybe reload).
+    """
+    config = _cache.fresh()
+    if config is None:
+        config = await asyncio.get_running_loop().run_in_executor(None, _cache.get)
+    return config, _cache.shadows
+
+
+def get_shadow_scoring_configs() -> Tuple[ScoringConfig, ...]:
+    """Candidate configs to score in shadow; cached with the active one."""
+    _cache.get()
+    return _cache.shadows
+
+
+def invalidate_scoring_config() -> None:
+    _cache.invalidate()
+
+
+def scoring_config_cache_info() -> Dict[str, Any]:
+    return _cache.info()
+
+
+# ---------------------------------------------------------
+# LISTEN/NOTIFY invalidation (activations reach every worker
+# immediately instead of after the TTL)
+# ---------------------------------------------------------
+
+_listener: Optional[threading.Thread] = None
+_listener_stop = threading.Event()
+
+
+def _listen_loop() -> None:
+    while not _listener_stop.is_set():
+        conn = None
+        try:
+            conn = get_connection()
+            conn.autocommit = True
+            conn.cursor().execute(f"LISTEN {NOTIFY_CHANNEL}")
+            # Anything activated while we were not listening
+            _cache.invalidate()
+
+            while not _listener_stop.is_set():
+                if select.select([conn], [], [], 1.0) == ([], [], []):
+                    continue
+                conn.poll()
+                if conn.notifies:
+                    conn.notifies.clear()
+                    _cache.invalidate()
+        except Exception:
+            logger.exception("Scoring config listener failed; retrying")
+            _listener_stop.wait(5.0)
+        finally:
+            if conn is not None:
+                conn.close()
+
+
+def start_scoring_config_listener() -> None:
+    global _listener
+    if not SCORING_CONFIG_LISTEN or (_listener is not None and _listener.is_alive()):
+        return
+    _listener_stop.clear()
+    _listener = threading.Thread(target=_listen_loop, name="scoring-config-listener", daemon=True)
+    _listener.start()
+
+
+def stop_scoring_config_listener() -> None:
+    global _listener
+    _listener_stop.set()
+    if _listener is not None:
+        _listener.join(timeout=5.0)
+        _listener = None
@@ -0,0 +1,171 @@
+import datetime
+import os
+import queue
+import threading
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+
+from psycopg2.extras import execute_values
+
+from app.core.logging import get_logger
+from app.data.database import get_pool
+from app.risk.scoring_config import ScoringConfig, get_shadow_scoring_configs
+
+
+logger = get_logger(__name__)
+
+SHADOW_QUEUE_SIZE = int(os.getenv("SHADOW_QUEUE_SIZE", 10000))
+SHADOW_BATCH_SIZE = int(os.getenv("SHADOW_BATCH_SIZE", 500))
+SHADOW_FLUSH_INTERVAL_SECONDS = float(os.getenv("SHADOW_FLUSH_INTERVAL_SECONDS", 1.0))
+
+
+class ShadowWriter:
+    """
+    Background, batched writer for shadow_scores rows.
+
+    submit() never blocks the request: rows go onto a bounded queue and are
+    dropped (and counted) when it is full. A daemon thread drains the queue
+    and writes up to `batch_size` rows per multi-row INSERT, at least every
+    `flush_interval` seconds.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_queue: int = SHADOW_QUEUE_SIZE,
+        batch_size: int = SHADOW_BATCH_SIZE,
+        flush_interval: float = SHADOW_FLUSH_INTERVAL_SECONDS,
+    ):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: "queue.Queue[tuple]" = queue.Queue(maxsize=max_queue)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+
+    def submit(self, rows: List[tuple]) -> None:
+        for row in rows:
+            try:
+                self._queue.put_nowait(row)
+            except queue.Full:
+                self.dropped += 1
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="shadow-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Stop the thread after flushing whatever is queued."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+
+    def _drain(self, first: tuple) -> List[tuple]:
+        batch = [first]
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        while not (self._stop.is_set() and self._queue.empty()):
+            try:
+                first = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+            self._write(self._drain(first))
+
+    def _write(self, batch: List[tuple]) -> None:
+        try:
+            with get_pool().connection() as conn:
+                execute_values(
+                    conn.cursor(),
+                    """
+                    INSERT INTO shadow_scores (
+                        shadow_id,
+                        txn_id,
+                        account_id,
+                        active_version,
+                        active_score,
+                        active_decision,
+                        candidate_version,
+                        candidate_score,
+                        candidate_decision,
+                        created_at
+                    )
+                    VALUES %s
+                    """,
+                    batch,
+                    page_size=len(batch),
+                )
+                conn.commit()
+            self.written += len(batch)
+        except Exception:
+            self.failed += len(batch)
+            logger.exception("Shadow score write failed; dropped %d rows", len(batch))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": self._thread is not None and self._thread.is_alive(),
+            "queued": self._queue.qsize(),
+            "written": self.written,
+            "dropped": self.dropped,
+            "failed": self.failed,
+        }
+
+
+shadow_writer = ShadowWriter()
+
+
+def shadow_score(
+    *,
+    txn_id: str,
+    account_id: str,
+    signals: List[Dict[str, Any]],
+    active: ScoringConfig,
+    risk_score: float,
+    decision: str,
+    created_at: Optional[datetime.datetime] = None,
+    candidates: Optional[Tuple[ScoringConfig, ...]] = None,
+) -> None:
+    """
+    Score `signals` with every shadow candidate and queue the results.
+
+    Pure arithmetic on already-generated signals plus a non-blocking
+    enqueue; no-op when there are no candidates. `candidates` defaults to
+    the cached ones, which may reload them on this thread.
+    """
+    if candidates is None:
+        candidates = get_shadow_scoring_configs()
+    if not candidates:
+        return
+
+    created_at = created_at or datetime.datetime.utcnow()
+    rows = []
+    for candidate in candidates:
+        if candidate.version == active.version:
+            continue
+        candidate_score = candidate.score(signals)
+        rows.append(
+            (
+                str(uuid.uuid4()),
+                txn_id,
+                account_id,
+                active.version,
+                risk_score,
+                decision,
+                candidate.version,
+                candidate_score,
+                candidate.decide(candidate_score),
+                created_at,
+            )
+        )
+    shadow_writer.submit(rows)
@@ -0,0 +1,343 @@
+import time
+import uuid
+import datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+import numpy as np
+from psycopg2 import extensions
+
+from app.audit.logger import log_events
+from app.core.logging import get_logger
+from app.repositories.audit_repo import account_event
+from app.repositories.case_repo import create_review_cases_batch
+from app.repositories.decision_repo import fetch_latest_decisions, insert_decisions_batch
+from app.repositories.scoring_config_repo import fetch_active_scoring_config
+from app.risk.engine import SIGNAL_WEIGHTS
+from app.risk.scoring_config import ScoringConfig, default_scoring_config
+
+
+logger = get_logger(__name__)
+
+LOAD_CHUNK_SIZE = 50000
+STORE_CHUNK_SIZE = 5000
+
+# Index 0..n-1 follow SIGNAL_WEIGHTS; the last slot collects unknown types (weight 0)
+SIGNAL_TYPES = list(SIGNAL_WEIGHTS)
+UNKNOWN_TYPE = len(SIGNAL_TYPES)
+
+
+def weight_vector(weights: Optional[Dict[str, float]] = None) -> np.ndarray:
+    """Weights aligned with SIGNAL_TYPES, plus a zero for unknown types."""
+    weights = SIGNAL_WEIGHTS if weights is None else weights
+    return np.array([float(weights.get(t, 0.0)) for t in SIGNAL_TYPES] + [0.0], dtype=np.float64)
+
+
+class SignalArrays:
+    """Column-wise signal rows attributed to accounts."""
+
+    __slots__ = ("account_ids", "user_ids", "type_codes", "values")
+
+    def __init__(self, account_ids, user_ids, type_codes, values):
+        self.account_ids = account_ids
+        self.user_ids = user_ids
+        self.type_codes = type_codes
+        self.values = values
+
+    def __len__(self):
+        return len(self.values)
+
+
+class AccountScores:
+    """Per-account scoring result; every array is aligned with account_ids."""
+
+    __slots__ = (
+        "account_ids",
+        "user_ids",
+        "scores",
+        "decisions",
+        "type_counts",
+        "type_contributions",
+        "type_first_seen",
+        "signal_count",
+        "config_version",
+    )
+
+    def __init__(self, **fields):
+        for name in self.__slots__:
+            setattr(self, name, fields[name])
+
+    def __len__(self):
+        return len(self.account_ids)
+
+    def reasons(self, i: int) -> List[Dict[str, Any]]:
+        """Per-type breakdown for account i, in first-triggered order."""
+        present = np.nonzero(self.type_counts[i])[0]
+        present = present[np.argsort(self.type_first_seen[i, present], kind="stable")]
+        return [
+            {
+                "type": SIGNAL_TYPES[t] if t < UNKNOWN_TYPE else "UNKNOWN",
+                "triggers": int(self.type_counts[i, t]),
+                "contribution": round(float(self.type_contributions[i, t]), 2),
+            }
+            for t in present
+        ]
+
+    def summary(self, i: int) -> str:
+        """Same text as engine.summarize_reasons for account i."""
+        return " | ".join(f"{r['type']}: {r['triggers']} triggers" for r in self.reasons(i))
+
+
+def _iter_signal_chunks(conn, chunk_size: int) -> Iterator[List[tuple]]:
+    # Tuple rows (not RealDictCursor) keep column extraction cheap
+    cursor = conn.cursor(
+        name=f"risk_signals_{uuid.uuid4().hex}",
+        cursor_factory=extensions.cursor,
+    )
+    cursor.itersize = chunk_size
+    try:
+        # Signals are user-level: attribute each one to the user's accounts
+        # (one row per account, not one per transaction as the old join did)
+        cursor.execute(
+            """
+            SELECT a.account_id,
+                   a.user_id,
+                   s.signal_type,
+                   s.signal_value
+            FROM signals s
+            JOIN accounts a
+              ON a.user_id = s.user_id
+            """
+        )
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            yield rows
+    finally:
+        cursor.close()
+
+
+def load_signal_arrays(conn, *, chunk_size: int = LOAD_CHUNK_SIZE) -> SignalArrays:
+    """
+    Stream signals into column arrays, mapping signal types to integer codes.
+    """
+    type_index = {t: i for i, t in enumerate(SIGNAL_TYPES)}
+
+    account_parts, user_parts, type_parts, value_parts = [], [], [], []
+
+    for rows in _iter_signal_chunks(conn, chunk_size):
+        accounts, users, types, values = zip(*rows)
+        account_parts.append(np.array(accounts, dtype=object))
+        user_parts.append(np.array(users, dtype=object))
+        type_parts.append(
+            np.fromiter((type_index.get(t, UNKNOWN_TYPE) for t in types), dtype=np.int16, count=len(types))
+        )
+        value_parts.append(np.array([v or 0.0 for v in values], dtype=np.float64))
+
+    conn.rollback()
+
+    if not value_parts:
+        return SignalArrays(
+            np.empty(0, dtype=object),
+            np.empty(0, dtype=object),
+            np.empty(0, dtype=np.int16),
+            np.empty(0, dtype=np.float64),
+        )
+
+    return SignalArrays(
+        np.concatenate(account_parts),
+        np.concatenate(user_parts),
+        np.concatenate(type_parts),
+        np.concatenate(value_parts),
+    )
+
+
+def score_accounts(signals: SignalArrays, config: Optional[ScoringConfig] = None) -> AccountScores:
+    """
+    Compute per-account scores and decisions with grouped reductions.
+
+    Matches compute_account_risk_scores + store_account_risk_decisions:
+    score = round(min(sum(weight * value), 100), 2), then thresholds.
+    """
+    config = config or default_scoring_config()
+    n_types = UNKNOWN_TYPE + 1
+
+    account_ids, first_index, group = np.unique(
+        signals.account_ids.astype(str), return_index=True, return_inverse=True
+    )
+    n_accounts = len(account_ids)
+
+    contributions = weight_vector(config.weights)[signals.type_codes] * signals.values
+    raw = np.bincount(group, weights=contributions, minlength=n_accounts)
+    scores = np.round(np.minimum(raw, 100.0), 2)
+
+    decisions = np.where(
+        scores >= config.block_threshold,
+        "BLOCK",
+        np.where(scores >= config.review_threshold, "REVIEW", "ALLOW"),
+    ).astype(object)
+
+    # (account, type) cells for the reasons breakdown
+    cell = group.astype(np.int64) * n_types + signals.type_codes
+    type_counts = np.bincount(cell, minlength=n_accounts * n_types).reshape(n_accounts, n_types)
+    type_contributions = np.bincount(
+        cell, weights=contributions, minlength=n_accounts * n_types
+    ).reshape(n_accounts, n_types)
+    type_first_seen = np.full(n_accounts * n_types, len(signals), dtype=np.int64)
+    np.minimum.at(type_first_seen, cell, np.arange(len(signals), dtype=np.int64))
+
+    return AccountScores(
+        account_ids=account_ids,
+        user_ids=signals.user_ids[first_index],
+        scores=scores,
+        decisions=decisions,
+        type_counts=type_counts,
+        type_contributions=type_contributions,
+        type_first_seen=type_first_seen.reshape(n_accounts, n_types),
+        signal_count=np.bincount(group, minlength=n_accounts),
+        config_version=config.version,
+    )
+
+
+def store_account_risk_decisions_bulk(
+    conn,
+    result: AccountScores,
+    *,
+    chunk_size: int = STORE_CHUNK_SIZE,
+    dedupe: bool = True,
+) -> Dict[str, int]:
+    """
+    Persist scored accounts in chunks of multi-row INSERTs.
+
+    Per chunk: one latest-decision lookup, then batched decisions, review
+    cases and CASE_OPENED / DECISION_MADE audit events (same order as the
+    row-by-row path). Each chunk commits, so an interrupted run keeps its
+    progress and re-running it skips unchanged accounts via dedupe.
+    """
+    stored = skipped = cases = 0
+
+    for start in range(0, len(result), chunk_size):
+        stop = min(start + chunk_size, len(result))
+        cursor = conn.cursor()
+
+        chunk_ids = [str(a) for a in result.account_ids[start:stop]]
+        latest = fetch_latest_decisions(cursor, chunk_ids) if dedupe else {}
+
+        now = datetime.datetime.utcnow()
+        decision_rows, case_rows, events = [], [], []
+
+        for offset, account_id in enumerate(chunk_ids):
+            i = start + offset
+            user_id = result.user_ids[i]
+            score = float(result.scores[i])
+            decision = result.decisions[i]
+
+            prev = latest.get(account_id)
+            if prev and prev[1] == decision and abs(float(prev[0]) - score) < 1:
+                skipped += 1
+                continue
+
+            decision_rows.append(
+                {
+                    "user_id": user_id,
+                    "account_id": account_id,
+                    "risk_score": score,
+                    "decision": decision,
+                    "reasons": result.summary(i),
+                    "created_at": now,
+                }
+            )
+
+            if decision in ("REVIEW", "BLOCK"):
+                case_id = str(uuid.uuid4())
+                case_rows.append(
+                    {
+                        "case_id": case_id,
+                        "user_id": user_id,
+                        "account_id": account_id,
+                        "decision": decision,
+                        "risk_score": score,
+                        "created_at": now,
+                    }
+                )
+                events.append(
+                    account_event(
+                        "CASE_OPENED",
+                        account_id=account_id,
+                        metadata={
+                            "case_id": case_id,
+                            "decision": decision,
+                            "risk_score": score,
+                            "status": "OPEN",
+                        },
+                    )
+                )
+
+            events.append(
+                account_event(
+                    "DECISION_MADE",
+                    account_id=account_id,
+                    metadata={
+                        "user_id": user_id,
+                        "account_id": account_id,
+                        "risk_score": score,
+                        "decision": decision,
+                        "reasons": result.reasons(i),
+                        "scoring_config_version": result.config_version,
+                    },
+                )
+            )
+
+        insert_decisions_batch(cursor, decision_rows)
+        create_review_cases_batch(cursor, case_rows)
+        log_events(cursor, events)
+        conn.commit()
+
+        stored += len(decision_rows)
+        cases += len(case_rows)
+
+    return {"decisions_stored": stored, "decisions_skipped": skipped, "cases_opened": cases}
+
+
+def rescore_all_accounts(
+    conn,
+    *,
+    config: Optional[ScoringConfig] = None,
+    store: bool = True,
+    load_chunk_size: int = LOAD_CHUNK_SIZE,
+    store_chunk_size: int = STORE_CHUNK_SIZE,
+) -> Dict[str, Any]:
+    """
+    Load, score and (optionally) store every account; returns stage timings.
+
+    Uses the active scoring config unless `config` is given.
+    """
+    started_at = time.monotonic()
+    if config is None:
+        row = fetch_active_scoring_config(conn.cursor())
+        config = ScoringConfig.from_row(row) if row else default_scoring_config()
+
+    signals = load_signal_arrays(conn, chunk_size=load_chunk_size)
+    loaded_at = time.monotonic()
+
+    result = score_accounts(signals, config)
+    scored_at = time.monotonic()
+
+    report: Dict[str, Any] = {
+        "signals": len(signals),
+        "accounts": len(result),
+        "scoring_config_version": config.version,
+        "decisions": {
+            d: int(np.count_nonzero(result.decisions == d)) for d in ("ALLOW", "REVIEW", "BLOCK")
+        },
+        "load_s": round(loaded_at - started_at, 3),
+        "score_s": round(scored_at - loaded_at, 3),
+    }
+
+    if store:
+        report.update(store_account_risk_decisions_bulk(conn, result, chunk_size=store_chunk_size))
+        report["store_s"] = round(time.monotonic() - scored_at, 3)
+
+    report["total_s"] = round(time.monotonic() - started_at, 3)
+    logger.info("Re-scored %d accounts from %d signals in %.2fs", len(result), len(signals), report["total_s"])
+    return report
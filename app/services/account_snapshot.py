@@ -0,0 +1,190 @@
+import datetime
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional
+
+from app.core.instrumentation import registry
+
+
+ACCOUNT_SNAPSHOT_TTL_SECONDS = float(os.getenv("ACCOUNT_SNAPSHOT_TTL_SECONDS", 5))
+ACCOUNT_SNAPSHOT_CACHE_SIZE = int(os.getenv("ACCOUNT_SNAPSHOT_CACHE_SIZE", 10000))
+
+RECENT_ITEMS = 10
+
+# Everything the account detail and profile views show, in one round trip.
+# Each section is an index probe (accounts PK, (account_id, created_at) on
+# decisions / open cases, (user_id, created_at) on signals, (account_id,
+# txn_timestamp) on transactions); the total comes from account_txn_counts.
+_SNAPSHOT_SQL = """
+    WITH acct AS (
+        SELECT account_id, user_id, account_type, balance, status, created_at
+        FROM accounts
+        WHERE account_id = %(account_id)s
+        LIMIT 1
+    )
+    SELECT
+        (SELECT row_to_json(a) FROM acct a) AS account,
+        (
+            SELECT row_to_json(d)
+            FROM (
+                SELECT decision, risk_score, reasons, created_at
+                FROM risk_decisions
+                WHERE account_id = %(account_id)s
+                ORDER BY created_at DESC
+                LIMIT 1
+            ) d
+        ) AS latest_decision,
+        (
+            SELECT row_to_json(c)
+            FROM (
+                SELECT case_id, decision, risk_score, status, created_at
+                FROM review_cases
+                WHERE account_id = %(account_id)s
+                  AND status = 'OPEN'
+                ORDER BY created_at DESC
+                LIMIT 1
+            ) c
+        ) AS open_case,
+        (
+            SELECT COALESCE(json_agg(s ORDER BY s.created_at DESC), '[]'::json)
+            FROM (
+                SELECT signal_type, signal_value, signal_weight, signal_contribution, description, created_at
+                FROM signals
+                WHERE user_id = (SELECT user_id FROM acct)
+                ORDER BY created_at DESC
+                LIMIT %(recent)s
+            ) s
+        ) AS recent_signals,
+        (
+            SELECT COALESCE(json_agg(t ORDER BY t.txn_timestamp DESC), '[]'::json)
+            FROM (
+                SELECT txn_id, amount, merchant_category, location, device_id, txn_timestamp, status
+                FROM transactions
+                WHERE account_id = %(account_id)s
+                ORDER BY txn_timestamp DESC
+                LIMIT %(recent)s
+            ) t
+        ) AS recent_transactions,
+        COALESCE(
+            (SELECT txn_count FROM account_txn_counts WHERE account_id = %(account_id)s),
+            0
+        ) AS total_transactions
+"""
+
+_TIMESTAMP_KEYS = ("created_at", "txn_timestamp")
+
+
+def _parse_timestamp(value: Optional[str]) -> Optional[datetime.datetime]:
+    if value is None:
+        return None
+    fmt = "%Y-%m-%dT%H:%M:%S.%f" if "." in value else "%Y-%m-%dT%H:%M:%S"
+    return datetime.datetime.strptime(value, fmt)
+
+
+def _restore_types(row: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """row_to_json renders timestamps as text; hand datetimes back like the cursor would."""
+    if row is None:
+        return None
+    for key in _TIMESTAMP_KEYS:
+        if isinstance(row.get(key), str):
+            row[key] = _parse_timestamp(row[key])
+    return row
+
+
+def fetch_account_snapshot(cursor: Any, account_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Load an account snapshot with a single query.
+
+    Returns None when neither the account nor any decision for it exists;
+    an orphan decision (account row missing) is returned with account=None.
+    """
+    cursor.execute(_SNAPSHOT_SQL, {"account_id": account_id, "recent": RECENT_ITEMS})
+    row = cursor.fetchone()
+    if row["account"] is None and row["latest_decision"] is None:
+        return None
+
+    return {
+        "account": _restore_types(row["account"]),
+        "latest_decision": _restore_types(row["latest_decision"]),
+        "open_case": _restore_types(row["open_case"]),
+        "recent_signals": [_restore_types(s) for s in row["recent_signals"]],
+        "recent_transactions": [_restore_types(t) for t in row["recent_transactions"]],
+        "total_transactions": int(row["total_transactions"]),
+    }
+
+
+class AccountSnapshotCache:
+    """
+    Bounded LRU of account snapshots with a TTL.
+
+    invalidate() drops an account's entry and bumps its generation; a load
+    that started before the bump is not stored, so a reader racing a commit
+    cannot put the pre-commit snapshot back. The cache is per process:
+    writes from other workers or scripts are picked up when the TTL expires.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # account_id -> (expires_at, snapshot)
+        self._generations: Dict[str, int] = {}
+        self._hits = registry.counter(
+            "aegis_account_snapshot_requests_total", "Account snapshot lookups", result="hit"
+        )
+        self._misses = registry.counter(
+            "aegis_account_snapshot_requests_total", "Account snapshot lookups", result="miss"
+        )
+
+    def get(self, cursor: Any, account_id: str) -> Optional[Dict[str, Any]]:
+        if self.ttl_seconds > 0:
+            now = time.monotonic()
+            with self._lock:
+                entry = self._entries.get(account_id)
+                if entry is not None and now < entry[0]:
+                    self._entries.move_to_end(account_id)
+                    self._hits.inc()
+                    return entry[1]
+                generation = self._generations.get(account_id, 0)
+
+        self._misses.inc()
+        snapshot = fetch_account_snapshot(cursor, account_id)
+        if snapshot is None or self.ttl_seconds <= 0:
+            return snapshot
+
+        with self._lock:
+            if self._generations.get(account_id, 0) == generation:
+                self._entries[account_id] = (time.monotonic() + self.ttl_seconds, snapshot)
+                self._entries.move_to_end(account_id)
+                while len(self._entries) > self.max_size:
+                    evicted, _ = self._entries.popitem(last=False)
+                    self._generations.pop(evicted, None)
+        return snapshot
+
+    def invalidate(self, account_ids: Iterable[str]) -> None:
+        with self._lock:
+            for account_id in account_ids:
+                self._entries.pop(account_id, None)
+                self._generations[account_id] = self._generations.get(account_id, 0) + 1
+            # Generations only matter while a load may be in flight
+            if len(self._generations) > 4 * self.max_size:
+                self._generations = {k: self._generations[k] for k in self._entries}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._generations.clear()
+
+
+account_snapshots = AccountSnapshotCache(ACCOUNT_SNAPSHOT_CACHE_SIZE, ACCOUNT_SNAPSHOT_TTL_SECONDS)
+
+
+def get_account_snapshot(cursor: Any, account_id: str) -> Optional[Dict[str, Any]]:
+    return account_snapshots.get(cursor, account_id)
+
+
+def invalidate_account_snapshots(*account_ids: str) -> None:
+    """Call after committing a write that changes what an account snapshot shows."""
+    account_snapshots.invalidate(account_ids)
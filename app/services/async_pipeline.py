@@ -0,0 +1,275 @@
+import datetime
+import time
+from typing import Any, Dict, Optional
+
+from app.core.config import FEATURE_STORE_ENABLED
+from app.core.instrumentation import InstrumentedAsyncConnection, StageTimer
+from app.core.logging import get_logger
+from app.repositories.aio.transaction_repo import insert_transaction
+from app.repositories.aio.decision_repo import fetch_latest_decision, insert_decision
+from app.repositories.decision_repo import build_explanation
+from app.repositories.aio.signal_repo import insert_signals
+from app.repositories.aio.case_repo import create_review_case
+from app.repositories.aio.outbox_repo import enqueue_side_effects
+from app.repositories.case_repo import build_review_case
+from app.repositories.signal_repo import build_signal_rows
+from app.repositories.aio.audit_repo import (
+    log_transaction_created,
+    log_signals_generated,
+    log_decision_made,
+    log_case_opened,
+)
+from app.risk.scoring_config import get_scoring_configs_async
+from app.risk.shadow import shadow_score
+from app.audit.writer import audit_writer
+from app.repositories.audit_repo import account_event
+from app.services.pipeline import RiskPipeline
+
+
+logger = get_logger(__name__)
+
+_AUDIT_LOGGERS = {
+    "TRANSACTION_CREATED": log_transaction_created,
+    "SIGNALS_GENERATED": log_signals_generated,
+    "CASE_OPENED": log_case_opened,
+    "DECISION_MADE": log_decision_made,
+}
+
+
+class AsyncRiskPipeline(RiskPipeline):
+    """
+    asyncpg implementation of RiskPipeline.process_transaction.
+
+    Issues the same statements in the same order and inherits the signal,
+    scoring and decision helpers, so decisions and audit hashes match the
+    psycopg2 pipeline exactly. Batches still go through
+    RiskPipeline.process_batch on the sync driver.
+    """
+
+    async def _audit(self, conn: Any, event_type: str, *, account_id: str, metadata: Dict[str, Any]) -> None:
+        if self.audit_write_behind or self.outbox:
+            self.deferred_audit_events.append(
+                account_event(event_type, account_id=account_id, metadata=metadata)
+            )
+        else:
+            await _AUDIT_LOGGERS[event_type](conn, account_id=account_id, metadata=metadata)
+
+    async def publish_audit_events(self) -> None:
+        """Queue the deferred audit events; call only after the transaction committed."""
+        events, self.deferred_audit_events = self.deferred_audit_events, []
+        await audit_writer.submit_async(events)
+
+    async def after_commit(self) -> None:
+        """Post-commit hook; failures are logged, never raised (see RiskPipeline)."""
+        try:
+            self.record_features()
+        except Exception:
+            logger.exception("Feature store update failed after commit")
+        try:
+            await self.publish_audit_events()
+        except Exception:
+            logger.exception("Audit event publish failed after commit")
+
+    async def process_transaction(
+        self,
+        account_id: str,
+        amount: float,
+        device_id: str,
+        *,
+        timings: bool = False,
+    ) -> Dict[str, Any]:
+
+        started_at = time.monotonic()
+        conn = InstrumentedAsyncConnection(self.db)
+        timer = StageTimer("single_async", conn)
+        config, shadow_configs = await get_scoring_configs_async()
+        timer.lap("scoring_config")
+
+        txn = await insert_transaction(
+            conn,
+            account_id=account_id,
+            amount=amount,
+            device_id=device_id,
+        )
+
+        if not txn:
+            raise ValueError("Transaction insert failed")
+
+        self._stage_feature(txn)
+        timer.lap("insert_transaction")
+        user_id = txn.get("user_id")
+
+        await self._audit(
+            conn,
+            "TRANSACTION_CREATED",
+            account_id=account_id,
+            metadata={
+                "transaction_id": txn["txn_id"],
+                "amount": amount,
+                "device_id": device_id,
+                "timestamp": str(txn["txn_timestamp"]),
+            },
+        )
+        timer.lap("audit_transaction_created")
+
+        latest = await fetch_latest_decision(conn, account_id=account_id)
+        timer.lap("fetch_latest_decision")
+
+        previous_decision: Optional[str] = None
+
+        if latest:
+            _, previous_decision = latest
+
+        # Defensive: signal generation should never crash the pipeline
+        try:
+            total_spend = None if FEATURE_STORE_ENABLED else await self._fetch_total_spend(conn, account_id)
+            signals = self._generate_signals(
+                None, account_id=account_id, txn=txn, total_spend=total_spend
+            )
+        except Exception:
+            logger.exception("Signal generation failed for account_id=%s", account_id)
+            signals = []
+        timer.lap("generate_signals")
+
+        risk_score, signal_breakdown = self._compute_risk_score(signals, config)
+
+        if self.outbox:
+            signal_rows = build_signal_rows(user_id, signals, datetime.datetime.utcnow())
+        else:
+            await insert_signals(conn, user_id, signals)
+            timer.lap("insert_signals")
+
+        if signals:
+            await self._audit(
+                conn,
+                "SIGNALS_GENERATED",
+                account_id=account_id,
+                metadata={
+                    "signals": signals,
+                    "signal_breakdown": signal_breakdown,
+                },
+            )
+            timer.lap("audit_signals_generated")
+
+        decision = self._decide(risk_score, config)
+        decision_transition = self._transition(previous_decision, decision)
+
+        await insert_decision(
+            conn,
+            user_id=user_id,
+            account_id=account_id,
+            risk_score=risk_score,
+            decision=decision,
+            reasons=self._summarize_signals(signals),
+            txn_id=txn["txn_id"],
+            scoring_config_version=config.version,
+            explanation=build_explanation(signals),
+        )
+        timer.lap("insert_decision")
+
+        case = None
+        case_created = False
+
+        if decision in ("REVIEW", "BLOCK"):
+
+            if self.outbox:
+                case = build_review_case(
+                    user_id=user_id,
+                    account_id=account_id,
+                    decision=decision,
+                    risk_score=risk_score,
+                )
+            else:
+                case = await create_review_case(
+                    conn,
+                    user_id=user_id,
+                    account_id=account_id,
+                    decision=decision,
+                    risk_score=risk_score,
+                )
+                timer.lap("create_case")
+
+            case_created = True
+
+            await self._audit(
+                conn,
+                "CASE_OPENED",
+                account_id=account_id,
+                metadata={
+                    "case_id": case["case_id"],
+                    "decision": decision,
+                    "risk_score": risk_score,
+                    "status": case["status"],
+                },
+            )
+            timer.lap("audit_case_opened")
+
+        await self._audit(
+            conn,
+            "DECISION_MADE",
+            account_id=account_id,
+            metadata={
+                "user_id": user_id,
+                "account_id": account_id,
+                "transaction_id": txn["txn_id"],
+                "risk_score": risk_score,
+                "decision": decision,
+                "previous_decision": previous_decision,
+                "decision_transition": decision_transition,
+                "signals": signals,
+                "signal_breakdown": signal_breakdown,
+                "scoring_config_version": config.version,
+            },
+        )
+        timer.lap("audit_decision_made")
+
+        if self.outbox:
+            await enqueue_side_effects(
+                conn,
+                account_id=account_id,
+                txn_id=txn["txn_id"],
+                payload=self._side_effects_payload(signal_rows, case),
+            )
+            timer.lap("enqueue_outbox")
+
+        latency_ms = (time.monotonic() - started_at) * 1000.0
+
+        shadow_score(
+            txn_id=txn["txn_id"],
+            account_id=account_id,
+            signals=signals,
+            active=config,
+            risk_score=risk_score,
+            decision=decision,
+            candidates=shadow_configs,
+        )
+        timer.lap("shadow_score")
+        timer.finish()
+
+        result = {
+            "transaction_id": txn["txn_id"],
+            "risk_score": risk_score,
+            "decision": decision,
+            "previous_decision": previous_decision,
+            "decision_transition": decision_transition,
+            "signals": signals,
+            "signal_breakdown": signal_breakdown,
+            "case_created": case_created,
+            "decision_latency_ms": round(latency_ms, 2),
+        }
+        if timings:
+            result["timings"] = timer.as_dict()
+        return result
+
+    async def _fetch_total_spend(self, conn: Any, account_id: str) -> float:
+        """24h spend for the SQL fallback (FEATURE_STORE_ENABLED=false)."""
+        total_spend = await conn.fetchval(
+            """
+            SELECT COALESCE(SUM(amount),0) AS total_spend
+            FROM transactions
+            WHERE account_id=$1
+            AND txn_timestamp >= NOW() - INTERVAL '1 day'
+            """,
+            account_id,
+        )
+        return float(total_spend or 0)
@@ -0,0 +1,180 @@
+import datetime
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from app.core.instrumentation import registry
+from app.repositories import idempotency_repo
+from app.repositories.aio import idempotency_repo as aio_idempotency_repo
+
+
+IDEMPOTENCY_KEY_TTL_SECONDS = float(os.getenv("IDEMPOTENCY_KEY_TTL_SECONDS", 86400))
+IDEMPOTENCY_CACHE_SIZE = int(os.getenv("IDEMPOTENCY_CACHE_SIZE", 10000))
+# How long a duplicate waits for the original request to commit before a 409
+IDEMPOTENCY_WAIT_SECONDS = float(os.getenv("IDEMPOTENCY_WAIT_SECONDS", 10))
+
+MAX_KEY_LENGTH = 255
+
+LOCK_NOT_AVAILABLE = "55P03"
+
+
+class IdempotencyKeyInvalid(ValueError):
+    """Empty or over-long Idempotency-Key header."""
+
+
+class IdempotencyKeyMismatch(Exception):
+    """The key was already used with a different request body."""
+
+
+class IdempotencyKeyInProgress(Exception):
+    """Another request holding the key did not finish within IDEMPOTENCY_WAIT_SECONDS."""
+
+
+def request_fingerprint(body: Dict[str, Any]) -> str:
+    return hashlib.sha256(json.dumps(body, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def _validate_key(key: str) -> str:
+    key = key.strip()
+    if not key or len(key) > MAX_KEY_LENGTH:
+        raise IdempotencyKeyInvalid(f"Idempotency-Key must be 1-{MAX_KEY_LENGTH} characters")
+    return key
+
+
+class IdempotencyCache:
+    """
+    Bounded LRU of completed results, checked before the database.
+
+    Entries are only added after the owning transaction committed (or read
+    back committed), so a hit is always a durable result. Per process; other
+    workers fall through to idempotency_keys.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (request_hash, response, expires_at)
+        self._hits = registry.counter(
+            "aegis_idempotency_cache_requests_total", "Idempotency key cache lookups", result="hit"
+        )
+        self._misses = registry.counter(
+            "aegis_idempotency_cache_requests_total", "Idempotency key cache lookups", result="miss"
+        )
+
+    def get(self, key: str, now: datetime.datetime):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now < entry[2]:
+                self._entries.move_to_end(key)
+                self._hits.inc()
+                return entry
+            if entry is not None:
+                del self._entries[key]
+        self._misses.inc()
+        return None
+
+    def put(self, key: str, request_hash: str, response: Dict[str, Any], expires_at: datetime.datetime) -> None:
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (request_hash, response, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+idempotency_cache = IdempotencyCache(IDEMPOTENCY_CACHE_SIZE)
+
+
+class IdempotentRequest:
+    """
+    Insert-or-wait protocol for one request carrying an Idempotency-Key.
+
+    begin() runs first in the request transaction. It either returns the
+    stored response (replay: the caller returns it without running the
+    pipeline) or inserts the key, which blocks any concurrent duplicate on
+    the unique index until this transaction ends. complete() stores the
+    response in the same transaction, so the key and the effects it guards
+    commit or roll back together; a rolled-back request leaves no key and
+    the retry runs normally. remember() fills the LRU after commit.
+    """
+
+    __slots__ = ("key", "request_hash", "now", "expires_at")
+
+    def __init__(self, key: str, body: Dict[str, Any]):
+        self.key = _validate_key(key)
+        self.request_hash = request_fingerprint(body)
+        self.now = datetime.datetime.utcnow()
+        self.expires_at = self.now + datetime.timedelta(seconds=IDEMPOTENCY_KEY_TTL_SECONDS)
+
+    def _claim_args(self) -> Dict[str, Any]:
+        return {
+            "key": self.key,
+            "request_hash": self.request_hash,
+            "now": self.now,
+            "expires_at": self.expires_at,
+            "wait_ms": int(IDEMPOTENCY_WAIT_SECONDS * 1000),
+        }
+
+    def _cached(self) -> Optional[Dict[str, Any]]:
+        entry = idempotency_cache.get(self.key, self.now)
+        if entry is None:
+            return None
+        if entry[0] != self.request_hash:
+            raise IdempotencyKeyMismatch(self.key)
+        return entry[1]
+
+    def _replay(self, row: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        if row is None or row["response"] is None:
+            # Not reachable while keys are only ever committed with a response
+            raise IdempotencyKeyInProgress(self.key)
+        if row["request_hash"] != self.request_hash:
+            raise IdempotencyKeyMismatch(self.key)
+        idempotency_cache.put(self.key, row["request_hash"], row["response"], row["expires_at"])
+        return row["response"]
+
+    def begin(self, cursor: Any) -> Optional[Dict[str, Any]]:
+        """None if this request owns the key; otherwise the response to replay."""
+        cached = self._cached()
+        if cached is not None:
+            return cached
+        try:
+            claimed = idempotency_repo.claim_idempotency_key(cursor, **self._claim_args())
+        except Exception as exc:
+            if getattr(exc, "pgcode", None) == LOCK_NOT_AVAILABLE:
+                raise IdempotencyKeyInProgress(self.key) from exc
+            raise
+        if claimed:
+            return None
+        return self._replay(idempotency_repo.fetch_idempotency_result(cursor, self.key))
+
+    async def begin_async(self, conn: Any) -> Optional[Dict[str, Any]]:
+        cached = self._cached()
+        if cached is not None:
+            return cached
+        try:
+            claimed = await aio_idempotency_repo.claim_idempotency_key(conn, **self._claim_args())
+        except Exception as exc:
+            if getattr(exc, "sqlstate", None) == LOCK_NOT_AVAILABLE:
+                raise IdempotencyKeyInProgress(self.key) from exc
+            raise
+        if claimed:
+            return None
+        return self._replay(await aio_idempotency_repo.fetch_idempotency_result(conn, self.key))
+
+    def complete(self, cursor: Any, response: Dict[str, Any]) -> None:
+        idempotency_repo.store_idempotency_result(cursor, key=self.key, response=response)
+
+    async def complete_async(self, conn: Any, response: Dict[str, Any]) -> None:
+        await aio_idempotency_repo.store_idempotency_result(conn, key=self.key, response=response)
+
+    def remember(self, response: Dict[str, Any]) -> None:
+        """Call after commit."""
+        idempotency_cache.put(self.key, self.request_hash, response, self.expires_at)
@@ -0,0 +1,442 @@
+import datetime
+import os
+import threading
+from typing import Any, Dict, List, Optional
+
+from psycopg2.extras import execute_values
+
+from app.core.logging import get_logger
+from app.data.database import get_pool
+
+
+logger = get_logger(__name__)
+
+METRICS_ROLLUP_INTERVAL_SECONDS = float(os.getenv("METRICS_ROLLUP_INTERVAL_SECONDS", 30))
+
+# Minutes younger than this are left for the next run: a writer may still
+# commit a row stamped before the newest visible one.
+METRICS_ROLLUP_LAG_SECONDS = float(os.getenv("METRICS_ROLLUP_LAG_SECONDS", 60))
+
+# Upper bound on raw data aggregated per transaction during a backfill
+METRICS_ROLLUP_MAX_WINDOW_HOURS = float(os.getenv("METRICS_ROLLUP_MAX_WINDOW_HOURS", 6))
+
+ROLLUP_STATE = "metrics"
+GRANULARITIES = ("minute", "hour")
+
+# Risk scores are 0..100; fixed 5-point bins make percentiles mergeable
+SCORE_BIN_WIDTH = 5.0
+SCORE_BINS = 20
+
+DECISIONS = ("ALLOW", "REVIEW", "BLOCK")
+
+_COLUMNS = (
+    "transactions",
+    "transaction_amount",
+    "decisions",
+    "allow_count",
+    "review_count",
+    "block_count",
+    "risk_score_sum",
+    "risk_score_hist",
+    "cases_opened",
+    "cases_resolved",
+)
+
+
+def floor_to(ts: datetime.datetime, granularity: str) -> datetime.datetime:
+    if granularity == "minute":
+        return ts.replace(second=0, microsecond=0)
+    if granularity == "hour":
+        return ts.replace(minute=0, second=0, microsecond=0)
+    if granularity == "day":
+        return ts.replace(hour=0, minute=0, second=0, microsecond=0)
+    raise ValueError(f"Unknown granularity: {granularity}")
+
+
+def _empty_bucket() -> Dict[str, Any]:
+    bucket = {column: 0 for column in _COLUMNS}
+    bucket["transaction_amount"] = 0.0
+    bucket["risk_score_sum"] = 0.0
+    bucket["risk_score_hist"] = [0] * SCORE_BINS
+    return bucket
+
+
+def merge_bucket(into: Dict[str, Any], other: Dict[str, Any]) -> None:
+    for column in _COLUMNS:
+        if column == "risk_score_hist":
+            into[column] = [a + b for a, b in zip(into[column], other[column])]
+        else:
+            into[column] += other[column]
+
+
+def histogram_percentile(hist: List[int], q: float) -> Optional[float]:
+    """Approximate score percentile, interpolating linearly inside a bin."""
+    total = sum(hist)
+    if not total:
+        return None
+    rank = q * total
+    seen = 0
+    for index, n in enumerate(hist):
+        if n and seen + n >= rank:
+            fraction = (rank - seen) / n
+            return round((index + fraction) * SCORE_BIN_WIDTH, 2)
+        seen += n
+    return SCORE_BINS * SCORE_BIN_WIDTH
+
+
+# ---------------------------------------------------------
+# Aggregation
+# ---------------------------------------------------------
+
+def aggregate_window(cursor, start: datetime.datetime, end: datetime.datetime) -> Dict[datetime.datetime, Dict]:
+    """
+    Minute buckets for raw rows stamped in [start, end).
+
+    One grouped scan per source table; only aggregates leave the database.
+    """
+    buckets: Dict[datetime.datetime, Dict[str, Any]] = {}
+
+    def bucket(ts):
+        entry = buckets.get(ts)
+        if entry is None:
+            entry = buckets[ts] = _empty_bucket()
+        return entry
+
+    cursor.execute(
+        """
+        SELECT date_trunc('minute', txn_timestamp) AS bucket,
+               COUNT(*) AS n,
+               COALESCE(SUM(amount), 0) AS amount
+        FROM transactions
+        WHERE txn_timestamp >= %s AND txn_timestamp < %s
+        GROUP BY 1
+        """,
+        (start, end),
+    )
+    for row in cursor.fetchall():
+        entry = bucket(row["bucket"])
+        entry["transactions"] += int(row["n"])
+        entry["transaction_amount"] += float(row["amount"])
+
+    cursor.execute(
+        """
+        SELECT date_trunc('minute', created_at) AS bucket,
+               decision,
+               LEAST(GREATEST(FLOOR(COALESCE(risk_score, 0) / %s)::INT, 0), %s) AS bin,
+               COUNT(*) AS n,
+               COALESCE(SUM(risk_score), 0) AS score_sum
+        FROM risk_decisions
+        WHERE created_at >= %s AND created_at < %s
+        GROUP BY 1, 2, 3
+        """,
+        (SCORE_BIN_WIDTH, SCORE_BINS - 1, start, end),
+    )
+    for row in cursor.fetchall():
+        entry = bucket(row["bucket"])
+        n = int(row["n"])
+        entry["decisions"] += n
+        entry["risk_score_sum"] += float(row["score_sum"])
+        entry["risk_score_hist"][row["bin"]] += n
+        if row["decision"] in DECISIONS:
+            entry[f"{row['decision'].lower()}_count"] += n
+
+    cursor.execute(
+        """
+        SELECT date_trunc('minute', created_at) AS bucket, COUNT(*) AS n
+        FROM review_cases
+        WHERE created_at >= %s AND created_at < %s
+        GROUP BY 1
+        """,
+        (start, end),
+    )
+    for row in cursor.fetchall():
+        bucket(row["bucket"])["cases_opened"] += int(row["n"])
+
+    cursor.execute(
+        """
+        SELECT date_trunc('minute', resolved_at) AS bucket, COUNT(*) AS n
+        FROM review_cases
+        WHERE resolved_at >= %s AND resolved_at < %s
+        GROUP BY 1
+        """,
+        (start, end),
+    )
+    for row in cursor.fetchall():
+        bucket(row["bucket"])["cases_resolved"] += int(row["n"])
+
+    return buckets
+
+
+def upsert_rollups(cursor, granularity: str, buckets: Dict[datetime.datetime, Dict]) -> int:
+    """Add bucket aggregates to metrics_rollups (hour rows span several windows)."""
+    if not buckets:
+        return 0
+
+    execute_values(
+        cursor,
+        f"""
+        INSERT INTO metrics_rollups (granularity, bucket_start, {", ".join(_COLUMNS)})
+        VALUES %s
+        ON CONFLICT (granularity, bucket_start) DO UPDATE SET
+            transactions = metrics_rollups.transactions + EXCLUDED.transactions,
+            transaction_amount = metrics_rollups.transaction_amount + EXCLUDED.transaction_amount,
+            decisions = metrics_rollups.decisions + EXCLUDED.decisions,
+            allow_count = metrics_rollups.allow_count + EXCLUDED.allow_count,
+            review_count = metrics_rollups.review_count + EXCLUDED.review_count,
+            block_count = metrics_rollups.block_count + EXCLUDED.block_count,
+            risk_score_sum = metrics_rollups.risk_score_sum + EXCLUDED.risk_score_sum,
+            risk_score_hist = ARRAY(
+                SELECT a + b
+                FROM unnest(metrics_rollups.risk_score_hist, EXCLUDED.risk_score_hist) AS t(a, b)
+            ),
+            cases_opened = metrics_rollups.cases_opened + EXCLUDED.cases_opened,
+            cases_resolved = metrics_rollups.cases_resolved + EXCLUDED.cases_resolved
+        """,
+        [
+            (granularity, ts) + tuple(entry[column] for column in _COLUMNS)
+            for ts, entry in sorted(buckets.items())
+        ],
+        page_size=1000,
+    )
+    return len(buckets)
+
+
+def _earliest_source_row(cursor) -> Optional[datetime.datetime]:
+    cursor.execute(
+        """
+        SELECT LEAST(
+            (SELECT MIN(txn_timestamp) FROM transactions),
+            (SELECT MIN(created_at) FROM risk_decisions),
+            (SELECT MIN(created_at) FROM review_cases)
+        ) AS earliest
+        """
+    )
+    row = cursor.fetchone()
+    return row["earliest"] if row else None
+
+
+def run_rollup(conn, *, now: Optional[datetime.datetime] = None) -> Dict[str, Any]:
+    """
+    Roll raw rows into minute and hour buckets from the stored high-water mark
+    up to the last closed minute older than METRICS_ROLLUP_LAG_SECONDS.
+
+    Each window (at most METRICS_ROLLUP_MAX_WINDOW_HOURS) commits together
+    with the advanced watermark, so a crash never double-counts. The state
+    row is locked with SKIP LOCKED: concurrent workers skip instead of
+    waiting.
+    """
+    now = now or datetime.datetime.utcnow()
+    cutoff = floor_to(now - datetime.timedelta(seconds=METRICS_ROLLUP_LAG_SECONDS), "minute")
+    max_window = datetime.timedelta(hours=METRICS_ROLLUP_MAX_WINDOW_HOURS)
+
+    cursor = conn.cursor()
+    cursor.execute(
+        """
+        INSERT INTO metrics_rollup_state (name, watermark, updated_at)
+        VALUES (%s, NULL, NULL)
+        ON CONFLICT (name) DO NOTHING
+        """,
+        (ROLLUP_STATE,),
+    )
+    conn.commit()
+
+    windows = 0
+    minute_buckets = 0
+    watermark = None
+
+    while True:
+        cursor.execute(
+            """
+            SELECT watermark
+            FROM metrics_rollup_state
+            WHERE name = %s
+            FOR UPDATE SKIP LOCKED
+            """,
+            (ROLLUP_STATE,),
+        )
+        row = cursor.fetchone()
+        if row is None:
+            conn.rollback()
+            return {"skipped": True, "reason": "another rollup is running"}
+
+        watermark = row["watermark"]
+        if watermark is None:
+            earliest = _earliest_source_row(cursor)
+            watermark = floor_to(earliest, "minute") if earliest else cutoff
+
+        if watermark >= cutoff:
+            conn.rollback()
+            break
+
+        window_end = min(cutoff, watermark + max_window)
+        minutes = aggregate_window(cursor, watermark, window_end)
+
+        hours: Dict[datetime.datetime, Dict[str, Any]] = {}
+        for ts, entry in minutes.items():
+            merge_bucket(hours.setdefault(floor_to(ts, "hour"), _empty_bucket()), entry)
+
+        upsert_rollups(cursor, "minute", minutes)
+        upsert_rollups(cursor, "hour", hours)
+
+        cursor.execute(
+            """
+            UPDATE metrics_rollup_state
+            SET watermark = %s, updated_at = %s
+            WHERE name = %s
+            """,
+            (window_end, datetime.datetime.utcnow(), ROLLUP_STATE),
+        )
+        conn.commit()
+
+        windows += 1
+        minute_buckets += len(minutes)
+        watermark = window_end
+
+    return {
+        "skipped": False,
+        "windows": windows,
+        "minute_buckets": minute_buckets,
+        "watermark": watermark,
+    }
+
+
+def reset_rollups(conn) -> None:
+    """Drop all rollups and rewind the watermark; the next run re-aggregates."""
+    cursor = conn.cursor()
+    cursor.execute("DELETE FROM metrics_rollups")
+    cursor.execute("DELETE FROM metrics_rollup_state WHERE name = %s", (ROLLUP_STATE,))
+    conn.commit()
+
+
+def fetch_rollup_watermark(cursor) -> Optional[datetime.datetime]:
+    cursor.execute(
+        "SELECT watermark FROM metrics_rollup_state WHERE name = %s",
+        (ROLLUP_STATE,),
+    )
+    row = cursor.fetchone()
+    return row["watermark"] if row else None
+
+
+# ---------------------------------------------------------
+# Time-series reads
+# ---------------------------------------------------------
+
+_STEPS = {
+    "minute": datetime.timedelta(minutes=1),
+    "hour": datetime.timedelta(hours=1),
+    "day": datetime.timedelta(days=1),
+}
+
+
+def fetch_timeseries(
+    cursor,
+    *,
+    start: datetime.datetime,
+    end: datetime.datetime,
+    granularity: str,
+) -> List[Dict[str, Any]]:
+    """
+    Dense series of buckets in [start, end) read from metrics_rollups only.
+
+    Day buckets are merged from hour rollups, so a week is at most 168 rows.
+    """
+    source = "minute" if granularity == "minute" else "hour"
+    first = floor_to(start, granularity)
+
+    cursor.execute(
+        f"""
+        SELECT bucket_start, {", ".join(_COLUMNS)}
+        FROM metrics_rollups
+        WHERE granularity = %s
+        AND bucket_start >= %s
+        AND bucket_start < %s
+        ORDER BY bucket_start
+        """,
+        (source, first, end),
+    )
+
+    merged: Dict[datetime.datetime, Dict[str, Any]] = {}
+    for row in cursor.fetchall():
+        entry = {column: row[column] for column in _COLUMNS}
+        entry["transaction_amount"] = float(entry["transaction_amount"])
+        entry["risk_score_sum"] = float(entry["risk_score_sum"])
+        entry["risk_score_hist"] = list(entry["risk_score_hist"] or [0] * SCORE_BINS)
+        merge_bucket(
+            merged.setdefault(floor_to(row["bucket_start"], granularity), _empty_bucket()),
+            entry,
+        )
+
+    points = []
+    step = _STEPS[granularity]
+    ts = first
+    while ts < end:
+        entry = merged.get(ts) or _empty_bucket()
+        decisions = entry["decisions"]
+        hist = entry["risk_score_hist"]
+        points.append(
+            {
+                "bucket_start": ts,
+                "transactions": entry["transactions"],
+                "transaction_amount": round(entry["transaction_amount"], 2),
+                "decisions": {
+                    "ALLOW": entry["allow_count"],
+                    "REVIEW": entry["review_count"],
+                    "BLOCK": entry["block_count"],
+                },
+                "decision_count": decisions,
+                "avg_risk_score": round(entry["risk_score_sum"] / decisions, 2) if decisions else None,
+                "risk_score_p50": histogram_percentile(hist, 0.50),
+                "risk_score_p90": histogram_percentile(hist, 0.90),
+                "risk_score_p99": histogram_percentile(hist, 0.99),
+                "cases_opened": entry["cases_opened"],
+                "case_open_rate": round(entry["cases_opened"] / decisions, 4) if decisions else None,
+                "cases_resolved": entry["cases_resolved"],
+            }
+        )
+        ts += step
+    return points
+
+
+# ---------------------------------------------------------
+# Background worker
+# ---------------------------------------------------------
+
+class MetricsRollupWorker:
+    """
+    Daemon thread running run_rollup() every `interval` seconds.
+
+    Safe to run in every API worker; the state row lock lets exactly one
+    of them advance the watermark at a time.
+    """
+
+    def __init__(self, *, interval: float = METRICS_ROLLUP_INTERVAL_SECONDS):
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.last_result: Optional[Dict[str, Any]] = None
+
+    def start(self) -> None:
+        if self.interval <= 0:
+            return
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="metrics-rollup", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                with get_pool().connection() as conn:
+                    self.last_result = run_rollup(conn)
+            except Exception:
+                logger.exception("Metrics rollup failed")
+
+
+metrics_rollup_worker = MetricsRollupWorker()
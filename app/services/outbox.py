@@ -0,0 +1,190 @@
+import datetime
+import json
+import os
+import uuid
+from typing import Any, Dict, List, Optional
+
+from app.audit.logger import log_events
+from app.core.logging import get_logger
+from app.repositories.case_repo import create_review_cases_batch
+from app.repositories.outbox_repo import (
+    claim_outbox_batch,
+    claim_outbox_row,
+    delete_outbox_rows,
+    record_outbox_failure,
+)
+from app.repositories.signal_repo import insert_signal_rows
+
+
+logger = get_logger(__name__)
+
+OUTBOX_BATCH_SIZE = int(os.getenv("OUTBOX_BATCH_SIZE", 500))
+OUTBOX_POLL_INTERVAL_SECONDS = float(os.getenv("OUTBOX_POLL_INTERVAL_SECONDS", 0.5))
+# A row failing this many times is left in place (with last_error) for inspection
+OUTBOX_MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", 5))
+
+PAYLOAD_VERSION = 1
+
+
+# ---------------------------------------------------------
+# Payloads
+# ---------------------------------------------------------
+
+def encode_side_effects(
+    *,
+    signal_rows: List[Dict[str, Any]],
+    case: Optional[Dict[str, Any]],
+    audit_events: List[Dict[str, Any]],
+) -> str:
+    """
+    Serialize one transaction's deferred side effects.
+
+    Every row carries its primary key (signal_id, case_id, audit_id) so
+    materializing the payload twice writes nothing the second time. Plain
+    json keeps NaN/-0.0 in audit metadata intact, so events hash exactly
+    as they would have inline.
+    """
+    for event in audit_events:
+        event.setdefault("audit_id", str(uuid.uuid4()))
+
+    return json.dumps(
+        {
+            "v": PAYLOAD_VERSION,
+            "signals": [
+                {**row, "created_at": row["created_at"].isoformat()} for row in signal_rows
+            ],
+            "case": {**case, "created_at": case["created_at"].isoformat()} if case else None,
+            "audit_events": audit_events,
+        }
+    )
+
+
+def decode_side_effects(payload: str) -> Dict[str, Any]:
+    data = json.loads(payload)
+    if data.get("v") != PAYLOAD_VERSION:
+        raise ValueError(f"Unsupported outbox payload version: {data.get('v')!r}")
+    for row in data["signals"]:
+        row["created_at"] = datetime.datetime.fromisoformat(row["created_at"])
+    if data["case"]:
+        data["case"]["created_at"] = datetime.datetime.fromisoformat(data["case"]["created_at"])
+    return data
+
+
+def materialize_side_effects(cursor: Any, payloads: List[Dict[str, Any]]) -> Dict[str, int]:
+    """
+    Write the signals, review cases and audit events of decoded payloads.
+
+    Idempotent: signals and cases skip existing primary keys, and audit
+    events whose audit_id is already logged are dropped before chaining.
+    Audit events are appended in payload order.
+    """
+    signal_rows = [row for payload in payloads for row in payload["signals"]]
+    cases = [payload["case"] for payload in payloads if payload["case"]]
+    events = [event for payload in payloads for event in payload["audit_events"]]
+
+    insert_signal_rows(cursor, signal_rows)
+    create_review_cases_batch(cursor, cases, skip_existing=True)
+
+    if events:
+        cursor.execute(
+            "SELECT audit_id FROM audit_logs WHERE audit_id = ANY(%s)",
+            ([event["audit_id"] for event in events],),
+        )
+        logged = {row["audit_id"] for row in cursor.fetchall()}
+        events = [event for event in events if event["audit_id"] not in logged]
+        log_events(cursor, events)
+
+    return {"signals": len(signal_rows), "cases": len(cases), "audit_events": len(events)}
+
+
+# ---------------------------------------------------------
+# Draining
+# ---------------------------------------------------------
+
+def _process_one(conn: Any, outbox_id: int, *, stats: Dict[str, int]) -> bool:
+    """
+    Retry a single row of a failed batch in its own transaction.
+
+    Returns False when the row was not materialized (it failed, or another
+    worker holds it), so the caller can hold back the account's later rows.
+    """
+    cursor = conn.cursor()
+    try:
+        row = claim_outbox_row(cursor, outbox_id)
+        if row is None:
+            conn.rollback()
+            return False
+        written = materialize_side_effects(cursor, [decode_side_effects(row["payload"])])
+        delete_outbox_rows(cursor, [outbox_id])
+        conn.commit()
+    except Exception as exc:
+        conn.rollback()
+        logger.exception("Outbox row %s failed", outbox_id)
+        record_outbox_failure(cursor, outbox_id, f"{type(exc).__name__}: {exc}")
+        conn.commit()
+        stats["failed"] += 1
+        return False
+
+    stats["processed"] += 1
+    for key, value in written.items():
+        stats[key] += value
+    return True
+
+
+def drain_outbox_batch(
+    conn: Any,
+    *,
+    batch_size: int = OUTBOX_BATCH_SIZE,
+    max_attempts: int = OUTBOX_MAX_ATTEMPTS,
+    shard: int = 0,
+    shards: int = 1,
+) -> Dict[str, int]:
+    """
+    Claim up to `batch_size` outbox rows, materialize them and delete them,
+    all in one transaction.
+
+    At-least-once: a crash before commit leaves the rows for the next run,
+    and materializing is idempotent. If the batch fails, its rows are
+    retried one by one so a single bad payload only costs its own attempts;
+    an account's rows after one that fails are left (deferred) for the next
+    batch, which claims them behind the failed row again, so side effects
+    are never materialized out of order.
+    """
+    stats = {
+        "claimed": 0,
+        "processed": 0,
+        "failed": 0,
+        "deferred": 0,
+        "signals": 0,
+        "cases": 0,
+        "audit_events": 0,
+    }
+
+    cursor = conn.cursor()
+    rows = claim_outbox_batch(
+        cursor, limit=batch_size, max_attempts=max_attempts, shard=shard, shards=shards
+    )
+    stats["claimed"] = len(rows)
+    if not rows:
+        conn.rollback()
+        return stats
+
+    try:
+        written = materialize_side_effects(cursor, [decode_side_effects(row["payload"]) for row in rows])
+        delete_outbox_rows(cursor, [row["outbox_id"] for row in rows])
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        logger.exception("Outbox batch of %d rows failed; retrying rows individually", len(rows))
+        failed_accounts = set()
+        for row in rows:
+            if row["account_id"] in failed_accounts:
+                stats["deferred"] += 1
+                continue
+            if not _process_one(conn, row["outbox_id"], stats=stats):
+                failed_accounts.add(row["account_id"])
+        return stats
+
+    stats["processed"] = len(rows)
+    stats.update(written)
+    return stats
@@ -1,37 +1,146 @@
 import time
+import uuid
+import datetime
 from typing import Any, Dict, List, Optional
 
-from app.repositories.signal_repo import insert_signal
+from app.repositories.signal_repo import build_signal_rows, insert_signal, insert_signals_batch
 from app.core.logging import get_logger
-from app.repositories.transaction_repo import insert_transaction
-from app.repositories.decision_repo import fetch_latest_decision, insert_decision
-from app.repositories.case_repo import create_review_case
+from app.repositories.transaction_repo import (
+    build_transaction,
+    insert_transaction,
+    insert_transactions_batch,
+)
+from app.repositories.account_repo import fetch_accounts, debit_accounts
+from app.repositories.decision_repo import (
+    build_explanation,
+    fetch_latest_decision,
+    fetch_latest_decisions,
+    insert_decision,
+    insert_decisions_batch,
+)
+from app.repositories.case_repo import build_review_case, create_review_case, create_review_cases_batch
+from app.repositories.outbox_repo import enqueue_side_effects
 from app.repositories.audit_repo import (
+    account_event,
+    log_account_events,
     log_transaction_created,
     log_signals_generated,
     log_decision_made,
     log_case_opened,
 )
-from app.risk.engine import SIGNAL_WEIGHTS, REVIEW_THRESHOLD, BLOCK_THRESHOLD
+from app.risk.scoring_config import ScoringConfig, get_scoring_config
+from app.core.config import FEATURE_STORE_ENABLED
+from app.core.instrumentation import StageTimer
+from app.signals.feature_store import feature_store
+from app.risk.shadow import shadow_score
+from app.audit.writer import audit_writer
+from app.services.outbox import encode_side_effects
 
 Session = Any
 
 logger = get_logger(__name__)
 
 
+_AUDIT_LOGGERS = {
+    "TRANSACTION_CREATED": log_transaction_created,
+    "SIGNALS_GENERATED": log_signals_generated,
+    "CASE_OPENED": log_case_opened,
+    "DECISION_MADE": log_decision_made,
+}
+
+
 class RiskPipeline:
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, *, audit_write_behind: bool = False, outbox: bool = False):
+        """
+        Transactions reach the in-process feature store only after the
+        caller's transaction commits, so a rollback leaves no phantom spend:
+        the caller must commit and then call after_commit().
+
+        With audit_write_behind, audit events are collected instead of being
+        appended inside the caller's transaction; after_commit() hands them
+        to the audit writer.
+
+        With outbox, process_transaction writes only the transaction and the
+        decision; its signals, review case and audit events go into one
+        outbox row in the same transaction (app/services/outbox.py).
+        """
         self.db = db
+        self.audit_write_behind = audit_write_behind
+        self.outbox = outbox
+        self.deferred_audit_events: List[Dict[str, Any]] = []
+        # Inserted but uncommitted transactions, and their spend per account
+        self.pending_features: List[Dict[str, Any]] = []
+        self._pending_spend: Dict[str, float] = {}
+
+    def _audit(self, cursor: Any, event_type: str, *, account_id: str, metadata: Dict[str, Any]) -> None:
+        if self.audit_write_behind or self.outbox:
+            self.deferred_audit_events.append(
+                account_event(event_type, account_id=account_id, metadata=metadata)
+            )
+        else:
+            _AUDIT_LOGGERS[event_type](cursor, account_id=account_id, metadata=metadata)
+
+    def publish_audit_events(self) -> None:
+        """Queue the deferred audit events; call only after the transaction committed."""
+        events, self.deferred_audit_events = self.deferred_audit_events, []
+        audit_writer.submit(events)
+
+    def _stage_feature(self, txn: Dict[str, Any]) -> None:
+        if FEATURE_STORE_ENABLED:
+            self.pending_features.append(txn)
+            account_id = txn["account_id"]
+            self._pending_spend[account_id] = self._pending_spend.get(account_id, 0.0) + float(txn["amount"])
+
+    def record_features(self) -> None:
+        """Feed the committed transactions to the feature store, in order."""
+        txns, self.pending_features = self.pending_features, []
+        self._pending_spend = {}
+        for txn in txns:
+            feature_store.record(txn)
+
+    def after_commit(self) -> None:
+        """
+        Post-commit hook for every commit site: feature store, then audit writer.
+
+        The transaction is already committed, so failures are logged rather
+        than raised into a response that would report it as failed.
+        """
+        try:
+            self.record_features()
+        except Exception:
+            logger.exception("Feature store update failed after commit")
+        try:
+            self.publish_audit_events()
+        except Exception:
+            logger.exception("Audit event publish failed after commit")
+
+    def _side_effects_payload(
+        self,
+        signal_rows: List[Dict[str, Any]],
+        case: Optional[Dict[str, Any]],
+    ) -> str:
+        events, self.deferred_audit_events = self.deferred_audit_events, []
+        return encode_side_effects(signal_rows=signal_rows, case=case, audit_events=events)
 
     def process_transaction(
         self,
         account_id: str,
         amount: float,
         device_id: str,
+        *,
+        timings: bool = False,
     ) -> Dict[str, Any]:
+        """
+        Score and persist one transaction.
 
+        Every stage is lap-timed (with its SQL round trips) into the
+        /metrics histograms; `timings` also returns the breakdown.
+        """
         started_at = time.monotonic()
         cursor = self.db.cursor()
+        timer = StageTimer("single", cursor)
+        config = get_scoring_config()
+        timer.lap("scoring_config")
 
         # Persist transaction
         txn = insert_transaction(
@@ -44,10 +153,13 @@ class RiskPipeline:
         if not txn:
             raise ValueError("Transaction insert failed")
 
+        self._stage_feature(txn)
+        timer.lap("insert_transaction")
         user_id = txn.get("user_id")
 
-        log_transaction_created(
+        self._audit(
             cursor,
+            "TRANSACTION_CREATED",
             account_id=account_id,
             metadata={
                 "transaction_id": txn["txn_id"],
@@ -56,8 +168,10 @@ class RiskPipeline:
                 "timestamp": str(txn["txn_timestamp"]),
             },
         )
+        timer.lap("audit_transaction_created")
 
         latest = fetch_latest_decision(cursor, account_id=account_id)
+        timer.lap("fetch_latest_decision")
 
         previous_decision: Optional[str] = None
 
@@ -70,35 +184,31 @@ class RiskPipeline:
         except Exception:
             logger.exception("Signal generation failed for account_id=%s", account_id)
             signals = []
+        timer.lap("generate_signals")
 
-        risk_score, signal_breakdown = self._compute_risk_score(signals)
+        risk_score, signal_breakdown = self._compute_risk_score(signals, config)
 
-        for signal in signals:
-            insert_signal(cursor, user_id, signal)
+        if self.outbox:
+            signal_rows = build_signal_rows(user_id, signals, datetime.datetime.utcnow())
+        else:
+            for signal in signals:
+                insert_signal(cursor, user_id, signal)
+            timer.lap("insert_signals")
 
         if signals:
-            log_signals_generated(
+            self._audit(
                 cursor,
+                "SIGNALS_GENERATED",
                 account_id=account_id,
                 metadata={
                     "signals": signals,
                     "signal_breakdown": signal_breakdown,
                 },
             )
+            timer.lap("audit_signals_generated")
 
-        if risk_score >= BLOCK_THRESHOLD:
-            decision = "BLOCK"
-        elif risk_score >= REVIEW_THRESHOLD:
-            decision = "REVIEW"
-        else:
-            decision = "ALLOW"
-
-        if previous_decision is None:
-            decision_transition = "NEW"
-        elif previous_decision == decision:
-            decision_transition = "NO_CHANGE"
-        else:
-            decision_transition = f"{previous_decision}->{decision}"
+        decision = self._decide(risk_score, config)
+        decision_transition = self._transition(previous_decision, decision)
 
         reasons_text = self._summarize_signals(signals)
 
@@ -109,24 +219,39 @@ class RiskPipeline:
             risk_score=risk_score,
             decision=decision,
             reasons=reasons_text,
+            txn_id=txn["txn_id"],
+            scoring_config_version=config.version,
+            explanation=build_explanation(signals),
         )
+        timer.lap("insert_decision")
 
+        case = None
         case_created = False
 
         if decision in ("REVIEW", "BLOCK"):
 
-            case = create_review_case(
-                cursor,
-                user_id=user_id,
-                account_id=account_id,
-                decision=decision,
-                risk_score=risk_score,
-            )
+            if self.outbox:
+                case = build_review_case(
+                    user_id=user_id,
+                    account_id=account_id,
+                    decision=decision,
+                    risk_score=risk_score,
+                )
+            else:
+                case = create_review_case(
+                    cursor,
+                    user_id=user_id,
+                    account_id=account_id,
+                    decision=decision,
+                    risk_score=risk_score,
+                )
+                timer.lap("create_case")
 
             case_created = True
 
-            log_case_opened(
+            self._audit(
                 cursor,
+                "CASE_OPENED",
                 account_id=account_id,
                 metadata={
                     "case_id": case["case_id"],
@@ -135,9 +260,11 @@ class RiskPipeline:
                     "status": case["status"],
                 },
             )
+            timer.lap("audit_case_opened")
 
-        log_decision_made(
+        self._audit(
             cursor,
+            "DECISION_MADE",
             account_id=account_id,
             metadata={
                 "user_id": user_id,
@@ -149,12 +276,35 @@ class RiskPipeline:
                 "decision_transition": decision_transition,
                 "signals": signals,
                 "signal_breakdown": signal_breakdown,
+                "scoring_config_version": config.version,
             },
         )
+        timer.lap("audit_decision_made")
+
+        if self.outbox:
+            enqueue_side_effects(
+                cursor,
+                account_id=account_id,
+                txn_id=txn["txn_id"],
+                payload=self._side_effects_payload(signal_rows, case),
+            )
+            timer.lap("enqueue_outbox")
 
         latency_ms = (time.monotonic() - started_at) * 1000.0
 
-        return {
+        # Candidate configs are scored off the decision path
+        shadow_score(
+            txn_id=txn["txn_id"],
+            account_id=account_id,
+            signals=signals,
+            active=config,
+            risk_score=risk_score,
+            decision=decision,
+        )
+        timer.lap("shadow_score")
+        timer.finish()
+
+        result = {
             "transaction_id": txn["txn_id"],
             "risk_score": risk_score,
             "decision": decision,
@@ -165,33 +315,335 @@ class RiskPipeline:
             "case_created": case_created,
             "decision_latency_ms": round(latency_ms, 2),
         }
+        if timings:
+            result["timings"] = timer.as_dict()
+        return result
 
-    def _generate_signals(self, cursor: Any, *, account_id: str, txn: Dict[str, Any]):
+    def process_batch(
+        self,
+        items: List[Dict[str, Any]],
+        *,
+        enforce_balance: bool = True,
+    ) -> List[Dict[str, Any]]:
+        """
+        Set-based variant of process_transaction for many transactions.
+
+        Accounts, latest decisions and audit chain heads are resolved with one
+        query each; transactions, signals, decisions, cases and audit events
+        are written with multi-row INSERTs. Items are evaluated in list order,
+        so every decision matches what sequential process_transaction calls
+        would have produced.
+
+        With enforce_balance, the POST /transactions settlement rules are
+        applied in order too: items exceeding the running balance are
+        rejected, ALLOW debits the balance and the stored transaction status
+        reflects the decision. The batch's account rows are locked while it
+        runs, so the running balances cannot be spent concurrently.
+
+        Returns one result per item, in order. Rejected items carry an
+        "error" key instead of a decision.
+        """
+        started_at = time.monotonic()
+        cursor = self.db.cursor()
+        timer = StageTimer("batch", cursor)
+        config = get_scoring_config()
+
+        account_ids = [item["account_id"] for item in items]
+        accounts = fetch_accounts(cursor, account_ids, for_update=enforce_balance)
+        previous = {
+            account_id: decision
+            for account_id, (_, decision) in fetch_latest_decisions(cursor, account_ids).items()
+        }
+        balances = {
+            account_id: float(account.get("balance") or 0.0)
+            for account_id, account in accounts.items()
+        }
+        spend_24h = None if FEATURE_STORE_ENABLED else self._fetch_spend_24h(cursor, account_ids)
+        timer.lap("load_state")
+
+        txns: List[Dict[str, Any]] = []
+        signal_rows: List[Any] = []
+        decision_rows: List[Dict[str, Any]] = []
+        case_rows: List[Dict[str, Any]] = []
+        events: List[Dict[str, Any]] = []
+        debits: Dict[str, float] = {}
+        results: List[Dict[str, Any]] = []
+        shadow_inputs: List[Dict[str, Any]] = []
+
+        last_ts = None
+
+        for index, item in enumerate(items):
+            account_id = item["account_id"]
+            amount = float(item["amount"])
+            device_id = item["device_id"]
+
+            account = accounts.get(account_id)
+            if not account:
+                results.append(
+                    {"index": index, "error": f"Account not found for account_id={account_id}"}
+                )
+                continue
+
+            if enforce_balance and amount > balances[account_id]:
+                results.append({"index": index, "error": "Insufficient balance"})
+                continue
+
+            # Strictly increasing timestamps keep per-account ordering stable
+            now = datetime.datetime.utcnow()
+            if last_ts is not None and now <= last_ts:
+                now = last_ts + datetime.timedelta(microseconds=1)
+            last_ts = now
+
+            user_id = account["user_id"]
+            txn = build_transaction(
+                user_id=user_id,
+                account_id=account_id,
+                amount=amount,
+                device_id=device_id,
+                txn_timestamp=now,
+            )
 
-        signals: List[Dict[str, Any]] = []
+            total_spend = None
+            if FEATURE_STORE_ENABLED:
+                self._stage_feature(txn)
+            else:
+                spend_24h[account_id] = spend_24h.get(account_id, 0.0) + amount
+                total_spend = spend_24h[account_id]
+
+            events.append(
+                account_event(
+                    "TRANSACTION_CREATED",
+                    account_id=account_id,
+                    metadata={
+                        "transaction_id": txn["txn_id"],
+                        "amount": amount,
+                        "device_id": device_id,
+                        "timestamp": str(txn["txn_timestamp"]),
+                    },
+                )
+            )
 
-        if float(txn.get("amount", 0)) > 5000:
-            signals.append(
+            previous_decision = previous.get(account_id)
+
+            try:
+                signals = self._generate_signals(
+                    cursor, account_id=account_id, txn=txn, total_spend=total_spend
+                )
+            except Exception:
+                logger.exception("Signal generation failed for account_id=%s", account_id)
+                signals = []
+
+            risk_score, signal_breakdown = self._compute_risk_score(signals, config)
+
+            signal_rows.extend((user_id, signal, now) for signal in signals)
+
+            if signals:
+                events.append(
+                    account_event(
+                        "SIGNALS_GENERATED",
+                        account_id=account_id,
+                        metadata={
+                            "signals": signals,
+                            "signal_breakdown": signal_breakdown,
+                        },
+                    )
+                )
+
+            decision = self._decide(risk_score, config)
+            decision_transition = self._transition(previous_decision, decision)
+            previous[account_id] = decision
+
+            decision_rows.append(
                 {
-                    "type": "HIGH_AMOUNT",
-                    "value": float(txn["amount"]),
-                    "description": f"Transaction amount ₹{float(txn['amount']):.2f} exceeds 5000 threshold",
+                    "user_id": user_id,
+                    "account_id": account_id,
+                    "risk_score": risk_score,
+                    "decision": decision,
+                    "reasons": self._summarize_signals(signals),
+                    "created_at": now,
+                    "txn_id": txn["txn_id"],
+                    "scoring_config_version": config.version,
+                    "explanation": build_explanation(signals),
+                }
+            )
+
+            case_created = False
+
+            if decision in ("REVIEW", "BLOCK"):
+                case_id = str(uuid.uuid4())
+                case_rows.append(
+                    {
+                        "case_id": case_id,
+                        "user_id": user_id,
+                        "account_id": account_id,
+                        "decision": decision,
+                        "risk_score": risk_score,
+                        "created_at": now,
+                    }
+                )
+                case_created = True
+
+                events.append(
+                    account_event(
+                        "CASE_OPENED",
+                        account_id=account_id,
+                        metadata={
+                            "case_id": case_id,
+                            "decision": decision,
+                            "risk_score": risk_score,
+                            "status": "OPEN",
+                        },
+                    )
+                )
+
+            events.append(
+                account_event(
+                    "DECISION_MADE",
+                    account_id=account_id,
+                    metadata={
+                        "user_id": user_id,
+                        "account_id": account_id,
+                        "transaction_id": txn["txn_id"],
+                        "risk_score": risk_score,
+                        "decision": decision,
+                        "previous_decision": previous_decision,
+                        "decision_transition": decision_transition,
+                        "signals": signals,
+                        "signal_breakdown": signal_breakdown,
+                        "scoring_config_version": config.version,
+                    },
+                )
+            )
+
+            if enforce_balance:
+                txn["status"] = "success" if decision == "ALLOW" else decision.lower()
+                if decision == "ALLOW":
+                    balances[account_id] -= amount
+                    debits[account_id] = debits.get(account_id, 0.0) + amount
+
+            txns.append(txn)
+            shadow_inputs.append(
+                {
+                    "txn_id": txn["txn_id"],
+                    "account_id": account_id,
+                    "signals": signals,
+                    "risk_score": risk_score,
+                    "decision": decision,
+                    "created_at": now,
                 }
             )
+            results.append(
+                {
+                    "index": index,
+                    "transaction_id": txn["txn_id"],
+                    "risk_score": risk_score,
+                    "decision": decision,
+                    "previous_decision": previous_decision,
+                    "decision_transition": decision_transition,
+                    "signals": signals,
+                    "signal_breakdown": signal_breakdown,
+                    "case_created": case_created,
+                }
+            )
+
+        timer.lap("score")
+        insert_transactions_batch(cursor, txns)
+        timer.lap("insert_transactions")
+        insert_signals_batch(cursor, signal_rows)
+        timer.lap("insert_signals")
+        insert_decisions_batch(cursor, decision_rows)
+        timer.lap("insert_decisions")
+        create_review_cases_batch(cursor, case_rows)
+        timer.lap("create_cases")
+        if self.audit_write_behind:
+            self.deferred_audit_events.extend(events)
+        else:
+            log_account_events(cursor, events)
+        timer.lap("audit_events")
+        debit_accounts(cursor, debits)
+        timer.lap("debit_accounts")
 
+        # Decisions are made together; report the amortized per-item latency
+        latency_ms = (time.monotonic() - started_at) * 1000.0
+        per_item_ms = round(latency_ms / len(txns), 2) if txns else 0.0
+        for result in results:
+            if "error" not in result:
+                result["decision_latency_ms"] = per_item_ms
+
+        for item in shadow_inputs:
+            shadow_score(active=config, **item)
+        timer.lap("shadow_score")
+        timer.finish()
+
+        return results
+
+    def _fetch_spend_24h(self, cursor: Any, account_ids: List[str]) -> Dict[str, float]:
+        """
+        24h spend per account in one query (SQL fallback for process_batch).
+        """
         cursor.execute(
             """
-            SELECT COALESCE(SUM(amount),0) AS total_spend
+            SELECT account_id, COALESCE(SUM(amount),0) AS total_spend
             FROM transactions
-            WHERE account_id=%s
+            WHERE account_id = ANY(%s)
             AND txn_timestamp >= NOW() - INTERVAL '1 day'
+            GROUP BY account_id
             """,
-            (account_id,),
+            (list(set(account_ids)),),
         )
+        return {row["account_id"]: float(row["total_spend"]) for row in cursor.fetchall()}
+
+    def _decide(self, risk_score: float, config: Optional[ScoringConfig] = None) -> str:
+        return (config or get_scoring_config()).decide(risk_score)
+
+    def _transition(self, previous_decision: Optional[str], decision: str) -> str:
+        if previous_decision is None:
+            return "NEW"
+        if previous_decision == decision:
+            return "NO_CHANGE"
+        return f"{previous_decision}->{decision}"
+
+    def _generate_signals(
+        self,
+        cursor: Any,
+        *,
+        account_id: str,
+        txn: Dict[str, Any],
+        total_spend: Optional[float] = None,
+    ):
+
+        signals: List[Dict[str, Any]] = []
+
+        if float(txn.get("amount", 0)) > 5000:
+            signals.append(
+                {
+                    "type": "HIGH_AMOUNT",
+                    "value": float(txn["amount"]),
+                    "description": f"Transaction amount ₹{float(txn['amount']):.2f} exceeds 5000 threshold",
+                }
+            )
+
+        if total_spend is not None:
+            total_spend = float(total_spend)
+        elif FEATURE_STORE_ENABLED:
+            # Committed spend plus this pipeline's uncommitted transactions,
+            # matching what the SQL fallback sees inside the transaction
+            features = feature_store.features(account_id, now=txn["txn_timestamp"])
+            total_spend = float(features["spend_24h"]) + self._pending_spend.get(account_id, 0.0)
+        else:
+            cursor.execute(
+                """
+                SELECT COALESCE(SUM(amount),0) AS total_spend
+                FROM transactions
+                WHERE account_id=%s
+                AND txn_timestamp >= NOW() - INTERVAL '1 day'
+                """,
+                (account_id,),
+            )
 
-        row = cursor.fetchone()
+            row = cursor.fetchone()
 
-        total_spend = float(row["total_spend"] if row else 0)
+            total_spend = float(row["total_spend"] if row else 0)
 
         if total_spend > 0:
             signals.append(
@@ -204,8 +656,9 @@ class RiskPipeline:
 
         return signals
 
-    def _compute_risk_score(self, signals):
+    def _compute_risk_score(self, signals, config: Optional[ScoringConfig] = None):
 
+        config = config or get_scoring_config()
         raw_score = 0
         signal_breakdown = []
 
@@ -214,7 +667,7 @@ class RiskPipeline:
             signal_type = signal["type"]
             value = float(signal["value"])
 
-            weight = SIGNAL_WEIGHTS.get(signal_type, 0)
+            weight = config.weight(signal_type)
 
             contribution = weight * value
 
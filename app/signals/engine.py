@@ -2,11 +2,16 @@ import uuid
 import datetime
 from app.data.database import get_connection
 from app.audit.logger import log_event
+from app.core.config import FEATURE_STORE_ENABLED
+from app.signals.feature_store import feature_store
 
 
 # -------- Signal 1: Total spend in last 24 hours --------
 
 def compute_total_spend_last_24h():
+    if FEATURE_STORE_ENABLED:
+        return feature_store.spend_24h()
+
     conn = get_connection()
     cursor = conn.cursor()
 
@@ -75,6 +80,9 @@ def generate_spend_signals():
 # -------- Signal: Transaction velocity (last 1 hour) --------
 
 def compute_txn_velocity_last_1h():
+    if FEATURE_STORE_ENABLED:
+        return feature_store.velocity_1h()
+
     conn = get_connection()
     cursor = conn.cursor()
 
@@ -110,6 +118,11 @@ def generate_velocity_signals(threshold=5):
 # -------- Signal: New device usage --------
 
 def compute_new_device_usage():
+    if FEATURE_STORE_ENABLED:
+        return feature_store.new_devices(
+            since=datetime.datetime.utcnow() - datetime.timedelta(days=1)
+        )
+
     conn = get_connection()
     cursor = conn.cursor()
 
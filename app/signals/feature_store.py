@@ -0,0 +1,232 @@
+import datetime
+import threading
+from collections import deque
+from typing import Any, Dict, Optional
+
+from app.core.logging import get_logger
+
+
+logger = get_logger(__name__)
+
+WINDOW_1H = datetime.timedelta(hours=1)
+WINDOW_24H = datetime.timedelta(days=1)
+
+
+class _SlidingWindow:
+    """
+    Exact sliding window over (timestamp, amount) events with running totals.
+
+    Each event is appended once and evicted once, so updates and reads are
+    amortized O(1).
+    """
+
+    __slots__ = ("span", "events", "count", "amount")
+
+    def __init__(self, span: datetime.timedelta):
+        self.span = span
+        self.events = deque()
+        self.count = 0
+        self.amount = 0.0
+
+    def add(self, ts: datetime.datetime, amount: float) -> None:
+        self.events.append((ts, amount))
+        self.count += 1
+        self.amount += amount
+
+    def evict(self, now: datetime.datetime) -> None:
+        cutoff = now - self.span
+        events = self.events
+        while events and events[0][0] < cutoff:
+            _, amount = events.popleft()
+            self.count -= 1
+            self.amount -= amount
+        if not events:
+            # Reset so float drift never outlives the window
+            self.count = 0
+            self.amount = 0.0
+
+
+class _AccountState:
+    __slots__ = ("user_id", "window_1h", "window_24h", "devices")
+
+    def __init__(self, user_id: Optional[str]):
+        self.user_id = user_id
+        self.window_1h = _SlidingWindow(WINDOW_1H)
+        self.window_24h = _SlidingWindow(WINDOW_24H)
+        self.devices = {}  # device_id -> first_seen
+
+
+class FeatureStore:
+    """
+    Per-account, in-process feature store for real-time signal generation.
+
+    Tracks 1h / 24h spend and transaction counts plus the set of devices
+    each account has used. Updated after every committed transaction insert
+    (RiskPipeline.after_commit; rolled-back spend never lands) and warmed
+    from the transactions table at startup, so RiskPipeline can read
+    features without a SQL round trip.
+
+    State is local to the worker process; deployments running several
+    workers should either pin accounts to workers or disable the store
+    (FEATURE_STORE_ENABLED=false) to fall back to SQL aggregation.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._accounts: Dict[str, _AccountState] = {}
+        self.warmed = False
+
+    def _state(self, account_id: str, user_id: Optional[str]) -> _AccountState:
+        state = self._accounts.get(account_id)
+        if state is None:
+            state = _AccountState(user_id)
+            self._accounts[account_id] = state
+        elif user_id and not state.user_id:
+            state.user_id = user_id
+        return state
+
+    def record(self, txn: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Record a persisted transaction and return the account's features
+        as of that transaction (including it).
+        """
+        ts = txn["txn_timestamp"]
+        amount = float(txn["amount"])
+        device_id = txn.get("device_id")
+
+        with self._lock:
+            state = self._state(txn["account_id"], txn.get("user_id"))
+
+            is_new_device = bool(device_id) and device_id not in state.devices
+            if is_new_device:
+                state.devices[device_id] = ts
+
+            state.window_1h.add(ts, amount)
+            state.window_24h.add(ts, amount)
+
+            features = self._snapshot(state, ts)
+
+        features["is_new_device"] = is_new_device
+        return features
+
+    def features(
+        self,
+        account_id: str,
+        now: Optional[datetime.datetime] = None,
+    ) -> Dict[str, Any]:
+        """Return current window features for an account."""
+        now = now or datetime.datetime.utcnow()
+        with self._lock:
+            state = self._accounts.get(account_id)
+            if state is None:
+                return {
+                    "spend_1h": 0.0,
+                    "spend_24h": 0.0,
+                    "txn_count_1h": 0,
+                    "txn_count_24h": 0,
+                    "device_count": 0,
+                }
+            return self._snapshot(state, now)
+
+    def has_seen_device(self, account_id: str, device_id: str) -> bool:
+        with self._lock:
+            state = self._accounts.get(account_id)
+            return bool(state) and device_id in state.devices
+
+    def _snapshot(self, state: _AccountState, now: datetime.datetime) -> Dict[str, Any]:
+        state.window_1h.evict(now)
+        state.window_24h.evict(now)
+        return {
+            "spend_1h": state.window_1h.amount,
+            "spend_24h": state.window_24h.amount,
+            "txn_count_1h": state.window_1h.count,
+            "txn_count_24h": state.window_24h.count,
+            "device_count": len(state.devices),
+        }
+
+    def velocity_1h(self, now: Optional[datetime.datetime] = None):
+        """Rows of (user_id, account_id, txn_count_1h) for active accounts."""
+        now = now or datetime.datetime.utcnow()
+        with self._lock:
+            rows = []
+            for account_id, state in self._accounts.items():
+                state.window_1h.evict(now)
+                if state.window_1h.count:
+                    rows.append((state.user_id, account_id, state.window_1h.count))
+            return rows
+
+    def spend_24h(self, now: Optional[datetime.datetime] = None):
+        """Rows of (user_id, total_spend_24h) aggregated per user."""
+        now = now or datetime.datetime.utcnow()
+        with self._lock:
+            totals: Dict[str, float] = {}
+            for state in self._accounts.values():
+                state.window_24h.evict(now)
+                if state.window_24h.count:
+                    totals[state.user_id] = totals.get(state.user_id, 0.0) + state.window_24h.amount
+            return list(totals.items())
+
+    def new_devices(self, since: datetime.datetime):
+        """Rows of (user_id, account_id, device_id) first seen at or after `since`."""
+        with self._lock:
+            return [
+                (state.user_id, account_id, device_id)
+                for account_id, state in self._accounts.items()
+                for device_id, first_seen in state.devices.items()
+                if first_seen >= since
+            ]
+
+    def warm(self, cursor: Any, now: Optional[datetime.datetime] = None) -> None:
+        """
+        Rebuild state from the transactions table.
+
+        Loads the last 24h of transactions into the windows and the
+        first-seen time of every (account, device) pair.
+        """
+        now = now or datetime.datetime.utcnow()
+
+        cursor.execute(
+            """
+            SELECT account_id, user_id, device_id, MIN(txn_timestamp) AS first_seen
+            FROM transactions
+            WHERE device_id IS NOT NULL
+            GROUP BY account_id, user_id, device_id
+            """
+        )
+        device_rows = cursor.fetchall()
+
+        cursor.execute(
+            """
+            SELECT account_id, user_id, amount, txn_timestamp
+            FROM transactions
+            WHERE txn_timestamp >= %s
+            ORDER BY txn_timestamp ASC
+            """,
+            (now - WINDOW_24H,),
+        )
+        window_rows = cursor.fetchall()
+
+        with self._lock:
+            self._accounts = {}
+            for row in device_rows:
+                state = self._state(row["account_id"], row["user_id"])
+                state.devices[row["device_id"]] = row["first_seen"]
+            for row in window_rows:
+                state = self._state(row["account_id"], row["user_id"])
+                amount = float(row["amount"] or 0)
+                state.window_1h.add(row["txn_timestamp"], amount)
+                state.window_24h.add(row["txn_timestamp"], amount)
+            for state in self._accounts.values():
+                state.window_1h.evict(now)
+                state.window_24h.evict(now)
+            self.warmed = True
+
+        logger.info(
+            "Feature store warmed: accounts=%d window_txns=%d devices=%d",
+            len(self._accounts),
+            len(window_rows),
+            len(device_rows),
+        )
+
+
+feature_store = FeatureStore()
@@ -0,0 +1,31 @@
+from app.data.database import get_connection
+
+
+def backfill():
+    conn = get_connection()
+    cursor = conn.cursor()
+
+    print("🔧 Backfilling audit_chain_heads from audit_logs...")
+
+    cursor.execute("""
+        INSERT INTO audit_chain_heads (entity_type, entity_id, event_hash, updated_at)
+        SELECT DISTINCT ON (entity_type, entity_id)
+               entity_type,
+               entity_id,
+               event_hash,
+               created_at
+        FROM audit_logs
+        WHERE event_hash IS NOT NULL
+        ORDER BY entity_type, entity_id, created_at DESC
+        ON CONFLICT (entity_type, entity_id) DO NOTHING
+    """)
+    created = cursor.rowcount
+
+    conn.commit()
+    conn.close()
+
+    print(f"Backfill complete. Created {created} chain heads.")
+
+
+if __name__ == "__main__":
+    backfill()
@@ -0,0 +1,159 @@
+import argparse
+import json
+import os
+import sys
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(PROJECT_ROOT)
+
+from psycopg2.extras import execute_values  # noqa: E402
+
+from app.audit.hash_utils import load_metadata  # noqa: E402
+from app.data.database import get_connection  # noqa: E402
+
+
+def explanation_from_metadata(metadata):
+    """Same per-signal view the explain endpoint used to build from audit metadata."""
+    desc_by_type = {
+        s["type"]: s.get("description")
+        for s in metadata.get("signals") or []
+        if isinstance(s, dict) and "type" in s
+    }
+    return [
+        {
+            "type": s.get("type"),
+            "value": s.get("value"),
+            "weight": s.get("weight"),
+            "contribution": s.get("contribution"),
+            "description": desc_by_type.get(s.get("type")),
+        }
+        for s in metadata.get("signal_breakdown") or []
+        if isinstance(s, dict)
+    ]
+
+
+def link_chunk(cursor, events):
+    """
+    Match each DECISION_MADE event to the unlinked decision row it produced:
+    same account and decision, stamped between the transaction and the
+    audit event. Returns the number of decisions linked.
+    """
+    matches = execute_values(
+        cursor,
+        """
+        SELECT m.decision_id, v.txn_id, v.version, v.explanation
+        FROM (VALUES %s) AS v(txn_id, account_id, decision, audit_created_at, version, explanation)
+        JOIN transactions t ON t.txn_id = v.txn_id
+        CROSS JOIN LATERAL (
+            SELECT d.decision_id
+            FROM risk_decisions d
+            WHERE d.account_id = v.account_id
+              AND d.txn_id IS NULL
+              AND d.decision = v.decision
+              AND d.created_at >= t.txn_timestamp
+              AND d.created_at <= v.audit_created_at
+            ORDER BY d.created_at ASC
+            LIMIT 1
+        ) m
+        WHERE NOT EXISTS (SELECT 1 FROM risk_decisions l WHERE l.txn_id = v.txn_id)
+        """,
+        events,
+        template="(%s, %s, %s, %s::TIMESTAMP, %s::INTEGER, %s)",
+        page_size=len(events),
+        fetch=True,
+    )
+
+    # Two events can pick the same decision row, or repeat a transaction;
+    # keep the first so each side is linked at most once
+    seen_decisions = set()
+    seen_txns = set()
+    updates = []
+    for row in matches:
+        if row["decision_id"] in seen_decisions or row["txn_id"] in seen_txns:
+            continue
+        seen_decisions.add(row["decision_id"])
+        seen_txns.add(row["txn_id"])
+        updates.append((row["decision_id"], row["txn_id"], row["version"], row["explanation"]))
+
+    if updates:
+        execute_values(
+            cursor,
+            """
+            UPDATE risk_decisions d
+            SET txn_id = v.txn_id,
+                scoring_config_version = v.version,
+                explanation = v.explanation
+            FROM (VALUES %s) AS v(decision_id, txn_id, version, explanation)
+            WHERE d.decision_id = v.decision_id
+              AND d.txn_id IS NULL
+            """,
+            updates,
+            template="(%s, %s, %s::INTEGER, %s::JSONB)",
+            page_size=len(updates),
+        )
+    return len(updates)
+
+
+def backfill(chunk_size: int):
+    reader = get_connection()
+    writer = get_connection()
+
+    print("🔧 Linking risk_decisions to transactions from DECISION_MADE audit events...")
+
+    scanned = 0
+    linked = 0
+    try:
+        stream = reader.cursor(name="decision_txn_backfill")
+        stream.itersize = chunk_size
+        stream.execute(
+            """
+            SELECT metadata, metadata_raw, created_at
+            FROM audit_logs
+            WHERE event_type = 'DECISION_MADE'
+            ORDER BY created_at
+            """
+        )
+
+        while True:
+            rows = stream.fetchmany(chunk_size)
+            if not rows:
+                break
+
+            events = []
+            for row in rows:
+                metadata = load_metadata(row["metadata"], row["metadata_raw"])
+                if not metadata.get("transaction_id"):
+                    continue
+                events.append(
+                    (
+                        metadata["transaction_id"],
+                        metadata.get("account_id"),
+                        metadata.get("decision"),
+                        row["created_at"],
+                        metadata.get("scoring_config_version"),
+                        json.dumps(explanation_from_metadata(metadata)),
+                    )
+                )
+
+            scanned += len(rows)
+            if events:
+                linked += link_chunk(writer.cursor(), events)
+                writer.commit()
+            print(f"  scanned={scanned} linked={linked}")
+    except Exception:
+        writer.rollback()
+        raise
+    finally:
+        reader.close()
+        writer.close()
+
+    print(f"Backfill complete. Linked {linked} decisions from {scanned} audit events.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Backfill risk_decisions.txn_id and explanations from audit DECISION_MADE events."
+    )
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    args = parser.parse_args()
+    backfill(args.chunk_size)
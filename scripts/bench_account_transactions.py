@@ -0,0 +1,252 @@
+"""
+Account transaction listing: legacy LATERAL decision probe vs the txn_id join.
+
+Runs in a throwaway schema (aegis_bench) with one hot account holding --txns
+transactions (plus --noise transactions spread over other accounts), each
+with the decision the pipeline linked to it. Decisions land 0-3s after their
+transaction while transactions arrive every ~1s, which is what makes the
+LATERAL probe attach a neighbouring transaction's decision.
+
+    python scripts/bench_account_transactions.py --txns 100000 --limit 50
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(PROJECT_ROOT)
+
+from app.data.database import get_connection  # noqa: E402
+from app.data.indexes import MANAGED_INDEXES  # noqa: E402
+from app.data.pagination import decode_cursor  # noqa: E402
+from app.data.schema import (  # noqa: E402
+    ACCOUNT_TABLE,
+    RISK_DECISIONS_TABLE,
+    TRANSACTION_TABLE,
+    USER_TABLE,
+)
+from app.repositories.transaction_repo import (  # noqa: E402
+    ACCOUNT_TRANSACTIONS_CURSOR_SCOPE,
+    fetch_account_transactions,
+)
+
+
+BENCH_SCHEMA = "aegis_bench"
+HOT_ACCOUNT = "bench-hot"
+BENCH_TABLES = ("transactions", "risk_decisions")
+
+LEGACY_SQL = """
+    SELECT
+      t.txn_id,
+      t.account_id,
+      t.amount,
+      t.txn_timestamp AS timestamp,
+      t.device_id,
+      t.channel,
+      d.decision,
+      d.risk_score
+    FROM transactions t
+    LEFT JOIN LATERAL (
+      SELECT decision, risk_score
+      FROM risk_decisions
+      WHERE account_id = t.account_id
+        AND created_at >= t.txn_timestamp
+      ORDER BY created_at ASC
+      LIMIT 1
+    ) d ON TRUE
+    WHERE t.account_id = %s
+    ORDER BY t.txn_timestamp DESC
+    LIMIT %s OFFSET %s
+"""
+
+
+def setup(conn, txns: int, noise: int, accounts: int):
+    cursor = conn.cursor()
+    cursor.execute(f"DROP SCHEMA IF EXISTS {BENCH_SCHEMA} CASCADE")
+    cursor.execute(f"CREATE SCHEMA {BENCH_SCHEMA}")
+    cursor.execute(f"SET search_path TO {BENCH_SCHEMA}")
+    for ddl in (USER_TABLE, ACCOUNT_TABLE, TRANSACTION_TABLE, RISK_DECISIONS_TABLE):
+        cursor.execute(ddl)
+
+    cursor.execute(
+        """
+        INSERT INTO users (user_id, created_at)
+        SELECT 'bench-user-' || g, NOW() FROM generate_series(0, %s) AS g
+        """,
+        (accounts,),
+    )
+    cursor.execute(
+        """
+        INSERT INTO accounts (account_id, user_id, account_type, balance, status, created_at)
+        SELECT CASE WHEN g = 0 THEN %s ELSE 'bench-' || g END,
+               'bench-user-' || g, 'wallet', 10000, 'active', NOW()
+        FROM generate_series(0, %s) AS g
+        """,
+        (HOT_ACCOUNT, accounts),
+    )
+
+    # Hot account: one transaction per second; noise spread across the rest
+    cursor.execute(
+        """
+        INSERT INTO transactions
+            (txn_id, user_id, account_id, amount, txn_type, channel, merchant_category,
+             location, device_id, txn_timestamp, status)
+        SELECT 'txn-' || g,
+               CASE WHEN g <= %(txns)s THEN 'bench-user-0' ELSE 'bench-user-' || (1 + g %% %(accounts)s) END,
+               CASE WHEN g <= %(txns)s THEN %(hot)s ELSE 'bench-' || (1 + g %% %(accounts)s) END,
+               round((random() * 5000)::numeric, 2), 'debit', 'upi', 'generic',
+               'Unknown', 'device-' || (g %% 7),
+               NOW() - ((%(txns)s - g) * INTERVAL '1 second') - (random() * INTERVAL '200 milliseconds'),
+               'success'
+        FROM generate_series(1, %(total)s) AS g
+        """,
+        {"txns": txns, "accounts": accounts, "hot": HOT_ACCOUNT, "total": txns + noise},
+    )
+    cursor.execute(
+        """
+        INSERT INTO risk_decisions
+            (decision_id, user_id, account_id, risk_score, decision, reasons, created_at, txn_id)
+        SELECT 'dec-' || t.txn_id, t.user_id, t.account_id,
+               s.score,
+               CASE WHEN s.score >= 70 THEN 'BLOCK' WHEN s.score >= 40 THEN 'REVIEW' ELSE 'ALLOW' END,
+               'bench',
+               t.txn_timestamp + (random() * INTERVAL '3 seconds'),
+               t.txn_id
+        FROM transactions t
+        CROSS JOIN LATERAL (SELECT round((random() * 100)::numeric, 2)::REAL AS score) s
+        """
+    )
+
+    for index in MANAGED_INDEXES:
+        if index.table in BENCH_TABLES:
+            unique = "UNIQUE " if index.unique else ""
+            where = f" WHERE {index.where}" if index.where else ""
+            cursor.execute(f"CREATE {unique}INDEX {index.name} ON {index.table} ({index.columns}){where}")
+    for table in BENCH_TABLES:
+        cursor.execute(f"ANALYZE {table}")
+    conn.commit()
+
+
+def timed(fn, reps: int) -> dict:
+    samples = []
+    for _ in range(reps):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000.0)
+    return {
+        "p50_ms": round(statistics.median(samples), 3),
+        "max_ms": round(max(samples), 3),
+    }
+
+
+def cursor_at_depth(cursor, depth: int, limit: int):
+    """Walk the keyset pages to `depth` rows and return the resume position."""
+    after = None
+    walked = 0
+    while walked < depth:
+        rows, token = fetch_account_transactions(cursor, HOT_ACCOUNT, limit=limit, after=after)
+        walked += len(rows)
+        if token is None:
+            break
+        after = decode_cursor(ACCOUNT_TRANSACTIONS_CURSOR_SCOPE, token)
+    return after
+
+
+def wrong_attachments(cursor, sample: int) -> dict:
+    """How often the LATERAL probe returns a decision other than the linked one."""
+    cursor.execute(
+        """
+        SELECT COUNT(*) AS checked,
+               COUNT(*) FILTER (WHERE probe.decision_id IS DISTINCT FROM linked.decision_id) AS wrong
+        FROM (
+            SELECT txn_id, account_id, txn_timestamp
+            FROM transactions
+            WHERE account_id = %s
+            ORDER BY txn_timestamp DESC
+            LIMIT %s
+        ) t
+        LEFT JOIN risk_decisions linked ON linked.txn_id = t.txn_id
+        LEFT JOIN LATERAL (
+            SELECT decision_id
+            FROM risk_decisions
+            WHERE account_id = t.account_id
+              AND created_at >= t.txn_timestamp
+            ORDER BY created_at ASC
+            LIMIT 1
+        ) probe ON TRUE
+        """,
+        (HOT_ACCOUNT, sample),
+    )
+    row = cursor.fetchone()
+    return {
+        "checked": row["checked"],
+        "wrong": row["wrong"],
+        "wrong_pct": round(100.0 * row["wrong"] / row["checked"], 2) if row["checked"] else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--txns", type=int, default=100_000, help="transactions on the hot account")
+    parser.add_argument("--noise", type=int, default=200_000, help="transactions on other accounts")
+    parser.add_argument("--accounts", type=int, default=1000)
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--depths", default="0,1000,10000,50000", help="comma-separated row offsets to time")
+    parser.add_argument("--reps", type=int, default=20)
+    parser.add_argument("--keep", action="store_true", help="keep the bench schema")
+    args = parser.parse_args()
+
+    conn = get_connection()
+    try:
+        print(f"🔧 Seeding {args.txns} hot-account transactions (+{args.noise} noise)...")
+        setup(conn, args.txns, args.noise, args.accounts)
+        cursor = conn.cursor()
+
+        pages = []
+        for depth in [int(d) for d in args.depths.split(",") if d.strip()]:
+            if depth >= args.txns:
+                continue
+            after = cursor_at_depth(cursor, depth, 1000) if depth else None
+
+            def legacy():
+                cursor.execute(LEGACY_SQL, (HOT_ACCOUNT, args.limit, depth))
+                cursor.fetchall()
+
+            def linked():
+                fetch_account_transactions(cursor, HOT_ACCOUNT, limit=args.limit, after=after)
+
+            before = timed(legacy, args.reps)
+            after_stats = timed(linked, args.reps)
+            pages.append(
+                {
+                    "depth": depth,
+                    "lateral_offset": before,
+                    "txn_id_join_keyset": after_stats,
+                    "speedup_p50": round(before["p50_ms"] / after_stats["p50_ms"], 2)
+                    if after_stats["p50_ms"] else None,
+                }
+            )
+            print(f"  depth={depth} lateral={before['p50_ms']}ms join={after_stats['p50_ms']}ms")
+
+        report = {
+            "hot_account_txns": args.txns,
+            "noise_txns": args.noise,
+            "limit": args.limit,
+            "pages": pages,
+            "lateral_wrong_decisions": wrong_attachments(cursor, min(args.txns, 10_000)),
+        }
+        print(json.dumps(report, indent=2))
+    finally:
+        conn.rollback()
+        if not args.keep:
+            cursor = conn.cursor()
+            cursor.execute(f"DROP SCHEMA IF EXISTS {BENCH_SCHEMA} CASCADE")
+            conn.commit()
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+"""
+Audit append throughput: legacy SELECT-then-INSERT vs chain-head log_event.
+
+Runs in a throwaway schema (aegis_bench) seeded with --rows audit rows so the
+numbers reflect a large audit_logs table without touching real data.
+
+    python scripts/bench_audit_append.py --rows 1000000 --events 5000
+"""
+import argparse
+import datetime
+import json
+import os
+import random
+import sys
+import time
+import uuid
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(PROJECT_ROOT)
+
+from app.data.database import get_connection  # noqa: E402
+from app.data.schema import AUDIT_LOG_TABLE, AUDIT_CHAIN_HEADS_TABLE  # noqa: E402
+from app.audit.hash_utils import compute_event_hash  # noqa: E402
+from app.audit.logger import log_event, clear_head_cache  # noqa: E402
+
+
+BENCH_SCHEMA = "aegis_bench"
+EVENTS_PER_TXN = 4
+
+
+def legacy_log_event(cursor, event_type, entity_type, entity_id, metadata):
+    """Pre chain-head implementation: scan for the previous hash, then INSERT."""
+    entity_id = str(entity_id)
+    cursor.execute(
+        """
+        SELECT event_hash
+        FROM audit_logs
+        WHERE entity_type = %s
+          AND entity_id = %s
+          AND event_hash IS NOT NULL
+        ORDER BY created_at DESC
+        LIMIT 1
+        """,
+        (entity_type, entity_id),
+    )
+    row = cursor.fetchone()
+    prev_hash = row["event_hash"] if row and row["event_hash"] else "GENESIS"
+    event_hash = compute_event_hash(
+        prev_hash=prev_hash,
+        event_type=event_type,
+        entity_type=entity_type,
+        entity_id=entity_id,
+        metadata=metadata,
+    )
+    cursor.execute(
+        """
+        INSERT INTO audit_logs (
+            audit_id, event_type, entity_type, entity_id,
+            metadata, prev_hash, event_hash, created_at
+        )
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+        """,
+        (
+            str(uuid.uuid4()),
+            event_type,
+            entity_type,
+            entity_id,
+            json.dumps(metadata),
+            prev_hash,
+            event_hash,
+            datetime.datetime.utcnow(),
+        ),
+    )
+
+
+def setup(conn, rows: int, entities: int):
+    cursor = conn.cursor()
+    cursor.execute(f"DROP SCHEMA IF EXISTS {BENCH_SCHEMA} CASCADE")
+    cursor.execute(f"CREATE SCHEMA {BENCH_SCHEMA}")
+    cursor.execute(f"SET search_path TO {BENCH_SCHEMA}")
+    cursor.execute(AUDIT_LOG_TABLE)
+    cursor.execute(AUDIT_CHAIN_HEADS_TABLE)
+    cursor.execute("CREATE INDEX ON audit_logs(created_at)")
+    cursor.execute(
+        """
+        INSERT INTO audit_logs (
+            audit_id, event_type, entity_type, entity_id,
+            metadata, prev_hash, event_hash, created_at
+        )
+        SELECT md5('seed' || g),
+               'TRANSACTION_CREATED',
+               'ACCOUNT',
+               'bench-' || (g %% %s),
+               '{}',
+               md5('prev' || g),
+               md5('hash' || g),
+               NOW() - ((%s - g) * INTERVAL '1 millisecond')
+        FROM generate_series(1, %s) AS g
+        """,
+        (entities, rows, rows),
+    )
+    cursor.execute("ANALYZE audit_logs")
+    conn.commit()
+
+
+def run(conn, append, events: int, entities: int, seed: int) -> dict:
+    rng = random.Random(seed)
+    cursor = conn.cursor()
+    started = time.perf_counter()
+    for i in range(events):
+        append(
+            cursor,
+            event_type="TRANSACTION_CREATED",
+            entity_type="ACCOUNT",
+            entity_id=f"bench-{rng.randrange(entities)}",
+            metadata={"seq": i, "amount": round(rng.uniform(10, 5000), 2)},
+        )
+        if (i + 1) % EVENTS_PER_TXN == 0:
+            conn.commit()
+    conn.commit()
+    elapsed = time.perf_counter() - started
+    return {
+        "events": events,
+        "elapsed_s": round(elapsed, 3),
+        "events_per_sec": round(events / elapsed, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--events", type=int, default=5000)
+    parser.add_argument("--entities", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--keep", action="store_true", help="keep the bench schema")
+    args = parser.parse_args()
+
+    conn = get_connection()
+    try:
+        print(f"🔧 Seeding {args.rows} audit rows across {args.entities} entities...")
+        setup(conn, args.rows, args.entities)
+
+        before = run(conn, legacy_log_event, args.events, args.entities, args.seed)
+
+        cursor = conn.cursor()
+        cursor.execute(
+            "CREATE INDEX ON audit_logs(entity_type, entity_id, created_at)"
+        )
+        conn.commit()
+
+        clear_head_cache()
+        after_cold = run(conn, log_event, args.events, args.entities, args.seed + 1)
+        after_warm = run(conn, log_event, args.events, args.entities, args.seed + 2)
+
+        report = {
+            "rows": args.rows,
+            "entities": args.entities,
+            "before": before,
+            "after_cold_cache": after_cold,
+            "after_warm_cache": after_warm,
+            "speedup_warm": round(
+                after_warm["events_per_sec"] / before["events_per_sec"], 2
+            ),
+        }
+        print(json.dumps(report, indent=2))
+    finally:
+        if not args.keep:
+            conn.rollback()
+            cursor = conn.cursor()
+            cursor.execute(f"DROP SCHEMA IF EXISTS {BENCH_SCHEMA} CASCADE")
+            conn.commit()
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
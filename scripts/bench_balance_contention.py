@@ -0,0 +1,295 @@
+"""
+Balance contention: many concurrent writers debiting one hot account.
+
+Runs in a throwaway schema (aegis_bench). Each strategy starts from the same
+balance and replays the same requests (more demand than balance), with
+--work-ms of simulated pipeline work between reading the balance and
+debiting it:
+
+  unsafe        read, check in Python, work, unconditional UPDATE (pre-fix ingest path)
+  for_update    SELECT ... FOR UPDATE, work, UPDATE (row locked for the whole request)
+  serializable  SERIALIZABLE read/check/UPDATE, retried on serialization failure
+  conditional   advisory read, work, account_repo.reserve_balance (ingest path now)
+
+Every accepted debit also writes a ledger row, so the report shows whether
+the final balance matches what was accepted (lost updates) and whether the
+account went negative (overdraft), next to throughput and latency.
+
+    python scripts/bench_balance_contention.py --writers 32 --requests 50 --work-ms 5
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(PROJECT_ROOT)
+
+from psycopg2 import errorcodes, extensions  # noqa: E402
+
+from app.data.database import get_connection  # noqa: E402
+from app.data.schema import ACCOUNT_TABLE, USER_TABLE  # noqa: E402
+from app.repositories.account_repo import reserve_balance  # noqa: E402
+
+
+BENCH_SCHEMA = "aegis_bench"
+HOT_ACCOUNT = "bench-hot"
+STRATEGIES = ("unsafe", "for_update", "serializable", "conditional")
+
+
+def setup(conn):
+    cursor = conn.cursor()
+    cursor.execute(f"DROP SCHEMA IF EXISTS {BENCH_SCHEMA} CASCADE")
+    cursor.execute(f"CREATE SCHEMA {BENCH_SCHEMA}")
+    cursor.execute(f"SET search_path TO {BENCH_SCHEMA}")
+    cursor.execute(USER_TABLE)
+    cursor.execute(ACCOUNT_TABLE)
+    cursor.execute(
+        """
+        CREATE TABLE bench_debits (
+            debit_id BIGSERIAL PRIMARY KEY,
+            account_id TEXT NOT NULL,
+            amount NUMERIC NOT NULL
+        )
+        """
+    )
+    cursor.execute("INSERT INTO users (user_id, created_at) VALUES ('bench-user-hot', NOW())")
+    cursor.execute(
+        """
+        INSERT INTO accounts (account_id, user_id, account_type, balance, status, created_at)
+        VALUES (%s, 'bench-user-hot', 'wallet', 0, 'active', NOW())
+        """,
+        (HOT_ACCOUNT,),
+    )
+    conn.commit()
+
+
+def reset(conn, balance: float):
+    cursor = conn.cursor()
+    cursor.execute("UPDATE accounts SET balance = %s WHERE account_id = %s", (balance, HOT_ACCOUNT))
+    cursor.execute("TRUNCATE bench_debits")
+    conn.commit()
+
+
+def read_balance(cursor, lock: bool = False) -> float:
+    cursor.execute(
+        "SELECT balance FROM accounts WHERE account_id = %s" + (" FOR UPDATE" if lock else ""),
+        (HOT_ACCOUNT,),
+    )
+    return float(cursor.fetchone()["balance"])
+
+
+def record_debit(cursor, amount: float):
+    cursor.execute("INSERT INTO bench_debits (account_id, amount) VALUES (%s, %s)", (HOT_ACCOUNT, amount))
+
+
+# ---------------------------------------------------------
+# Strategies: each returns True if the debit was accepted
+# ---------------------------------------------------------
+
+def debit_unsafe(conn, amount: float, work_s: float) -> bool:
+    cursor = conn.cursor()
+    if read_balance(cursor) < amount:
+        conn.rollback()
+        return False
+    time.sleep(work_s)
+    cursor.execute(
+        "UPDATE accounts SET balance = balance - %s WHERE account_id = %s",
+        (amount, HOT_ACCOUNT),
+    )
+    record_debit(cursor, amount)
+    conn.commit()
+    return True
+
+
+def debit_for_update(conn, amount: float, work_s: float) -> bool:
+    cursor = conn.cursor()
+    if read_balance(cursor, lock=True) < amount:
+        conn.rollback()
+        return False
+    time.sleep(work_s)
+    cursor.execute(
+        "UPDATE accounts SET balance = balance - %s WHERE account_id = %s",
+        (amount, HOT_ACCOUNT),
+    )
+    record_debit(cursor, amount)
+    conn.commit()
+    return True
+
+
+def debit_serializable(conn, amount: float, work_s: float) -> bool:
+    # Same statements as unsafe; SERIALIZABLE turns the race into a 40001
+    return debit_unsafe(conn, amount, work_s)
+
+
+def debit_conditional(conn, amount: float, work_s: float) -> bool:
+    cursor = conn.cursor()
+    if read_balance(cursor) < amount:
+        conn.rollback()
+        return False
+    time.sleep(work_s)
+    if reserve_balance(cursor, account_id=HOT_ACCOUNT, amount=amount) is None:
+        conn.rollback()
+        return False
+    record_debit(cursor, amount)
+    conn.commit()
+    return True
+
+
+DEBITS = {
+    "unsafe": debit_unsafe,
+    "for_update": debit_for_update,
+    "serializable": debit_serializable,
+    "conditional": debit_conditional,
+}
+
+RETRYABLE = (errorcodes.SERIALIZATION_FAILURE, errorcodes.DEADLOCK_DETECTED)
+
+
+def run_strategy(strategy: str, args) -> dict:
+    debit = DEBITS[strategy]
+    work_s = args.work_ms / 1000.0
+    latencies = []
+    counts = {"accepted": 0, "rejected": 0, "retries": 0, "errors": 0}
+    lock = threading.Lock()
+    start = threading.Barrier(args.writers + 1)
+
+    def writer():
+        conn = get_connection()
+        conn.cursor().execute(f"SET search_path TO {BENCH_SCHEMA}")
+        conn.commit()
+        if strategy == "serializable":
+            conn.set_session(isolation_level=extensions.ISOLATION_LEVEL_SERIALIZABLE)
+        local = {"accepted": 0, "rejected": 0, "retries": 0, "errors": 0}
+        local_latencies = []
+        start.wait()
+        try:
+            for _ in range(args.requests):
+                started_at = time.perf_counter()
+                for attempt in range(args.max_retries + 1):
+                    try:
+                        accepted = debit(conn, args.amount, work_s)
+                        local["accepted" if accepted else "rejected"] += 1
+                        break
+                    except Exception as exc:
+                        conn.rollback()
+                        if getattr(exc, "pgcode", None) in RETRYABLE and attempt < args.max_retries:
+                            local["retries"] += 1
+                            continue
+                        local["errors"] += 1
+                        break
+                local_latencies.append((time.perf_counter() - started_at) * 1000.0)
+        finally:
+            conn.close()
+        with lock:
+            for key, value in local.items():
+                counts[key] += value
+            latencies.extend(local_latencies)
+
+    threads = [threading.Thread(target=writer) for _ in range(args.writers)]
+    for thread in threads:
+        thread.start()
+    start.wait()
+    started_at = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started_at
+
+    conn = get_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute(f"SET search_path TO {BENCH_SCHEMA}")
+        final_balance = read_balance(cursor)
+        cursor.execute("SELECT COALESCE(SUM(amount), 0) AS total FROM bench_debits")
+        debited = float(cursor.fetchone()["total"])
+        conn.rollback()
+    finally:
+        conn.close()
+
+    latencies.sort()
+    requests = args.writers * args.requests
+    return {
+        **counts,
+        "requests": requests,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(requests / elapsed, 1) if elapsed else None,
+        "accepted_per_sec": round(counts["accepted"] / elapsed, 1) if elapsed else None,
+        "latency_ms": {
+            "p50": round(statistics.median(latencies), 3) if latencies else None,
+            "p99": round(latencies[int(0.99 * (len(latencies) - 1))], 3) if latencies else None,
+            "max": round(latencies[-1], 3) if latencies else None,
+        },
+        "final_balance": round(final_balance, 2),
+        "ledger_debited": round(debited, 2),
+        # Debits recorded but not reflected in the balance
+        "lost_updates": round((debited - (args.balance - final_balance)) / args.amount),
+        "overdraft": final_balance < 0,
+        "correct": final_balance >= 0 and abs(args.balance - final_balance - debited) < 0.005,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--writers", type=int, default=32, help="concurrent connections")
+    parser.add_argument("--requests", type=int, default=50, help="debits per writer")
+    parser.add_argument("--amount", type=float, default=100.0)
+    parser.add_argument(
+        "--balance",
+        type=float,
+        default=None,
+        help="starting balance (default: half of the total demand)",
+    )
+    parser.add_argument("--work-ms", type=float, default=5.0, help="simulated pipeline time per request")
+    parser.add_argument("--max-retries", type=int, default=20, help="serializable: retries per request")
+    parser.add_argument("--strategies", default=",".join(STRATEGIES))
+    parser.add_argument("--keep", action="store_true", help="keep the bench schema")
+    args = parser.parse_args()
+
+    if args.balance is None:
+        args.balance = args.writers * args.requests * args.amount / 2
+
+    strategies = [s.strip() for s in args.strategies.split(",") if s.strip()]
+    unknown = set(strategies) - set(STRATEGIES)
+    if unknown:
+        parser.error(f"unknown strategies: {', '.join(sorted(unknown))}")
+
+    conn = get_connection()
+    try:
+        setup(conn)
+        results = {}
+        for strategy in strategies:
+            reset(conn, args.balance)
+            print(f"🔧 {strategy}: {args.writers} writers x {args.requests} debits of {args.amount}...")
+            results[strategy] = run_strategy(strategy, args)
+            r = results[strategy]
+            status = "✅" if r["correct"] else "❌"
+            print(
+                f"  {status} accepted={r['accepted']} final_balance={r['final_balance']} "
+                f"lost_updates={r['lost_updates']} retries={r['retries']} "
+                f"rps={r['throughput_rps']} p99={r['latency_ms']['p99']}ms"
+            )
+
+        report = {
+            "writers": args.writers,
+            "requests_per_writer": args.requests,
+            "amount": args.amount,
+            "starting_balance": args.balance,
+            "max_acceptable": int(args.balance // args.amount),
+            "work_ms": args.work_ms,
+            "strategies": results,
+        }
+        print(json.dumps(report, indent=2))
+    finally:
+        conn.rollback()
+        if not args.keep:
+            cursor = conn.cursor()
+            cursor.execute(f"DROP SCHEMA IF EXISTS {BENCH_SCHEMA} CASCADE")
+            conn.commit()
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
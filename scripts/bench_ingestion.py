@@ -0,0 +1,429 @@
+"""
+Ingestion benchmark: seed accounts, generate a traffic mix and drive it
+through RiskPipeline in-process or POST /transactions over HTTP.
+
+    python scripts/bench_ingestion.py --seed-accounts 10000 --requests 5000 --concurrency 16
+    python scripts/bench_ingestion.py --mode http --base-url http://127.0.0.1:8000 --requests 5000
+    python scripts/bench_ingestion.py --mix normal=0.5,burst=0.3,high_amount=0.2 --output bench.json
+
+Prints (or writes) a JSON report meant to be diffed across commits:
+throughput, latency percentiles + histogram, per-stage SQL timings and
+statement counts.
+"""
+import argparse
+import bisect
+import itertools
+import json
+import os
+import re
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(PROJECT_ROOT)
+
+from app.core.instrumentation import InstrumentedCursor  # noqa: E402
+from app.data.database import DATABASE_URL, ConnectionPool, get_connection  # noqa: E402
+from app.ingestion.traffic import (  # noqa: E402
+    BENCH_ACCOUNT_PREFIX,
+    DEFAULT_MIX,
+    TrafficGenerator,
+    parse_mix,
+    seed_bench_accounts,
+)
+from app.risk.shadow import shadow_writer  # noqa: E402
+from app.audit.writer import audit_writer  # noqa: E402
+from app.services.pipeline import RiskPipeline  # noqa: E402
+
+
+HISTOGRAM_BUCKETS_MS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000]
+
+# A statement's stage is that of the first known table it names
+STAGE_TABLES = [
+    ("audit_chain_heads", "audit"),
+    ("audit_logs", "audit"),
+    ("risk_decisions", "decision"),
+    ("review_cases", "case"),
+    ("shadow_scores", "shadow"),
+    ("scoring_configs", "config"),
+    ("signals", "signals"),
+    ("transactions", "transaction"),
+    ("accounts", "account"),
+]
+_STAGE_RE = re.compile("|".join(table for table, _ in STAGE_TABLES))
+_STAGE_BY_TABLE = dict(STAGE_TABLES)
+
+DB_COUNTERS = [
+    "xact_commit",
+    "xact_rollback",
+    "tup_returned",
+    "tup_fetched",
+    "tup_inserted",
+    "tup_updated",
+    "tup_deleted",
+    "blks_read",
+    "blks_hit",
+]
+
+
+# ---------------------------------------------------------
+# Statement accounting (in-process mode)
+# ---------------------------------------------------------
+
+class StatementStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.by_statement = {}  # "VERB stage" -> [count, seconds]
+
+    def record(self, query, seconds: float) -> None:
+        if isinstance(query, bytes):
+            query = query.decode("utf-8", "replace")
+        text = query.lstrip()
+        verb = text.split(None, 1)[0].upper() if text else "?"
+        match = _STAGE_RE.search(text)
+        stage = _STAGE_BY_TABLE[match.group(0)] if match else "other"
+        key = f"{verb} {stage}"
+        with self._lock:
+            entry = self.by_statement.setdefault(key, [0, 0.0])
+            entry[0] += 1
+            entry[1] += seconds
+
+    def reset(self) -> None:
+        with self._lock:
+            self.by_statement = {}
+
+    def report(self, transactions: int):
+        by_stage = {}
+        total_count = 0
+        total_s = 0.0
+        for key, (count, seconds) in self.by_statement.items():
+            stage = key.split(" ", 1)[1]
+            entry = by_stage.setdefault(stage, {"statements": 0, "sql_ms": 0.0})
+            entry["statements"] += count
+            entry["sql_ms"] += seconds * 1000.0
+            total_count += count
+            total_s += seconds
+
+        per_txn = max(transactions, 1)
+        return {
+            "total": total_count,
+            "per_transaction": round(total_count / per_txn, 2),
+            "sql_ms_per_transaction": round(total_s * 1000.0 / per_txn, 3),
+            "by_statement": {
+                key: {"count": count, "per_transaction": round(count / per_txn, 2), "ms": round(seconds * 1000.0, 2)}
+                for key, (count, seconds) in sorted(self.by_statement.items())
+            },
+            "stages": {
+                stage: {
+                    "statements_per_transaction": round(entry["statements"] / per_txn, 2),
+                    "sql_ms_per_transaction": round(entry["sql_ms"] / per_txn, 3),
+                }
+                for stage, entry in sorted(by_stage.items())
+            },
+        }
+
+
+statement_stats = StatementStats()
+
+
+class CountingCursor(InstrumentedCursor):
+    """Pool cursor that also records every statement it sends."""
+
+    def execute(self, query, vars=None):
+        started_at = time.perf_counter()
+        try:
+            return super().execute(query, vars)
+        finally:
+            statement_stats.record(query, time.perf_counter() - started_at)
+
+
+# ---------------------------------------------------------
+# Database-side counters (both modes)
+# ---------------------------------------------------------
+
+def snapshot_db_counters():
+    conn = get_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute(
+            f"SELECT {', '.join(DB_COUNTERS)} FROM pg_stat_database WHERE datname = current_database()"
+        )
+        counters = dict(cursor.fetchone())
+
+        cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_stat_statements'")
+        counters["statements"] = None
+        if cursor.fetchone():
+            cursor.execute(
+                """
+                SELECT COALESCE(SUM(calls), 0) AS calls
+                FROM pg_stat_statements
+                WHERE dbid = (SELECT oid FROM pg_database WHERE datname = current_database())
+                """
+            )
+            counters["statements"] = int(cursor.fetchone()["calls"])
+        return counters
+    finally:
+        conn.close()
+
+
+def diff_counters(before, after, transactions: int):
+    per_txn = max(transactions, 1)
+    out = {}
+    for key in DB_COUNTERS + ["statements"]:
+        if before.get(key) is None or after.get(key) is None:
+            out[key] = None
+            continue
+        delta = int(after[key]) - int(before[key])
+        out[key] = {"total": delta, "per_transaction": round(delta / per_txn, 2)}
+    return out
+
+
+# ---------------------------------------------------------
+# Drivers
+# ---------------------------------------------------------
+
+class InProcessDriver:
+    """Runs the POST /transactions work directly on RiskPipeline."""
+
+    def __init__(self, concurrency: int, *, audit_write_behind: bool = False, outbox: bool = False):
+        self.pool = ConnectionPool(DATABASE_URL, min_size=0, max_size=concurrency)
+        self.audit_write_behind = audit_write_behind
+        self.outbox = outbox
+        shadow_writer.start()
+        if audit_write_behind:
+            audit_writer.start()
+
+    def __call__(self, item):
+        conn = self.pool.getconn()
+        conn.cursor_factory = CountingCursor
+        try:
+            pipeline = RiskPipeline(conn, audit_write_behind=self.audit_write_behind, outbox=self.outbox)
+            result = pipeline.process_transaction(
+                account_id=item["account_id"],
+                amount=item["amount"],
+                device_id=item["device_id"],
+            )
+            conn.commit()
+            pipeline.after_commit()
+            return result["decision"]
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.cursor_factory = InstrumentedCursor
+            self.pool.putconn(conn)
+
+    def close(self):
+        shadow_writer.stop()
+        audit_writer.stop()
+        self.pool.close()
+
+
+class HttpDriver:
+    def __init__(self, base_url: str):
+        self.url = base_url.rstrip("/") + "/transactions"
+
+    def __call__(self, item):
+        body = json.dumps(
+            {"account_id": item["account_id"], "amount": item["amount"], "device_id": item["device_id"]}
+        ).encode("utf-8")
+        request = urllib.request.Request(
+            self.url, data=body, headers={"Content-Type": "application/json"}, method="POST"
+        )
+        with urllib.request.urlopen(request, timeout=60) as response:
+            return json.loads(response.read()).get("decision")
+
+    def close(self):
+        pass
+
+
+def run(driver, items, concurrency: int):
+    latencies = [None] * len(items)
+    outcomes = [None] * len(items)
+    counter = itertools.count()
+    errors = []
+    lock = threading.Lock()
+
+    def worker():
+        while True:
+            index = next(counter)
+            if index >= len(items):
+                return
+            started_at = time.perf_counter()
+            try:
+                outcomes[index] = driver(items[index])
+            except Exception as exc:
+                outcomes[index] = "ERROR"
+                with lock:
+                    if len(errors) < 10:
+                        errors.append(f"{type(exc).__name__}: {exc}")
+            latencies[index] = (time.perf_counter() - started_at) * 1000.0
+
+    started_at = time.perf_counter()
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - started_at, latencies, outcomes, errors
+
+
+# ---------------------------------------------------------
+# Report
+# ---------------------------------------------------------
+
+def percentile(sorted_values, pct: float):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, int(round(pct / 100.0 * (len(sorted_values) - 1))))
+    return round(sorted_values[index], 3)
+
+
+def latency_report(latencies):
+    values = sorted(latencies)
+    counts = [0] * (len(HISTOGRAM_BUCKETS_MS) + 1)
+    for value in values:
+        counts[bisect.bisect_left(HISTOGRAM_BUCKETS_MS, value)] += 1
+    histogram = [
+        {"le_ms": upper, "count": count}
+        for upper, count in zip(HISTOGRAM_BUCKETS_MS + ["+Inf"], counts)
+    ]
+    return {
+        "p50": percentile(values, 50),
+        "p95": percentile(values, 95),
+        "p99": percentile(values, 99),
+        "max": round(values[-1], 3) if values else None,
+        "mean": round(sum(values) / len(values), 3) if values else None,
+        "histogram": histogram,
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_ROOT, stderr=subprocess.DEVNULL
+        ).decode().strip()
+    except Exception:
+        return None
+
+
+def load_bench_accounts(limit: int):
+    conn = get_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute(
+            """
+            SELECT account_id
+            FROM accounts
+            WHERE account_id LIKE %s
+            ORDER BY account_id
+            LIMIT %s
+            """,
+            (BENCH_ACCOUNT_PREFIX + "%", limit),
+        )
+        return [row["account_id"] for row in cursor.fetchall()]
+    finally:
+        conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mode", choices=["inproc", "http"], default="inproc")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--seed-accounts", type=int, default=0, help="bulk-create N bench accounts first")
+    parser.add_argument("--accounts", type=int, default=10000, help="bench accounts to draw traffic from")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--warmup", type=int, default=100, help="requests run before measuring")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--mix", type=parse_mix, default=DEFAULT_MIX, help="e.g. normal=0.8,burst=0.1,new_device=0.05,high_amount=0.05")
+    parser.add_argument("--seed", type=int, default=7, help="traffic RNG seed")
+    parser.add_argument("--output", default=None, help="write the JSON report here as well")
+    parser.add_argument(
+        "--audit-write-behind",
+        action="store_true",
+        help="inproc: queue audit events to the write-behind writer instead of appending them in the request",
+    )
+    parser.add_argument(
+        "--outbox",
+        action="store_true",
+        help="inproc: defer signals, cases and audit events to the outbox (drain with scripts/run_outbox_worker.py)",
+    )
+    args = parser.parse_args()
+
+    if args.seed_accounts:
+        conn = get_connection()
+        try:
+            started_at = time.perf_counter()
+            seed_bench_accounts(conn.cursor(), args.seed_accounts)
+            conn.commit()
+            print(f"🔧 Seeded {args.seed_accounts} bench accounts in {time.perf_counter() - started_at:.2f}s", file=sys.stderr)
+        finally:
+            conn.close()
+
+    account_ids = load_bench_accounts(args.accounts)
+    if not account_ids:
+        print("❌ No bench accounts; run with --seed-accounts N first", file=sys.stderr)
+        sys.exit(1)
+
+    generator = TrafficGenerator(account_ids, mix=args.mix, seed=args.seed)
+    items = generator.take(args.warmup + args.requests)
+    warmup, measured = items[: args.warmup], items[args.warmup:]
+
+    driver = (
+        InProcessDriver(args.concurrency, audit_write_behind=args.audit_write_behind, outbox=args.outbox)
+        if args.mode == "inproc"
+        else HttpDriver(args.base_url)
+    )
+    try:
+        if warmup:
+            run(driver, warmup, args.concurrency)
+        statement_stats.reset()
+        before = snapshot_db_counters()
+        elapsed_s, latencies, outcomes, errors = run(driver, measured, args.concurrency)
+        after = snapshot_db_counters()
+    finally:
+        driver.close()
+
+    ok = [lat for lat, outcome in zip(latencies, outcomes) if outcome != "ERROR"]
+    processed = len(ok)
+
+    mix_counts = {}
+    for item in measured:
+        mix_counts[item["kind"]] = mix_counts.get(item["kind"], 0) + 1
+
+    decisions = {}
+    for outcome in outcomes:
+        decisions[outcome] = decisions.get(outcome, 0) + 1
+
+    report = {
+        "revision": git_revision(),
+        "mode": args.mode,
+        "audit_write_behind": args.audit_write_behind,
+        "outbox": args.outbox,
+        "concurrency": args.concurrency,
+        "accounts": len(account_ids),
+        "requests": len(measured),
+        "processed": processed,
+        "errors": len(measured) - processed,
+        "error_samples": errors,
+        "duration_s": round(elapsed_s, 3),
+        "throughput_tps": round(processed / elapsed_s, 2) if elapsed_s > 0 else None,
+        "latency_ms": latency_report(ok),
+        "mix": mix_counts,
+        "decisions": decisions,
+        "statements": statement_stats.report(processed) if args.mode == "inproc" else None,
+        "db_counters": diff_counters(before, after, processed),
+    }
+
+    text = json.dumps(report, indent=2, sort_keys=True)
+    print(text)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            fh.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
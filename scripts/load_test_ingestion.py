@@ -0,0 +1,128 @@
+"""
+Closed-loop HTTP load test for POST /transactions.
+
+Start the API once per driver and compare the reports:
+
+    INGESTION_DRIVER=psycopg2 uvicorn app.main:app --port 8000
+    python scripts/load_test_ingestion.py --concurrency 64 --duration 30
+
+    INGESTION_DRIVER=asyncpg uvicorn app.main:app --port 8000
+    python scripts/load_test_ingestion.py --concurrency 64 --duration 30
+
+Amounts are small so balances do not run out during the run.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(PROJECT_ROOT)
+
+from app.data.database import get_connection  # noqa: E402
+
+
+def load_account_ids(limit: int):
+    conn = get_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute(
+            "SELECT account_id FROM accounts WHERE balance > 1000 ORDER BY account_id LIMIT %s",
+            (limit,),
+        )
+        return [row["account_id"] for row in cursor.fetchall()]
+    finally:
+        conn.close()
+
+
+def percentile(sorted_values, pct: float):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, int(round(pct / 100.0 * (len(sorted_values) - 1))))
+    return round(sorted_values[index], 2)
+
+
+def worker(url, account_ids, deadline, latencies, errors, lock):
+    rng = random.Random()
+    local_latencies = []
+    local_errors = 0
+
+    while time.monotonic() < deadline:
+        body = json.dumps(
+            {
+                "account_id": rng.choice(account_ids),
+                "amount": round(rng.uniform(1, 50), 2),
+                "device_id": f"load-device-{rng.randint(1, 5)}",
+            }
+        ).encode("utf-8")
+        request = urllib.request.Request(
+            url, data=body, headers={"Content-Type": "application/json"}, method="POST"
+        )
+        started_at = time.monotonic()
+        try:
+            with urllib.request.urlopen(request, timeout=30) as response:
+                response.read()
+            local_latencies.append((time.monotonic() - started_at) * 1000.0)
+        except (urllib.error.URLError, OSError):
+            local_errors += 1
+
+    with lock:
+        latencies.extend(local_latencies)
+        errors.append(local_errors)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds")
+    parser.add_argument("--accounts", type=int, default=200, help="distinct accounts to spread load over")
+    args = parser.parse_args()
+
+    account_ids = load_account_ids(args.accounts)
+    if not account_ids:
+        print("❌ No funded accounts found; run scripts/seed_accounts.py first")
+        sys.exit(1)
+
+    url = args.base_url.rstrip("/") + "/transactions"
+    latencies, errors = [], []
+    lock = threading.Lock()
+
+    started_at = time.monotonic()
+    deadline = started_at + args.duration
+    threads = [
+        threading.Thread(target=worker, args=(url, account_ids, deadline, latencies, errors, lock))
+        for _ in range(args.concurrency)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed_s = time.monotonic() - started_at
+
+    latencies.sort()
+    print(
+        json.dumps(
+            {
+                "url": url,
+                "concurrency": args.concurrency,
+                "duration_s": round(elapsed_s, 2),
+                "requests": len(latencies),
+                "errors": sum(errors),
+                "rps": round(len(latencies) / elapsed_s, 2) if elapsed_s > 0 else None,
+                "p50_ms": percentile(latencies, 50),
+                "p95_ms": percentile(latencies, 95),
+                "p99_ms": percentile(latencies, 99),
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+import argparse
+import json
+import os
+import sys
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(PROJECT_ROOT)
+
+from app.data.database import get_connection  # noqa: E402
+from app.data.indexes import MANAGED_INDEXES, ensure_managed_indexes, run_index_advisor  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Managed index set and EXPLAIN advisor.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    sub.add_parser("list", help="print the managed index definitions")
+
+    ensure = sub.add_parser("ensure", help="create missing indexes concurrently")
+    ensure.add_argument("--keep-retired", action="store_true", help="do not drop superseded indexes")
+
+    explain = sub.add_parser("explain", help="EXPLAIN registered queries and flag sequential scans")
+    explain.add_argument(
+        "--min-rows",
+        type=float,
+        default=1000,
+        help="ignore seq scans on tables estimated below this many rows",
+    )
+    args = parser.parse_args()
+
+    if args.command == "list":
+        for index in MANAGED_INDEXES:
+            print(f"{index.ddl()};  -- {index.serves}")
+        return
+
+    if args.command == "ensure":
+        print("🔧 Ensuring managed indexes...")
+        report = ensure_managed_indexes(drop_retired=not args.keep_retired)
+        print(json.dumps(report, indent=2))
+        sys.exit(1 if report["failed"] else 0)
+
+    conn = get_connection()
+    try:
+        report = run_index_advisor(conn, min_rows=args.min_rows)
+    finally:
+        conn.close()
+
+    print(json.dumps(report, indent=2))
+    for name in report["flagged"]:
+        print(f"⚠️  {name}: sequential scan or error")
+    sys.exit(1 if report["flagged"] else 0)
+
+
+if __name__ == "__main__":
+    main()
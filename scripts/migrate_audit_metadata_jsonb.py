@@ -0,0 +1,163 @@
+import argparse
+import json
+import os
+import sys
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(PROJECT_ROOT)
+
+from psycopg2.extras import execute_values  # noqa: E402
+
+from app.audit.hash_utils import encode_metadata  # noqa: E402
+from app.data.database import get_connection  # noqa: E402
+from app.data.indexes import ensure_managed_indexes  # noqa: E402
+
+
+# Rows written while the backfill runs get metadata_jsonb from this trigger,
+# so the final swap only has to rename columns.
+SYNC_TRIGGER = """
+CREATE OR REPLACE FUNCTION audit_logs_metadata_jsonb_sync()
+RETURNS trigger AS $$
+BEGIN
+    NEW.metadata_jsonb := NEW.metadata::jsonb;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS audit_logs_metadata_jsonb_sync ON audit_logs;
+CREATE TRIGGER audit_logs_metadata_jsonb_sync
+BEFORE INSERT ON audit_logs
+FOR EACH ROW EXECUTE FUNCTION audit_logs_metadata_jsonb_sync();
+"""
+
+
+def metadata_type(cursor):
+    cursor.execute(
+        """
+        SELECT column_name, data_type
+        FROM information_schema.columns
+        WHERE table_schema = current_schema()
+          AND table_name = 'audit_logs'
+          AND column_name IN ('metadata', 'metadata_jsonb', 'metadata_raw')
+        """
+    )
+    return {row["column_name"]: row["data_type"] for row in cursor.fetchall()}
+
+
+def convert_chunk(cursor, rows):
+    """
+    Fill metadata_jsonb for one chunk. The JSONB value and metadata_raw come
+    from the same encode_metadata() the writers use; metadata_raw keeps the
+    original text byte-for-byte so existing event hashes still verify.
+    Returns the number of rows that needed metadata_raw.
+    """
+    updates = []
+    kept_raw = 0
+    for row in rows:
+        text = row["metadata"]
+        if not text:
+            updates.append((row["audit_id"], "{}", None))
+            continue
+        jsonb_text, raw = encode_metadata(json.loads(text))
+        if raw is not None:
+            raw = text
+            kept_raw += 1
+        updates.append((row["audit_id"], jsonb_text, raw))
+
+    execute_values(
+        cursor,
+        """
+        UPDATE audit_logs a
+        SET metadata_jsonb = v.metadata,
+            metadata_raw = v.metadata_raw
+        FROM (VALUES %s) AS v(audit_id, metadata, metadata_raw)
+        WHERE a.audit_id = v.audit_id
+        """,
+        updates,
+        template="(%s, %s::jsonb, %s)",
+        page_size=len(updates),
+    )
+    return kept_raw
+
+
+def migrate(chunk_size: int):
+    conn = get_connection()
+    cursor = conn.cursor()
+
+    print("🔧 Migrating audit_logs.metadata to JSONB...")
+
+    cols = metadata_type(cursor)
+    if cols.get("metadata") == "jsonb":
+        conn.close()
+        print(" audit_logs.metadata is already JSONB.")
+        return
+
+    cursor.execute("ALTER TABLE audit_logs ADD COLUMN IF NOT EXISTS metadata_raw TEXT;")
+    cursor.execute("ALTER TABLE audit_logs ADD COLUMN IF NOT EXISTS metadata_jsonb JSONB;")
+    cursor.execute(SYNC_TRIGGER)
+    conn.commit()
+
+    # Keyset batches over audit_id, one commit per chunk: no long-running
+    # transaction and no lock beyond the rows being converted.
+    converted = 0
+    kept_raw = 0
+    last_id = ""
+    try:
+        while True:
+            cursor.execute(
+                """
+                SELECT audit_id, metadata
+                FROM audit_logs
+                WHERE audit_id > %s
+                  AND metadata_jsonb IS NULL
+                ORDER BY audit_id
+                LIMIT %s
+                """,
+                (last_id, chunk_size),
+            )
+            rows = cursor.fetchall()
+            if not rows:
+                break
+
+            kept_raw += convert_chunk(cursor, rows)
+            conn.commit()
+
+            converted += len(rows)
+            last_id = rows[-1]["audit_id"]
+            print(f"  converted={converted} kept_raw={kept_raw}")
+
+        # Swap under a short exclusive lock; anything inserted between the
+        # last chunk and the lock was already filled by the trigger.
+        cursor.execute("LOCK TABLE audit_logs IN ACCESS EXCLUSIVE MODE")
+        cursor.execute("DROP TRIGGER IF EXISTS audit_logs_metadata_jsonb_sync ON audit_logs")
+        cursor.execute("DROP FUNCTION IF EXISTS audit_logs_metadata_jsonb_sync()")
+        cursor.execute(
+            """
+            UPDATE audit_logs
+            SET metadata_jsonb = COALESCE(metadata, '{}')::jsonb
+            WHERE metadata_jsonb IS NULL
+            """
+        )
+        cursor.execute("ALTER TABLE audit_logs DROP COLUMN metadata")
+        cursor.execute("ALTER TABLE audit_logs RENAME COLUMN metadata_jsonb TO metadata")
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+    print(f" Migration complete: {converted} rows converted, {kept_raw} kept their original text.")
+
+    print("🔧 Building audit metadata indexes...")
+    report = ensure_managed_indexes()
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Convert audit_logs.metadata from TEXT to JSONB in committed batches."
+    )
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    args = parser.parse_args()
+    migrate(args.chunk_size)
@@ -0,0 +1,48 @@
+"""
+Delete expired Idempotency-Key results in small batches.
+
+Expired keys are already ignored (and reclaimed) by POST /transactions; this
+only keeps idempotency_keys from growing. Safe to run from cron.
+
+    python scripts/purge_idempotency_keys.py --batch-size 5000
+"""
+import argparse
+import datetime
+import json
+import os
+import sys
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(PROJECT_ROOT)
+
+from app.data.database import get_connection  # noqa: E402
+from app.repositories.idempotency_repo import purge_expired_idempotency_keys  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=5000, help="keys deleted per transaction")
+    args = parser.parse_args()
+
+    started_at = time.perf_counter()
+    now = datetime.datetime.utcnow()
+    deleted = 0
+
+    conn = get_connection()
+    try:
+        cursor = conn.cursor()
+        while True:
+            batch = purge_expired_idempotency_keys(cursor, now=now, limit=args.batch_size)
+            conn.commit()
+            deleted += batch
+            if batch < args.batch_size:
+                break
+    finally:
+        conn.close()
+
+    print(json.dumps({"deleted": deleted, "elapsed_s": round(time.perf_counter() - started_at, 3)}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
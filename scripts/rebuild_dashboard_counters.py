@@ -0,0 +1,32 @@
+import json
+import os
+import sys
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(PROJECT_ROOT)
+
+from app.data.database import get_connection  # noqa: E402
+from app.repositories.dashboard_repo import rebuild_dashboard_counters  # noqa: E402
+
+
+def main():
+    """
+    Recount dashboard_counters from the base tables, e.g. after a TRUNCATE
+    or restore that the counter triggers did not see.
+    """
+    conn = get_connection()
+    try:
+        print("🔧 Rebuilding dashboard counters...")
+        counters = rebuild_dashboard_counters(conn.cursor())
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+    print(json.dumps(counters, indent=2, sort_keys=True))
+
+
+if __name__ == "__main__":
+    main()
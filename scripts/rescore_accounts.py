@@ -0,0 +1,74 @@
+"""
+Re-score every account with the vectorized engine (e.g. after a weight change).
+
+    python scripts/rescore_accounts.py --dry-run
+    python scripts/rescore_accounts.py --version 3
+    python scripts/rescore_accounts.py --dry-run --weight HIGH_AMOUNT=0.02
+"""
+import argparse
+import json
+import os
+import sys
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(PROJECT_ROOT)
+
+from app.data.database import get_connection  # noqa: E402
+from app.repositories.scoring_config_repo import fetch_active_scoring_config, fetch_scoring_config  # noqa: E402
+from app.risk.scoring_config import ScoringConfig, default_scoring_config  # noqa: E402
+from app.risk.vectorized import LOAD_CHUNK_SIZE, STORE_CHUNK_SIZE, rescore_all_accounts  # noqa: E402
+
+
+def parse_weight(value: str):
+    name, _, weight = value.partition("=")
+    if not name or not weight:
+        raise argparse.ArgumentTypeError("expected TYPE=WEIGHT")
+    return name, float(weight)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dry-run", action="store_true", help="score only; do not write decisions")
+    parser.add_argument("--version", type=int, default=None, help="scoring config version (default: active)")
+    parser.add_argument("--weight", type=parse_weight, action="append", default=[], help="override TYPE=WEIGHT")
+    parser.add_argument("--load-chunk-size", type=int, default=LOAD_CHUNK_SIZE)
+    parser.add_argument("--store-chunk-size", type=int, default=STORE_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    conn = get_connection()
+    try:
+        cursor = conn.cursor()
+        if args.version is not None:
+            row = fetch_scoring_config(cursor, args.version)
+            if not row:
+                print(f"❌ Scoring config version {args.version} not found")
+                sys.exit(1)
+        else:
+            row = fetch_active_scoring_config(cursor)
+        config = ScoringConfig.from_row(row) if row else default_scoring_config()
+
+        if args.weight:
+            # Ad-hoc weights are not a stored version; only allow them for previews
+            if not args.dry_run:
+                print("❌ --weight overrides require --dry-run; store them as a scoring config version first")
+                sys.exit(1)
+            weights = dict(config.weights)
+            weights.update(dict(args.weight))
+            config = ScoringConfig(config.version, weights, config.review_threshold, config.block_threshold)
+
+        report = rescore_all_accounts(
+            conn,
+            config=config,
+            store=not args.dry_run,
+            load_chunk_size=args.load_chunk_size,
+            store_chunk_size=args.store_chunk_size,
+        )
+    finally:
+        conn.close()
+
+    report["weights"] = config.weights
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
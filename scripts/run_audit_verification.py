@@ -0,0 +1,52 @@
+"""
+Advance the audit integrity checkpoint with an incremental chain verification.
+
+Use this (from cron, or with --loop) when AUDIT_VERIFY_INTERVAL_SECONDS=0
+disables the in-app verifier. Each run re-hashes the events added since the
+persisted checkpoint and commits the new checkpoint; --full discards it and
+re-verifies every event.
+
+    python scripts/run_audit_verification.py --loop --interval 60
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(PROJECT_ROOT)
+
+from app.audit.integrity import verify_audit_chain  # noqa: E402
+from app.data.database import get_connection  # noqa: E402
+
+
+def run_once(full: bool) -> dict:
+    conn = get_connection()
+    try:
+        return verify_audit_chain(conn, full=full)
+    finally:
+        conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--full", action="store_true", help="discard the checkpoint and re-verify every event")
+    parser.add_argument("--loop", action="store_true", help="keep running every --interval seconds")
+    parser.add_argument("--interval", type=float, default=60.0, help="seconds between --loop runs")
+    args = parser.parse_args()
+
+    while True:
+        print("🔧 Verifying audit chain...")
+        result = run_once(args.full)
+        status = "✅" if result["audit_chain_valid"] else "❌"
+        print(f"  {status} newly_verified={result['newly_verified_events']} verified={result['verified_events']}")
+        print(json.dumps(result, indent=2, default=str))
+        if not args.loop:
+            break
+        args.full = False
+        time.sleep(args.interval)
+
+
+if __name__ == "__main__":
+    main()
@@ -13,9 +13,20 @@ from app.data.schema import (
     SIGNALS_TABLE,
     RISK_DECISIONS_TABLE,
     AUDIT_LOG_TABLE,
+    AUDIT_CHAIN_HEADS_TABLE,
+    AUDIT_VERIFICATION_CHECKPOINTS_TABLE,
+    SCORING_CONFIGS_TABLE,
+    SHADOW_SCORES_TABLE,
     REVIEW_CASES_TABLE,
+    DASHBOARD_COUNTERS_TABLE,
+    ACCOUNT_TXN_COUNTS_TABLE,
+    METRICS_ROLLUPS_TABLE,
+    METRICS_ROLLUP_STATE_TABLE,
+    OUTBOX_TABLE,
+    IDEMPOTENCY_KEYS_TABLE,
 )
 from app.data.seed import seed_users_and_accounts
+from app.repositories.dashboard_repo import rebuild_dashboard_counters
 from app.core.logging import get_logger
 
 
@@ -49,16 +60,31 @@ if __name__ == "__main__":
         cursor.execute(SIGNALS_TABLE)
         cursor.execute(RISK_DECISIONS_TABLE)
         cursor.execute(AUDIT_LOG_TABLE)
+        cursor.execute(AUDIT_CHAIN_HEADS_TABLE)
+        cursor.execute(AUDIT_VERIFICATION_CHECKPOINTS_TABLE)
+        cursor.execute(SCORING_CONFIGS_TABLE)
+        cursor.execute(SHADOW_SCORES_TABLE)
         cursor.execute(REVIEW_CASES_TABLE)
+        cursor.execute(DASHBOARD_COUNTERS_TABLE)
+        cursor.execute(ACCOUNT_TXN_COUNTS_TABLE)
+        cursor.execute(METRICS_ROLLUPS_TABLE)
+        cursor.execute(METRICS_ROLLUP_STATE_TABLE)
+        cursor.execute(OUTBOX_TABLE)
+        cursor.execute(IDEMPOTENCY_KEYS_TABLE)
 
         # Truncate core entities
         cursor.execute("DELETE FROM transactions;")
         cursor.execute("DELETE FROM accounts;")
         cursor.execute("DELETE FROM users;")
+        cursor.execute("DELETE FROM metrics_rollups;")
+        cursor.execute("DELETE FROM metrics_rollup_state;")
 
         conn.commit()
 
         seed_users_and_accounts()
+
+        rebuild_dashboard_counters(cursor)
+        conn.commit()
         logger.info(
             "Database initialized with fresh users and accounts. No transactions or risk data have been generated."
         )
@@ -0,0 +1,39 @@
+import argparse
+import json
+import os
+import sys
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(PROJECT_ROOT)
+
+from app.data.database import get_connection  # noqa: E402
+from app.services.metrics_rollup import reset_rollups, run_rollup  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Roll transactions, decisions and cases into minute/hour metrics buckets."
+    )
+    parser.add_argument(
+        "--rebuild",
+        action="store_true",
+        help="drop existing rollups and re-aggregate from the earliest row",
+    )
+    args = parser.parse_args()
+
+    conn = get_connection()
+    try:
+        if args.rebuild:
+            print("🔧 Dropping existing rollups...")
+            reset_rollups(conn)
+
+        print("🔧 Rolling up metrics...")
+        result = run_rollup(conn)
+    finally:
+        conn.close()
+
+    print(json.dumps(result, indent=2, default=str))
+
+
+if __name__ == "__main__":
+    main()
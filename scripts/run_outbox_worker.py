@@ -0,0 +1,114 @@
+"""
+Drain the outbox: materialize deferred signals, review cases and audit events
+written by POST /transactions with PIPELINE_SIDE_EFFECTS=outbox.
+
+    python scripts/run_outbox_worker.py                      # run until interrupted
+    python scripts/run_outbox_worker.py --once               # drain the backlog and exit
+    python scripts/run_outbox_worker.py --shards 4 --shard 0 # one of four workers
+
+Each account belongs to one shard, so run at most one worker per shard to
+keep every account's audit events in order.
+"""
+import argparse
+import json
+import os
+import signal
+import sys
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(PROJECT_ROOT)
+
+import psycopg2  # noqa: E402
+
+from app.data.database import get_connection  # noqa: E402
+from app.services.outbox import (  # noqa: E402
+    OUTBOX_BATCH_SIZE,
+    OUTBOX_MAX_ATTEMPTS,
+    OUTBOX_POLL_INTERVAL_SECONDS,
+    drain_outbox_batch,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=OUTBOX_BATCH_SIZE)
+    parser.add_argument("--poll-interval", type=float, default=OUTBOX_POLL_INTERVAL_SECONDS)
+    parser.add_argument("--max-attempts", type=int, default=OUTBOX_MAX_ATTEMPTS)
+    parser.add_argument("--shard", type=int, default=0)
+    parser.add_argument("--shards", type=int, default=1)
+    parser.add_argument("--once", action="store_true", help="exit once the backlog is drained")
+    args = parser.parse_args()
+
+    if not 0 <= args.shard < args.shards:
+        parser.error("--shard must be in [0, --shards)")
+
+    stopping = {"flag": False}
+
+    def request_stop(signum, frame):
+        stopping["flag"] = True
+
+    signal.signal(signal.SIGTERM, request_stop)
+    signal.signal(signal.SIGINT, request_stop)
+
+    totals = {
+        "batches": 0,
+        "claimed": 0,
+        "processed": 0,
+        "failed": 0,
+        "deferred": 0,
+        "signals": 0,
+        "cases": 0,
+        "audit_events": 0,
+    }
+    started_at = time.perf_counter()
+    conn = None
+
+    print(f"🔧 Outbox worker shard {args.shard}/{args.shards} (batch={args.batch_size})")
+    # A batch is one transaction, so stopping between batches loses nothing
+    while not stopping["flag"]:
+        try:
+            if conn is None or conn.closed:
+                conn = get_connection()
+            stats = drain_outbox_batch(
+                conn,
+                batch_size=args.batch_size,
+                max_attempts=args.max_attempts,
+                shard=args.shard,
+                shards=args.shards,
+            )
+        except psycopg2.OperationalError as exc:
+            print(f"❌ Database unavailable: {exc}; retrying", file=sys.stderr)
+            if conn is not None:
+                conn.close()
+            conn = None
+            time.sleep(max(args.poll_interval, 1.0))
+            continue
+
+        if stats["claimed"]:
+            totals["batches"] += 1
+            for key, value in stats.items():
+                totals[key] += value
+            print(
+                f"  claimed={stats['claimed']} processed={stats['processed']} failed={stats['failed']} "
+                f"deferred={stats['deferred']} signals={stats['signals']} cases={stats['cases']} "
+                f"audit_events={stats['audit_events']}"
+            )
+
+        # A full batch means there is probably more waiting
+        if stats["claimed"] < args.batch_size:
+            if args.once:
+                break
+            time.sleep(args.poll_interval)
+
+    if conn is not None:
+        conn.close()
+
+    elapsed = time.perf_counter() - started_at
+    totals["elapsed_s"] = round(elapsed, 3)
+    totals["rows_per_sec"] = round(totals["processed"] / elapsed, 1) if elapsed else None
+    print(json.dumps(totals, indent=2))
+
+
+if __name__ == "__main__":
+    main()
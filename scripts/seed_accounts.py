@@ -6,6 +6,7 @@ import datetime
 PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 sys.path.append(PROJECT_ROOT)
 
+from app.data.bulk_seed import ACCOUNT_COLUMNS, USER_COLUMNS, copy_rows  # noqa: E402
 from app.data.database import get_connection  # noqa: E402
 from app.core.logging import get_logger  # noqa: E402
 
@@ -28,46 +29,21 @@ def main():
 
         now = datetime.datetime.utcnow()
 
-        users = []
-        for i in range(5):
-            user_id = str(uuid.uuid4())
-            users.append(user_id)
-            cursor.execute(
-                """
-                INSERT INTO users (user_id, name, email, phone, kyc_level, created_at)
-                VALUES (%s, %s, %s, %s, %s, %s)
-                """,
-                (
-                    user_id,
-                    f"Seed User {i+1}",
-                    f"seed{i+1}@aegis.local",
-                    f"900000000{i}",
-                    2,
-                    now,
-                ),
-            )
+        users = [
+            (str(uuid.uuid4()), f"Seed User {i+1}", f"seed{i+1}@aegis.local", f"900000000{i}", 2, now)
+            for i in range(5)
+        ]
 
         # 10 accounts, 2 per user
         account_types = ["wallet", "savings"]
-        for idx, user_id in enumerate(users):
-            for t in account_types:
-                account_id = str(uuid.uuid4())
-                cursor.execute(
-                    """
-                    INSERT INTO accounts (
-                        account_id, user_id, account_type, balance, status, created_at
-                    )
-                    VALUES (%s, %s, %s, %s, %s, %s)
-                    """,
-                    (
-                        account_id,
-                        user_id,
-                        t,
-                        10000.0,
-                        "active",
-                        now,
-                    ),
-                )
+        accounts = [
+            (str(uuid.uuid4()), user[0], t, 10000.0, "active", now)
+            for user in users
+            for t in account_types
+        ]
+
+        copy_rows(cursor, "users", USER_COLUMNS, users)
+        copy_rows(cursor, "accounts", ACCOUNT_COLUMNS, accounts)
 
         conn.commit()
         logger.info("Seeded 5 users and 10 accounts.")
@@ -0,0 +1,121 @@
+"""
+Bulk-seed users, accounts and back-dated transaction history with COPY.
+
+Deterministic for a given --seed and --end: rerunning with the same values
+reproduces the same rows (and so collides on primary keys); use a new seed
+to add another population.
+
+    python scripts/seed_bulk.py --users 1000000 --txns-per-account 20 --seed 7
+"""
+import argparse
+import datetime
+import json
+import os
+import sys
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(PROJECT_ROOT)
+
+from app.data.bulk_seed import SeedProfile, bulk_seed, parse_weights  # noqa: E402
+from app.data.database import get_connection  # noqa: E402
+from app.data.indexes import MANAGED_INDEXES, ensure_managed_indexes  # noqa: E402
+from app.ingestion.generator import CHANNELS, LOCATIONS, MERCHANT_CATEGORIES  # noqa: E402
+
+
+SEEDED_TABLES = ("users", "accounts", "transactions")
+
+
+def drop_seeded_table_indexes(conn):
+    """Drop managed indexes on the seeded tables; ensure_managed_indexes rebuilds them after."""
+    cursor = conn.cursor()
+    dropped = []
+    for index in MANAGED_INDEXES:
+        if index.table in SEEDED_TABLES:
+            cursor.execute(f"DROP INDEX IF EXISTS {index.name}")
+            dropped.append(index.name)
+    conn.commit()
+    return dropped
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--accounts-per-user", type=float, default=1.5)
+    parser.add_argument("--txns-per-account", type=float, default=20.0, help="mean of an exponential draw")
+    parser.add_argument("--history-days", type=int, default=90)
+    parser.add_argument(
+        "--end",
+        type=datetime.datetime.fromisoformat,
+        default=None,
+        help="newest possible txn_timestamp (default: today 00:00 UTC)",
+    )
+    parser.add_argument("--amount-mu", type=float, default=6.2, help="lognormal mu (median amount = e^mu)")
+    parser.add_argument("--amount-sigma", type=float, default=1.1)
+    parser.add_argument("--amount-min", type=float, default=10.0)
+    parser.add_argument("--amount-max", type=float, default=5000.0)
+    parser.add_argument("--device-reuse", type=float, default=0.9, help="probability of reusing a known device")
+    parser.add_argument("--max-devices-per-user", type=int, default=5)
+    parser.add_argument("--home-location-prob", type=float, default=0.85)
+    parser.add_argument("--channel-weights", help=f"e.g. upi=0.6,card=0.3 (choices: {', '.join(CHANNELS)})")
+    parser.add_argument("--location-weights", help=f"choices: {', '.join(LOCATIONS)}")
+    parser.add_argument("--merchant-weights", help=f"choices: {', '.join(MERCHANT_CATEGORIES)}")
+    parser.add_argument("--failure-rate", type=float, default=0.05)
+    parser.add_argument("--chunk-users", type=int, default=10_000, help="users per COPY round / commit")
+    parser.add_argument(
+        "--drop-indexes",
+        action="store_true",
+        help="drop managed indexes on the seeded tables first and rebuild them concurrently afterwards",
+    )
+    args = parser.parse_args()
+
+    profile = SeedProfile(
+        seed=args.seed,
+        users=args.users,
+        accounts_per_user=args.accounts_per_user,
+        txns_per_account=args.txns_per_account,
+        history_days=args.history_days,
+        end=args.end,
+        amount_mu=args.amount_mu,
+        amount_sigma=args.amount_sigma,
+        amount_min=args.amount_min,
+        amount_max=args.amount_max,
+        device_reuse=args.device_reuse,
+        max_devices_per_user=args.max_devices_per_user,
+        home_location_prob=args.home_location_prob,
+        channel_weights=parse_weights(args.channel_weights, CHANNELS),
+        location_weights=parse_weights(args.location_weights, LOCATIONS),
+        merchant_weights=parse_weights(args.merchant_weights, MERCHANT_CATEGORIES),
+        failure_rate=args.failure_rate,
+    )
+
+    def progress(users_done, tables):
+        print(
+            f"  users={users_done}/{profile.users} "
+            f"accounts={tables['accounts']['rows']} transactions={tables['transactions']['rows']}"
+        )
+
+    conn = get_connection()
+    try:
+        if args.drop_indexes:
+            dropped = drop_seeded_table_indexes(conn)
+            print(f"🔧 Dropped {len(dropped)} managed indexes for the load")
+
+        print(f"🔧 Seeding {profile.users} users (seed={profile.seed}, end={profile.end.isoformat()})...")
+        report = bulk_seed(conn, profile, chunk_users=args.chunk_users, progress=progress)
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+    if args.drop_indexes:
+        print("🔧 Rebuilding managed indexes...")
+        report["indexes"] = ensure_managed_indexes(drop_retired=False)
+
+    report["profile"] = profile.as_dict()
+    print(json.dumps(report, indent=2, default=str))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+import argparse
+import json
+import os
+import sys
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(PROJECT_ROOT)
+
+from app.audit.chain_verifier import verify_entity_chains  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Verify every per-entity audit hash chain in parallel."
+    )
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--partitions", type=int, default=None, help="entity key ranges (default: 4 x workers)")
+    parser.add_argument("--chunk-size", type=int, default=5000, help="rows fetched per round trip")
+    args = parser.parse_args()
+
+    print("🔧 Verifying audit chains per entity...")
+
+    report = verify_entity_chains(
+        workers=args.workers,
+        partitions=args.partitions,
+        chunk_size=args.chunk_size,
+    )
+    print(json.dumps(report, indent=2, default=str))
+
+    sys.exit(0 if report["audit_chain_valid"] else 1)
+
+
+if __name__ == "__main__":
+    main()
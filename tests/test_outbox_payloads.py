@@ -0,0 +1,78 @@
+import datetime
+import json
+import math
+
+import pytest
+
+from app.services.outbox import PAYLOAD_VERSION, decode_side_effects, encode_side_effects
+
+
+NOW = datetime.datetime(2024, 5, 1, 12, 30, 15, 123456)
+
+
+def signal_row(signal_id="s-1"):
+    return {
+        "signal_id": signal_id,
+        "user_id": "u-1",
+        "signal_type": "HIGH_AMOUNT",
+        "signal_value": 2500.0,
+        "description": "Amount above threshold",
+        "created_at": NOW,
+    }
+
+
+def case_row():
+    return {
+        "case_id": "c-1",
+        "user_id": "u-1",
+        "account_id": "acc-1",
+        "decision": "REVIEW",
+        "risk_score": 45.5,
+        "created_at": NOW,
+    }
+
+
+def test_round_trip_restores_rows_and_timestamps():
+    events = [{"audit_id": "a-1", "event_type": "DECISION_MADE", "metadata": {"risk_score": 45.5}}]
+
+    decoded = decode_side_effects(
+        encode_side_effects(signal_rows=[signal_row()], case=case_row(), audit_events=events)
+    )
+
+    assert decoded["signals"] == [signal_row()]
+    assert decoded["case"] == case_row()
+    assert decoded["audit_events"] == events
+
+
+def test_round_trip_without_case():
+    decoded = decode_side_effects(encode_side_effects(signal_rows=[], case=None, audit_events=[]))
+    assert decoded == {"v": PAYLOAD_VERSION, "signals": [], "case": None, "audit_events": []}
+
+
+def test_encode_assigns_missing_audit_ids_and_keeps_existing_ones():
+    events = [{"event_type": "CASE_OPENED"}, {"audit_id": "a-2", "event_type": "DECISION_MADE"}]
+
+    decoded = decode_side_effects(encode_side_effects(signal_rows=[], case=None, audit_events=events))
+
+    assert decoded["audit_events"][0]["audit_id"]
+    assert decoded["audit_events"][1]["audit_id"] == "a-2"
+    # The caller's events carry the same ids, so a retry dedupes against them
+    assert events[0]["audit_id"] == decoded["audit_events"][0]["audit_id"]
+
+
+def test_audit_metadata_floats_survive_exactly():
+    events = [{"audit_id": "a-1", "metadata": {"nan": float("nan"), "neg_zero": -0.0, "third": 1 / 3}}]
+
+    metadata = decode_side_effects(
+        encode_side_effects(signal_rows=[], case=None, audit_events=events)
+    )["audit_events"][0]["metadata"]
+
+    assert math.isnan(metadata["nan"])
+    assert math.copysign(1.0, metadata["neg_zero"]) == -1.0
+    assert metadata["third"] == 1 / 3
+
+
+def test_unknown_payload_version_is_rejected():
+    payload = json.dumps({"v": PAYLOAD_VERSION + 1, "signals": [], "case": None, "audit_events": []})
+    with pytest.raises(ValueError):
+        decode_side_effects(payload)
@@ -0,0 +1,154 @@
+import datetime
+
+import pytest
+
+from app.data.pagination import InvalidCursor, decode_cursor, encode_cursor, fetch_keyset_page
+
+
+TS = datetime.datetime(2024, 5, 1, 12, 30, 15, 123456)
+
+SELECT_SQL = "SELECT txn_id, created_at FROM transactions"
+
+
+class FakeCursor:
+    """Returns one canned result set per execute() and records the queries."""
+
+    def __init__(self, *results):
+        self.results = list(results)
+        self.queries = []
+
+    def execute(self, sql, args):
+        self.queries.append((sql, args))
+
+    def fetchall(self):
+        return self.results.pop(0)
+
+
+def row(txn_id, created_at):
+    return {"txn_id": txn_id, "created_at": created_at}
+
+
+def page(cursor, *, descending, after=None, limit=3):
+    return fetch_keyset_page(
+        cursor,
+        scope="transactions",
+        select_sql=SELECT_SQL,
+        conditions=["account_id = %s"],
+        params=["acc-1"],
+        created_column="created_at",
+        id_column="txn_id",
+        descending=descending,
+        after=after,
+        limit=limit,
+    )
+
+
+# ---------------------------------------------------------
+# Cursor tokens
+# ---------------------------------------------------------
+
+def test_cursor_round_trip():
+    token = encode_cursor("transactions", TS, "t-42")
+    assert "=" not in token
+    assert decode_cursor("transactions", token) == (TS, "t-42")
+
+
+def test_cursor_round_trip_null_timestamp():
+    token = encode_cursor("transactions", None, 7)
+    assert decode_cursor("transactions", token) == (None, "7")
+
+
+def test_empty_cursor_is_first_page():
+    assert decode_cursor("transactions", None) is None
+    assert decode_cursor("transactions", "") is None
+
+
+def test_cursor_from_another_scope_is_rejected():
+    token = encode_cursor("cases", TS, "c-1")
+    with pytest.raises(InvalidCursor):
+        decode_cursor("transactions", token)
+
+
+@pytest.mark.parametrize("token", ["not-base64!", "e30", encode_cursor("transactions", TS, "x")[:-4]])
+def test_malformed_cursor_is_rejected(token):
+    with pytest.raises(InvalidCursor):
+        decode_cursor("transactions", token)
+
+
+# ---------------------------------------------------------
+# Keyset pages
+# ---------------------------------------------------------
+
+def test_descending_first_page_crosses_from_null_to_value_segment():
+    cursor = FakeCursor(
+        [row("n-1", None)],
+        [row("t-3", TS), row("t-2", TS), row("t-1", TS)],
+    )
+
+    rows, next_cursor = page(cursor, descending=True)
+
+    assert [r["txn_id"] for r in rows] == ["n-1", "t-3", "t-2"]
+    assert decode_cursor("transactions", next_cursor) == (TS, "t-2")
+
+    (null_sql, null_args), (value_sql, value_args) = cursor.queries
+    assert "created_at IS NULL" in null_sql
+    assert "ORDER BY txn_id DESC" in null_sql
+    assert null_args == ("acc-1", 4)
+    assert "created_at IS NOT NULL" in value_sql
+    assert "ORDER BY created_at DESC, txn_id DESC" in value_sql
+    # Only what the null segment did not fill (+1 to detect a next page)
+    assert value_args == ("acc-1", 3)
+
+
+def test_descending_page_after_value_skips_null_segment():
+    cursor = FakeCursor([row("t-1", TS)])
+
+    rows, next_cursor = page(cursor, descending=True, after=(TS, "t-2"))
+
+    assert [r["txn_id"] for r in rows] == ["t-1"]
+    assert next_cursor is None
+    ((sql, args),) = cursor.queries
+    assert "(created_at, txn_id) < (%s, %s)" in sql
+    assert args == ("acc-1", TS, "t-2", 4)
+
+
+def test_ascending_page_resumes_value_segment_then_starts_null_segment():
+    cursor = FakeCursor(
+        [row("t-5", TS)],
+        [row("n-1", None), row("n-2", None), row("n-3", None)],
+    )
+
+    rows, next_cursor = page(cursor, descending=False, after=(TS, "t-4"))
+
+    assert [r["txn_id"] for r in rows] == ["t-5", "n-1", "n-2"]
+    assert decode_cursor("transactions", next_cursor) == (None, "n-2")
+
+    (value_sql, value_args), (null_sql, null_args) = cursor.queries
+    assert "(created_at, txn_id) > (%s, %s)" in value_sql
+    assert value_args == ("acc-1", TS, "t-4", 4)
+    # The null segment starts from its beginning, not after the value keyset
+    assert "txn_id > %s" not in null_sql
+    assert null_args == ("acc-1", 3)
+
+
+def test_ascending_page_after_null_key_stays_in_null_segment():
+    cursor = FakeCursor([row("n-3", None)])
+
+    rows, next_cursor = page(cursor, descending=False, after=(None, "n-2"))
+
+    assert [r["txn_id"] for r in rows] == ["n-3"]
+    assert next_cursor is None
+    ((sql, args),) = cursor.queries
+    assert "created_at IS NULL" in sql
+    assert "txn_id > %s" in sql
+    assert args == ("acc-1", "n-2", 4)
+
+
+def test_full_first_segment_skips_second_query():
+    cursor = FakeCursor([row("n-1", None), row("n-2", None), row("n-3", None), row("n-4", None)])
+
+    rows, next_cursor = page(cursor, descending=True)
+
+    assert len(rows) == 3
+    assert len(cursor.queries) == 1
+    assert decode_cursor("transactions", next_cursor) == (None, "n-3")
@@ -0,0 +1,88 @@
+import numpy as np
+import pytest
+
+from app.risk import engine
+from app.risk.scoring_config import ScoringConfig
+from app.risk.vectorized import SIGNAL_TYPES, UNKNOWN_TYPE, SignalArrays, score_accounts
+
+
+def signal_rows():
+    """Signals attributed to accounts, as fetch_signals_with_accounts returns them."""
+    rng = np.random.default_rng(7)
+    types = SIGNAL_TYPES + ["LEGACY_SIGNAL"]
+    rows = []
+    for n in range(150):
+        user = f"u-{n % 23}"
+        rows.append(
+            {
+                "user_id": user,
+                "account_id": f"acc-{n % 53}",
+                "signal_type": types[int(rng.integers(len(types)))],
+                "signal_value": None if n % 29 == 0 else float(rng.choice([0.0, 1.0, rng.uniform(0, 5000)])),
+                "description": "test",
+            }
+        )
+    # Every account keeps a single owner, as the accounts join guarantees
+    owners = {}
+    for row in rows:
+        row["user_id"] = owners.setdefault(row["account_id"], row["user_id"])
+    return rows
+
+
+def to_arrays(rows):
+    type_index = {t: i for i, t in enumerate(SIGNAL_TYPES)}
+    return SignalArrays(
+        np.array([r["account_id"] for r in rows], dtype=object),
+        np.array([r["user_id"] for r in rows], dtype=object),
+        np.array([type_index.get(r["signal_type"], UNKNOWN_TYPE) for r in rows], dtype=np.int16),
+        np.array([r["signal_value"] or 0.0 for r in rows], dtype=np.float64),
+    )
+
+
+def scalar_results(monkeypatch, rows):
+    """Score and decide each account with the row-by-row engine."""
+    monkeypatch.setattr(engine, "fetch_signals_with_accounts", lambda: rows)
+    results = {}
+    for (user_id, account_id), data in engine.compute_account_risk_scores().items():
+        score = round(min(data["score"], 100), 2)
+        if score >= engine.BLOCK_THRESHOLD:
+            decision = "BLOCK"
+        elif score >= engine.REVIEW_THRESHOLD:
+            decision = "REVIEW"
+        else:
+            decision = "ALLOW"
+        results[account_id] = (user_id, score, decision, engine.summarize_reasons(data["reasons"]))
+    return results
+
+
+def test_score_accounts_matches_scalar_engine(monkeypatch):
+    rows = signal_rows()
+    expected = scalar_results(monkeypatch, rows)
+    config = ScoringConfig(0, engine.SIGNAL_WEIGHTS, engine.REVIEW_THRESHOLD, engine.BLOCK_THRESHOLD)
+
+    result = score_accounts(to_arrays(rows), config)
+
+    assert len(result) == len(expected)
+    assert {"ALLOW", "REVIEW", "BLOCK"} <= set(result.decisions)
+    for i, account_id in enumerate(result.account_ids):
+        user_id, score, decision, summary = expected[account_id]
+        assert result.user_ids[i] == user_id
+        assert float(result.scores[i]) == pytest.approx(score, abs=1e-9)
+        assert result.decisions[i] == decision
+        assert result.summary(i) == summary.replace("LEGACY_SIGNAL", "UNKNOWN")
+
+
+def test_score_accounts_uses_config_weights_and_thresholds():
+    rows = [
+        {"account_id": "acc-1", "user_id": "u-1", "signal_type": "NEW_DEVICE_USED", "signal_value": 1.0},
+        {"account_id": "acc-2", "user_id": "u-2", "signal_type": "HIGH_AMOUNT", "signal_value": 1000.0},
+    ]
+    config = ScoringConfig(3, {"NEW_DEVICE_USED": 50.0, "HIGH_AMOUNT": 0.2}, 40, 60)
+
+    result = score_accounts(to_arrays(rows), config)
+
+    assert list(result.account_ids) == ["acc-1", "acc-2"]
+    assert list(result.scores) == [50.0, 100.0]
+    assert list(result.decisions) == ["REVIEW", "BLOCK"]
+    assert result.config_version == 3
+    assert result.reasons(1) == [{"type": "HIGH_AMOUNT", "triggers": 1, "contribution": 200.0}]